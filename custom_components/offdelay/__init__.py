@@ -6,15 +6,43 @@ https://github.com/offdelay/offdelay_integration
 
 from __future__ import annotations
 
-from datetime import timedelta
+from typing import TYPE_CHECKING
 
 from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
 from homeassistant.loader import async_get_loaded_integration
 
-from .blueprint import async_setup_blueprints, async_unload_blueprints
-from .const import DOMAIN, PLATFORMS
+from .accuracy import ForecastAccuracyTracker, async_remove_accuracy_store
+from .actuation import ClimateActuator
+from .auto_turn_off import AutoTurnOffManager, async_remove_store
+from .blueprint import async_remove_blueprints, async_setup_blueprints
+from .const import CONF_BLUEPRINTS, DOMAIN, PLATFORMS
 from .coordinator import OffdelayDataUpdateCoordinator
 from .data import OffdelayConfigEntry, OffdelayData
+from .degree_days import DegreeDayTracker, async_remove_degree_day_store
+from .enocean import RockerSwitchHandler
+from .heating import HeatingController
+from .lighting import LightController
+from .notifications import NotificationDispatcher
+from .reconfigure import EntrySnapshot, async_apply_entry_update
+from .services import async_setup_services
+from .sites import SiteEngine
+from .telemetry import TelemetryUploader, async_remove_spool
+from .template_functions import DATA_TEMPLATE_FUNCTIONS, async_setup_template_functions
+from .thermal import ThermalModels, async_remove_thermal_store
+from .weather import async_remove_weather_issue
+
+if TYPE_CHECKING:
+    from homeassistant.helpers.typing import ConfigType
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001, RUF029
+    """Set up the offdelay services and template functions."""
+    async_setup_services(hass)
+    async_setup_template_functions(hass)
+    return True
 
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
@@ -34,9 +62,6 @@ async def async_setup_entry(
     """
     coordinator = OffdelayDataUpdateCoordinator(hass, entry)
 
-    # Optionally set periodic update interval
-    coordinator.update_interval = timedelta(hours=1)
-
     # Initialize runtime data
     entry.runtime_data = OffdelayData(
         integration=async_get_loaded_integration(hass, entry.domain),
@@ -46,12 +71,93 @@ async def async_setup_entry(
     # Perform first refresh
     await coordinator.async_config_entry_first_refresh()
 
-    # Set up blueprints
-    await async_setup_blueprints(hass, DOMAIN)
+    # Set up the selected blueprints (only changed files are written)
+    selected = entry.options.get(CONF_BLUEPRINTS)
+    await async_setup_blueprints(
+        hass, entry.entry_id, set(selected) if selected is not None else None
+    )
+
+    # Start the native heating controller for the configured rooms
+    heating = HeatingController.from_config_entry(hass, entry, coordinator)
+    if heating is not None:
+        entry.runtime_data.heating = heating
+        heating.async_start()
+        entry.async_on_unload(heating.async_stop)
+
+    # Start the native motion light controller for the configured rooms
+    lighting = LightController.from_config_entry(hass, entry)
+    if lighting is not None:
+        entry.runtime_data.lighting = lighting
+        lighting.async_start()
+        entry.async_on_unload(lighting.async_stop)
+
+    # Start the native handler for the configured rocker switches
+    rockers = RockerSwitchHandler.from_config_entry(hass, entry)
+    if rockers is not None:
+        entry.runtime_data.rockers = rockers
+        rockers.async_start()
+        entry.async_on_unload(rockers.async_stop)
+
+    # Refresh the sites of the fleet mode, spread over the refresh interval
+    sites = SiteEngine.from_config_entry(hass, entry, coordinator)
+    if sites is not None:
+        entry.runtime_data.sites = sites
+        sites.async_start()
+        entry.async_on_unload(sites.async_stop)
+
+    # Restore the pending offdelay.auto_turn_off deadlines
+    auto_turn_off = AutoTurnOffManager(hass, entry)
+    entry.runtime_data.auto_turn_off = auto_turn_off
+    await auto_turn_off.async_start()
+    entry.async_on_unload(auto_turn_off.async_stop)
+
+    # Compare the forecast with the observed temperatures
+    accuracy = ForecastAccuracyTracker(hass, entry, coordinator)
+    entry.runtime_data.accuracy = accuracy
+    await accuracy.async_start()
+    entry.async_on_unload(accuracy.async_stop)
+
+    # Accumulate the heating and cooling degree-days
+    degree_days = DegreeDayTracker(hass, entry, coordinator)
+    entry.runtime_data.degree_days = degree_days
+    await degree_days.async_start()
+    entry.async_on_unload(degree_days.async_stop)
+
+    # Learn how fast every climate heats and cools
+    thermal = ThermalModels.from_config_entry(hass, entry, coordinator)
+    if thermal is not None:
+        entry.runtime_data.thermal = thermal
+        await thermal.async_start()
+        entry.async_on_unload(thermal.async_stop)
+
+    # Set the climates themselves when the climate mode flips, if enabled
+    actuator = ClimateActuator.from_config_entry(hass, entry, coordinator)
+    if actuator is not None:
+        entry.runtime_data.actuator = actuator
+        actuator.async_start()
+        entry.async_on_unload(actuator.async_stop)
+
+    # Keep the areas of the climates known to the template functions
+    template_functions = hass.data[DATA_TEMPLATE_FUNCTIONS]
+    template_functions.async_start()
+    entry.async_on_unload(template_functions.async_stop)
+
+    # Queue offdelay.notify messages
+    notifications = NotificationDispatcher(hass, entry)
+    entry.runtime_data.notifications = notifications
+    notifications.async_start()
+    entry.async_on_unload(notifications.async_stop)
+
+    # Upload engine events if a telemetry URL is configured
+    telemetry = TelemetryUploader.from_config_entry(hass, entry, coordinator)
+    if telemetry is not None:
+        entry.runtime_data.telemetry = telemetry
+        await telemetry.async_start()
 
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.runtime_data.snapshot = EntrySnapshot.from_entry(entry)
+    entry.async_on_unload(entry.add_update_listener(async_update_entry))
 
     return True
 
@@ -60,14 +166,30 @@ async def async_unload_entry(
     hass: HomeAssistant,
     entry: OffdelayConfigEntry,
 ) -> bool:
-    """Handle removal of an entry."""
-    await async_unload_blueprints(hass, DOMAIN)
+    """Handle unloading of an entry."""
+    # A reconfigure can replace the uploader, so it is not an unload callback
+    if (telemetry := entry.runtime_data.telemetry) is not None:
+        await telemetry.async_stop()
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
-async def async_reload_entry(
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: OffdelayConfigEntry,
+) -> None:
+    """Handle removal of an entry."""
+    await async_remove_blueprints(hass, entry.entry_id)
+    await async_remove_store(hass, entry.entry_id)
+    await async_remove_spool(hass, entry.entry_id)
+    await async_remove_accuracy_store(hass, entry.entry_id)
+    await async_remove_degree_day_store(hass, entry.entry_id)
+    await async_remove_thermal_store(hass, entry.entry_id)
+    async_remove_weather_issue(hass, entry.entry_id)
+
+
+async def async_update_entry(
     hass: HomeAssistant,
     entry: OffdelayConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply a changed config entry, reloading it only if its entities change."""
+    await async_apply_entry_update(hass, entry)
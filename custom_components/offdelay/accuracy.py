@@ -0,0 +1,386 @@
+"""Accuracy of the weather forecast, measured against the observed weather.
+
+Every day the first forecast of its max and min is kept twice: the one made
+on the day itself (lead ``today``) and the one made the day before (lead
+``tomorrow``). The max and min the day really had are followed from the
+outdoor sensor, or else from the current temperature of the weather entity.
+At midnight the errors of the day (forecast minus observed) are added to
+Welford accumulators per lead, which keep the count, the bias, the variance
+and the mean absolute error without keeping any history. They are saved in a
+small store, so no recorder queries are needed. The observation of the day
+changes with every reading, so it is saved every
+:data:`OBSERVED_SAVE_INTERVAL` rather than after each reading.
+
+Only days observed from their start are counted, so a day Home Assistant
+was started halfway through does not skew the errors with a partial max or
+min.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+import math
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_change,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from .const import (
+    CONF_OUTDOOR_SENSOR,
+    DATA_WEATHER_STALE,
+    DOMAIN,
+    LOGGER,
+    SIGNAL_ACCURACY_UPDATED,
+)
+from .outdoor import temperature_from_state
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+
+    from .coordinator import OffdelayDataUpdateCoordinator
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+OBSERVED_SAVE_INTERVAL = timedelta(minutes=15)
+
+LEAD_TODAY = "today"
+LEAD_TOMORROW = "tomorrow"
+QUANTITY_MAX = "max"
+QUANTITY_MIN = "min"
+
+# Coordinator data keys of the forecast per lead, and the day it is for
+FORECAST_KEYS = {
+    LEAD_TODAY: (0, "weather_max_temp_today", "weather_min_temp_today"),
+    LEAD_TOMORROW: (1, "weather_max_temp_tomorrow", "weather_min_temp_tomorrow"),
+}
+
+# How late after midnight the observation of a day may start
+OBSERVATION_SLACK = timedelta(hours=1)
+MIN_SAMPLES = 4
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.forecast_accuracy.{entry_id}")
+
+
+async def async_remove_accuracy_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored forecast errors of a config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+def observed_temperature(state: State) -> float | None:
+    """Return the current temperature of a sensor or weather entity in °C."""
+    if state.domain != "weather":
+        return temperature_from_state(state)
+    value = state.attributes.get("temperature")
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    unit = state.attributes.get("temperature_unit", UnitOfTemperature.CELSIUS)
+    if unit != UnitOfTemperature.CELSIUS and unit in TemperatureConverter.VALID_UNITS:
+        return TemperatureConverter.convert(value, unit, UnitOfTemperature.CELSIUS)
+    return float(value)
+
+
+@dataclass(slots=True)
+class ErrorStats:
+    """Running statistics of the errors of a forecast, by Welford's method."""
+
+    count: int = 0
+    mean: float = 0.0
+    # Sum of the squared differences from the mean
+    m2: float = 0.0
+    mean_abs: float = 0.0
+
+    def add(self, error: float) -> None:
+        """Add the error of one day."""
+        self.count += 1
+        delta = error - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (error - self.mean)
+        self.mean_abs += (abs(error) - self.mean_abs) / self.count
+
+    @property
+    def bias(self) -> float | None:
+        """Return the mean error, positive if the forecast is too warm."""
+        return self.mean if self.count else None
+
+    @property
+    def mae(self) -> float | None:
+        """Return the mean absolute error."""
+        return self.mean_abs if self.count else None
+
+    @property
+    def std(self) -> float | None:
+        """Return the sample standard deviation of the error."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ErrorStats:
+        """Restore the statistics from the store."""
+        return cls(
+            count=int(data.get("count", 0)),
+            mean=float(data.get("mean", 0.0)),
+            m2=float(data.get("m2", 0.0)),
+            mean_abs=float(data.get("mean_abs", 0.0)),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {"days": self.count, "bias": self.bias, "mae": self.mae, "std": self.std}
+
+
+@dataclass(slots=True)
+class ObservedDay:
+    """The max and min temperature observed so far on a day."""
+
+    day: str
+    # POSIX time the observation started
+    since: float
+    max_temp: float | None = None
+    min_temp: float | None = None
+    samples: int = 0
+
+    def add(self, value: float) -> None:
+        """Add a temperature reading."""
+        self.samples += 1
+        self.max_temp = value if self.max_temp is None else max(self.max_temp, value)
+        self.min_temp = value if self.min_temp is None else min(self.min_temp, value)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ObservedDay:
+        """Restore the day from the store."""
+        return cls(
+            day=str(data["day"]),
+            since=float(data["since"]),
+            max_temp=data.get("max_temp"),
+            min_temp=data.get("min_temp"),
+            samples=int(data.get("samples", 0)),
+        )
+
+
+class ForecastAccuracyTracker:
+    """Keep the errors of the daily forecast per lead."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self._coordinator = coordinator
+        self._store = _store(hass, config_entry.entry_id)
+        self.errors = {
+            lead: {QUANTITY_MAX: ErrorStats(), QUANTITY_MIN: ErrorStats()}
+            for lead in FORECAST_KEYS
+        }
+        # Forecast max and min per ISO date and lead
+        self._forecasts: dict[str, dict[str, dict[str, float]]] = {}
+        self.observed = ObservedDay(
+            dt_util.now().date().isoformat(), dt_util.utcnow().timestamp()
+        )
+        self._observed_changed = False
+        self.source: str | None = None
+        self._source_unsub: CALLBACK_TYPE | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @property
+    def signal(self) -> str:
+        """Return the dispatcher signal sent when the errors change."""
+        return f"{SIGNAL_ACCURACY_UPDATED}_{self._config_entry.entry_id}"
+
+    async def async_start(self) -> None:
+        """Restore the errors and start following the forecast and weather."""
+        stored = await self._store.async_load() or {}
+        for lead, quantities in stored.get("errors", {}).items():
+            for quantity, data in quantities.items():
+                if quantity in self.errors.get(lead, {}):
+                    self.errors[lead][quantity] = ErrorStats.from_dict(data)
+        self._forecasts = stored.get("forecasts", {})
+        # A day that was not observed until its end is not counted
+        observed = stored.get("observed")
+        if observed is not None and observed.get("day") == self.observed.day:
+            self.observed = ObservedDay.from_dict(observed)
+        self._prune(dt_util.now().date())
+
+        self._unsubs = [
+            self._coordinator.async_add_listener(self._async_coordinator_updated),
+            async_track_time_change(
+                self.hass, self._async_day_ended, hour=0, minute=0, second=0
+            ),
+            async_track_time_interval(
+                self.hass, self._async_save_observed, OBSERVED_SAVE_INTERVAL
+            ),
+        ]
+        self._async_coordinator_updated()
+
+    async def async_stop(self) -> None:
+        """Stop following and save the errors."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        self._async_follow(None)
+        await self._store.async_save(self._data_to_store())
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        self._record_forecasts()
+        self._async_follow(
+            self._config_entry.options.get(CONF_OUTDOOR_SENSOR)
+            or self._coordinator.weather_sources.preferred
+        )
+
+    def _record_forecasts(self) -> None:
+        """Keep the first forecast fetched on a day for each lead."""
+        fetched = self._coordinator.weather_breaker.last_success
+        data = self._coordinator.data
+        if fetched is None or data.get(DATA_WEATHER_STALE):
+            return
+        # The forecast of a previous day is still cached until the next fetch
+        fetched_on = dt_util.as_local(fetched).date()
+        if fetched_on != dt_util.now().date():
+            return
+        recorded = False
+        for lead, (days, max_key, min_key) in FORECAST_KEYS.items():
+            day = (fetched_on + timedelta(days=days)).isoformat()
+            forecasts = self._forecasts.get(day, {})
+            max_temp, min_temp = data.get(max_key), data.get(min_key)
+            if lead in forecasts or max_temp is None or min_temp is None:
+                continue
+            forecasts[lead] = {QUANTITY_MAX: max_temp, QUANTITY_MIN: min_temp}
+            self._forecasts[day] = forecasts
+            recorded = True
+        if recorded:
+            self._async_schedule_save()
+
+    @callback
+    def _async_follow(self, entity_id: str | None) -> None:
+        """Observe the temperature of ``entity_id``, or of no entity."""
+        if entity_id == self.source:
+            return
+        if self._source_unsub is not None:
+            self._source_unsub()
+            self._source_unsub = None
+        self.source = entity_id
+        if entity_id is None:
+            return
+        if (state := self.hass.states.get(entity_id)) is not None:
+            self._add_observation(state)
+        self._source_unsub = async_track_state_change_event(
+            self.hass, [entity_id], self._async_source_changed
+        )
+
+    @callback
+    def _async_source_changed(self, event: Event[EventStateChangedData]) -> None:
+        if (new_state := event.data["new_state"]) is not None:
+            self._add_observation(new_state)
+
+    def _add_observation(self, state: State) -> None:
+        if (value := observed_temperature(state)) is None:
+            return
+        self.observed.add(value)
+        self._observed_changed = True
+
+    @callback
+    def _async_save_observed(self, _now: datetime) -> None:
+        """Save the observation of the day if it changed."""
+        if not self._observed_changed:
+            return
+        self._observed_changed = False
+        # Without a delay, so a pending save of the errors cannot hold it off
+        self._store.async_delay_save(self._data_to_store)
+
+    @callback
+    def _async_day_ended(self, now: datetime) -> None:
+        """Add the errors of the day that ended and start observing the next."""
+        today = dt_util.as_local(now).date()
+        if self.observed.day != today.isoformat():
+            self._close_day()
+            self.observed = ObservedDay(today.isoformat(), dt_util.utcnow().timestamp())
+            if self.source is not None and (state := self.hass.states.get(self.source)):
+                self._add_observation(state)
+        self._prune(today)
+        self._async_schedule_save()
+        async_dispatcher_send(self.hass, self.signal)
+        # Pick up the forecast of the new day
+        self._config_entry.async_create_background_task(
+            self.hass,
+            self._coordinator.async_request_refresh(),
+            "offdelay forecast of the new day",
+        )
+
+    def _close_day(self) -> None:
+        observed = self.observed
+        start = dt_util.start_of_local_day(date.fromisoformat(observed.day))
+        if (
+            observed.max_temp is None
+            or observed.min_temp is None
+            or observed.samples < MIN_SAMPLES
+            or observed.since > (start + OBSERVATION_SLACK).timestamp()
+        ):
+            LOGGER.debug("Not counting the forecast errors of %s", observed.day)
+            return
+        for lead, forecast in self._forecasts.get(observed.day, {}).items():
+            self.errors[lead][QUANTITY_MAX].add(
+                forecast[QUANTITY_MAX] - observed.max_temp
+            )
+            self.errors[lead][QUANTITY_MIN].add(
+                forecast[QUANTITY_MIN] - observed.min_temp
+            )
+
+    def _prune(self, today: date) -> None:
+        """Drop the forecasts of days that have passed."""
+        self._forecasts = {
+            day: forecasts
+            for day, forecasts in self._forecasts.items()
+            if day >= today.isoformat()
+        }
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_store, SAVE_DELAY)
+
+    def _data_to_store(self) -> dict[str, Any]:
+        return {
+            "errors": {
+                lead: {
+                    quantity: asdict(stats) for quantity, stats in quantities.items()
+                }
+                for lead, quantities in self.errors.items()
+            },
+            "forecasts": self._forecasts,
+            "observed": asdict(self.observed),
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Return the errors and the current observation for diagnostics."""
+        return {
+            "source": self.source,
+            "errors": {
+                lead: {
+                    quantity: stats.stats() for quantity, stats in quantities.items()
+                }
+                for lead, quantities in self.errors.items()
+            },
+            "forecasts": self._forecasts,
+            "observed": asdict(self.observed),
+        }
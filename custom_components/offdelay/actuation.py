@@ -0,0 +1,260 @@
+"""Set the climates to the climate mode when it changes.
+
+When the climate mode flips, every configured climate gets a desired state
+of both its HVAC mode and its preset: heat or cool with a preset other than
+eco in winter and summer, and auto with the eco preset in between. The two
+are compared separately, so a climate that already heats still gets its
+preset back after the eco preset. Values a climate already has, or does not
+support, are skipped. The rest are grouped per integration and value, so each
+group is set with a single service call for all its entities; HVAC modes are
+set before presets, as some climates only offer their presets in a mode. At
+most :data:`MAX_CONCURRENT_CALLS` calls run at a time, and a failed call is
+retried with backoff. The outcome of the last run is kept for the
+diagnostics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
+    ATTR_HVAC_MODES,
+    ATTR_PRESET_MODE,
+    ATTR_PRESET_MODES,
+    DOMAIN as CLIMATE_DOMAIN,
+    PRESET_COMFORT,
+    PRESET_ECO,
+    PRESET_HOME,
+    PRESET_NONE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_PRESET_MODE,
+    HVACMode,
+)
+from homeassistant.const import ATTR_ENTITY_ID, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .api import backoff_delay
+from .const import CONF_CLIMATE_ACTUATION, CONF_CLIMATES, DATA_CLIMATE_MODE, LOGGER
+
+if TYPE_CHECKING:
+    from .coordinator import OffdelayDataUpdateCoordinator
+    from .data import OffdelayConfigEntry
+
+MAX_CONCURRENT_CALLS = 4
+MAX_ATTEMPTS = 3
+
+SKIP_UNAVAILABLE = "unavailable"
+SKIP_UNCHANGED = "unchanged"
+SKIP_UNSUPPORTED = "unsupported"
+
+
+@dataclass(frozen=True, slots=True)
+class DesiredValue:
+    """A value of one climate attribute in the state of a climate mode."""
+
+    service: str
+    attribute: str
+    # State attribute listing the supported values
+    supported: str
+    # Accepted values, the first supported one is set
+    values: tuple[str, ...]
+    # Instead of the values, accept anything but this one
+    avoid: str | None = None
+
+    def current(self, state: State) -> str | None:
+        """Return the value the climate has now."""
+        if self.attribute == ATTR_HVAC_MODE:
+            return state.state
+        return state.attributes.get(self.attribute)
+
+    def target(self, state: State) -> str | None:
+        """Return the value to set, if the climate supports one."""
+        supported = state.attributes.get(self.supported) or ()
+        return next((value for value in self.values if value in supported), None)
+
+    def skip_reason(self, state: State | None) -> str | None:
+        """Return why the climate does not need the call, if it does not."""
+        if state is None or state.state in {STATE_UNAVAILABLE, STATE_UNKNOWN}:
+            return SKIP_UNAVAILABLE
+        current = self.current(state)
+        if current in self.values or (
+            self.avoid is not None and current not in {None, self.avoid}
+        ):
+            return SKIP_UNCHANGED
+        if self.target(state) is None:
+            return SKIP_UNSUPPORTED
+        return None
+
+
+def _hvac_mode(*values: str) -> DesiredValue:
+    return DesiredValue(SERVICE_SET_HVAC_MODE, ATTR_HVAC_MODE, ATTR_HVAC_MODES, values)
+
+
+def _preset(*values: str, avoid: str | None = None) -> DesiredValue:
+    return DesiredValue(
+        SERVICE_SET_PRESET_MODE, ATTR_PRESET_MODE, ATTR_PRESET_MODES, values, avoid
+    )
+
+
+# Presets that undo the eco preset, the first one a climate supports is set
+_NOT_ECO = _preset(PRESET_COMFORT, PRESET_HOME, PRESET_NONE, avoid=PRESET_ECO)
+
+# Per climate mode, HVAC mode first
+DESIRED_STATES = {
+    "winter": (_hvac_mode(HVACMode.HEAT), _NOT_ECO),
+    "summer": (_hvac_mode(HVACMode.COOL), _NOT_ECO),
+    "none": (_hvac_mode(HVACMode.AUTO), _preset(PRESET_ECO)),
+}
+
+
+class ClimateActuator:
+    """Put the climates in the state of the climate mode when it flips."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+        climates: list[str],
+    ) -> None:
+        """Initialize the actuator."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self._coordinator = coordinator
+        self._climates = climates
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+        self._mode: str | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+        # Outcome of the last run, for diagnostics
+        self.last_run: dict[str, Any] | None = None
+
+    @classmethod
+    def from_config_entry(
+        cls,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+    ) -> ClimateActuator | None:
+        """Create an actuator if it is enabled and climates are configured."""
+        climates = config_entry.data.get(CONF_CLIMATES)
+        if not climates or not config_entry.options.get(CONF_CLIMATE_ACTUATION):
+            return None
+        return cls(hass, config_entry, coordinator, list(climates))
+
+    @callback
+    def async_start(self) -> None:
+        """Follow the climate mode, taking the current one as already applied."""
+        self._mode = self._coordinator.data.get(DATA_CLIMATE_MODE)
+        self._unsub = self._coordinator.async_add_listener(
+            self._async_coordinator_updated
+        )
+
+    async def async_stop(self) -> None:
+        """Stop following the climate mode and cancel a running run."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        mode = self._coordinator.data.get(DATA_CLIMATE_MODE)
+        if mode == self._mode:
+            return
+        previous, self._mode = self._mode, mode
+        if previous is None or mode not in DESIRED_STATES:
+            return
+        # A newer mode supersedes the run of the previous one
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = self._config_entry.async_create_background_task(
+            self.hass, self.async_apply(mode), "offdelay climate actuation"
+        )
+
+    async def async_apply(self, mode: str) -> None:
+        """Put every climate that needs it in the state of ``mode``."""
+        registry = er.async_get(self.hass)
+        self.last_run = {
+            "mode": mode,
+            "started": dt_util.utcnow().isoformat(),
+            "skipped": {},
+            "batches": [],
+        }
+        for desired in DESIRED_STATES[mode]:
+            skipped: dict[str, str] = {}
+            batches: dict[tuple[str, str], list[str]] = defaultdict(list)
+            for entity_id in self._climates:
+                state = self.hass.states.get(entity_id)
+                if (reason := desired.skip_reason(state)) is not None:
+                    skipped[entity_id] = reason
+                    continue
+                entry = registry.async_get(entity_id)
+                platform = entry.platform if entry is not None else ""
+                batches[platform, desired.target(state)].append(entity_id)
+            self.last_run["skipped"][desired.attribute] = skipped
+            self.last_run["batches"] += await asyncio.gather(
+                *(
+                    self._async_call(desired, platform, value, entity_ids)
+                    for (platform, value), entity_ids in batches.items()
+                )
+            )
+        self.last_run["finished"] = dt_util.utcnow().isoformat()
+
+    async def _async_call(
+        self,
+        desired: DesiredValue,
+        platform: str,
+        value: str,
+        entity_ids: list[str],
+    ) -> dict[str, Any]:
+        """Call the service for the climates of one integration, with retries."""
+        result: dict[str, Any] = {
+            "integration": platform,
+            "service": desired.service,
+            desired.attribute: value,
+            "entities": entity_ids,
+        }
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            result["attempts"] = attempt
+            try:
+                async with self._semaphore:
+                    await self.hass.services.async_call(
+                        CLIMATE_DOMAIN,
+                        desired.service,
+                        {ATTR_ENTITY_ID: entity_ids, desired.attribute: value},
+                        blocking=True,
+                    )
+            except HomeAssistantError as err:
+                result["error"] = str(err)
+                if attempt < MAX_ATTEMPTS:
+                    await asyncio.sleep(backoff_delay(attempt))
+            else:
+                result.pop("error", None)
+                return result
+        LOGGER.warning(
+            "Setting %s of %s to %s failed: %s",
+            desired.attribute,
+            entity_ids,
+            value,
+            result["error"],
+        )
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Return the climates and the outcome of the last run for diagnostics."""
+        return {
+            "climates": self._climates,
+            "max_concurrent_calls": MAX_CONCURRENT_CALLS,
+            "last_run": self.last_run,
+        }
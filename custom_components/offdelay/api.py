@@ -1,124 +1,230 @@
-"""Sample API Client."""
+"""Client for the offdelay.be API.
+
+The client runs on Home Assistant's shared aiohttp session, so it reuses
+its pooled keep-alive connections and DNS cache instead of opening a
+connector of its own. On top of that it:
+
+- retries connection errors, timeouts, 429 and 5xx responses with jittered
+  exponential backoff, honouring ``Retry-After``;
+- sends ``If-None-Match`` with the ETag of the last response and answers a
+  ``304 Not Modified`` from its local cache, so unchanged data is neither
+  transferred nor parsed again;
+- lets concurrent calls for the same URL share one request.
+
+:meth:`OffdelayApiClient.async_upload` posts data with the same retries.
+"""
 
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import functools
+import random
 import socket
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
+from homeassistant.util.json import JsonValueType
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
 
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5)
+MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 
-class IntegrationBlueprintApiClientError(Exception):
+
+class OffdelayApiClientError(Exception):
     """Exception to indicate a general API error."""
 
 
-class IntegrationBlueprintApiClientCommunicationError(
-    IntegrationBlueprintApiClientError,
+class OffdelayApiClientCommunicationError(
+    OffdelayApiClientError,
 ):
     """Exception to indicate a communication error."""
 
 
-class IntegrationBlueprintApiClientAuthenticationError(
-    IntegrationBlueprintApiClientError,
+class OffdelayApiClientAuthenticationError(
+    OffdelayApiClientError,
 ):
     """Exception to indicate an authentication error."""
 
 
+class _RetryableError(OffdelayApiClientCommunicationError):
+    """A failed attempt that is worth repeating."""
+
+    def __init__(self, msg: str, retry_after: float | None = None) -> None:
+        super().__init__(msg)
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """The last response for a URL and its ETag."""
+
+    etag: str | None
+    data: JsonValueType
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return the delay before retry ``attempt`` (1 based), with full jitter."""
+    return random.uniform(  # noqa: S311
+        0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    )
+
+
+def _retry_after(response: aiohttp.ClientResponse) -> float | None:
+    try:
+        return min(RETRY_MAX_DELAY, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
 def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
     """Verify that the response is valid.
 
     Raises:
-        IntegrationBlueprintApiClientAuthenticationError: If the response indicates an authentication error.
+        OffdelayApiClientAuthenticationError: If the credentials are refused.
+        OffdelayApiClientError: If the request cannot succeed.
+        _RetryableError: If the request is worth repeating.
 
     """
     if response.status in {401, 403}:
         msg = "Invalid credentials"
-        raise IntegrationBlueprintApiClientAuthenticationError(
-            msg,
-        )
-    response.raise_for_status()
-
-
-class IntegrationBlueprintApiClient:
-    """Sample API Client."""
-
-    def __init__(
-        self,
-        username: str,
-        password: str,
-        session: aiohttp.ClientSession,
-    ) -> None:
-        """Sample API Client."""
-        self._username = username
-        self._password = password
+        raise OffdelayApiClientAuthenticationError(msg)
+    if response.status in RETRY_STATUSES:
+        msg = f"HTTP {response.status}"
+        raise _RetryableError(msg, _retry_after(response))
+    if response.status >= 400:
+        msg = f"HTTP {response.status} fetching {response.url}"
+        raise OffdelayApiClientError(msg)
+
+
+async def _async_with_retries[T](
+    url: str, attempt_once: Callable[[], Awaitable[T]]
+) -> T:
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            return await attempt_once()
+        except _RetryableError as err:
+            if attempt == MAX_ATTEMPTS:
+                msg = f"Error fetching information - {err}"
+                raise OffdelayApiClientCommunicationError(msg) from err
+            delay = (
+                err.retry_after
+                if err.retry_after is not None
+                else backoff_delay(attempt)
+            )
+            LOGGER.debug(
+                "Request to %s failed (%s), retrying in %.1fs", url, err, delay
+            )
+            await asyncio.sleep(delay)
+    raise AssertionError  # pragma: no cover
+
+
+class OffdelayApiClient:
+    """Client for the offdelay.be API."""
+
+    def __init__(self, session: aiohttp.ClientSession, url: str) -> None:
+        """Initialize the client for the data at ``url``."""
         self._session = session
+        self._url = url
+        self._cache: dict[str, CachedResponse] = {}
+        self._inflight: dict[str, asyncio.Future[JsonValueType]] = {}
+        self.requests = 0
+        self.not_modified = 0
 
-    async def async_get_data(self) -> dict:
-        """Get data from the API.
+    async def async_get_data(self) -> JsonValueType:
+        """Get the data from the API.
 
         Returns:
-            dict: The data from the API.
+            JsonValueType: The decoded JSON body.
 
         """
-        return await self._api_wrapper(
-            method="get",
-            url="https://jsonplaceholder.typicode.com/posts/1",
-        )
+        return await self.async_get(self._url)
 
-    async def async_set_title(self, value: str) -> dict:
-        """Get data from the API.
-
-        Returns:
-            dict: The data from the API.
+    async def async_get(self, url: str) -> JsonValueType:
+        """GET ``url``, sharing the request with concurrent calls for it.
 
+        Refused credentials raise :class:`OffdelayApiClientAuthenticationError`,
+        other failures :class:`OffdelayApiClientError`.
         """
-        return await self._api_wrapper(
-            method="patch",
-            url="https://jsonplaceholder.typicode.com/posts/1",
-            data={"title": value},
-            headers={"Content-type": "application/json; charset=UTF-8"},
+        if (future := self._inflight.get(url)) is None:
+            future = asyncio.ensure_future(self._async_get_with_retries(url))
+            self._inflight[url] = future
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        # A cancelled caller must not cancel the request of the others
+        return await asyncio.shield(future)
+
+    def cache_info(self) -> dict[str, Any]:
+        """Return the cache state for diagnostics."""
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "etags": {url: cached.etag for url, cached in self._cache.items()},
+        }
+
+    async def async_upload(
+        self, url: str, body: bytes, headers: dict[str, str] | None = None
+    ) -> None:
+        """POST ``body`` to ``url``, retrying like a GET."""
+        await _async_with_retries(
+            url, functools.partial(self._async_post_once, url, body, headers or {})
+        )
+
+    async def _async_get_with_retries(self, url: str) -> JsonValueType:
+        return await _async_with_retries(
+            url, functools.partial(self._async_get_once, url)
         )
 
-    async def _api_wrapper(
+    async def _async_get_once(self, url: str) -> JsonValueType:
+        cached = self._cache.get(url)
+        headers = {}
+        if cached is not None and cached.etag is not None:
+            headers[aiohttp.hdrs.IF_NONE_MATCH] = cached.etag
+        async with self._async_request("GET", url, headers=headers) as response:
+            if response.status == 304 and cached is not None:
+                self.not_modified += 1
+                return cached.data
+            _verify_response_or_raise(response)
+            data = await response.json()
+            self._cache[url] = CachedResponse(
+                response.headers.get(aiohttp.hdrs.ETAG), data
+            )
+            return data
+
+    async def _async_post_once(
+        self, url: str, body: bytes, headers: dict[str, str]
+    ) -> None:
+        async with self._async_request(
+            "POST", url, data=body, headers=headers
+        ) as response:
+            _verify_response_or_raise(response)
+
+    @asynccontextmanager
+    async def _async_request(
         self,
         method: str,
         url: str,
-        data: dict | None = None,
-        headers: dict | None = None,
-    ) -> dict:
-        """Get information from the API.
-
-        Returns:
-            dict: The data from the API.
-
-        Raises:
-            IntegrationBlueprintApiClientCommunicationError: If a communication error occurs.
-            IntegrationBlueprintApiClientError: If a general API error occurs.
-
-        """
+        *,
+        headers: dict[str, str],
+        data: bytes | None = None,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        # Transport failures are worth retrying
+        self.requests += 1
         try:
-            async with asyncio.timeout(10):
-                response = await self._session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=data,
-                )
-                _verify_response_or_raise(response)
-                return await response.json()
-
+            async with self._session.request(
+                method, url, headers=headers, data=data, timeout=REQUEST_TIMEOUT
+            ) as response:
+                yield response
         except TimeoutError as exception:
-            msg = f"Timeout error fetching information - {exception}"
-            raise IntegrationBlueprintApiClientCommunicationError(
-                msg,
-            ) from exception
+            msg = f"Timeout error - {exception}"
+            raise _RetryableError(msg) from exception
         except (aiohttp.ClientError, socket.gaierror) as exception:
-            msg = f"Error fetching information - {exception}"
-            raise IntegrationBlueprintApiClientCommunicationError(
-                msg,
-            ) from exception
-        except Exception as exception:
-            msg = f"Something really wrong happened! - {exception}"
-            raise IntegrationBlueprintApiClientError(
-                msg,
-            ) from exception
+            msg = f"{type(exception).__name__} - {exception}"
+            raise _RetryableError(msg) from exception
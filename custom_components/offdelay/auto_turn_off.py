@@ -0,0 +1,133 @@
+"""Native replacement for the entity_auto_turn_off script blueprint.
+
+Every ``offdelay.auto_turn_off`` call turns its entities on and schedules
+them to be turned off again. All deadlines live in one
+:class:`DeadlineScheduler`, on/off calls are batched per domain and pending
+deadlines are stored so they survive a restart.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import SERVICE_TURN_OFF, SERVICE_TURN_ON, STATE_ON
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER
+from .helpers import ServiceCallBatcher
+from .scheduler import DeadlineScheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    import datetime as dt
+
+    from homeassistant.config_entries import ConfigEntry
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+MODE_RESTART = "restart"
+MODE_EXTEND = "extend"
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.auto_turn_off.{entry_id}")
+
+
+async def async_remove_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored deadlines of a config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+class AutoTurnOffManager:
+    """Turn entities off once their deadline passes."""
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        self.scheduler = DeadlineScheduler(hass)
+        self._batcher = ServiceCallBatcher(hass, config_entry, "offdelay auto off")
+        self._store = _store(hass, config_entry.entry_id)
+        self._remove_listener: CALLBACK_TYPE | None = None
+
+    async def async_start(self) -> None:
+        """Restore the stored deadlines and start saving changes."""
+        stored = await self._store.async_load() or {}
+        now = dt_util.utcnow()
+        overdue: list[str] = []
+        for entity_id, value in stored.get("deadlines", {}).items():
+            if (when := dt_util.parse_datetime(value)) is None:
+                continue
+            if when <= now:
+                overdue.append(entity_id)
+            else:
+                self._async_schedule(entity_id, when, extend=False)
+        if overdue:
+            LOGGER.debug("Turning off %s, their deadline passed", overdue)
+            self._batcher.async_queue(SERVICE_TURN_OFF, overdue)
+        self._remove_listener = self.scheduler.async_add_listener(
+            self._async_schedule_save
+        )
+
+    async def async_stop(self) -> None:
+        """Save the pending deadlines and drop the timer."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        data = self._data_to_store()
+        self.scheduler.async_stop()
+        await self._store.async_save(data)
+
+    @callback
+    def async_turn_off_later(
+        self,
+        durations: Mapping[str, dt.timedelta],
+        *,
+        mode: str = MODE_RESTART,
+        turn_on: bool = True,
+    ) -> None:
+        """Turn entities on and off again after their duration.
+
+        With ``mode`` restart a new call replaces a pending deadline, with
+        extend a pending deadline is only ever moved later.
+        """
+        now = dt_util.utcnow()
+        for entity_id, duration in durations.items():
+            self._async_schedule(entity_id, now + duration, extend=mode == MODE_EXTEND)
+        if turn_on:
+            self._batcher.async_queue(
+                SERVICE_TURN_ON,
+                (
+                    entity_id
+                    for entity_id in durations
+                    if (state := self.hass.states.get(entity_id)) is None
+                    or state.state != STATE_ON
+                ),
+            )
+
+    @callback
+    def _async_schedule(
+        self, entity_id: str, when: dt.datetime, *, extend: bool
+    ) -> None:
+        schedule = (
+            self.scheduler.async_extend if extend else self.scheduler.async_schedule
+        )
+        schedule(entity_id, when, lambda: self._async_expired(entity_id))
+
+    @callback
+    def _async_expired(self, entity_id: str) -> None:
+        self._batcher.async_queue(SERVICE_TURN_OFF, [entity_id])
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_store, SAVE_DELAY)
+
+    def _data_to_store(self) -> dict[str, Any]:
+        return {
+            "deadlines": {
+                entity_id: when.isoformat()
+                for entity_id, when in self.scheduler.deadlines().items()
+            }
+        }
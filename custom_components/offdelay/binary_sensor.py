@@ -14,11 +14,12 @@ from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.event import async_track_state_change_event
 
 if TYPE_CHECKING:
-    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
     from .data import OffdelayConfigEntry
+    from .sites import Site
 
-from .const import ATTRIBUTION, DATA_CLIMATE_MODE, DOMAIN
+from .const import ATTRIBUTION, DATA_CLIMATE_MODE, DOMAIN, ZONE_HOME_ENTITY
 from .entity import OffdelayEntity
 
 ENTITY_DESCRIPTIONS = (
@@ -39,13 +40,11 @@ ENTITY_DESCRIPTIONS = (
     ),
 )
 
-ZONE_HOME_ENTITY = "zone.home"
-
 
 async def async_setup_entry(  # noqa: RUF029
     hass: HomeAssistant,  # noqa: ARG001
     entry: OffdelayConfigEntry,
-    async_add_entities: AddEntitiesCallback,
+    async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up binary sensors for this integration."""
     entities: list[BinarySensorEntity] = [
@@ -60,6 +59,16 @@ async def async_setup_entry(  # noqa: RUF029
 
     async_add_entities(entities)
 
+    sites = entry.runtime_data.sites
+    if sites is not None:
+        for site in sites.sites.values():
+            site_entities = [SiteZoneBinarySensor(entry, site, site.zone, "is_home")]
+            if site.near_zone is not None:
+                site_entities.append(
+                    SiteZoneBinarySensor(entry, site, site.near_zone, "is_near")
+                )
+            async_add_entities(site_entities, config_subentry_id=site.site_id)
+
 
 class OffdelayBinarySensor(OffdelayEntity, BinarySensorEntity):
     """Binary sensor representing home status or other flag."""
@@ -80,6 +89,8 @@ class OffdelayBinarySensor(OffdelayEntity, BinarySensorEntity):
 class OffdelayHomeBinarySensor(BinarySensorEntity):
     """Binary sensor: ON when at least 1 person is in zone.home."""
 
+    _zone = ZONE_HOME_ENTITY
+
     _attr_attribution = ATTRIBUTION
     _attr_has_entity_name = True
     _attr_translation_key = "is_home"
@@ -110,7 +121,7 @@ class OffdelayHomeBinarySensor(BinarySensorEntity):
         self._update_from_zone_state()
 
         self._unsub = async_track_state_change_event(
-            self.hass, ZONE_HOME_ENTITY, self._async_zone_home_changed
+            self.hass, self._zone, self._async_zone_home_changed
         )
 
     async def async_will_remove_from_hass(self) -> None:
@@ -127,7 +138,7 @@ class OffdelayHomeBinarySensor(BinarySensorEntity):
 
     def _update_from_zone_state(self) -> None:
         """Update _is_on from current zone.home state."""
-        state = self.hass.states.get(ZONE_HOME_ENTITY)
+        state = self.hass.states.get(self._zone)
         if state is None:
             self._is_on = False
             return
@@ -135,3 +146,25 @@ class OffdelayHomeBinarySensor(BinarySensorEntity):
             self._is_on = int(state.state) > 0
         except (ValueError, TypeError):
             self._is_on = False
+
+
+class SiteZoneBinarySensor(OffdelayHomeBinarySensor):
+    """Binary sensor: ON when at least 1 person is in a zone of a site."""
+
+    def __init__(
+        self,
+        config_entry: OffdelayConfigEntry,
+        site: Site,
+        zone: str,
+        translation_key: str,
+    ) -> None:
+        """Initialize the zone binary sensor of a site."""
+        super().__init__(config_entry)
+        self._zone = zone
+        self._attr_translation_key = translation_key
+        self._attr_unique_id = (
+            f"{config_entry.entry_id}_{site.site_id}_{translation_key}"
+        )
+        self._attr_device_info = site.device_info(config_entry.entry_id)
+        if translation_key == "is_near":
+            self._attr_icon = "mdi:home-import-outline"
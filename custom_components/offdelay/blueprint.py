@@ -1,76 +1,418 @@
-"""Add Offdelay blueprints to HomeAssistant."""
+"""Add Offdelay blueprints to HomeAssistant.
+
+Blueprints are synced into the Home Assistant ``blueprints`` folder through a
+content-hash manifest kept in ``.storage``. A file is only written when the
+shipped version changed, and each write is atomic. Every config entry holds a
+reference on the files it installed, so removing one entry never deletes a
+blueprint another entry still uses. Copies that were edited by the user after
+installation are detected and left alone.
+
+The shipped blueprints are listed in a catalog whose metadata is parsed once
+per process. Entries only install the blueprints selected in their options.
+"""
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
+import copy
+from dataclasses import dataclass, field
+from functools import cache, partial
+import hashlib
 from pathlib import Path
-import shutil
+import re
+from typing import Any
 
+from homeassistant.components.automation import automations_with_blueprint
+from homeassistant.components.script import scripts_with_blueprint
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.util.file import write_utf8_file
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.yaml import parse_yaml
+
+from .const import DOMAIN, LOGGER as _LOGGER
+
+BLUEPRINT_TYPES = ("automation", "script")
+INTEGRATION_BLUEPRINT_DIR = Path(__file__).parent / "blueprints"
+COMPACT_BLUEPRINT_DIR = Path(__file__).parent / "blueprints_compact"
+
+STORAGE_KEY = f"{DOMAIN}.blueprints"
+STORAGE_VERSION = 1
+
+DATA_BLUEPRINT_LOCK: HassKey[asyncio.Lock] = HassKey(f"{DOMAIN}_blueprint_lock")
+
+SUMMARY_MAX_LENGTH = 120
+_TOP_LEVEL_KEY = re.compile(r"^[^\s#]")
+_MARKUP = re.compile(r"<[^>]+>|[#*_>`]")
+
+
+@dataclass(frozen=True, slots=True)
+class BlueprintInfo:
+    """Metadata of a shipped blueprint."""
+
+    path: str
+    blueprint_type: str
+    name: str
+    summary: str
+    size: int
+
+
+@dataclass
+class BlueprintSyncResult:
+    """Outcome of a blueprint sync or release."""
+
+    written: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
 
-from .const import LOGGER as _LOGGER
+@cache
+def _source_blueprint(path: Path) -> tuple[bytes, str]:
+    """Return the content and hash of a shipped blueprint.
 
+    Shipped files only change when the integration is updated, which requires
+    a restart, so they are read and hashed once per process.
+    """
+    data = path.read_bytes()
+    return data, _sha256(data)
 
-def copy_blueprints(hass: HomeAssistant, domain: str) -> None:
-    """Copy blueprints to the Home Assistant blueprints folder."""
-    # Get the path to the integration's blueprints directory.
-    integration_blueprint_dir = Path(__file__).parent / "blueprints"
 
-    # Get the path to the Home Assistant blueprints directory.
-    ha_blueprint_dir = Path(hass.config.path("blueprints"))
+def _installable_blueprint(rel_path: str, source: Path) -> Path:
+    """Return the file to install for a blueprint, preferring its compact variant."""
+    compact = COMPACT_BLUEPRINT_DIR / rel_path
+    return compact if compact.is_file() else source
 
-    # Check if the integration's blueprints directory exists.
-    if not integration_blueprint_dir.is_dir():
+
+def source_blueprints(domain: str) -> dict[str, Path]:
+    """Return the shipped blueprints keyed by their path relative to ``blueprints``."""
+    blueprints: dict[str, Path] = {}
+    if not INTEGRATION_BLUEPRINT_DIR.is_dir():
         _LOGGER.debug("No blueprints found in integration directory.")
-        return
+        return blueprints
 
-    # Loop through the blueprint types (automation, script).
-    for blueprint_type in ("automation", "script"):
-        # Check if the blueprint type directory exists in the integration.
-        source_dir = integration_blueprint_dir / blueprint_type / domain
+    for blueprint_type in BLUEPRINT_TYPES:
+        source_dir = INTEGRATION_BLUEPRINT_DIR / blueprint_type / domain
         if not source_dir.is_dir():
             continue
+        for blueprint in sorted(source_dir.glob("*.yaml")):
+            blueprints[f"{blueprint_type}/{domain}/{blueprint.name}"] = blueprint
+    return blueprints
+
+
+def summarize(description: str) -> str:
+    """Return the first meaningful line of a description, without markup."""
+    for line in description.splitlines():
+        text = " ".join(_MARKUP.sub(" ", line).split())
+        if text:
+            if len(text) > SUMMARY_MAX_LENGTH:
+                return text[: SUMMARY_MAX_LENGTH - 1].rstrip() + "\u2026"
+            return text
+    return ""
+
+
+def _blueprint_header(content: str) -> dict[str, Any]:
+    """Parse only the top-level ``blueprint:`` block of a blueprint file.
+
+    The triggers, variables and actions make up most of a blueprint, so
+    skipping them keeps the catalog cheap to build.
+
+    Raises:
+        HomeAssistantError: If the file has no ``blueprint:`` mapping.
+
+    """
+    lines = content.splitlines()
+    start = lines.index("blueprint:")
+    end = next(
+        (
+            index
+            for index in range(start + 1, len(lines))
+            if _TOP_LEVEL_KEY.match(lines[index])
+        ),
+        len(lines),
+    )
+    parsed = parse_yaml("\n".join(lines[start:end]))
+    if not isinstance(parsed, dict) or not isinstance(parsed.get("blueprint"), dict):
+        raise HomeAssistantError("Blueprint metadata is missing")
+    return parsed["blueprint"]
+
+
+@cache
+def load_blueprint_catalog(domain: str) -> dict[str, BlueprintInfo]:
+    """Return the catalog of shipped blueprints, keyed by relative path.
+
+    Shipped blueprints only change when the integration is updated, so the
+    catalog is built once per process.
+    """
+    catalog: dict[str, BlueprintInfo] = {}
+    for rel_path, source in source_blueprints(domain).items():
+        data, _digest = _source_blueprint(source)
+        try:
+            header = _blueprint_header(data.decode("utf-8"))
+        except (ValueError, HomeAssistantError) as err:
+            _LOGGER.warning("Skipping invalid blueprint %s: %s", rel_path, err)
+            continue
+        catalog[rel_path] = BlueprintInfo(
+            path=rel_path,
+            blueprint_type=rel_path.split("/", 1)[0],
+            name=str(header.get("name", source.stem)),
+            summary=summarize(str(header.get("description", ""))),
+            size=len(data),
+        )
+    return catalog
+
+
+async def async_get_blueprint_catalog(hass: HomeAssistant) -> dict[str, BlueprintInfo]:
+    """Return the blueprint catalog, building it in the executor if needed."""
+    return await hass.async_add_executor_job(load_blueprint_catalog, DOMAIN)
 
-        # Define the destination directory.
-        destination_dir = ha_blueprint_dir / blueprint_type / domain
-
-        # Create the destination directory if it doesn't exist.
-        destination_dir.mkdir(parents=True, exist_ok=True)
-
-        # Copy the blueprint files.
-        for blueprint in source_dir.glob("*.yaml"):
-            destination_file = destination_dir / blueprint.name
-            # Copy the file, overwriting if it exists.
-            shutil.copy2(blueprint, destination_file)
-            _LOGGER.debug(
-                "Copied blueprint: %s/%s/%s",
-                blueprint_type,
-                domain,
-                blueprint.name,
+
+def _blueprints_in_use(hass: HomeAssistant, paths: set[str]) -> set[str]:
+    """Return the blueprints, out of ``paths``, used by automations or scripts."""
+    in_use: set[str] = set()
+    for rel_path in paths:
+        blueprint_type, blueprint_path = rel_path.split("/", 1)
+        users = (
+            automations_with_blueprint(hass, blueprint_path)
+            if blueprint_type == "automation"
+            else scripts_with_blueprint(hass, blueprint_path)
+        )
+        if users:
+            in_use.add(rel_path)
+    return in_use
+
+
+def _installed_hash(destination: Path, record: dict[str, Any] | None) -> str | None:
+    """Return the hash of an installed blueprint, or None if it is missing.
+
+    When size and mtime still match the manifest the recorded hash is reused,
+    so an unchanged install costs a single ``stat`` call.
+    """
+    try:
+        stat = destination.stat()
+    except FileNotFoundError:
+        return None
+
+    if (
+        record is not None
+        and record.get("size") == stat.st_size
+        and record.get("mtime_ns") == stat.st_mtime_ns
+    ):
+        return record["hash"]
+    return _sha256(destination.read_bytes())
+
+
+def _stat_record(destination: Path, digest: str) -> dict[str, Any]:
+    stat = destination.stat()
+    return {"hash": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _write_blueprint(destination: Path, data: bytes, digest: str) -> dict[str, Any]:
+    """Atomically write a blueprint and return its manifest record."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    write_utf8_file(str(destination), data, mode="wb")
+    return _stat_record(destination, digest)
+
+
+def sync_blueprints(
+    config_dir: Path,
+    manifest: dict[str, Any],
+    domain: str,
+    entry_id: str,
+    *,
+    selected: set[str] | None = None,
+    in_use: set[str] | None = None,
+) -> BlueprintSyncResult:
+    """Install the shipped blueprints for a config entry.
+
+    ``manifest`` maps relative paths to the hash, size and mtime of the copy
+    this integration last wrote, plus the entries referencing it. It is updated
+    in place. When ``selected`` is given, only those relative paths are kept
+    installed for this entry. Files in ``in_use`` are never deleted.
+
+    A file already on disk but unknown to the manifest was written by a
+    release that overwrote blueprints on every setup, so it is adopted and
+    replaced with the shipped version.
+    """
+    result = BlueprintSyncResult()
+    ha_blueprint_dir = config_dir / "blueprints"
+    sources = source_blueprints(domain)
+    if selected is not None:
+        sources = {path: src for path, src in sources.items() if path in selected}
+
+    for rel_path, source in sources.items():
+        data, digest = _source_blueprint(_installable_blueprint(rel_path, source))
+        destination = ha_blueprint_dir / rel_path
+        record = manifest.get(rel_path)
+        installed = _installed_hash(destination, record)
+
+        if record is not None and installed is not None and installed != record["hash"]:
+            # Edited after we installed it: keep the user's copy.
+            _LOGGER.warning(
+                "Blueprint %s was modified locally, not updating it", rel_path
             )
+            result.modified.append(rel_path)
+            entries = record.setdefault("entries", [])
+            if entry_id not in entries:
+                entries.append(entry_id)
+            continue
+
+        entries = record.get("entries", []) if record is not None else []
+        if installed == digest:
+            if record is None or record["hash"] != digest:
+                record = _stat_record(destination, digest)
+            result.unchanged.append(rel_path)
+        else:
+            record = _write_blueprint(destination, data, digest)
+            result.written.append(rel_path)
+            _LOGGER.debug("Installed blueprint: %s", rel_path)
+
+        if entry_id not in entries:
+            entries.append(entry_id)
+        record["entries"] = entries
+        manifest[rel_path] = record
+
+    # Blueprints this entry no longer installs (deselected or no longer shipped).
+    stale = [path for path in manifest if path not in sources]
+    for rel_path in stale:
+        _release_blueprint(
+            ha_blueprint_dir,
+            manifest,
+            rel_path,
+            entry_id,
+            in_use=in_use or set(),
+            result=result,
+        )
+
+    return result
+
+
+def release_blueprints(
+    config_dir: Path,
+    manifest: dict[str, Any],
+    entry_id: str,
+    *,
+    in_use: set[str] | None = None,
+) -> BlueprintSyncResult:
+    """Drop an entry's references and delete blueprints nobody uses anymore."""
+    result = BlueprintSyncResult()
+    ha_blueprint_dir = config_dir / "blueprints"
+    for rel_path in list(manifest):
+        _release_blueprint(
+            ha_blueprint_dir,
+            manifest,
+            rel_path,
+            entry_id,
+            in_use=in_use or set(),
+            result=result,
+        )
+    return result
+
+
+def _release_blueprint(
+    ha_blueprint_dir: Path,
+    manifest: dict[str, Any],
+    rel_path: str,
+    entry_id: str,
+    *,
+    in_use: set[str],
+    result: BlueprintSyncResult,
+) -> None:
+    """Release one blueprint reference, removing the file on the last one."""
+    record = manifest[rel_path]
+    entries: list[str] = record.get("entries", [])
+    if entry_id in entries:
+        entries.remove(entry_id)
+    if entries:
+        return
+
+    destination = ha_blueprint_dir / rel_path
+    installed = _installed_hash(destination, record)
+    if installed is not None and installed != record["hash"]:
+        # Keep the record so a later sync still treats the copy as user-owned.
+        _LOGGER.warning(
+            "Blueprint %s was modified locally, leaving it in place", rel_path
+        )
+        result.modified.append(rel_path)
+        return
+
+    del manifest[rel_path]
+    if installed is None:
+        return
+    if rel_path in in_use:
+        _LOGGER.warning(
+            "Blueprint %s is no longer selected but still in use, leaving it in place",
+            rel_path,
+        )
+        return
+    destination.unlink()
+    result.removed.append(rel_path)
+    _LOGGER.debug("Removed blueprint: %s", rel_path)
+
 
+def _store(hass: HomeAssistant) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, STORAGE_KEY)
 
-async def async_setup_blueprints(hass: HomeAssistant, domain: str) -> None:
-    """Set up the blueprints."""
-    await hass.async_add_executor_job(copy_blueprints, hass, domain)
 
+async def _async_update_manifest(
+    hass: HomeAssistant,
+    job: Callable[[Path, dict[str, Any]], BlueprintSyncResult],
+) -> BlueprintSyncResult:
+    """Run a manifest job in the executor, serialised across entries."""
+    lock = hass.data.setdefault(DATA_BLUEPRINT_LOCK, asyncio.Lock())
+    async with lock:
+        store = _store(hass)
+        stored = await store.async_load() or {}
+        manifest: dict[str, Any] = copy.deepcopy(stored.get("files", {}))
+        result = await hass.async_add_executor_job(
+            job, Path(hass.config.config_dir), manifest
+        )
+        if manifest != stored.get("files", {}):
+            await store.async_save({"files": manifest})
+        return result
 
-async def async_unload_blueprints(hass: HomeAssistant, domain: str) -> None:
-    """Remove the blueprints."""
-    await hass.async_add_executor_job(remove_blueprints, hass, domain)
 
+async def async_setup_blueprints(
+    hass: HomeAssistant,
+    entry_id: str,
+    selected: set[str] | None = None,
+) -> BlueprintSyncResult:
+    """Set up the blueprints selected for a config entry.
 
-def remove_blueprints(hass: HomeAssistant, domain: str) -> None:
-    """Remove blueprints from the Home Assistant blueprints folder."""
-    # Get the path to the Home Assistant blueprints directory.
-    ha_blueprint_dir = Path(hass.config.path("blueprints"))
+    ``selected`` of None installs every shipped blueprint, which is what
+    entries created before the catalog existed expect.
+    """
+    catalog = await async_get_blueprint_catalog(hass)
+    unselected = set(catalog) - (selected if selected is not None else set(catalog))
+    return await _async_update_manifest(
+        hass,
+        partial(
+            sync_blueprints,
+            domain=DOMAIN,
+            entry_id=entry_id,
+            selected=selected,
+            in_use=_blueprints_in_use(hass, unselected),
+        ),
+    )
 
-    # Loop through the blueprint types (automation, script).
-    for blueprint_type in ("automation", "script"):
-        # Define the destination directory.
-        destination_dir = ha_blueprint_dir / domain / blueprint_type
 
-        # Check if the destination directory exists.
-        if destination_dir.is_dir():
-            # Remove the directory and all its contents.
-            shutil.rmtree(destination_dir)
-            _LOGGER.debug("Removed blueprints directory: %s", destination_dir)
+async def async_remove_blueprints(
+    hass: HomeAssistant,
+    entry_id: str,
+) -> BlueprintSyncResult:
+    """Remove the blueprints installed for a config entry."""
+    catalog = await async_get_blueprint_catalog(hass)
+    return await _async_update_manifest(
+        hass,
+        partial(
+            release_blueprints,
+            entry_id=entry_id,
+            in_use=_blueprints_in_use(hass, set(catalog)),
+        ),
+    )
@@ -1,22 +1,69 @@
 """Adds config flow for Blueprint."""
 
+from __future__ import annotations
+
+from typing import Any
+
 from homeassistant import config_entries
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import CONF_NAME, PERCENTAGE, UnitOfTemperature
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 import voluptuous as vol
 
+from .blueprint import async_get_blueprint_catalog
 from .const import (
+    CONF_ACTIVE_END,
+    CONF_ACTIVE_START,
+    CONF_API_URL,
+    CONF_BLUEPRINTS,
+    CONF_BYPASS_ENTITY,
+    CONF_CLIMATE,
+    CONF_CLIMATE_ACTUATION,
     CONF_CLIMATE_DAY_START_HOUR,
     CONF_CLIMATE_DELTA_TOLERANCE,
     CONF_CLIMATE_NIGHT_START_HOUR,
+    CONF_CLIMATE_SCHEDULE,
     CONF_CLIMATES,
+    CONF_COMFORT_END,
+    CONF_COMFORT_START,
+    CONF_COMFORT_TEMP,
+    CONF_DIM_STEP,
+    CONF_ECO_TEMP,
+    CONF_FROST_TEMP,
     CONF_GUEST_TURN_OFF_DELAY,
     CONF_GUEST_TURN_ON_DELAY,
+    CONF_HOURLY_FORECAST,
+    CONF_LIGHTS,
+    CONF_LIGHTS_LEFT,
+    CONF_LIGHTS_RIGHT,
+    CONF_LUX_SENSOR,
+    CONF_LUX_THRESHOLD,
+    CONF_MAX_SUN_ELEVATION,
+    CONF_MOTION_SENSORS,
+    CONF_NEAR_ZONE,
     CONF_OCCUPANCY_SENSORS,
+    CONF_OFF_DELAY,
+    CONF_OUTDOOR_SENSOR,
+    CONF_OUTDOOR_WEIGHT,
     CONF_SUMMER_MIN_TEMP,
+    CONF_SWITCH_EVENT,
+    CONF_TELEMETRY_URL,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_WEATHER_ENTITIES,
+    CONF_WEATHER_ENTITY,
+    CONF_WEATHER_STRATEGY,
+    CONF_WINDOW_SENSORS,
     CONF_WINTER_MAX_TEMP,
+    CONF_ZONE,
     DOMAIN,
+    SUBENTRY_ENOCEAN_SWITCH,
+    SUBENTRY_HEATING_ROOM,
+    SUBENTRY_LIGHT_ROOM,
+    SUBENTRY_SITE,
 )
+from .outdoor import DEFAULT_OUTDOOR_WEIGHT
+from .schedule import parse_schedule
+from .weather import STRATEGY_FIRST, STRATEGY_MEDIAN
 
 
 class OffdelayFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -24,6 +71,28 @@ class OffdelayFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OffdelayOptionsFlowHandler()
+
+    @classmethod
+    @callback
+    def async_get_supported_subentry_types(
+        cls,
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG003
+    ) -> dict[str, type[config_entries.ConfigSubentryFlow]]:
+        """Return the subentry types supported by this integration."""
+        return {
+            SUBENTRY_HEATING_ROOM: HeatingRoomSubentryFlowHandler,
+            SUBENTRY_LIGHT_ROOM: LightRoomSubentryFlowHandler,
+            SUBENTRY_ENOCEAN_SWITCH: EnoceanSwitchSubentryFlowHandler,
+            SUBENTRY_SITE: SiteSubentryFlowHandler,
+        }
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
@@ -48,13 +117,23 @@ class OffdelayFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             if not errors:
                 day_hour = int(user_input[CONF_CLIMATE_DAY_START_HOUR])
                 night_hour = int(user_input[CONF_CLIMATE_NIGHT_START_HOUR])
-                if day_hour >= night_hour:
+                # A night start before the day start wraps around midnight
+                if day_hour == night_hour:
                     errors["base"] = "day_night_hour_conflict"
+                elif not user_input.get(CONF_CLIMATE_SCHEDULE):
+                    user_input.pop(CONF_CLIMATE_SCHEDULE, None)
+                else:
+                    try:
+                        parse_schedule(user_input[CONF_CLIMATE_SCHEDULE])
+                    except ValueError:
+                        errors["base"] = "invalid_schedule"
 
             if not errors:
+                # Blueprints are opt-in through the options flow
                 return self.async_create_entry(
                     title="Offdelay",
                     data=user_input,
+                    options={CONF_BLUEPRINTS: []},
                 )
 
         return self.async_show_form(
@@ -158,6 +237,16 @@ class OffdelayFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                             step=1,
                         ),
                     ),
+                    vol.Optional(
+                        CONF_CLIMATE_SCHEDULE,
+                        description={
+                            "suggested_value": (user_input or {}).get(
+                                CONF_CLIMATE_SCHEDULE
+                            )
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(multiline=True),
+                    ),
                 },
             ),
             errors=errors,
@@ -187,14 +276,21 @@ class OffdelayFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             if not errors:
                 day_hour = int(user_input[CONF_CLIMATE_DAY_START_HOUR])
                 night_hour = int(user_input[CONF_CLIMATE_NIGHT_START_HOUR])
-                if day_hour >= night_hour:
+                # A night start before the day start wraps around midnight
+                if day_hour == night_hour:
                     errors["base"] = "day_night_hour_conflict"
+                elif not user_input.get(CONF_CLIMATE_SCHEDULE):
+                    user_input.pop(CONF_CLIMATE_SCHEDULE, None)
+                else:
+                    try:
+                        parse_schedule(user_input[CONF_CLIMATE_SCHEDULE])
+                    except ValueError:
+                        errors["base"] = "invalid_schedule"
 
             if not errors:
-                return self.async_update_reload_and_abort(
-                    entry,
-                    data=user_input,
-                )
+                # The update listener applies the changes without a reload
+                self.hass.config_entries.async_update_entry(entry, data=user_input)
+                return self.async_abort(reason="reconfigure_successful")
 
         return self.async_show_form(
             step_id="reconfigure",
@@ -290,7 +386,669 @@ class OffdelayFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                             step=1,
                         ),
                     ),
+                    vol.Optional(
+                        CONF_CLIMATE_SCHEDULE,
+                        description={
+                            "suggested_value": entry.data.get(CONF_CLIMATE_SCHEDULE)
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(multiline=True),
+                    ),
                 },
             ),
             errors=errors,
         )
+
+
+class OffdelayOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for Offdelay."""
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Configure the options of the entry.
+
+        These are the blueprints to install, the API to poll, the telemetry
+        URL, the weather entities and the strategy to combine them, the
+        hourly forecast, the outdoor sensor and its weight, and whether the
+        climates are set when the climate mode changes.
+
+        Returns:
+            config_entries.ConfigFlowResult: The result of the options flow.
+
+        """
+        catalog = await async_get_blueprint_catalog(self.hass)
+
+        if user_input is not None:
+            options = {**self.config_entry.options, **user_input}
+            for key in (CONF_API_URL, CONF_TELEMETRY_URL, CONF_OUTDOOR_SENSOR):
+                if not user_input.get(key):
+                    options.pop(key, None)
+            return self.async_create_entry(data=options)
+
+        # Entries created before the catalog existed install every blueprint
+        selected = self.config_entry.options.get(CONF_BLUEPRINTS, list(catalog))
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_BLUEPRINTS,
+                        default=[path for path in selected if path in catalog],
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(
+                                    value=info.path,
+                                    label=f"{info.name} ({info.blueprint_type})",
+                                )
+                                for info in catalog.values()
+                            ],
+                            multiple=True,
+                            mode=selector.SelectSelectorMode.LIST,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_API_URL,
+                        description={
+                            "suggested_value": self.config_entry.options.get(
+                                CONF_API_URL
+                            )
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+                    ),
+                    vol.Optional(
+                        CONF_TELEMETRY_URL,
+                        description={
+                            "suggested_value": self.config_entry.options.get(
+                                CONF_TELEMETRY_URL
+                            )
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.URL)
+                    ),
+                    vol.Optional(
+                        CONF_WEATHER_ENTITIES,
+                        default=self.config_entry.options.get(
+                            CONF_WEATHER_ENTITIES, []
+                        ),
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="weather", multiple=True)
+                    ),
+                    vol.Optional(
+                        CONF_WEATHER_STRATEGY,
+                        default=self.config_entry.options.get(
+                            CONF_WEATHER_STRATEGY, STRATEGY_FIRST
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[STRATEGY_FIRST, STRATEGY_MEDIAN],
+                            translation_key=CONF_WEATHER_STRATEGY,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_HOURLY_FORECAST,
+                        default=self.config_entry.options.get(
+                            CONF_HOURLY_FORECAST, False
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_CLIMATE_ACTUATION,
+                        default=self.config_entry.options.get(
+                            CONF_CLIMATE_ACTUATION, False
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_OUTDOOR_SENSOR,
+                        description={
+                            "suggested_value": self.config_entry.options.get(
+                                CONF_OUTDOOR_SENSOR
+                            )
+                        },
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(
+                            domain="sensor", device_class="temperature"
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_OUTDOOR_WEIGHT,
+                        default=self.config_entry.options.get(
+                            CONF_OUTDOOR_WEIGHT, DEFAULT_OUTDOOR_WEIGHT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=100,
+                            step=5,
+                            mode="slider",
+                            unit_of_measurement=PERCENTAGE,
+                        )
+                    ),
+                },
+            ),
+        )
+
+
+def _optional(key: str, defaults: dict[str, Any]) -> vol.Optional:
+    """Return an optional key that is only prefilled when it has a value."""
+    if defaults.get(key) is None:
+        return vol.Optional(key)
+    return vol.Optional(key, default=defaults[key])
+
+
+def _temperature_selector() -> selector.NumberSelector:
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            mode="box",
+            unit_of_measurement=UnitOfTemperature.CELSIUS,
+            min=5,
+            max=30,
+            step=0.5,
+        ),
+    )
+
+
+def _heating_room_schema(defaults: dict[str, Any]) -> vol.Schema:
+    """Return the schema of a heating room, prefilled with ``defaults``."""
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_NAME,
+                default=defaults.get(CONF_NAME, vol.UNDEFINED),
+            ): selector.TextSelector(),
+            vol.Required(
+                CONF_CLIMATE,
+                default=defaults.get(CONF_CLIMATE, vol.UNDEFINED),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="climate"),
+            ),
+            vol.Required(
+                CONF_COMFORT_TEMP,
+                default=defaults.get(CONF_COMFORT_TEMP, 21.0),
+            ): _temperature_selector(),
+            vol.Required(
+                CONF_ECO_TEMP,
+                default=defaults.get(CONF_ECO_TEMP, 18.0),
+            ): _temperature_selector(),
+            vol.Required(
+                CONF_FROST_TEMP,
+                default=defaults.get(CONF_FROST_TEMP, 7.0),
+            ): _temperature_selector(),
+            vol.Required(
+                CONF_COMFORT_START,
+                default=defaults.get(CONF_COMFORT_START, "07:00:00"),
+            ): selector.TimeSelector(),
+            vol.Required(
+                CONF_COMFORT_END,
+                default=defaults.get(CONF_COMFORT_END, "22:00:00"),
+            ): selector.TimeSelector(),
+            vol.Optional(
+                CONF_WINDOW_SENSORS,
+                default=defaults.get(CONF_WINDOW_SENSORS, []),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="binary_sensor", multiple=True),
+            ),
+            _optional(CONF_TEMPERATURE_SENSOR, defaults): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="sensor", device_class="temperature"
+                ),
+            ),
+        }
+    )
+
+
+def _validate_heating_room(
+    entry: config_entries.ConfigEntry,
+    user_input: dict[str, Any],
+    subentry_id: str | None = None,
+) -> dict[str, str]:
+    errors: dict[str, str] = {}
+    if any(
+        subentry.unique_id == user_input[CONF_CLIMATE]
+        for subentry in entry.subentries.values()
+        if subentry.subentry_id != subentry_id
+    ):
+        errors["base"] = "heating_climate_in_use"
+    elif not (
+        user_input[CONF_FROST_TEMP]
+        <= user_input[CONF_ECO_TEMP]
+        <= user_input[CONF_COMFORT_TEMP]
+    ):
+        errors["base"] = "heating_temperature_order"
+    elif user_input[CONF_COMFORT_START] == user_input[CONF_COMFORT_END]:
+        errors["base"] = "heating_empty_schedule"
+    return errors
+
+
+class HeatingRoomSubentryFlowHandler(config_entries.ConfigSubentryFlow):
+    """Add or change a room of the native heating controller."""
+
+    async def async_step_user(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.SubentryFlowResult:
+        """Add a heating room.
+
+        Returns:
+            config_entries.SubentryFlowResult: The result of the subentry flow.
+
+        """
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_heating_room(self._get_entry(), user_input)
+            if not errors:
+                data = dict(user_input)
+                return self.async_create_entry(
+                    title=data.pop(CONF_NAME),
+                    data=data,
+                    unique_id=data[CONF_CLIMATE],
+                )
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=_heating_room_schema(user_input or {}),
+            errors=errors,
+        )
+
+    async def async_step_reconfigure(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.SubentryFlowResult:
+        """Change a heating room.
+
+        Returns:
+            config_entries.SubentryFlowResult: The result of the subentry flow.
+
+        """
+        subentry = self._get_reconfigure_subentry()
+
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_heating_room(
+                self._get_entry(), user_input, subentry.subentry_id
+            )
+            if not errors:
+                data = dict(user_input)
+                return self.async_update_and_abort(
+                    self._get_entry(),
+                    subentry,
+                    title=data.pop(CONF_NAME),
+                    data=data,
+                    unique_id=data[CONF_CLIMATE],
+                )
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=_heating_room_schema(
+                user_input or {CONF_NAME: subentry.title, **subentry.data}
+            ),
+            errors=errors,
+        )
+
+
+def _light_room_schema(defaults: dict[str, Any]) -> vol.Schema:
+    """Return the schema of a motion light room, prefilled with ``defaults``."""
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_NAME,
+                default=defaults.get(CONF_NAME, vol.UNDEFINED),
+            ): selector.TextSelector(),
+            vol.Required(
+                CONF_MOTION_SENSORS,
+                default=defaults.get(CONF_MOTION_SENSORS, vol.UNDEFINED),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="binary_sensor", multiple=True),
+            ),
+            vol.Required(
+                CONF_LIGHTS,
+                default=defaults.get(CONF_LIGHTS, vol.UNDEFINED),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain=["light", "switch"], multiple=True
+                ),
+            ),
+            vol.Required(
+                CONF_OFF_DELAY,
+                default=defaults.get(CONF_OFF_DELAY, 120),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode="box",
+                    min=0,
+                    step=1,
+                    unit_of_measurement="s",
+                ),
+            ),
+            _optional(CONF_LUX_SENSOR, defaults): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="sensor", device_class="illuminance"
+                ),
+            ),
+            _optional(CONF_LUX_THRESHOLD, defaults): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode="box", min=0, step=1, unit_of_measurement="lx"
+                ),
+            ),
+            _optional(CONF_MAX_SUN_ELEVATION, defaults): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode="box", min=-90, max=90, step=0.5, unit_of_measurement="\u00b0"
+                ),
+            ),
+            _optional(CONF_ACTIVE_START, defaults): selector.TimeSelector(),
+            _optional(CONF_ACTIVE_END, defaults): selector.TimeSelector(),
+            _optional(CONF_BYPASS_ENTITY, defaults): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain=["input_boolean", "switch", "binary_sensor"]
+                ),
+            ),
+        }
+    )
+
+
+def _validate_light_room(user_input: dict[str, Any]) -> dict[str, str]:
+    errors: dict[str, str] = {}
+    if (CONF_LUX_SENSOR in user_input) != (CONF_LUX_THRESHOLD in user_input):
+        errors["base"] = "light_lux_incomplete"
+    elif (CONF_ACTIVE_START in user_input) != (CONF_ACTIVE_END in user_input):
+        errors["base"] = "light_time_window_incomplete"
+    return errors
+
+
+class LightRoomSubentryFlowHandler(config_entries.ConfigSubentryFlow):
+    """Add or change a room of the native motion light controller."""
+
+    async def async_step_user(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.SubentryFlowResult:
+        """Add a motion light room.
+
+        Returns:
+            config_entries.SubentryFlowResult: The result of the subentry flow.
+
+        """
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_light_room(user_input)
+            if not errors:
+                data = dict(user_input)
+                return self.async_create_entry(title=data.pop(CONF_NAME), data=data)
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=_light_room_schema(user_input or {}),
+            errors=errors,
+        )
+
+    async def async_step_reconfigure(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.SubentryFlowResult:
+        """Change a motion light room.
+
+        Returns:
+            config_entries.SubentryFlowResult: The result of the subentry flow.
+
+        """
+        subentry = self._get_reconfigure_subentry()
+
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_light_room(user_input)
+            if not errors:
+                data = dict(user_input)
+                return self.async_update_and_abort(
+                    self._get_entry(),
+                    subentry,
+                    title=data.pop(CONF_NAME),
+                    data=data,
+                )
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=_light_room_schema(
+                user_input or {CONF_NAME: subentry.title, **subentry.data}
+            ),
+            errors=errors,
+        )
+
+
+def _enocean_switch_schema(defaults: dict[str, Any]) -> vol.Schema:
+    """Return the schema of a rocker switch, prefilled with ``defaults``."""
+    lights = selector.EntitySelector(
+        selector.EntitySelectorConfig(domain="light", multiple=True),
+    )
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_NAME,
+                default=defaults.get(CONF_NAME, vol.UNDEFINED),
+            ): selector.TextSelector(),
+            vol.Required(
+                CONF_SWITCH_EVENT,
+                default=defaults.get(CONF_SWITCH_EVENT, vol.UNDEFINED),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="event"),
+            ),
+            vol.Optional(
+                CONF_LIGHTS_LEFT,
+                default=defaults.get(CONF_LIGHTS_LEFT, []),
+            ): lights,
+            vol.Optional(
+                CONF_LIGHTS_RIGHT,
+                default=defaults.get(CONF_LIGHTS_RIGHT, []),
+            ): lights,
+            vol.Required(
+                CONF_DIM_STEP,
+                default=defaults.get(CONF_DIM_STEP, 10),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode="box", min=1, max=50, step=1, unit_of_measurement="%"
+                ),
+            ),
+        }
+    )
+
+
+def _validate_enocean_switch(
+    entry: config_entries.ConfigEntry,
+    user_input: dict[str, Any],
+    subentry_id: str | None = None,
+) -> dict[str, str]:
+    errors: dict[str, str] = {}
+    if any(
+        subentry.subentry_type == SUBENTRY_ENOCEAN_SWITCH
+        and subentry.unique_id == user_input[CONF_SWITCH_EVENT]
+        for subentry in entry.subentries.values()
+        if subentry.subentry_id != subentry_id
+    ):
+        errors["base"] = "enocean_switch_in_use"
+    elif not user_input.get(CONF_LIGHTS_LEFT) and not user_input.get(CONF_LIGHTS_RIGHT):
+        errors["base"] = "enocean_no_lights"
+    return errors
+
+
+class EnoceanSwitchSubentryFlowHandler(config_entries.ConfigSubentryFlow):
+    """Add or change a rocker switch of the native EnOcean handler."""
+
+    async def async_step_user(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.SubentryFlowResult:
+        """Add a rocker switch.
+
+        Returns:
+            config_entries.SubentryFlowResult: The result of the subentry flow.
+
+        """
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_enocean_switch(self._get_entry(), user_input)
+            if not errors:
+                data = dict(user_input)
+                return self.async_create_entry(
+                    title=data.pop(CONF_NAME),
+                    data=data,
+                    unique_id=data[CONF_SWITCH_EVENT],
+                )
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=_enocean_switch_schema(user_input or {}),
+            errors=errors,
+        )
+
+    async def async_step_reconfigure(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.SubentryFlowResult:
+        """Change a rocker switch.
+
+        Returns:
+            config_entries.SubentryFlowResult: The result of the subentry flow.
+
+        """
+        subentry = self._get_reconfigure_subentry()
+
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_enocean_switch(
+                self._get_entry(), user_input, subentry.subentry_id
+            )
+            if not errors:
+                data = dict(user_input)
+                return self.async_update_and_abort(
+                    self._get_entry(),
+                    subentry,
+                    title=data.pop(CONF_NAME),
+                    data=data,
+                    unique_id=data[CONF_SWITCH_EVENT],
+                )
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=_enocean_switch_schema(
+                user_input or {CONF_NAME: subentry.title, **subentry.data}
+            ),
+            errors=errors,
+        )
+
+
+def _site_schema(defaults: dict[str, Any]) -> vol.Schema:
+    """Return the schema of a site, prefilled with ``defaults``."""
+    zone = selector.EntitySelector(selector.EntitySelectorConfig(domain="zone"))
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_NAME,
+                default=defaults.get(CONF_NAME, vol.UNDEFINED),
+            ): selector.TextSelector(),
+            vol.Required(
+                CONF_ZONE,
+                default=defaults.get(CONF_ZONE, vol.UNDEFINED),
+            ): zone,
+            _optional(CONF_NEAR_ZONE, defaults): zone,
+            _optional(CONF_WEATHER_ENTITY, defaults): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="weather"),
+            ),
+            vol.Optional(
+                CONF_CLIMATES,
+                default=defaults.get(CONF_CLIMATES, []),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="climate", multiple=True),
+            ),
+            vol.Optional(
+                CONF_OCCUPANCY_SENSORS,
+                default=defaults.get(CONF_OCCUPANCY_SENSORS, []),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain=["binary_sensor", "sensor"], multiple=True
+                ),
+            ),
+        }
+    )
+
+
+def _validate_site(
+    entry: config_entries.ConfigEntry,
+    user_input: dict[str, Any],
+    subentry_id: str | None = None,
+) -> dict[str, str]:
+    errors: dict[str, str] = {}
+    if any(
+        subentry.subentry_type == SUBENTRY_SITE
+        and subentry.unique_id == user_input[CONF_ZONE]
+        for subentry in entry.subentries.values()
+        if subentry.subentry_id != subentry_id
+    ):
+        errors["base"] = "site_zone_in_use"
+    elif user_input.get(CONF_NEAR_ZONE) == user_input[CONF_ZONE]:
+        errors["base"] = "site_near_zone_same"
+    return errors
+
+
+class SiteSubentryFlowHandler(config_entries.ConfigSubentryFlow):
+    """Add or change a site of the fleet mode."""
+
+    async def async_step_user(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.SubentryFlowResult:
+        """Add a site.
+
+        Returns:
+            config_entries.SubentryFlowResult: The result of the subentry flow.
+
+        """
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_site(self._get_entry(), user_input)
+            if not errors:
+                data = dict(user_input)
+                return self.async_create_entry(
+                    title=data.pop(CONF_NAME),
+                    data=data,
+                    unique_id=data[CONF_ZONE],
+                )
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=_site_schema(user_input or {}),
+            errors=errors,
+        )
+
+    async def async_step_reconfigure(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.SubentryFlowResult:
+        """Change a site.
+
+        Returns:
+            config_entries.SubentryFlowResult: The result of the subentry flow.
+
+        """
+        subentry = self._get_reconfigure_subentry()
+
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_site(self._get_entry(), user_input, subentry.subentry_id)
+            if not errors:
+                data = dict(user_input)
+                return self.async_update_and_abort(
+                    self._get_entry(),
+                    subentry,
+                    title=data.pop(CONF_NAME),
+                    data=data,
+                    unique_id=data[CONF_ZONE],
+                )
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=_site_schema(
+                user_input or {CONF_NAME: subentry.title, **subentry.data}
+            ),
+            errors=errors,
+        )
@@ -28,8 +28,91 @@ CONF_CLIMATES = "climates"
 CONF_CLIMATE_DELTA_TOLERANCE = "climate_delta_tolerance"
 CONF_CLIMATE_DAY_START_HOUR = "climate_day_start_hour"
 CONF_CLIMATE_NIGHT_START_HOUR = "climate_night_start_hour"
+# Weekly day windows, overriding the day and night start hours
+CONF_CLIMATE_SCHEDULE = "climate_schedule"
+
+# Zone whose state is the number of persons at home
+ZONE_HOME_ENTITY = "zone.home"
+
+# Sent when the entry data changed without a reload
+SIGNAL_CONFIG_UPDATED = f"{DOMAIN}_config_updated"
+
+# Options: blueprints to install from the catalog
+CONF_BLUEPRINTS = "blueprints"
+
+# Options: offdelay.be API endpoint to poll with the coordinator
+CONF_API_URL = "api_url"
+CONF_TELEMETRY_URL = "telemetry_url"
+
+# Options: weather entities to fetch the forecast from, in order
+CONF_WEATHER_ENTITIES = "weather_entities"
+CONF_WEATHER_STRATEGY = "weather_strategy"
+CONF_HOURLY_FORECAST = "hourly_forecast"
+
+# Options: local outdoor temperature sensor, and its weight against the forecast
+CONF_OUTDOOR_SENSOR = "outdoor_sensor"
+CONF_OUTDOOR_WEIGHT = "outdoor_weight"
+
+# Options: set the climates themselves when the climate mode changes
+CONF_CLIMATE_ACTUATION = "climate_actuation"
 
 # Climate mode internal data keys
 DATA_CLIMATE_MODE = "climate_mode"
 DATA_CLIMATE_MAX_POS_DELTA = "climate_max_pos_delta"
 DATA_CLIMATE_MAX_NEG_DELTA = "climate_max_neg_delta"
+DATA_API = "api"
+DATA_WEATHER_STALE = "weather_stale"
+DATA_WINDOW_MAX_TEMP = "window_max_temp"
+DATA_WINDOW_MEAN_TEMP = "window_mean_temp"
+DATA_WINDOW_HOURS_ABOVE = "window_hours_above"
+DATA_WINDOW_HOURS_BELOW = "window_hours_below"
+DATA_WINDOW_CLOUD_COVERAGE = "window_cloud_coverage"
+DATA_OUTDOOR_TEMP = "outdoor_temp"
+DATA_OUTDOOR_MAX = "outdoor_max_temp"
+DATA_OUTDOOR_MIN = "outdoor_min_temp"
+DATA_OUTDOOR_TREND = "outdoor_trend"
+
+# Sent when a day closed and the forecast errors were updated
+SIGNAL_ACCURACY_UPDATED = f"{DOMAIN}_accuracy_updated"
+# Sent when the degree-day totals were reset for a new day or month
+SIGNAL_DEGREE_DAYS_UPDATED = f"{DOMAIN}_degree_days_updated"
+# Sent when the thermal model of a climate took a new sample
+SIGNAL_THERMAL_UPDATED = f"{DOMAIN}_thermal_updated"
+
+# Heating rooms (config subentries)
+SUBENTRY_HEATING_ROOM = "heating_room"
+CONF_CLIMATE = "climate"
+CONF_COMFORT_TEMP = "comfort_temperature"
+CONF_ECO_TEMP = "eco_temperature"
+CONF_FROST_TEMP = "frost_temperature"
+CONF_COMFORT_START = "comfort_start"
+CONF_COMFORT_END = "comfort_end"
+CONF_WINDOW_SENSORS = "window_sensors"
+CONF_TEMPERATURE_SENSOR = "temperature_sensor"
+SIGNAL_HEATING_UPDATED = f"{DOMAIN}_heating_updated"
+
+# Motion light rooms (config subentries)
+SUBENTRY_LIGHT_ROOM = "light_room"
+CONF_MOTION_SENSORS = "motion_sensors"
+CONF_LIGHTS = "lights"
+CONF_OFF_DELAY = "off_delay"
+CONF_LUX_SENSOR = "lux_sensor"
+CONF_LUX_THRESHOLD = "lux_threshold"
+CONF_MAX_SUN_ELEVATION = "max_sun_elevation"
+CONF_ACTIVE_START = "active_start"
+CONF_ACTIVE_END = "active_end"
+CONF_BYPASS_ENTITY = "bypass_entity"
+
+# EnOcean rocker switches (config subentries)
+SUBENTRY_ENOCEAN_SWITCH = "enocean_switch"
+CONF_SWITCH_EVENT = "switch_event"
+CONF_LIGHTS_LEFT = "lights_left"
+CONF_LIGHTS_RIGHT = "lights_right"
+CONF_DIM_STEP = "dim_step"
+
+# Sites of the fleet mode (config subentries)
+SUBENTRY_SITE = "site"
+CONF_ZONE = "zone"
+CONF_NEAR_ZONE = "near_zone"
+CONF_WEATHER_ENTITY = "weather_entity"
+SIGNAL_SITE_UPDATED = f"{DOMAIN}_site_updated"
@@ -2,25 +2,115 @@
 
 from __future__ import annotations
 
-from typing import Any
-
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_time,
+    async_track_state_change_event,
+)
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonValueType
 
+from .api import OffdelayApiClient, OffdelayApiClientError
 from .const import (
-    CONF_CLIMATE_DAY_START_HOUR,
+    CONF_API_URL,
     CONF_CLIMATE_DELTA_TOLERANCE,
-    CONF_CLIMATE_NIGHT_START_HOUR,
     CONF_CLIMATES,
+    CONF_HOURLY_FORECAST,
+    CONF_OUTDOOR_SENSOR,
+    CONF_OUTDOOR_WEIGHT,
     CONF_SUMMER_MIN_TEMP,
+    CONF_WEATHER_ENTITIES,
+    CONF_WEATHER_STRATEGY,
     CONF_WINTER_MAX_TEMP,
+    DATA_API,
     DATA_CLIMATE_MAX_NEG_DELTA,
     DATA_CLIMATE_MAX_POS_DELTA,
     DATA_CLIMATE_MODE,
+    DATA_OUTDOOR_MAX,
+    DATA_OUTDOOR_MIN,
+    DATA_OUTDOOR_TEMP,
+    DATA_OUTDOOR_TREND,
+    DATA_WEATHER_STALE,
+    DATA_WINDOW_MAX_TEMP,
     LOGGER,
 )
 from .data import OffdelayConfigEntry
+from .hourly import WINDOW_KEYS, HourlyForecast, async_fetch_hourly_forecast
+from .outdoor import DEFAULT_OUTDOOR_WEIGHT, OutdoorStats, temperature_from_state
+from .schedule import WeeklySchedule, sun_times, windows_from_config
+from .weather import (
+    SOURCE_TIMEOUT,
+    STRATEGY_FIRST,
+    WeatherCircuitBreaker,
+    WeatherSources,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from homeassistant.core import State
+
+WEATHER_KEYS = (
+    "weather_max_temp_today",
+    "weather_min_temp_today",
+    "weather_max_temp_tomorrow",
+    "weather_min_temp_tomorrow",
+)
+
+# Adaptive refresh interval
+DEFAULT_UPDATE_INTERVAL = timedelta(hours=1)
+SHORT_UPDATE_INTERVAL = timedelta(minutes=15)
+MAX_UPDATE_INTERVAL = timedelta(hours=3)
+SMALL_MARGIN = 1.0
+LARGE_MARGIN = 3.0
+
+# Outdoor sensor readings are published at most this often (seconds)
+OUTDOOR_PUBLISH_INTERVAL = 60
+OUTDOOR_KEYS = (
+    DATA_OUTDOOR_TEMP,
+    DATA_OUTDOOR_MAX,
+    DATA_OUTDOOR_MIN,
+    DATA_OUTDOOR_TREND,
+)
+
+
+def choose_update_interval(
+    *,
+    margin: float | None,
+    forecast_changed: bool,
+    previous: timedelta,
+) -> tuple[timedelta, str]:
+    """Return the next refresh interval and why it was chosen.
+
+    ``margin`` is how far (in °C) the active decision is from flipping the
+    climate mode. A small margin refreshes often, a large one with an
+    unchanged forecast backs off up to :data:`MAX_UPDATE_INTERVAL`. Window
+    boundaries do not need a refresh, the schedule re-evaluates at them.
+    """
+    if margin is None:
+        interval, reason = DEFAULT_UPDATE_INTERVAL, "default"
+    elif margin < SMALL_MARGIN:
+        interval, reason = SHORT_UPDATE_INTERVAL, "small_margin"
+    elif margin > LARGE_MARGIN and not forecast_changed:
+        interval = min(max(previous * 2, DEFAULT_UPDATE_INTERVAL), MAX_UPDATE_INTERVAL)
+        reason = "stable"
+    else:
+        interval, reason = DEFAULT_UPDATE_INTERVAL, "default"
+    return interval, reason
 
 
 class OffdelayDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
@@ -31,29 +121,281 @@ class OffdelayDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def __init__(self, hass: HomeAssistant, config_entry: OffdelayConfigEntry) -> None:
         """Initialize coordinator."""
         super().__init__(
-            hass, LOGGER, name="Offdelay Coordinator", update_interval=None
+            hass,
+            LOGGER,
+            name="Offdelay Coordinator",
+            update_interval=DEFAULT_UPDATE_INTERVAL,
         )
 
         self.config_entry = config_entry
 
         self.data: dict[str, Any] = {}
 
+        self.client: OffdelayApiClient | None = None
+        self.async_set_api_url(config_entry.options.get(CONF_API_URL))
+
+        # Why the current update interval was chosen, for diagnostics
+        self.update_interval_reason = "default"
+
+        self.weather_sources = WeatherSources(
+            hass,
+            config_entry,
+            config_entry.options.get(CONF_WEATHER_ENTITIES),
+            config_entry.options.get(CONF_WEATHER_STRATEGY, STRATEGY_FIRST),
+        )
+        self.weather_breaker = WeatherCircuitBreaker(hass, config_entry.entry_id)
+
+        # Hourly forecast, and the day window features computed from it
+        self.hourly_forecast: HourlyForecast | None = None
+        self._window_features: tuple[HourlyForecast, tuple[Any, ...], dict] | None = (
+            None
+        )
+
+        # Day windows, re-evaluated exactly at their start and end. Windows
+        # relative to the sun are compiled again every day at midnight.
+        self._windows = windows_from_config(config_entry.data)
+        self.schedule = WeeklySchedule([])
+        self.sun_times: dict[str, int | None] = {}
+        self._sun_day: date | None = None
+        self._transition_unsub: CALLBACK_TYPE | None = None
+        self._async_compile_schedule()
+
+        # Local outdoor sensor
+        self.outdoor: OutdoorStats | None = None
+        self._outdoor_entity: str | None = None
+        self._outdoor_unsub: CALLBACK_TYPE | None = None
+        self._outdoor_timer: CALLBACK_TYPE | None = None
+        self.async_set_outdoor_sensor(config_entry.options.get(CONF_OUTDOOR_SENSOR))
+
+    async def async_shutdown(self) -> None:
+        """Stop following the outdoor sensor and the schedule."""
+        await super().async_shutdown()
+        self._async_stop_outdoor()
+        if self._transition_unsub is not None:
+            self._transition_unsub()
+            self._transition_unsub = None
+
+    @callback
+    def async_update_schedule(self) -> None:
+        """Compile the schedule of the entry again after it changed."""
+        self._windows = windows_from_config(self.config_entry.data)
+        self._async_compile_schedule()
+
+    @callback
+    def _async_compile_schedule(self) -> None:
+        """Compile the windows at today's sun times and arm the next transition."""
+        if any(window.uses_sun for window in self._windows):
+            self._sun_day = dt_util.now().date()
+            self.sun_times = sun_times(self.hass, self._sun_day)
+        else:
+            self._sun_day = None
+            self.sun_times = {}
+        self.schedule = WeeklySchedule(self._windows, self.sun_times)
+        self._async_schedule_transition()
+
+    @callback
+    def _async_schedule_transition(self) -> None:
+        """Re-evaluate at the next start or end of a day window.
+
+        With windows relative to the sun, also at the next midnight to move
+        them to the sun times of the new day.
+        """
+        if self._transition_unsub is not None:
+            self._transition_unsub()
+            self._transition_unsub = None
+        when = self.schedule.next_transition(dt_util.now())
+        if self._sun_day is not None:
+            midnight = dt_util.start_of_local_day(self._sun_day + timedelta(days=1))
+            when = midnight if when is None else min(when, midnight)
+        if when is not None:
+            self._transition_unsub = async_track_point_in_time(
+                self.hass, self._async_window_transition, when
+            )
+
+    @callback
+    def _async_window_transition(self, _now: datetime) -> None:
+        self._transition_unsub = None
+        if self._sun_day is not None and self._sun_day != dt_util.now().date():
+            self._async_compile_schedule()
+        else:
+            self._async_schedule_transition()
+        # The cached forecast and climates are evaluated with the new logic
+        if self.data:
+            self.async_reevaluate()
+
+    @callback
+    def async_set_outdoor_sensor(self, entity_id: str | None) -> None:
+        """Follow the outdoor temperature of ``entity_id``, or of no sensor."""
+        if entity_id == self._outdoor_entity and (
+            entity_id is None or self._outdoor_unsub is not None
+        ):
+            return
+        self._async_stop_outdoor()
+        self._outdoor_entity = entity_id or None
+        if not entity_id:
+            self.outdoor = None
+            for key in OUTDOOR_KEYS:
+                self.data.pop(key, None)
+            return
+        self.outdoor = OutdoorStats()
+        if (state := self.hass.states.get(entity_id)) is not None:
+            self._add_outdoor_reading(state)
+        self._outdoor_unsub = async_track_state_change_event(
+            self.hass, [entity_id], self._async_outdoor_changed
+        )
+
+    @callback
+    def _async_stop_outdoor(self) -> None:
+        if self._outdoor_unsub is not None:
+            self._outdoor_unsub()
+            self._outdoor_unsub = None
+        if self._outdoor_timer is not None:
+            self._outdoor_timer()
+            self._outdoor_timer = None
+
+    def _add_outdoor_reading(self, state: State) -> bool:
+        value = temperature_from_state(state)
+        if value is None or self.outdoor is None:
+            return False
+        self.outdoor.add(value, state.last_updated_timestamp)
+        return True
+
+    @callback
+    def _async_outdoor_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Add a reading, publishing the readings of a minute at once."""
+        new_state = event.data["new_state"]
+        if new_state is None or not self._add_outdoor_reading(new_state):
+            return
+        if self._outdoor_timer is None:
+            self._outdoor_timer = async_call_later(
+                self.hass, OUTDOOR_PUBLISH_INTERVAL, self._async_publish_outdoor
+            )
+
+    @callback
+    def _async_publish_outdoor(self, _now: datetime) -> None:
+        self._outdoor_timer = None
+        self.async_reevaluate()
+
+    def _outdoor_data(self) -> dict[str, Any]:
+        """Return the outdoor statistics, if there is a sensor with readings."""
+        if self.outdoor is None or self.outdoor.ewma is None:
+            return {}
+        now = dt_util.utcnow().timestamp()
+        max_temp = self.outdoor.daily_max(now)
+        min_temp = self.outdoor.daily_min(now)
+        return {
+            DATA_OUTDOOR_TEMP: round(self.outdoor.ewma, 1),
+            DATA_OUTDOOR_MAX: round(max_temp, 1) if max_temp is not None else None,
+            DATA_OUTDOOR_MIN: round(min_temp, 1) if min_temp is not None else None,
+            DATA_OUTDOOR_TREND: round(self.outdoor.trend, 2),
+        }
+
+    @callback
+    def async_set_api_url(self, url: str | None) -> None:
+        """Poll the offdelay.be API at ``url``, or not at all."""
+        if not url:
+            self.client = None
+            self.data.pop(DATA_API, None)
+            return
+        self.client = OffdelayApiClient(async_get_clientsession(self.hass), url)
+
+    @callback
+    def async_reevaluate(self) -> None:
+        """Evaluate the cached data again after the configuration changed.
+
+        The next scheduled refresh is kept, so frequent re-evaluations do not
+        hold off fetching the weather.
+        """
+        data = {
+            key: value
+            for key, value in self.data.items()
+            if key not in {DATA_CLIMATE_MAX_POS_DELTA, DATA_CLIMATE_MAX_NEG_DELTA}
+        }
+        if self.config_entry.options.get(CONF_HOURLY_FORECAST):
+            data.update(self._update_window_features())
+        data.update(self._outdoor_data())
+        data.update(self._update_climate_data())
+        data.update(self._update_climate_mode(data))
+        self._adapt_update_interval(data, forecast_changed=False)
+        # Not async_set_updated_data: that would push back the next refresh
+        self.data = data
+        self.async_update_listeners()
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch all coordinator data."""
         data: dict[str, Any] = {}
 
-        weather = await self._update_weather_data()
+        data.update(await self._update_weather_data())
 
-        if weather:
-            data.update(weather)
+        if self.config_entry.options.get(CONF_HOURLY_FORECAST):
+            await self._update_hourly_forecast()
+            data.update(self._update_window_features())
+
+        data.update(self._outdoor_data())
+
+        if self.client is not None:
+            data[DATA_API] = await self._update_api_data()
 
         climate_deltas = self._update_climate_data()
         climate_mode = self._update_climate_mode(data)
         data.update(climate_deltas)
         data.update(climate_mode)
 
+        self._adapt_update_interval(
+            data,
+            forecast_changed=any(
+                data.get(key) != self.data.get(key) for key in WEATHER_KEYS
+            ),
+        )
         return data
 
+    def _adapt_update_interval(
+        self, data: Mapping[str, Any], *, forecast_changed: bool
+    ) -> None:
+        """Refresh sooner when the climate mode may flip, later when it will not."""
+        interval, reason = choose_update_interval(
+            margin=self._decision_margin(data),
+            forecast_changed=forecast_changed,
+            previous=self.update_interval or DEFAULT_UPDATE_INTERVAL,
+        )
+        if interval != self.update_interval:
+            LOGGER.debug("Refreshing every %s (%s)", interval, reason)
+        self.update_interval = interval
+        self.update_interval_reason = reason
+
+    def _decision_margin(self, data: Mapping[str, Any]) -> float | None:
+        """Return how far the active mode logic is from changing the mode."""
+        climates = self.config_entry.data.get(CONF_CLIMATES, [])
+        if not climates or self._is_day_window():
+            max_temp = self._decisive_max_temp(data)
+            # A stale forecast says nothing about how close the mode is
+            if max_temp is None or data.get(DATA_WEATHER_STALE):
+                return None
+            winter_max = self.config_entry.data.get(CONF_WINTER_MAX_TEMP, 0.0)
+            summer_min = self.config_entry.data.get(CONF_SUMMER_MIN_TEMP, 0.0)
+            return min(abs(max_temp - winter_max), abs(max_temp - summer_min))
+
+        # Night window: the mode only flips when every climate crosses the
+        # tolerance, so the climate closest to it decides
+        tolerance = self.config_entry.data.get(CONF_CLIMATE_DELTA_TOLERANCE, 0.0)
+        mode = data.get(DATA_CLIMATE_MODE)
+        if mode == "winter":
+            delta = data.get(DATA_CLIMATE_MAX_NEG_DELTA)
+            return abs(delta - tolerance) if delta is not None else None
+        if mode == "summer":
+            delta = data.get(DATA_CLIMATE_MAX_POS_DELTA)
+            return abs(delta + tolerance) if delta is not None else None
+        # Without a mode the night logic keeps the mode as it is
+        return float("inf")
+
+    async def _update_api_data(self) -> JsonValueType:
+        """Fetch the offdelay.be data, keeping the last data if that fails."""
+        try:
+            return await self.client.async_get_data()
+        except OffdelayApiClientError as err:
+            LOGGER.warning("Fetching offdelay.be data failed: %s", err)
+            return self.data.get(DATA_API)
+
     def _update_climate_data(self) -> dict[str, Any]:
         """Calculate climate deltas."""
         climates = self.config_entry.data.get(CONF_CLIMATES, [])
@@ -93,39 +435,56 @@ class OffdelayDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def _is_day_window(self) -> bool:
         """Check if current time is in the day (weather) window.
 
-        Day window is [day_start, night_start). During this window,
-        weather-based logic determines the climate mode.
+        During the day windows of the schedule, weather-based logic
+        determines the climate mode.
         """
-        day_start = int(self.config_entry.data.get(CONF_CLIMATE_DAY_START_HOUR, 8))
-        night_start = int(self.config_entry.data.get(CONF_CLIMATE_NIGHT_START_HOUR, 17))
-        current_hour = dt_util.now().hour
-        return day_start <= current_hour < night_start
+        return self.schedule.is_day(dt_util.now())
 
     def _weather_mode_logic(
-        self, current_data: dict[str, Any], current_mode: str
+        self, current_data: Mapping[str, Any], current_mode: str
     ) -> dict[str, Any]:
         """Determine climate mode from weather forecast.
 
-        Uses weather_max_temp_today to decide winter/summer/none.
+        Uses the max temperature of the day window, or weather_max_temp_today
+        without an hourly forecast, to decide winter/summer/none.
         """
-        weather_max_temp_today = current_data.get("weather_max_temp_today")
-        if weather_max_temp_today is None:
-            LOGGER.warning(
-                "weather_max_temp_today is None, keeping current climate mode"
-            )
+        max_temp = self._decisive_max_temp(current_data)
+        if max_temp is None:
+            # A missing weather source is reported by a repair issue
+            LOGGER.debug("weather_max_temp_today is None, keeping current climate mode")
             return {DATA_CLIMATE_MODE: current_mode}
 
         winter_max = self.config_entry.data.get(CONF_WINTER_MAX_TEMP, 0.0)
         summer_min = self.config_entry.data.get(CONF_SUMMER_MIN_TEMP, 0.0)
 
-        if weather_max_temp_today < winter_max:
+        if max_temp < winter_max:
             mode = "winter"
-        elif weather_max_temp_today > summer_min:
+        elif max_temp > summer_min:
             mode = "summer"
         else:
             mode = "none"
         return {DATA_CLIMATE_MODE: mode}
 
+    def _decisive_max_temp(self, data: Mapping[str, Any]) -> float | None:
+        """Return the max temperature the weather logic decides on.
+
+        The forecast max (of the day window with the hourly forecast) is
+        blended with the max measured by the outdoor sensor over the last day.
+        """
+        forecast = data.get(DATA_WINDOW_MAX_TEMP)
+        if forecast is None:
+            forecast = data.get("weather_max_temp_today")
+        measured = data.get(DATA_OUTDOOR_MAX)
+        if measured is None:
+            return forecast
+        if forecast is None:
+            return measured
+        weight = (
+            self.config_entry.options.get(CONF_OUTDOOR_WEIGHT, DEFAULT_OUTDOOR_WEIGHT)
+            / 100
+        )
+        return forecast + weight * (measured - forecast)
+
     def _climate_mode_logic(
         self, climates: list[str], current_mode: str
     ) -> dict[str, Any]:
@@ -179,81 +538,76 @@ class OffdelayDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """
         climates = self.config_entry.data.get(CONF_CLIMATES, [])
         current_mode = self.data.get(DATA_CLIMATE_MODE, "none")
+        return {
+            DATA_CLIMATE_MODE: self.evaluate_climate_mode(
+                current_data, climates, current_mode
+            )
+        }
 
+    def evaluate_climate_mode(
+        self, weather: Mapping[str, Any], climates: list[str], current_mode: str
+    ) -> str:
+        """Return the climate mode for a forecast and a set of climates.
+
+        Sites share the thresholds and windows of the entry, so they are
+        evaluated here with their own forecast and climates.
+        """
         # No climates: weather-based logic runs all day
         if not climates or self._is_day_window():
-            return self._weather_mode_logic(current_data, current_mode)
+            return self._weather_mode_logic(weather, current_mode)[DATA_CLIMATE_MODE]
 
         # Night window with climates: check indoor temps for mode switching
-        return self._climate_mode_logic(climates, current_mode)
+        return self._climate_mode_logic(climates, current_mode)[DATA_CLIMATE_MODE]
 
     async def _update_weather_data(self) -> dict[str, Any]:
-        """Get weather forecast data and compute values.
-
-        Returns:
-            dict[str, Any]: The weather data.
-
-        Raises:
-            UpdateFailed: If fetching weather data fails.
+        """Get the weather forecast, or the last good one marked stale.
 
+        The weather source sits behind a circuit breaker, so a missing or
+        failing weather entity neither blocks the refresh nor makes the
+        entities that do not need a forecast unavailable.
         """
-        # Determine weather entity
-        weather_entity: str | None = None
-        if self.hass.states.get("weather.forecast_home"):
-            weather_entity = "weather.forecast_home"
-        elif self.hass.states.get("weather.home"):
-            weather_entity = "weather.home"
-
-        if weather_entity is None:
-            raise UpdateFailed("No weather entity found")
-
-        # Fetch daily forecast only
-        daily_response: dict[str, Any] | None = await self.hass.services.async_call(
-            "weather",
-            "get_forecasts",
-            {"entity_id": weather_entity, "type": "daily"},
-            blocking=True,
-            return_response=True,
-        )
-
-        daily_data: dict[str, Any] = (
-            daily_response.get(weather_entity, {}) if daily_response else {}
-        )
-        daily_forecast: list[dict[str, Any]] = daily_data.get("forecast", [])
-
-        # Get today's and tomorrow's data
-        today_data: dict[str, Any] = (
-            daily_forecast[0] if len(daily_forecast) > 0 else {}
-        )
-        tomorrow_data: dict[str, Any] = (
-            daily_forecast[1] if len(daily_forecast) > 1 else {}
-        )
-
-        # Extract temperatures
-        today_max_temp: float = (
-            float(today_data.get("temperature", 17.0))
-            if isinstance(today_data.get("temperature"), (int, float))
-            else 17.0
+        forecast = await self.weather_breaker.async_call(
+            self.weather_sources.async_fetch
         )
-        today_min_temp: float = (
-            float(today_data.get("templow", 7.0))
-            if isinstance(today_data.get("templow"), (int, float))
-            else 7.0
-        )
-        tomorrow_max_temp: float = (
-            float(tomorrow_data.get("temperature", 17.0))
-            if isinstance(tomorrow_data.get("temperature"), (int, float))
-            else 17.0
-        )
-        tomorrow_min_temp: float = (
-            float(tomorrow_data.get("templow", 7.0))
-            if isinstance(tomorrow_data.get("templow"), (int, float))
-            else 7.0
-        )
-
+        if forecast is not None:
+            return {**forecast, DATA_WEATHER_STALE: False}
         return {
-            "weather_max_temp_today": today_max_temp,
-            "weather_min_temp_today": today_min_temp,
-            "weather_max_temp_tomorrow": tomorrow_max_temp,
-            "weather_min_temp_tomorrow": tomorrow_min_temp,
+            **{key: self.data[key] for key in WEATHER_KEYS if key in self.data},
+            DATA_WEATHER_STALE: True,
         }
+
+    async def _update_hourly_forecast(self) -> None:
+        """Fetch the hourly forecast, keeping the last one if that fails."""
+        entity_id = self.weather_sources.preferred
+        if entity_id is None or self.weather_breaker.is_open:
+            return
+        try:
+            async with asyncio.timeout(SOURCE_TIMEOUT):
+                forecast = await async_fetch_hourly_forecast(self.hass, entity_id)
+        except (HomeAssistantError, TimeoutError) as err:
+            LOGGER.debug(
+                "Fetching the hourly forecast of %s failed: %s", entity_id, err
+            )
+            return
+        forecast = forecast.merged_with(self.hourly_forecast)
+        # Keep the same object for an unchanged forecast, its features are cached
+        if forecast != self.hourly_forecast:
+            self.hourly_forecast = forecast
+
+    def _update_window_features(self) -> dict[str, Any]:
+        """Return the day window features, computed once per forecast and window."""
+        if self.hourly_forecast is None:
+            return dict.fromkeys(WINDOW_KEYS)
+        if (window := self.schedule.window(dt_util.now())) is None:
+            return dict.fromkeys(WINDOW_KEYS)
+        start, end = window
+        winter_max = self.config_entry.data.get(CONF_WINTER_MAX_TEMP, 0.0)
+        summer_min = self.config_entry.data.get(CONF_SUMMER_MIN_TEMP, 0.0)
+        key = (start, end, winter_max, summer_min)
+        cached = self._window_features
+        if cached is None or cached[0] is not self.hourly_forecast or cached[1] != key:
+            features = self.hourly_forecast.window_features(
+                start, end, winter_max=winter_max, summer_min=summer_min
+            )
+            cached = self._window_features = (self.hourly_forecast, key, features)
+        return cached[2]
@@ -10,7 +10,19 @@ from homeassistant.config_entries import ConfigEntry
 if TYPE_CHECKING:
     from homeassistant.loader import Integration
 
+    from .accuracy import ForecastAccuracyTracker
+    from .actuation import ClimateActuator
+    from .auto_turn_off import AutoTurnOffManager
     from .coordinator import OffdelayDataUpdateCoordinator
+    from .degree_days import DegreeDayTracker
+    from .enocean import RockerSwitchHandler
+    from .heating import HeatingController
+    from .lighting import LightController
+    from .notifications import NotificationDispatcher
+    from .reconfigure import EntrySnapshot
+    from .sites import SiteEngine
+    from .telemetry import TelemetryUploader
+    from .thermal import ThermalModels
 
 
 type OffdelayConfigEntry = ConfigEntry[OffdelayData]
@@ -22,3 +34,15 @@ class OffdelayData:
 
     coordinator: OffdelayDataUpdateCoordinator
     integration: Integration
+    snapshot: EntrySnapshot | None = None
+    heating: HeatingController | None = None
+    lighting: LightController | None = None
+    rockers: RockerSwitchHandler | None = None
+    auto_turn_off: AutoTurnOffManager | None = None
+    notifications: NotificationDispatcher | None = None
+    telemetry: TelemetryUploader | None = None
+    sites: SiteEngine | None = None
+    accuracy: ForecastAccuracyTracker | None = None
+    degree_days: DegreeDayTracker | None = None
+    thermal: ThermalModels | None = None
+    actuator: ClimateActuator | None = None
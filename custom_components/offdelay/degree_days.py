@@ -0,0 +1,183 @@
+"""Heating and cooling degree-days, accumulated as the temperature comes in.
+
+The outdoor temperature is taken from the outdoor sensor (its moving
+average), or else the mean of today's forecast max and min. Every
+coordinator update integrates it since the previous update by the trapezoidal
+rule. When the temperature crosses the base between two updates, only the
+part on the counting side is added, so the result does not depend on how
+often updates come. Totals are kept for today and for this month. Scheduled
+callbacks reset them at midnight and on the first of the month, and they are
+saved in a small store, so no recorder queries are needed.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SIGNAL_DEGREE_DAYS_UPDATED
+from .outdoor import outdoor_temperature
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+
+    from .coordinator import OffdelayDataUpdateCoordinator
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+# Base temperatures in °C, as used by Eurostat
+HEATING_BASE = 18.0
+COOLING_BASE = 21.0
+# Updates further apart than this are not integrated over
+MAX_GAP = timedelta(hours=4)
+
+HEATING_TODAY = "heating_degree_days_today"
+COOLING_TODAY = "cooling_degree_days_today"
+HEATING_MONTH = "heating_degree_days_month"
+COOLING_MONTH = "cooling_degree_days_month"
+DEGREE_DAY_KEYS = (HEATING_TODAY, COOLING_TODAY, HEATING_MONTH, COOLING_MONTH)
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.degree_days.{entry_id}")
+
+
+async def async_remove_degree_day_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored degree-days of a config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+def degree_days_below(base: float, before: float, after: float, days: float) -> float:
+    """Integrate how far the temperature is below ``base`` over ``days``.
+
+    The temperature goes linearly from ``before`` to ``after``.
+    """
+    below_before = base - before
+    below_after = base - after
+    if below_before >= 0 and below_after >= 0:
+        return (below_before + below_after) / 2 * days
+    if below_before <= 0 and below_after <= 0:
+        return 0.0
+    # Only the triangle on the side below the base counts
+    peak = max(below_before, below_after)
+    return peak * days * (peak / abs(below_before - below_after)) / 2
+
+
+class DegreeDayTracker:
+    """Accumulate heating and cooling degree-days per day and month."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the tracker with empty totals."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self._coordinator = coordinator
+        self._store = _store(hass, config_entry.entry_id)
+        self.totals = dict.fromkeys(DEGREE_DAY_KEYS, 0.0)
+        # POSIX time and temperature of the last update
+        self._last: tuple[float, float] | None = None
+        self._day = dt_util.now().date()
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @property
+    def signal(self) -> str:
+        """Return the dispatcher signal sent when the totals are reset."""
+        return f"{SIGNAL_DEGREE_DAYS_UPDATED}_{self._config_entry.entry_id}"
+
+    async def async_start(self) -> None:
+        """Restore the totals of the current periods and start integrating."""
+        stored = await self._store.async_load() or {}
+        totals = stored.get("totals", {})
+        stored_day = stored.get("day", "")
+        if stored_day[:7] == self._day.isoformat()[:7]:
+            for key in (HEATING_MONTH, COOLING_MONTH):
+                self.totals[key] = float(totals.get(key, 0.0))
+        if stored_day == self._day.isoformat():
+            for key in (HEATING_TODAY, COOLING_TODAY):
+                self.totals[key] = float(totals.get(key, 0.0))
+            # A gap since a stop on an earlier day is not split over the days
+            if (last := stored.get("last")) is not None:
+                self._last = (float(last[0]), float(last[1]))
+
+        self._unsubs = [
+            self._coordinator.async_add_listener(self._async_coordinator_updated),
+            async_track_time_change(
+                self.hass, self._async_day_ended, hour=0, minute=0, second=0
+            ),
+        ]
+        self._async_coordinator_updated()
+
+    async def async_stop(self) -> None:
+        """Stop integrating and save the totals."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        await self._store.async_save(self._data_to_store())
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        if (temperature := outdoor_temperature(self._coordinator.data)) is None:
+            return
+        self._integrate(dt_util.utcnow().timestamp(), temperature)
+        self._store.async_delay_save(self._data_to_store, SAVE_DELAY)
+
+    def _integrate(self, when: float, temperature: float) -> None:
+        """Add the degree-days since the last update, up to ``when``."""
+        if self._last is not None:
+            last_when, last_temperature = self._last
+            elapsed = when - last_when
+            if 0 < elapsed <= MAX_GAP.total_seconds():
+                days = elapsed / 86400
+                heating = degree_days_below(
+                    HEATING_BASE, last_temperature, temperature, days
+                )
+                cooling = degree_days_below(
+                    -COOLING_BASE, -last_temperature, -temperature, days
+                )
+                self.totals[HEATING_TODAY] += heating
+                self.totals[HEATING_MONTH] += heating
+                self.totals[COOLING_TODAY] += cooling
+                self.totals[COOLING_MONTH] += cooling
+        self._last = (when, temperature)
+
+    @callback
+    def _async_day_ended(self, now: datetime) -> None:
+        """Close the day, and the month on the first, and start new totals."""
+        if self._last is not None:
+            # The last temperature holds until midnight
+            self._integrate(dt_util.utcnow().timestamp(), self._last[1])
+        today = dt_util.as_local(now).date()
+        if today == self._day:
+            return
+        if today.month != self._day.month or today.year != self._day.year:
+            self.totals[HEATING_MONTH] = self.totals[COOLING_MONTH] = 0.0
+        self.totals[HEATING_TODAY] = self.totals[COOLING_TODAY] = 0.0
+        self._day = today
+        self._store.async_delay_save(self._data_to_store, SAVE_DELAY)
+        async_dispatcher_send(self.hass, self.signal)
+
+    def _data_to_store(self) -> dict[str, Any]:
+        return {
+            "day": self._day.isoformat(),
+            "totals": self.totals,
+            "last": list(self._last) if self._last is not None else None,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Return the totals and the last update for diagnostics."""
+        return {
+            **self._data_to_store(),
+            "heating_base": HEATING_BASE,
+            "cooling_base": COOLING_BASE,
+        }
@@ -33,10 +33,60 @@ def async_get_config_entry_diagnostics(
         "coordinator": {
             "last_update_success": coordinator.last_update_success,
             "update_interval": str(coordinator.update_interval),
+            "update_interval_reason": coordinator.update_interval_reason,
+            "schedule": coordinator.schedule.stats(),
+            "sun_times": coordinator.sun_times,
             "data": {
                 "title": coordinator.data.get("title"),
             },
+            "api": (
+                coordinator.client.cache_info()
+                if coordinator.client is not None
+                else None
+            ),
         },
+        "weather": {
+            **coordinator.weather_breaker.stats(),
+            **coordinator.weather_sources.stats(),
+            "hourly_forecast": (
+                coordinator.hourly_forecast.stats()
+                if coordinator.hourly_forecast is not None
+                else None
+            ),
+        },
+        "outdoor": (
+            coordinator.outdoor.stats() if coordinator.outdoor is not None else None
+        ),
+        "forecast_accuracy": (
+            entry.runtime_data.accuracy.stats()
+            if entry.runtime_data.accuracy is not None
+            else None
+        ),
+        "degree_days": (
+            entry.runtime_data.degree_days.stats()
+            if entry.runtime_data.degree_days is not None
+            else None
+        ),
+        "thermal": (
+            entry.runtime_data.thermal.stats()
+            if entry.runtime_data.thermal is not None
+            else None
+        ),
+        "actuation": (
+            entry.runtime_data.actuator.stats()
+            if entry.runtime_data.actuator is not None
+            else None
+        ),
+        "telemetry": (
+            entry.runtime_data.telemetry.stats()
+            if entry.runtime_data.telemetry is not None
+            else None
+        ),
+        "sites": (
+            entry.runtime_data.sites.stats()
+            if entry.runtime_data.sites is not None
+            else None
+        ),
         "error": {
             "last_exception": str(coordinator.last_exception),
         },
@@ -0,0 +1,256 @@
+"""Native handler for EnOcean (Friends of Hue) rocker switches.
+
+Replaces the ``light_enocean_switch`` blueprint. Every switch is a config
+subentry naming the event entity Zigbee2MQTT creates for it and the lights
+of its left and right rocker. One state subscription covers the event
+entities of all switches, and every ``press_*``/``release_*`` event is
+dispatched through a table keyed on (event entity, button, press/release)
+that is built once, so a button press costs a dictionary lookup however
+many switches are configured.
+
+Buttons 1 and 3 turn their rocker's lights on, 2 and 4 turn them off.
+Holding a button for longer than :data:`LONG_PRESS` dims the lights up or
+down in steps until it is released, or until the steps span the whole
+brightness range in case the release was lost; the long-press and dim
+deadlines of all switches share one :class:`DeadlineScheduler`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import datetime as dt
+import math
+from typing import TYPE_CHECKING
+
+from homeassistant.components.event import ATTR_EVENT_TYPE
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_DIM_STEP,
+    CONF_LIGHTS_LEFT,
+    CONF_LIGHTS_RIGHT,
+    CONF_SWITCH_EVENT,
+    LOGGER,
+    SUBENTRY_ENOCEAN_SWITCH,
+)
+from .helpers import ServiceCallBatcher
+from .scheduler import DeadlineScheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.config_entries import ConfigSubentry
+
+    from .data import OffdelayConfigEntry
+
+LIGHT_DOMAIN = "light"
+ATTR_BRIGHTNESS_STEP_PCT = "brightness_step_pct"
+
+PRESS = "press"
+RELEASE = "release"
+
+LONG_PRESS = dt.timedelta(seconds=1)
+DIM_INTERVAL = dt.timedelta(milliseconds=500)
+DEFAULT_DIM_STEP = 10
+
+# button -> (rocker, turn on), the combined buttons act on both rockers
+BUTTONS: dict[str, tuple[str, bool]] = {
+    "1": ("left", True),
+    "2": ("left", False),
+    "3": ("right", True),
+    "4": ("right", False),
+    "1_and_3": ("both", True),
+    "2_and_4": ("both", False),
+}
+
+type DispatchKey = tuple[str, str, str]
+
+
+def parse_event_type(event_type: str) -> tuple[str, str] | None:
+    """Split ``press_1_and_3`` into the button and press/release."""
+    kind, _, button = event_type.partition("_")
+    if kind not in {PRESS, RELEASE} or button not in BUTTONS:
+        return None
+    return button, kind
+
+
+@dataclass(frozen=True, slots=True)
+class RockerSwitch:
+    """Configuration of one rocker switch."""
+
+    switch_id: str
+    name: str
+    event_entity: str
+    lights_left: tuple[str, ...]
+    lights_right: tuple[str, ...]
+    dim_step: float = DEFAULT_DIM_STEP
+
+    @classmethod
+    def from_subentry(cls, subentry: ConfigSubentry) -> RockerSwitch:
+        """Build a switch from its config subentry."""
+        data = subentry.data
+        return cls(
+            switch_id=subentry.subentry_id,
+            name=subentry.title,
+            event_entity=data[CONF_SWITCH_EVENT],
+            lights_left=tuple(data.get(CONF_LIGHTS_LEFT, ())),
+            lights_right=tuple(data.get(CONF_LIGHTS_RIGHT, ())),
+            dim_step=float(data.get(CONF_DIM_STEP, DEFAULT_DIM_STEP)),
+        )
+
+    def lights(self, rocker: str) -> tuple[str, ...]:
+        """Return the lights of ``rocker`` (left, right or both)."""
+        if rocker == "left":
+            return self.lights_left
+        if rocker == "right":
+            return self.lights_right
+        return self.lights_left + self.lights_right
+
+
+class RockerSwitchHandler:
+    """Dispatch rocker switch events to light actions."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        switches: list[RockerSwitch],
+    ) -> None:
+        """Initialize the handler and build the dispatch table."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self.switches: dict[str, RockerSwitch] = {
+            switch.switch_id: switch for switch in switches
+        }
+        self.scheduler = DeadlineScheduler(hass)
+        self._batcher = ServiceCallBatcher(hass, config_entry, "offdelay rockers")
+        # Buttons that are held long enough to dim, and the steps dimmed
+        self._dimming: dict[DispatchKey, int] = {}
+        self._dispatch: dict[DispatchKey, Callable[[], None]] = {}
+        for switch in switches:
+            for button in BUTTONS:
+                key = (switch.event_entity, button, PRESS)
+                self._dispatch[key] = self._press_action(switch, button)
+                key = (switch.event_entity, button, RELEASE)
+                self._dispatch[key] = self._release_action(switch, button)
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @classmethod
+    def from_config_entry(
+        cls,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+    ) -> RockerSwitchHandler | None:
+        """Create a handler for the rocker switches of an entry, if any."""
+        switches = [
+            RockerSwitch.from_subentry(subentry)
+            for subentry in config_entry.subentries.values()
+            if subentry.subentry_type == SUBENTRY_ENOCEAN_SWITCH
+        ]
+        if not switches:
+            return None
+        return cls(hass, config_entry, switches)
+
+    @callback
+    def async_start(self) -> None:
+        """Subscribe to the event entities of every switch at once."""
+        self._unsub = async_track_state_change_event(
+            self.hass,
+            {switch.event_entity for switch in self.switches.values()},
+            self._async_event_entity_changed,
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe and stop dimming."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._dimming.clear()
+        self.scheduler.async_stop()
+
+    @callback
+    def _async_event_entity_changed(self, event: Event) -> None:
+        new_state = event.data["new_state"]
+        old_state = event.data["old_state"]
+        # Coming back from unavailable or being restored is not a new event,
+        # a new event always has a new timestamp as its state
+        if (
+            new_state is None
+            or old_state is None
+            or old_state.state in {STATE_UNAVAILABLE, STATE_UNKNOWN}
+            or new_state.state == old_state.state
+        ):
+            return
+        if (event_type := new_state.attributes.get(ATTR_EVENT_TYPE)) is None:
+            return
+        if (parsed := parse_event_type(event_type)) is None:
+            return
+        action = self._dispatch.get((event.data["entity_id"], *parsed))
+        if action is not None:
+            action()
+
+    def _press_action(self, switch: RockerSwitch, button: str) -> Callable[[], None]:
+        key = (switch.event_entity, button, PRESS)
+        rocker, up = BUTTONS[button]
+        lights = switch.lights(rocker)
+        step = switch.dim_step if up else -switch.dim_step
+        # Enough steps to go from off to full brightness, should the release
+        # never arrive
+        max_steps = math.ceil(100 / switch.dim_step)
+
+        @callback
+        def dim() -> None:
+            steps = self._dimming[key] = self._dimming.get(key, 0) + 1
+            if steps < max_steps:
+                self.scheduler.async_schedule(key, dt_util.utcnow() + DIM_INTERVAL, dim)
+            self._config_entry.async_create_task(
+                self.hass, self._async_dim(lights, step), "offdelay rocker dim"
+            )
+
+        @callback
+        def press() -> None:
+            # A release before the deadline makes it a short press
+            self._dimming.pop(key, None)
+            self.scheduler.async_schedule(key, dt_util.utcnow() + LONG_PRESS, dim)
+
+        return press
+
+    def _release_action(self, switch: RockerSwitch, button: str) -> Callable[[], None]:
+        key = (switch.event_entity, button, PRESS)
+        rocker, on = BUTTONS[button]
+        lights = switch.lights(rocker)
+        service = SERVICE_TURN_ON if on else SERVICE_TURN_OFF
+
+        @callback
+        def release() -> None:
+            self.scheduler.async_cancel(key)
+            if self._dimming.pop(key, None) is not None:
+                # Releasing a held button stops dimming
+                return
+            self._batcher.async_queue(service, lights)
+
+        return release
+
+    async def _async_dim(self, lights: tuple[str, ...], step: float) -> None:
+        if not lights:
+            return
+        try:
+            await self.hass.services.async_call(
+                LIGHT_DOMAIN,
+                SERVICE_TURN_ON,
+                {ATTR_ENTITY_ID: list(lights), ATTR_BRIGHTNESS_STEP_PCT: step},
+                blocking=True,
+            )
+        except HomeAssistantError as err:
+            LOGGER.warning("Dimming %s failed: %s", lights, err)
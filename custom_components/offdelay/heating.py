@@ -0,0 +1,358 @@
+"""Native heating controller for Offdelay.
+
+Replaces the Jinja templates of the ``climate_heatpump`` blueprint with a
+Python engine. Every room is a config subentry. The controller caches its
+inputs (climate mode, presence, window and temperature sensors), only
+re-evaluates the rooms an event affects and only calls
+``climate.set_temperature`` when a room's target actually changes.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+import datetime as dt
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.climate import (
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_TEMPERATURE,
+    DOMAIN as CLIMATE_DOMAIN,
+    SERVICE_SET_TEMPERATURE,
+)
+from homeassistant.const import ATTR_ENTITY_ID, STATE_ON
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_change,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_CLIMATE,
+    CONF_COMFORT_END,
+    CONF_COMFORT_START,
+    CONF_COMFORT_TEMP,
+    CONF_ECO_TEMP,
+    CONF_FROST_TEMP,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_WINDOW_SENSORS,
+    DATA_CLIMATE_MODE,
+    LOGGER,
+    SIGNAL_HEATING_UPDATED,
+    SUBENTRY_HEATING_ROOM,
+    ZONE_HOME_ENTITY,
+)
+from .helpers import time_in_window
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from homeassistant.config_entries import ConfigSubentry
+
+    from .coordinator import OffdelayDataUpdateCoordinator
+    from .data import OffdelayConfigEntry
+
+SETPOINT_STEP = 0.5
+MAX_SETPOINT = 30.0
+MAX_CALIBRATION = 5.0
+
+
+def _parse_time(value: str) -> dt.time:
+    return dt.time.fromisoformat(value)
+
+
+@dataclass(frozen=True, slots=True)
+class HeatingRoom:
+    """Configuration of one heated room."""
+
+    room_id: str
+    name: str
+    climate: str
+    comfort: float
+    eco: float
+    frost: float
+    comfort_start: dt.time
+    comfort_end: dt.time
+    window_sensors: tuple[str, ...] = ()
+    temperature_sensor: str | None = None
+
+    @classmethod
+    def from_subentry(cls, subentry: ConfigSubentry) -> HeatingRoom:
+        """Build a room from its config subentry."""
+        data = subentry.data
+        return cls(
+            room_id=subentry.subentry_id,
+            name=subentry.title,
+            climate=data[CONF_CLIMATE],
+            comfort=float(data[CONF_COMFORT_TEMP]),
+            eco=float(data[CONF_ECO_TEMP]),
+            frost=float(data[CONF_FROST_TEMP]),
+            comfort_start=_parse_time(data[CONF_COMFORT_START]),
+            comfort_end=_parse_time(data[CONF_COMFORT_END]),
+            window_sensors=tuple(data.get(CONF_WINDOW_SENSORS, [])),
+            temperature_sensor=data.get(CONF_TEMPERATURE_SENSOR) or None,
+        )
+
+    def in_comfort_window(self, now: dt.time) -> bool:
+        """Return True if ``now`` is inside the comfort schedule."""
+        return time_in_window(now, self.comfort_start, self.comfort_end)
+
+
+def compute_target(
+    room: HeatingRoom,
+    *,
+    climate_mode: str | None,
+    home: bool,
+    window_open: bool,
+    now: dt.time,
+) -> float:
+    """Return the target temperature of a room.
+
+    Priority: open window, then the summer climate mode (heating season
+    over), both falling back to frost protection. Otherwise comfort applies
+    while someone is home inside the schedule, and eco the rest of the time.
+    """
+    if window_open or climate_mode == "summer":
+        return room.frost
+    if home and room.in_comfort_window(now):
+        return room.comfort
+    return room.eco
+
+
+def calibrate(
+    target: float, climate_temp: float | None, room_temp: float | None
+) -> float:
+    """Offset a target by the error of the thermostat's own sensor.
+
+    The result is rounded to the setpoint step so small sensor fluctuations
+    do not produce a new service call.
+    """
+    if climate_temp is None or room_temp is None:
+        return target
+    setpoint = target + (climate_temp - room_temp)
+    setpoint = round(setpoint / SETPOINT_STEP) * SETPOINT_STEP
+    setpoint = min(max(setpoint, target - MAX_CALIBRATION), target + MAX_CALIBRATION)
+    return min(setpoint, MAX_SETPOINT)
+
+
+def _float_or_none(value: Any) -> float | None:  # noqa: ANN401
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class HeatingController:
+    """Compute and apply room targets from cached inputs."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+        rooms: list[HeatingRoom],
+    ) -> None:
+        """Initialize the controller."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self._coordinator = coordinator
+        self.rooms: dict[str, HeatingRoom] = {room.room_id: room for room in rooms}
+
+        # Cached inputs
+        self._home = False
+        self._climate_mode: str | None = None
+        self._open_windows: set[str] = set()
+        self._temperatures: dict[str, float | None] = {}
+
+        # entity_id -> rooms that depend on it
+        self._index: dict[str, set[str]] = defaultdict(set)
+        self._window_sensors: set[str] = set()
+        for room in rooms:
+            self._window_sensors.update(room.window_sensors)
+            for entity_id in (room.climate, *room.window_sensors):
+                self._index[entity_id].add(room.room_id)
+            if room.temperature_sensor:
+                self._index[room.temperature_sensor].add(room.room_id)
+
+        self.targets: dict[str, float] = {}
+        self._sent: dict[str, float] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @classmethod
+    def from_config_entry(
+        cls,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+    ) -> HeatingController | None:
+        """Create a controller for the heating rooms of an entry, if any."""
+        rooms = [
+            HeatingRoom.from_subentry(subentry)
+            for subentry in config_entry.subentries.values()
+            if subentry.subentry_type == SUBENTRY_HEATING_ROOM
+        ]
+        if not rooms:
+            return None
+        return cls(hass, config_entry, coordinator, rooms)
+
+    def signal(self, room_id: str) -> str:
+        """Return the dispatcher signal sent when a room's target changes."""
+        return f"{SIGNAL_HEATING_UPDATED}_{self._config_entry.entry_id}_{room_id}"
+
+    @callback
+    def async_start(self) -> None:
+        """Load the inputs, subscribe to their changes and evaluate all rooms."""
+        self._home = self._read_home()
+        self._climate_mode = self._coordinator.data.get(DATA_CLIMATE_MODE)
+        for entity_id in self._index:
+            self._read_entity(entity_id)
+
+        self._unsubs.append(
+            async_track_state_change_event(
+                self.hass,
+                [ZONE_HOME_ENTITY, *self._index],
+                self._async_state_changed,
+            )
+        )
+        self._unsubs.append(
+            self._coordinator.async_add_listener(self._async_coordinator_updated)
+        )
+        boundaries = {
+            boundary
+            for room in self.rooms.values()
+            for boundary in (room.comfort_start, room.comfort_end)
+        }
+        self._unsubs.extend(
+            async_track_time_change(
+                self.hass,
+                self._async_schedule_boundary,
+                hour=boundary.hour,
+                minute=boundary.minute,
+                second=boundary.second,
+            )
+            for boundary in boundaries
+        )
+        self._async_evaluate(self.rooms)
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe from all inputs."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+
+    def _read_home(self) -> bool:
+        state = self.hass.states.get(ZONE_HOME_ENTITY)
+        count = _float_or_none(state.state) if state is not None else None
+        return bool(count)
+
+    def _read_entity(self, entity_id: str) -> None:
+        """Refresh the cached value of one input entity."""
+        state = self.hass.states.get(entity_id)
+        if entity_id.startswith(f"{CLIMATE_DOMAIN}."):
+            self._temperatures[entity_id] = (
+                _float_or_none(state.attributes.get(ATTR_CURRENT_TEMPERATURE))
+                if state is not None
+                else None
+            )
+        elif entity_id in self._window_sensors:
+            if state is not None and state.state == STATE_ON:
+                self._open_windows.add(entity_id)
+            else:
+                self._open_windows.discard(entity_id)
+        else:
+            self._temperatures[entity_id] = (
+                _float_or_none(state.state) if state is not None else None
+            )
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        entity_id: str = event.data["entity_id"]
+        if entity_id == ZONE_HOME_ENTITY:
+            home = self._read_home()
+            if home != self._home:
+                self._home = home
+                self._async_evaluate(self.rooms)
+            return
+        self._read_entity(entity_id)
+        self._async_evaluate(self._index[entity_id])
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        climate_mode = self._coordinator.data.get(DATA_CLIMATE_MODE)
+        if climate_mode != self._climate_mode:
+            self._climate_mode = climate_mode
+            self._async_evaluate(self.rooms)
+
+    @callback
+    def _async_schedule_boundary(self, _now: dt.datetime) -> None:
+        self._async_evaluate(self.rooms)
+
+    def _target_for(self, room: HeatingRoom, now: dt.time) -> float:
+        target = compute_target(
+            room,
+            climate_mode=self._climate_mode,
+            home=self._home,
+            window_open=any(
+                sensor in self._open_windows for sensor in room.window_sensors
+            ),
+            now=now,
+        )
+        if room.temperature_sensor:
+            target = calibrate(
+                target,
+                self._temperatures.get(room.climate),
+                self._temperatures.get(room.temperature_sensor),
+            )
+        return target
+
+    @callback
+    def _async_evaluate(self, room_ids: Iterable[str]) -> None:
+        """Recompute the given rooms and send the targets that changed."""
+        now = dt_util.now().time()
+        changes: dict[float, list[str]] = defaultdict(list)
+        for room_id in room_ids:
+            room = self.rooms[room_id]
+            target = self._target_for(room, now)
+            if self.targets.get(room_id) != target:
+                self.targets[room_id] = target
+                async_dispatcher_send(self.hass, self.signal(room_id))
+            if self._sent.get(room_id) == target:
+                continue
+            self._sent[room_id] = target
+            state = self.hass.states.get(room.climate)
+            if (
+                state is not None
+                and _float_or_none(state.attributes.get(ATTR_TEMPERATURE)) == target
+            ):
+                continue
+            changes[target].append(room.climate)
+
+        if changes:
+            self._config_entry.async_create_task(
+                self.hass,
+                self._async_apply(changes),
+                "offdelay heating set_temperature",
+            )
+
+    async def _async_apply(self, changes: dict[float, list[str]]) -> None:
+        """Send one set_temperature call per distinct target."""
+        for target, entity_ids in changes.items():
+            try:
+                await self.hass.services.async_call(
+                    CLIMATE_DOMAIN,
+                    SERVICE_SET_TEMPERATURE,
+                    {ATTR_ENTITY_ID: entity_ids, ATTR_TEMPERATURE: target},
+                    blocking=True,
+                )
+            except HomeAssistantError as err:
+                LOGGER.warning(
+                    "Setting %s to %s failed: %s", ", ".join(entity_ids), target, err
+                )
+                # Forget what was sent so the next evaluation retries.
+                for room_id, room in self.rooms.items():
+                    if room.climate in entity_ids:
+                        self._sent.pop(room_id, None)
@@ -0,0 +1,97 @@
+"""Helpers shared by the Offdelay controllers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF, SERVICE_TURN_ON
+from homeassistant.core import HomeAssistant, callback, split_entity_id
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    import datetime as dt
+
+    from homeassistant.config_entries import ConfigEntry
+
+
+def time_in_window(now: dt.time, start: dt.time, end: dt.time) -> bool:
+    """Return True if ``now`` is inside ``[start, end)``.
+
+    A window whose end is before its start wraps around midnight.
+    """
+    if start <= end:
+        return start <= now < end
+    return now >= start or now < end
+
+
+def group_by_domain(entity_ids: Iterable[str]) -> dict[str, list[str]]:
+    """Group entity IDs by their domain, keeping their order."""
+    grouped: dict[str, list[str]] = defaultdict(list)
+    for entity_id in entity_ids:
+        grouped[split_entity_id(entity_id)[0]].append(entity_id)
+    return dict(grouped)
+
+
+async def async_call_per_domain(
+    hass: HomeAssistant,
+    service: str,
+    entity_ids: Iterable[str],
+    *,
+    blocking: bool = True,
+) -> None:
+    """Call ``service`` once per domain for all ``entity_ids``."""
+    for domain, domain_entity_ids in group_by_domain(entity_ids).items():
+        await hass.services.async_call(
+            domain,
+            service,
+            {ATTR_ENTITY_ID: domain_entity_ids},
+            blocking=blocking,
+        )
+
+
+class ServiceCallBatcher:
+    """Merge turn on/off requests made in the same loop iteration.
+
+    Requests queued by callbacks that run together (one state change
+    reaching many rooms, or many deadlines expiring in one timer tick) are
+    sent as a single call per service and domain.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, config_entry: ConfigEntry, name: str
+    ) -> None:
+        """Initialize the batcher."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self._name = name
+        self._batches: dict[str, set[str]] = {}
+
+    @callback
+    def async_queue(self, service: str, entity_ids: Iterable[str]) -> None:
+        """Queue entities for ``service``."""
+        entity_ids = list(entity_ids)
+        if not entity_ids:
+            return
+        if not self._batches:
+            self._config_entry.async_create_task(
+                self.hass, self._async_flush(), self._name
+            )
+        self._batches.setdefault(service, set()).update(entity_ids)
+
+    async def _async_flush(self) -> None:
+        # Tasks start eagerly, let the running callbacks queue their entities
+        await asyncio.sleep(0)
+        batches, self._batches = self._batches, {}
+        # Turning off first lets an entity that is also turned on end up on
+        for service in (SERVICE_TURN_OFF, SERVICE_TURN_ON):
+            if not (entity_ids := sorted(batches.get(service, ()))):
+                continue
+            try:
+                await async_call_per_domain(self.hass, service, entity_ids)
+            except HomeAssistantError as err:
+                LOGGER.warning("Calling %s for %s failed: %s", service, entity_ids, err)
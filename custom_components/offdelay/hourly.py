@@ -0,0 +1,147 @@
+"""Hourly forecast of the day window.
+
+The hourly forecast is kept in three typed arrays instead of a list of
+dicts: the start of every hour, its temperature and its cloud coverage. The
+hours of the day window are found by bisecting the sorted timestamps, and
+the window features are computed over slices of the arrays. Hours that have
+passed are dropped from a new forecast, so they are carried over from the
+previous one to keep the whole window.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import math
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_WINDOW_CLOUD_COVERAGE,
+    DATA_WINDOW_HOURS_ABOVE,
+    DATA_WINDOW_HOURS_BELOW,
+    DATA_WINDOW_MAX_TEMP,
+    DATA_WINDOW_MEAN_TEMP,
+)
+from .weather import async_get_forecast
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+WINDOW_KEYS = (
+    DATA_WINDOW_MAX_TEMP,
+    DATA_WINDOW_MEAN_TEMP,
+    DATA_WINDOW_HOURS_ABOVE,
+    DATA_WINDOW_HOURS_BELOW,
+    DATA_WINDOW_CLOUD_COVERAGE,
+)
+
+# Hours before the start of a new forecast that are carried over
+KEEP_PAST = timedelta(hours=24)
+
+
+@dataclass(frozen=True, slots=True)
+class HourlyForecast:
+    """An hourly forecast, sorted by time."""
+
+    # Start of every hour, as a POSIX timestamp
+    timestamps: array[float] = field(default_factory=lambda: array("d"))
+    temperature: array[float] = field(default_factory=lambda: array("d"))
+    # NaN where the weather entity does not report it
+    cloud_coverage: array[float] = field(default_factory=lambda: array("d"))
+
+    @classmethod
+    def from_forecast(cls, forecast: list[dict[str, Any]]) -> HourlyForecast:
+        """Build the arrays from the response of ``weather.get_forecasts``."""
+        hours: list[tuple[float, float, float]] = []
+        for hour in forecast:
+            when = dt_util.parse_datetime(str(hour.get("datetime", "")))
+            temperature = hour.get("temperature")
+            if when is None or not isinstance(temperature, (int, float)):
+                continue
+            cloud_coverage = hour.get("cloud_coverage")
+            hours.append(
+                (
+                    when.timestamp(),
+                    float(temperature),
+                    float(cloud_coverage)
+                    if isinstance(cloud_coverage, (int, float))
+                    else math.nan,
+                )
+            )
+        hours.sort()
+        return cls(
+            array("d", (hour[0] for hour in hours)),
+            array("d", (hour[1] for hour in hours)),
+            array("d", (hour[2] for hour in hours)),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of hours."""
+        return len(self.timestamps)
+
+    def merged_with(self, previous: HourlyForecast | None) -> HourlyForecast:
+        """Return this forecast with the hours before it taken from ``previous``."""
+        if previous is None or not self.timestamps or not previous.timestamps:
+            return self
+        first = self.timestamps[0]
+        lo = bisect_left(previous.timestamps, first - KEEP_PAST.total_seconds())
+        hi = bisect_left(previous.timestamps, first)
+        if lo == hi:
+            return self
+        return HourlyForecast(
+            previous.timestamps[lo:hi] + self.timestamps,
+            previous.temperature[lo:hi] + self.temperature,
+            previous.cloud_coverage[lo:hi] + self.cloud_coverage,
+        )
+
+    def window_features(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        winter_max: float,
+        summer_min: float,
+    ) -> dict[str, float | int | None]:
+        """Return the temperatures and cloud coverage of the hours in a window."""
+        lo = bisect_left(self.timestamps, start.timestamp())
+        hi = bisect_left(self.timestamps, end.timestamp())
+        temperature = self.temperature[lo:hi]
+        if not temperature:
+            return dict.fromkeys(WINDOW_KEYS)
+        cloud_coverage = [
+            value for value in self.cloud_coverage[lo:hi] if not math.isnan(value)
+        ]
+        return {
+            DATA_WINDOW_MAX_TEMP: max(temperature),
+            DATA_WINDOW_MEAN_TEMP: round(math.fsum(temperature) / len(temperature), 1),
+            DATA_WINDOW_HOURS_ABOVE: sum(value > summer_min for value in temperature),
+            DATA_WINDOW_HOURS_BELOW: sum(value < winter_max for value in temperature),
+            DATA_WINDOW_CLOUD_COVERAGE: (
+                round(math.fsum(cloud_coverage) / len(cloud_coverage))
+                if cloud_coverage
+                else None
+            ),
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Return the size and span of the forecast for diagnostics."""
+        if not self.timestamps:
+            return {"hours": 0}
+        return {
+            "hours": len(self),
+            "first": dt_util.utc_from_timestamp(self.timestamps[0]).isoformat(),
+            "last": dt_util.utc_from_timestamp(self.timestamps[-1]).isoformat(),
+        }
+
+
+async def async_fetch_hourly_forecast(
+    hass: HomeAssistant, entity_id: str
+) -> HourlyForecast:
+    """Fetch the hourly forecast of a weather entity."""
+    return HourlyForecast.from_forecast(
+        await async_get_forecast(hass, entity_id, "hourly")
+    )
@@ -0,0 +1,292 @@
+"""Native motion light controller for Offdelay.
+
+Replaces the ``light_sensor`` blueprint: every room is a config subentry
+with motion sensors, lights and an off-delay. All rooms share one state
+subscription, an index from trigger entity to rooms and one deadline
+scheduler for the off-delays. The optional lux, sun and time conditions of
+a room are compiled once into predicates that read cached values.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+import datetime as dt
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import SERVICE_TURN_OFF, SERVICE_TURN_ON, STATE_OFF, STATE_ON
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_ACTIVE_END,
+    CONF_ACTIVE_START,
+    CONF_BYPASS_ENTITY,
+    CONF_LIGHTS,
+    CONF_LUX_SENSOR,
+    CONF_LUX_THRESHOLD,
+    CONF_MAX_SUN_ELEVATION,
+    CONF_MOTION_SENSORS,
+    CONF_OFF_DELAY,
+    SUBENTRY_LIGHT_ROOM,
+)
+from .helpers import ServiceCallBatcher, time_in_window
+from .scheduler import DeadlineScheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.config_entries import ConfigSubentry
+
+    from .data import OffdelayConfigEntry
+
+SUN_ENTITY = "sun.sun"
+ATTR_ELEVATION = "elevation"
+
+type Predicate = Callable[[dt.time], bool]
+
+
+def _float_or_none(value: Any) -> float | None:  # noqa: ANN401
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class LightRoom:
+    """Configuration of one motion lit room."""
+
+    room_id: str
+    name: str
+    motion_sensors: tuple[str, ...]
+    lights: tuple[str, ...]
+    off_delay: dt.timedelta
+    lux_sensor: str | None = None
+    lux_threshold: float | None = None
+    max_sun_elevation: float | None = None
+    active_start: dt.time | None = None
+    active_end: dt.time | None = None
+    bypass_entity: str | None = None
+
+    @classmethod
+    def from_subentry(cls, subentry: ConfigSubentry) -> LightRoom:
+        """Build a room from its config subentry."""
+        data = subentry.data
+        start = data.get(CONF_ACTIVE_START)
+        end = data.get(CONF_ACTIVE_END)
+        return cls(
+            room_id=subentry.subentry_id,
+            name=subentry.title,
+            motion_sensors=tuple(data[CONF_MOTION_SENSORS]),
+            lights=tuple(data[CONF_LIGHTS]),
+            off_delay=dt.timedelta(seconds=float(data[CONF_OFF_DELAY])),
+            lux_sensor=data.get(CONF_LUX_SENSOR) or None,
+            lux_threshold=_float_or_none(data.get(CONF_LUX_THRESHOLD)),
+            max_sun_elevation=_float_or_none(data.get(CONF_MAX_SUN_ELEVATION)),
+            active_start=dt.time.fromisoformat(start) if start else None,
+            active_end=dt.time.fromisoformat(end) if end else None,
+            bypass_entity=data.get(CONF_BYPASS_ENTITY) or None,
+        )
+
+
+class LightController:
+    """Turn lights on for motion and off after a shared off-delay."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        rooms: list[LightRoom],
+    ) -> None:
+        """Initialize the controller."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self.rooms: dict[str, LightRoom] = {room.room_id: room for room in rooms}
+        self.scheduler = DeadlineScheduler(hass)
+
+        # Cached inputs
+        self._motion: set[str] = set()
+        self._bypassed: set[str] = set()
+        self._values: dict[str, float | None] = {}
+
+        # Rooms whose lights were turned on by the controller
+        self.active: set[str] = set()
+
+        # entity_id -> rooms that are triggered by it
+        self._motion_index: dict[str, list[str]] = defaultdict(list)
+        self._bypass_index: dict[str, list[str]] = defaultdict(list)
+        self._value_entities: set[str] = set()
+        self._predicates: dict[str, tuple[Predicate, ...]] = {}
+        for room in rooms:
+            for sensor in room.motion_sensors:
+                self._motion_index[sensor].append(room.room_id)
+            if room.bypass_entity:
+                self._bypass_index[room.bypass_entity].append(room.room_id)
+            self._predicates[room.room_id] = self._compile(room)
+
+        self._batcher = ServiceCallBatcher(hass, config_entry, "offdelay lights")
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @classmethod
+    def from_config_entry(
+        cls,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+    ) -> LightController | None:
+        """Create a controller for the light rooms of an entry, if any."""
+        rooms = [
+            LightRoom.from_subentry(subentry)
+            for subentry in config_entry.subentries.values()
+            if subentry.subentry_type == SUBENTRY_LIGHT_ROOM
+        ]
+        if not rooms:
+            return None
+        return cls(hass, config_entry, rooms)
+
+    def _compile(self, room: LightRoom) -> tuple[Predicate, ...]:
+        """Turn the optional conditions of a room into predicates."""
+        values = self._values
+        predicates: list[Predicate] = []
+
+        if room.lux_sensor and room.lux_threshold is not None:
+            lux_sensor, threshold = room.lux_sensor, room.lux_threshold
+            self._value_entities.add(lux_sensor)
+
+            def lux_is_low(_now: dt.time) -> bool:
+                lux = values.get(lux_sensor)
+                # An unavailable sensor must not keep the room dark
+                return lux is None or lux < threshold
+
+            predicates.append(lux_is_low)
+
+        if room.max_sun_elevation is not None:
+            max_elevation = room.max_sun_elevation
+            self._value_entities.add(SUN_ENTITY)
+
+            def sun_is_low(_now: dt.time) -> bool:
+                elevation = values.get(SUN_ENTITY)
+                return elevation is None or elevation < max_elevation
+
+            predicates.append(sun_is_low)
+
+        if room.active_start is not None and room.active_end is not None:
+            start, end = room.active_start, room.active_end
+
+            def in_time_window(now: dt.time) -> bool:
+                return time_in_window(now, start, end)
+
+            predicates.append(in_time_window)
+
+        return tuple(predicates)
+
+    @callback
+    def async_start(self) -> None:
+        """Load the inputs and subscribe to all of them at once."""
+        for sensor in self._motion_index:
+            self._read_motion(sensor)
+        for entity_id in self._bypass_index:
+            self._read_bypass(entity_id)
+        for entity_id in self._value_entities:
+            self._read_value(entity_id)
+
+        self._unsubs.append(
+            async_track_state_change_event(
+                self.hass,
+                [*self._motion_index, *self._bypass_index, *self._value_entities],
+                self._async_state_changed,
+            )
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe and drop pending off-delays."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        self.scheduler.async_stop()
+
+    def _read_motion(self, entity_id: str) -> None:
+        state = self.hass.states.get(entity_id)
+        if state is not None and state.state == STATE_ON:
+            self._motion.add(entity_id)
+        else:
+            self._motion.discard(entity_id)
+
+    def _read_bypass(self, entity_id: str) -> None:
+        state = self.hass.states.get(entity_id)
+        if state is not None and state.state == STATE_ON:
+            self._bypassed.add(entity_id)
+        else:
+            self._bypassed.discard(entity_id)
+
+    def _read_value(self, entity_id: str) -> None:
+        state = self.hass.states.get(entity_id)
+        if state is None:
+            self._values[entity_id] = None
+        elif entity_id == SUN_ENTITY:
+            self._values[entity_id] = _float_or_none(
+                state.attributes.get(ATTR_ELEVATION)
+            )
+        else:
+            self._values[entity_id] = _float_or_none(state.state)
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        entity_id: str = event.data["entity_id"]
+        if entity_id in self._value_entities:
+            self._read_value(entity_id)
+        if entity_id in self._bypass_index:
+            self._read_bypass(entity_id)
+            for room_id in self._bypass_index[entity_id]:
+                self._async_update_room(self.rooms[room_id])
+        if entity_id in self._motion_index:
+            self._read_motion(entity_id)
+            now = dt_util.now().time()
+            for room_id in self._motion_index[entity_id]:
+                self._async_update_room(self.rooms[room_id], now)
+
+    def _is_bypassed(self, room: LightRoom) -> bool:
+        return room.bypass_entity is not None and room.bypass_entity in self._bypassed
+
+    @callback
+    def _async_update_room(self, room: LightRoom, now: dt.time | None = None) -> None:
+        """Apply the current motion and bypass state to a room."""
+        if self._is_bypassed(room):
+            self.scheduler.async_cancel(room.room_id)
+            return
+
+        if any(sensor in self._motion for sensor in room.motion_sensors):
+            self.scheduler.async_cancel(room.room_id)
+            if room.room_id in self.active or now is None:
+                return
+            if all(predicate(now) for predicate in self._predicates[room.room_id]):
+                self.active.add(room.room_id)
+                self._batcher.async_queue(
+                    SERVICE_TURN_ON, self._lights_in_state(room, STATE_OFF)
+                )
+            return
+
+        if room.room_id in self.active:
+            self.scheduler.async_schedule(
+                room.room_id,
+                dt_util.utcnow() + room.off_delay,
+                lambda: self._async_turn_off(room),
+            )
+
+    @callback
+    def _async_turn_off(self, room: LightRoom) -> None:
+        self.active.discard(room.room_id)
+        self._batcher.async_queue(
+            SERVICE_TURN_OFF, self._lights_in_state(room, STATE_ON)
+        )
+
+    def _lights_in_state(self, room: LightRoom, state: str) -> list[str]:
+        """Return the lights of a room that are (or may be) in ``state``."""
+        return [
+            light
+            for light in room.lights
+            if (current := self.hass.states.get(light)) is None
+            or current.state == state
+        ]
@@ -0,0 +1,190 @@
+"""Native replacement for the notification script blueprint.
+
+``offdelay.notify`` only queues a message. Messages for the same devices
+sharing a tag within the coalescing window replace each other, the rest
+are grouped per target device and sent with a bounded number of concurrent
+notify calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass, field
+import datetime as dt
+import itertools
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import slugify
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable
+
+    from homeassistant.config_entries import ConfigEntry
+
+NOTIFY_DOMAIN = "notify"
+MOBILE_APP_DOMAIN = "mobile_app"
+
+COALESCE_WINDOW = dt.timedelta(seconds=2)
+MAX_CONCURRENT_SENDS = 4
+
+
+@dataclass(frozen=True, slots=True)
+class Notification:
+    """A queued notification."""
+
+    message: str
+    title: str | None = None
+    tag: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def service_data(self) -> dict[str, Any]:
+        """Return the data for a notify service call."""
+        service_data: dict[str, Any] = {"message": self.message}
+        if self.title is not None:
+            service_data["title"] = self.title
+        data = dict(self.data)
+        if self.tag is not None:
+            # The companion app replaces a shown notification with the same tag
+            data.setdefault("tag", self.tag)
+        if data:
+            service_data["data"] = data
+        return service_data
+
+
+class NotificationDispatcher:
+    """Queue, coalesce and send notifications to mobile app devices."""
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self._queue: dict[Hashable, tuple[Notification, tuple[str, ...] | None]] = {}
+        self._counter = itertools.count()
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        self._flush_timer: CALLBACK_TYPE | None = None
+        self._services: dict[str, str | None] = {}
+        self._all_devices: list[str] | None = None
+        self._unsub_registry: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start following device registry updates."""
+        self._unsub_registry = self.hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_registry_updated
+        )
+
+    async def async_stop(self) -> None:
+        """Send what is still queued and stop."""
+        if self._unsub_registry is not None:
+            self._unsub_registry()
+            self._unsub_registry = None
+        await self._async_flush()
+
+    @callback
+    def async_queue(
+        self, notification: Notification, device_ids: Iterable[str] | None = None
+    ) -> None:
+        """Queue a notification for ``device_ids`` or every mobile app device.
+
+        A queued notification with the same tag for the same devices is
+        replaced.
+        """
+        targets = tuple(device_ids) if device_ids is not None else None
+        key: Hashable = (
+            (
+                notification.tag,
+                frozenset(targets) if targets is not None else None,
+            )
+            if notification.tag is not None
+            else next(self._counter)
+        )
+        self._queue.pop(key, None)
+        self._queue[key] = (notification, targets)
+        if self._flush_timer is None:
+            self._flush_timer = async_call_later(
+                self.hass, COALESCE_WINDOW, self._async_window_closed
+            )
+
+    @callback
+    def _async_window_closed(self, _now: dt.datetime) -> None:
+        self._flush_timer = None
+        self._config_entry.async_create_task(
+            self.hass, self._async_flush(), "offdelay notifications"
+        )
+
+    async def _async_flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer()
+            self._flush_timer = None
+        queue, self._queue = self._queue, {}
+        batches: dict[str, list[Notification]] = defaultdict(list)
+        for notification, device_ids in queue.values():
+            for service in self._async_resolve(device_ids):
+                batches[service].append(notification)
+        await asyncio.gather(*itertools.starmap(self._async_send, batches.items()))
+
+    async def _async_send(
+        self, service: str, notifications: list[Notification]
+    ) -> None:
+        """Send the notifications of one device in the order they were queued."""
+        async with self._semaphore:
+            for notification in notifications:
+                try:
+                    await self.hass.services.async_call(
+                        NOTIFY_DOMAIN,
+                        service,
+                        notification.service_data(),
+                        blocking=True,
+                    )
+                except HomeAssistantError as err:
+                    LOGGER.warning(
+                        "Sending notification via %s failed: %s", service, err
+                    )
+
+    @callback
+    def _async_resolve(self, device_ids: tuple[str, ...] | None) -> list[str]:
+        """Return the notify services of the devices, without duplicates."""
+        if device_ids is None:
+            device_ids = tuple(self._async_mobile_app_devices())
+        services: dict[str, None] = {}
+        for device_id in device_ids:
+            if device_id not in self._services:
+                self._services[device_id] = self._async_notify_service(device_id)
+            if (service := self._services[device_id]) is not None:
+                services[service] = None
+        return list(services)
+
+    @callback
+    def _async_notify_service(self, device_id: str) -> str | None:
+        device = dr.async_get(self.hass).async_get(device_id)
+        if device is None or device.name is None:
+            LOGGER.warning("Cannot notify unknown device %s", device_id)
+            return None
+        return f"{MOBILE_APP_DOMAIN}_{slugify(device.name)}"
+
+    @callback
+    def _async_mobile_app_devices(self) -> list[str]:
+        if self._all_devices is None:
+            registry = dr.async_get(self.hass)
+            self._all_devices = [
+                device.id
+                for entry in self.hass.config_entries.async_entries(MOBILE_APP_DOMAIN)
+                for device in dr.async_entries_for_config_entry(
+                    registry, entry.entry_id
+                )
+            ]
+        return self._all_devices
+
+    @callback
+    def _async_registry_updated(
+        self, _event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        self._services.clear()
+        self._all_devices = None
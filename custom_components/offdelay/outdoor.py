@@ -0,0 +1,141 @@
+"""Streaming statistics of a local outdoor temperature sensor.
+
+Every reading updates the statistics in constant time, whatever the rate of
+the sensor:
+
+- an exponentially weighted moving average, weighted by the time between
+  readings so irregular reporting does not skew it;
+- the trend of that average in °C per hour, smoothed the same way;
+- the max and min of every :data:`BUCKET` of the last day, in a ring buffer
+  of :data:`BUCKETS` slots. A slot is reset when its bucket comes round
+  again, so old readings fall out without being removed one by one.
+
+The daily max and min scan the ring buffer, which is only done when the
+statistics are published, not for every reading.
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import timedelta
+import math
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN, UnitOfTemperature
+from homeassistant.util.unit_conversion import TemperatureConverter
+
+from .const import DATA_OUTDOOR_TEMP
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from homeassistant.core import State
+
+EWMA_TIME_CONSTANT = timedelta(minutes=30)
+TREND_TIME_CONSTANT = timedelta(hours=1)
+BUCKET = timedelta(minutes=15)
+BUCKETS = 96  # One day of buckets
+# Percentage of the measured max in the max the mode is decided on
+DEFAULT_OUTDOOR_WEIGHT = 50
+
+
+def temperature_from_state(state: State) -> float | None:
+    """Return the temperature of a sensor state in °C, if it has one."""
+    if state.state in {STATE_UNKNOWN, STATE_UNAVAILABLE}:
+        return None
+    try:
+        value = float(state.state)
+    except ValueError:
+        return None
+    unit = state.attributes.get("unit_of_measurement", UnitOfTemperature.CELSIUS)
+    if unit != UnitOfTemperature.CELSIUS and unit in TemperatureConverter.VALID_UNITS:
+        value = TemperatureConverter.convert(value, unit, UnitOfTemperature.CELSIUS)
+    return value if math.isfinite(value) else None
+
+
+def outdoor_temperature(data: Mapping[str, Any]) -> float | None:
+    """Return the outdoor temperature of the coordinator data.
+
+    That is the moving average of the outdoor sensor, or else the mean of
+    today's forecast max and min.
+    """
+    if (temperature := data.get(DATA_OUTDOOR_TEMP)) is not None:
+        return temperature
+    max_temp = data.get("weather_max_temp_today")
+    min_temp = data.get("weather_min_temp_today")
+    if max_temp is None or min_temp is None:
+        return None
+    return (max_temp + min_temp) / 2
+
+
+class OutdoorStats:
+    """Statistics of the outdoor temperature, updated per reading."""
+
+    __slots__ = (
+        "_bucket_ids",
+        "_bucket_max",
+        "_bucket_min",
+        "_last_time",
+        "ewma",
+        "readings",
+        "trend",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.ewma: float | None = None
+        # °C per hour
+        self.trend = 0.0
+        self.readings = 0
+        self._last_time: float | None = None
+        self._bucket_ids = array("q", [-1] * BUCKETS)
+        self._bucket_max = array("d", [math.nan] * BUCKETS)
+        self._bucket_min = array("d", [math.nan] * BUCKETS)
+
+    def add(self, value: float, when: float) -> None:
+        """Add a reading taken at POSIX time ``when``."""
+        self.readings += 1
+        if self.ewma is None or self._last_time is None:
+            self.ewma = value
+        else:
+            elapsed = max(when - self._last_time, 0.0)
+            previous = self.ewma
+            alpha = 1 - math.exp(-elapsed / EWMA_TIME_CONSTANT.total_seconds())
+            self.ewma += alpha * (value - self.ewma)
+            if elapsed > 0:
+                slope = (self.ewma - previous) / (elapsed / 3600)
+                beta = 1 - math.exp(-elapsed / TREND_TIME_CONSTANT.total_seconds())
+                self.trend += beta * (slope - self.trend)
+        self._last_time = when
+
+        bucket = int(when // BUCKET.total_seconds())
+        slot = bucket % BUCKETS
+        if self._bucket_ids[slot] != bucket:
+            self._bucket_ids[slot] = bucket
+            self._bucket_max[slot] = value
+            self._bucket_min[slot] = value
+        else:
+            self._bucket_max[slot] = max(self._bucket_max[slot], value)
+            self._bucket_min[slot] = min(self._bucket_min[slot], value)
+
+    def _recent_slots(self, now: float) -> list[int]:
+        oldest = int(now // BUCKET.total_seconds()) - BUCKETS
+        return [slot for slot, bucket in enumerate(self._bucket_ids) if bucket > oldest]
+
+    def daily_max(self, now: float) -> float | None:
+        """Return the max of the last day."""
+        slots = self._recent_slots(now)
+        return max(self._bucket_max[slot] for slot in slots) if slots else None
+
+    def daily_min(self, now: float) -> float | None:
+        """Return the min of the last day."""
+        slots = self._recent_slots(now)
+        return min(self._bucket_min[slot] for slot in slots) if slots else None
+
+    def stats(self) -> dict[str, Any]:
+        """Return the state of the statistics for diagnostics."""
+        return {
+            "readings": self.readings,
+            "ewma": self.ewma,
+            "trend": self.trend,
+        }
@@ -0,0 +1,195 @@
+"""Apply config entry changes in place instead of reloading the entry.
+
+A reload tears down every entity and listener, re-copies the blueprints,
+refetches the weather and resets the guest and vacation switches. Most
+changes do not need that: new thresholds, hours or tolerance only change
+how the cached data is evaluated, and new occupancy entities only change
+what is subscribed. The entry is compared with the snapshot
+taken when it was last applied and only the affected parts are updated.
+The entry is reloaded when the entities it provides change: when rooms or
+switches (subentries) change, or when the climates change, as every climate
+has a time to target sensor.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .blueprint import async_setup_blueprints
+from .const import (
+    CONF_API_URL,
+    CONF_BLUEPRINTS,
+    CONF_CLIMATE_ACTUATION,
+    CONF_CLIMATE_DAY_START_HOUR,
+    CONF_CLIMATE_DELTA_TOLERANCE,
+    CONF_CLIMATE_NIGHT_START_HOUR,
+    CONF_CLIMATE_SCHEDULE,
+    CONF_CLIMATES,
+    CONF_GUEST_TURN_OFF_DELAY,
+    CONF_GUEST_TURN_ON_DELAY,
+    CONF_HOURLY_FORECAST,
+    CONF_OCCUPANCY_SENSORS,
+    CONF_OUTDOOR_SENSOR,
+    CONF_OUTDOOR_WEIGHT,
+    CONF_SUMMER_MIN_TEMP,
+    CONF_TELEMETRY_URL,
+    CONF_WEATHER_ENTITIES,
+    CONF_WEATHER_STRATEGY,
+    CONF_WINTER_MAX_TEMP,
+    LOGGER,
+    SIGNAL_CONFIG_UPDATED,
+)
+from .telemetry import TelemetryUploader
+from .weather import STRATEGY_FIRST
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from homeassistant.core import HomeAssistant
+
+    from .data import OffdelayConfigEntry
+
+CLIMATE_KEYS = (
+    CONF_WINTER_MAX_TEMP,
+    CONF_SUMMER_MIN_TEMP,
+    CONF_CLIMATES,
+    CONF_CLIMATE_DELTA_TOLERANCE,
+    CONF_CLIMATE_DAY_START_HOUR,
+    CONF_CLIMATE_NIGHT_START_HOUR,
+    CONF_CLIMATE_SCHEDULE,
+)
+WEATHER_SOURCE_KEYS = (CONF_WEATHER_ENTITIES, CONF_WEATHER_STRATEGY)
+OUTDOOR_SENSOR_KEYS = (CONF_OUTDOOR_SENSOR, CONF_OUTDOOR_WEIGHT)
+GUEST_KEYS = (
+    CONF_OCCUPANCY_SENSORS,
+    CONF_GUEST_TURN_ON_DELAY,
+    CONF_GUEST_TURN_OFF_DELAY,
+)
+
+
+def config_signal(entry_id: str) -> str:
+    """Return the dispatcher signal sent when the entry data changed in place."""
+    return f"{SIGNAL_CONFIG_UPDATED}_{entry_id}"
+
+
+@dataclass(frozen=True, slots=True)
+class EntrySnapshot:
+    """The configuration an entry was last applied with."""
+
+    data: Mapping[str, Any]
+    options: Mapping[str, Any]
+    subentries: Mapping[str, tuple[str, Mapping[str, Any]]]
+
+    @classmethod
+    def from_entry(cls, entry: OffdelayConfigEntry) -> EntrySnapshot:
+        """Take a snapshot of an entry."""
+        return cls(
+            data=entry.data,
+            options=entry.options,
+            subentries={
+                subentry_id: (subentry.title, subentry.data)
+                for subentry_id, subentry in entry.subentries.items()
+            },
+        )
+
+
+def _changed(
+    old: Mapping[str, Any], new: Mapping[str, Any], keys: Iterable[str]
+) -> bool:
+    return any(old.get(key) != new.get(key) for key in keys)
+
+
+@dataclass(frozen=True, slots=True)
+class EntryChanges:
+    """What changed between two snapshots of an entry."""
+
+    reload: bool = False
+    climate: bool = False
+    guest: bool = False
+    blueprints: bool = False
+    api: bool = False
+    telemetry: bool = False
+    weather: bool = False
+    outdoor: bool = False
+
+    @classmethod
+    def between(cls, old: EntrySnapshot, new: EntrySnapshot) -> EntryChanges:
+        """Compare two snapshots."""
+        known = {*CLIMATE_KEYS, *GUEST_KEYS}
+        return cls(
+            reload=(
+                old.subentries != new.subentries
+                # The time to target sensors exist per climate
+                or set(old.data.get(CONF_CLIMATES, []))
+                != set(new.data.get(CONF_CLIMATES, []))
+                # The day window and outdoor sensors only exist when enabled
+                or any(
+                    bool(old.options.get(key)) != bool(new.options.get(key))
+                    for key in (CONF_HOURLY_FORECAST, CONF_OUTDOOR_SENSOR)
+                )
+                # The actuator is only started when enabled
+                or bool(old.options.get(CONF_CLIMATE_ACTUATION))
+                != bool(new.options.get(CONF_CLIMATE_ACTUATION))
+                # Be safe with keys this module does not know about
+                or _changed(old.data, new.data, {*old.data, *new.data} - known)
+            ),
+            climate=_changed(old.data, new.data, CLIMATE_KEYS),
+            guest=_changed(old.data, new.data, GUEST_KEYS),
+            blueprints=_changed(old.options, new.options, (CONF_BLUEPRINTS,)),
+            api=_changed(old.options, new.options, (CONF_API_URL,)),
+            telemetry=_changed(old.options, new.options, (CONF_TELEMETRY_URL,)),
+            weather=_changed(old.options, new.options, WEATHER_SOURCE_KEYS),
+            outdoor=_changed(old.options, new.options, OUTDOOR_SENSOR_KEYS),
+        )
+
+
+async def async_apply_entry_update(
+    hass: HomeAssistant, entry: OffdelayConfigEntry
+) -> None:
+    """Apply the changes made to an entry, reloading it only if needed."""
+    runtime = entry.runtime_data
+    new = EntrySnapshot.from_entry(entry)
+    changes = EntryChanges.between(runtime.snapshot, new)
+    if changes.reload:
+        LOGGER.debug("Reloading %s, its entities changed", entry.title)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    runtime.snapshot = new
+    coordinator = runtime.coordinator
+
+    if changes.climate:
+        # Evaluate the cached weather again, without fetching it
+        coordinator.async_update_schedule()
+        coordinator.async_reevaluate()
+    if changes.guest:
+        async_dispatcher_send(hass, config_signal(entry.entry_id))
+    if changes.blueprints:
+        selected = entry.options.get(CONF_BLUEPRINTS)
+        await async_setup_blueprints(
+            hass, entry.entry_id, set(selected) if selected is not None else None
+        )
+    if changes.api:
+        coordinator.async_set_api_url(entry.options.get(CONF_API_URL))
+        await coordinator.async_request_refresh()
+    if changes.outdoor:
+        # Another sensor restarts the statistics, another weight only blends
+        coordinator.async_set_outdoor_sensor(entry.options.get(CONF_OUTDOOR_SENSOR))
+        coordinator.async_reevaluate()
+    if changes.weather:
+        coordinator.weather_sources.async_set_sources(
+            entry.options.get(CONF_WEATHER_ENTITIES, []),
+            entry.options.get(CONF_WEATHER_STRATEGY, STRATEGY_FIRST),
+        )
+        await coordinator.async_request_refresh()
+    if changes.api or changes.telemetry:
+        # The uploader may share the client of the coordinator
+        if runtime.telemetry is not None:
+            await runtime.telemetry.async_stop()
+        runtime.telemetry = TelemetryUploader.from_config_entry(
+            hass, entry, coordinator
+        )
+        if runtime.telemetry is not None:
+            await runtime.telemetry.async_start()
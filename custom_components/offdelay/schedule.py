@@ -0,0 +1,331 @@
+"""Weekly schedule of the day window of the climate mode logic.
+
+A schedule is a set of day windows, each on some weekdays with a start and
+an end to the minute. A window that does not end after it starts runs past
+midnight into the next day, so night shifts work. The windows are compiled
+once into a sorted table of the minutes of the week at which the day window
+starts or ends: whether it is day is a bisect of that table, and the next
+transition is the entry after it.
+
+A start or end can also be relative to sunrise or sunset, like
+``sunrise+1h``. Sun times are computed once a day with the astral helpers of
+Home Assistant and resolved into the table, so evaluating the schedule never
+looks at the sun. On days the sun does not rise or set, such windows are
+left out.
+
+Without a schedule the day and night start hours of the entry form the
+same window on every day.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import re
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET
+from homeassistant.helpers.sun import get_astral_event_date
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_CLIMATE_DAY_START_HOUR,
+    CONF_CLIMATE_NIGHT_START_HOUR,
+    CONF_CLIMATE_SCHEDULE,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from homeassistant.core import HomeAssistant
+
+MINUTES_PER_HOUR = 60
+MINUTES_PER_DAY = 24 * MINUTES_PER_HOUR
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+EVERY_DAY = frozenset(range(7))
+SUN_EVENTS = (SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET)
+
+_TIME = (
+    rf"(?:{'|'.join(SUN_EVENTS)})(?:[+-](?:\d+[hm]|\d{{1,2}}:\d{{2}}))?"
+    r"|\d{1,2}(?::\d{2})?"
+)
+_LINE = re.compile(
+    rf"(?:(?P<weekdays>.+?)\s+)?(?P<start>{_TIME})\s*-\s*(?P<end>{_TIME})"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SunTime:
+    """A time relative to sunrise or sunset."""
+
+    event: str
+    # Minutes after the event, negative before it
+    offset: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class DayWindow:
+    """A day window on some weekdays."""
+
+    # 0 is Monday
+    weekdays: frozenset[int]
+    # Minutes after midnight; an end not after the start is on the next day
+    start: int | SunTime
+    end: int | SunTime
+
+    @property
+    def uses_sun(self) -> bool:
+        """Return whether the window starts or ends relative to the sun."""
+        return isinstance(self.start, SunTime) or isinstance(self.end, SunTime)
+
+    def minutes(self, sun: Mapping[str, int | None]) -> tuple[int, int] | None:
+        """Return the start and end in minutes after midnight.
+
+        ``sun`` maps the sun events to minutes after midnight of the day.
+        Returns None if the sun does not rise or set that day.
+        """
+        start = _resolve(self.start, sun)
+        end = _resolve(self.end, sun)
+        if start is None or end is None:
+            return None
+        return start, end
+
+
+def _resolve(time: int | SunTime, sun: Mapping[str, int | None]) -> int | None:
+    if isinstance(time, int):
+        return time
+    if (minute := sun.get(time.event)) is None:
+        return None
+    return (minute + time.offset) % MINUTES_PER_DAY
+
+
+def sun_times(hass: HomeAssistant, day: date) -> dict[str, int | None]:
+    """Return the local minutes after midnight of sunrise and sunset on ``day``.
+
+    A sun event that does not happen that day, near the poles, is None.
+    """
+    times: dict[str, int | None] = {}
+    for event in SUN_EVENTS:
+        if (when := get_astral_event_date(hass, event, day)) is None:
+            times[event] = None
+            continue
+        local = dt_util.as_local(when)
+        times[event] = local.hour * MINUTES_PER_HOUR + local.minute
+    return times
+
+
+def _parse_weekdays(spec: str) -> frozenset[int]:
+    if spec in {"daily", "*"}:
+        return EVERY_DAY
+    weekdays: set[int] = set()
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        if first not in WEEKDAYS or (last and last not in WEEKDAYS):
+            msg = f"Unknown weekday in {part!r}"
+            raise ValueError(msg)
+        start = WEEKDAYS.index(first)
+        # A range like fri-mon wraps around the weekend
+        length = (WEEKDAYS.index(last) - start) % 7 if last else 0
+        weekdays.update((start + offset) % 7 for offset in range(length + 1))
+    return frozenset(weekdays)
+
+
+def _parse_minutes(spec: str) -> int:
+    if spec[-1] in "hm":
+        return int(spec[:-1]) * (MINUTES_PER_HOUR if spec[-1] == "h" else 1)
+    hours, _, minutes = spec.partition(":")
+    if int(minutes) >= MINUTES_PER_HOUR:
+        msg = f"Invalid offset {spec!r}"
+        raise ValueError(msg)
+    return int(hours) * MINUTES_PER_HOUR + int(minutes)
+
+
+def _parse_time(spec: str) -> int | SunTime:
+    for event in SUN_EVENTS:
+        if spec.startswith(event):
+            offset = spec.removeprefix(event)
+            if not offset:
+                return SunTime(event)
+            minutes = _parse_minutes(offset[1:])
+            return SunTime(event, minutes if offset[0] == "+" else -minutes)
+    hours, _, minutes = spec.partition(":")
+    minutes = minutes or "0"
+    if not (
+        hours.isdigit()
+        and minutes.isdigit()
+        and int(minutes) < MINUTES_PER_HOUR
+        and int(hours) * MINUTES_PER_HOUR + int(minutes) <= MINUTES_PER_DAY
+    ):
+        msg = f"Invalid time {spec!r}"
+        raise ValueError(msg)
+    return (int(hours) * MINUTES_PER_HOUR + int(minutes)) % MINUTES_PER_DAY
+
+
+def parse_schedule(text: str) -> list[DayWindow]:
+    """Parse one window per line, like ``mon-fri 07:30-22:00``.
+
+    Times are ``HH:MM``, or ``sunrise`` and ``sunset`` with an optional
+    offset like ``sunset-1h``, ``sunrise+30m`` or ``sunset+1:30``.
+
+    Raises:
+        ValueError: If a line is not a valid window.
+
+    """
+    windows: list[DayWindow] = []
+    for raw_line in text.lower().splitlines():
+        if not (line := raw_line.strip()):
+            continue
+        if (match := _LINE.fullmatch(line)) is None:
+            msg = f"Expected weekdays and a time range in {raw_line!r}"
+            raise ValueError(msg)
+        weekdays = (match["weekdays"] or "daily").replace(" ", "")
+        windows.append(
+            DayWindow(
+                _parse_weekdays(weekdays),
+                _parse_time(match["start"]),
+                _parse_time(match["end"]),
+            )
+        )
+    return windows
+
+
+def windows_from_config(data: Mapping[str, Any]) -> list[DayWindow]:
+    """Return the day windows of the entry data, or the one of its hours."""
+    if text := data.get(CONF_CLIMATE_SCHEDULE):
+        return parse_schedule(text)
+    day_start = int(data.get(CONF_CLIMATE_DAY_START_HOUR, 8))
+    night_start = int(data.get(CONF_CLIMATE_NIGHT_START_HOUR, 17))
+    return [
+        DayWindow(
+            EVERY_DAY, day_start * MINUTES_PER_HOUR, night_start * MINUTES_PER_HOUR
+        )
+    ]
+
+
+def _minute_of_week(now: datetime) -> int:
+    return now.weekday() * MINUTES_PER_DAY + now.hour * MINUTES_PER_HOUR + now.minute
+
+
+class WeeklySchedule:
+    """Day windows compiled into a sorted weekly table of transitions."""
+
+    __slots__ = ("_is_day", "_minutes", "always_day")
+
+    def __init__(
+        self,
+        windows: Iterable[DayWindow],
+        sun: Mapping[str, int | None] | None = None,
+    ) -> None:
+        """Compile the windows, merging the ones that overlap.
+
+        Windows relative to the sun are placed at the sun times of ``sun``,
+        the same on every weekday.
+        """
+        pieces: list[tuple[int, int]] = []
+        for window in windows:
+            if (minutes := window.minutes(sun or {})) is None:
+                continue
+            window_start, window_end = minutes
+            length = (window_end - window_start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+            for weekday in window.weekdays:
+                start = weekday * MINUTES_PER_DAY + window_start
+                end = start + length
+                # A window past the end of the week goes on at its start
+                if end > MINUTES_PER_WEEK:
+                    pieces.extend(
+                        ((start, MINUTES_PER_WEEK), (0, end - MINUTES_PER_WEEK))
+                    )
+                else:
+                    pieces.append((start, end))
+        merged: list[list[int]] = []
+        for start, end in sorted(pieces):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        # A window running over the end of the week into one at its start
+        if len(merged) > 1 and merged[0][0] == 0 and merged[-1][1] == MINUTES_PER_WEEK:
+            merged[0][0] = merged.pop()[0]
+
+        self.always_day = merged == [[0, MINUTES_PER_WEEK]]
+        transitions: list[tuple[int, bool]] = []
+        if not self.always_day:
+            for start, end in merged:
+                transitions.extend(((start, True), (end % MINUTES_PER_WEEK, False)))
+            transitions.sort()
+        self._minutes = [minute for minute, _ in transitions]
+        self._is_day = [is_day for _, is_day in transitions]
+
+    def __len__(self) -> int:
+        """Return the number of transitions in a week."""
+        return len(self._minutes)
+
+    def _index(self, minute: int) -> int:
+        """Return the index of the last transition at or before ``minute``."""
+        # -1 is the last transition of the week before
+        return bisect_right(self._minutes, minute) - 1
+
+    def is_day(self, now: datetime) -> bool:
+        """Return whether ``now`` is inside a day window."""
+        if not self._minutes:
+            return self.always_day
+        return self._is_day[self._index(_minute_of_week(now))]
+
+    def _following(self, index: int, after: int) -> int:
+        """Return the minute of transition ``index`` after minute ``after``.
+
+        Minutes count from the start of the current week and go on past
+        its end.
+        """
+        minute = self._minutes[index % len(self._minutes)]
+        while minute <= after:
+            minute += MINUTES_PER_WEEK
+        return minute
+
+    @staticmethod
+    def _time_of(now: datetime, minute: int) -> datetime:
+        return now.replace(second=0, microsecond=0) + timedelta(
+            minutes=minute - _minute_of_week(now)
+        )
+
+    def next_transition(self, now: datetime) -> datetime | None:
+        """Return when the day window next starts or ends."""
+        if not self._minutes:
+            return None
+        now_minute = _minute_of_week(now)
+        return self._time_of(
+            now, self._following(self._index(now_minute) + 1, now_minute)
+        )
+
+    def window(self, now: datetime) -> tuple[datetime, datetime] | None:
+        """Return the current day window, or the next one outside of one."""
+        if not self._minutes:
+            if not self.always_day:
+                return None
+            midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            return midnight, midnight + timedelta(days=1)
+        now_minute = _minute_of_week(now)
+        index = self._index(now_minute)
+        if self._is_day[index]:
+            start = self._minutes[index]
+            if start > now_minute:
+                start -= MINUTES_PER_WEEK
+        else:
+            index += 1
+            start = self._following(index, now_minute)
+        end = self._following(index + 1, start)
+        return self._time_of(now, start), self._time_of(now, end)
+
+    def stats(self) -> list[str]:
+        """Return the transitions of the week for diagnostics."""
+        if not self._minutes:
+            return ["always day" if self.always_day else "always night"]
+        return [
+            f"{WEEKDAYS[minute // MINUTES_PER_DAY]} "
+            f"{minute % MINUTES_PER_DAY // 60:02d}:{minute % 60:02d} "
+            f"{'day' if is_day else 'night'}"
+            for minute, is_day in zip(self._minutes, self._is_day, strict=True)
+        ]
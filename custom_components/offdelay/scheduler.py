@@ -0,0 +1,161 @@
+"""Shared deadline scheduler for Offdelay.
+
+Off-delays, auto turn-offs and long presses all boil down to "run this at
+that time unless it is rescheduled first". Instead of one Home Assistant
+timer per pending deadline, the scheduler keeps every deadline in a heap
+and arms a single timer for the earliest one.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import heapq
+import itertools
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+    import datetime as dt
+
+
+@dataclass(slots=True)
+class _Deadline:
+    when: dt.datetime
+    action: Callable[[], Any]
+    seq: int
+
+
+class DeadlineScheduler:
+    """Run callbacks at deadlines using one timer.
+
+    Every deadline has a key. Scheduling a key again replaces its deadline
+    (restart), :meth:`async_extend` only moves it later. Replaced entries stay
+    in the heap and are skipped when they surface.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._deadlines: dict[Hashable, _Deadline] = {}
+        self._heap: list[tuple[dt.datetime, int, Hashable]] = []
+        self._counter = itertools.count()
+        self._timer: CALLBACK_TYPE | None = None
+        self._timer_when: dt.datetime | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    def __len__(self) -> int:
+        """Return the number of pending deadlines."""
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if ``key`` has a pending deadline."""
+        return key in self._deadlines
+
+    def deadline(self, key: Hashable) -> dt.datetime | None:
+        """Return the pending deadline of ``key``."""
+        entry = self._deadlines.get(key)
+        return entry.when if entry is not None else None
+
+    def deadlines(self) -> dict[Hashable, dt.datetime]:
+        """Return every pending deadline by key."""
+        return {key: entry.when for key, entry in self._deadlines.items()}
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for changes of the pending deadlines."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_schedule(
+        self, key: Hashable, when: dt.datetime, action: Callable[[], Any]
+    ) -> None:
+        """Run ``action`` at ``when``, replacing the deadline of ``key``."""
+        seq = next(self._counter)
+        self._deadlines[key] = _Deadline(when, action, seq)
+        heapq.heappush(self._heap, (when, seq, key))
+        self._async_arm()
+        self._async_notify()
+
+    @callback
+    def async_extend(
+        self, key: Hashable, when: dt.datetime, action: Callable[[], Any]
+    ) -> None:
+        """Schedule ``key`` unless its pending deadline is already later."""
+        entry = self._deadlines.get(key)
+        if entry is not None and entry.when >= when:
+            entry.action = action
+            return
+        self.async_schedule(key, when, action)
+
+    @callback
+    def async_cancel(self, key: Hashable) -> bool:
+        """Cancel the deadline of ``key``, return True if there was one."""
+        if self._deadlines.pop(key, None) is None:
+            return False
+        self._async_notify()
+        return True
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop every deadline and the timer."""
+        self._deadlines.clear()
+        self._heap.clear()
+        self._async_cancel_timer()
+
+    def _is_current(self, seq: int, key: Hashable) -> bool:
+        entry = self._deadlines.get(key)
+        return entry is not None and entry.seq == seq
+
+    @callback
+    def _async_arm(self) -> None:
+        """Point the timer at the earliest live deadline."""
+        while self._heap and not self._is_current(self._heap[0][1], self._heap[0][2]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._async_cancel_timer()
+            return
+        when = self._heap[0][0]
+        if self._timer is not None and self._timer_when == when:
+            return
+        self._async_cancel_timer()
+        self._timer_when = when
+        self._timer = async_track_point_in_utc_time(self.hass, self._async_fire, when)
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer()
+        self._timer = None
+        self._timer_when = None
+
+    @callback
+    def _async_fire(self, now: dt.datetime) -> None:
+        """Run every action that is due and re-arm the timer."""
+        self._timer = None
+        self._timer_when = None
+        now = max(now, dt_util.utcnow())
+        due: list[Callable[[], Any]] = []
+        while self._heap and self._heap[0][0] <= now:
+            _when, seq, key = heapq.heappop(self._heap)
+            if self._is_current(seq, key):
+                due.append(self._deadlines.pop(key).action)
+        self._async_arm()
+        if due:
+            self._async_notify()
+        for action in due:
+            action()
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
@@ -2,23 +2,60 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import (
+    ATTR_FRIENDLY_NAME,
+    PERCENTAGE,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import callback, split_entity_id
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .const import CONF_CLIMATES, DATA_CLIMATE_MAX_NEG_DELTA, DATA_CLIMATE_MAX_POS_DELTA
+from .accuracy import LEAD_TODAY, LEAD_TOMORROW, QUANTITY_MAX, QUANTITY_MIN
+from .const import (
+    ATTRIBUTION,
+    CONF_CLIMATES,
+    CONF_HOURLY_FORECAST,
+    CONF_OUTDOOR_SENSOR,
+    DATA_CLIMATE_MAX_NEG_DELTA,
+    DATA_CLIMATE_MAX_POS_DELTA,
+    DATA_OUTDOOR_MAX,
+    DATA_OUTDOOR_MIN,
+    DATA_OUTDOOR_TEMP,
+    DATA_OUTDOOR_TREND,
+    DATA_WEATHER_STALE,
+    DATA_WINDOW_CLOUD_COVERAGE,
+    DATA_WINDOW_HOURS_ABOVE,
+    DATA_WINDOW_HOURS_BELOW,
+    DATA_WINDOW_MAX_TEMP,
+    DATA_WINDOW_MEAN_TEMP,
+    DOMAIN,
+)
+from .degree_days import COOLING_MONTH, COOLING_TODAY, HEATING_MONTH, HEATING_TODAY
 from .entity import OffdelayEntity
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
-    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
+    from .accuracy import ErrorStats, ForecastAccuracyTracker
+    from .coordinator import OffdelayDataUpdateCoordinator
     from .data import OffdelayConfigEntry
+    from .degree_days import DegreeDayTracker
+    from .heating import HeatingController, HeatingRoom
+    from .scheduler import DeadlineScheduler
+    from .sites import Site, SiteEngine
+    from .thermal import ThermalModels
 
 ENTITY_DESCRIPTIONS = (
     SensorEntityDescription(
@@ -47,6 +84,13 @@ ENTITY_DESCRIPTIONS = (
     ),
 )
 
+AUTO_TURN_OFF_PENDING_DESCRIPTION = SensorEntityDescription(
+    key="auto_turn_off_pending",
+    translation_key="auto_turn_off_pending",
+    state_class=SensorStateClass.MEASUREMENT,
+    icon="mdi:timer-outline",
+)
+
 CLIMATE_ENTITY_DESCRIPTIONS = (
     SensorEntityDescription(
         key=DATA_CLIMATE_MAX_POS_DELTA,
@@ -64,23 +108,219 @@ CLIMATE_ENTITY_DESCRIPTIONS = (
     ),
 )
 
+WINDOW_ENTITY_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key=DATA_WINDOW_MAX_TEMP,
+        translation_key=DATA_WINDOW_MAX_TEMP,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+    SensorEntityDescription(
+        key=DATA_WINDOW_MEAN_TEMP,
+        translation_key=DATA_WINDOW_MEAN_TEMP,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+    SensorEntityDescription(
+        key=DATA_WINDOW_HOURS_ABOVE,
+        translation_key=DATA_WINDOW_HOURS_ABOVE,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        icon="mdi:thermometer-chevron-up",
+    ),
+    SensorEntityDescription(
+        key=DATA_WINDOW_HOURS_BELOW,
+        translation_key=DATA_WINDOW_HOURS_BELOW,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        icon="mdi:thermometer-chevron-down",
+    ),
+    SensorEntityDescription(
+        key=DATA_WINDOW_CLOUD_COVERAGE,
+        translation_key=DATA_WINDOW_CLOUD_COVERAGE,
+        native_unit_of_measurement=PERCENTAGE,
+        icon="mdi:weather-cloudy",
+    ),
+)
+
+OUTDOOR_ENTITY_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key=DATA_OUTDOOR_TEMP,
+        translation_key=DATA_OUTDOOR_TEMP,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+    SensorEntityDescription(
+        key=DATA_OUTDOOR_MAX,
+        translation_key=DATA_OUTDOOR_MAX,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+    SensorEntityDescription(
+        key=DATA_OUTDOOR_MIN,
+        translation_key=DATA_OUTDOOR_MIN,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+    SensorEntityDescription(
+        key=DATA_OUTDOOR_TREND,
+        translation_key=DATA_OUTDOOR_TREND,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="°C/h",
+        icon="mdi:chart-line-variant",
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class AccuracySensorEntityDescription(SensorEntityDescription):
+    """Describes a forecast accuracy sensor."""
+
+    lead: str
+    # "bias" or "mae" of the forecast errors
+    statistic: str
+
+
+ACCURACY_ENTITY_DESCRIPTIONS = tuple(
+    AccuracySensorEntityDescription(
+        key=f"forecast_{statistic}_{lead}",
+        translation_key=f"forecast_{statistic}_{lead}",
+        lead=lead,
+        statistic=statistic,
+        state_class=SensorStateClass.MEASUREMENT,
+        # A temperature difference, which must not be converted like one
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=2,
+        icon="mdi:bullseye-arrow",
+    )
+    for lead in (LEAD_TODAY, LEAD_TOMORROW)
+    for statistic in ("bias", "mae")
+)
+
+DEGREE_DAY_ENTITY_DESCRIPTIONS = tuple(
+    SensorEntityDescription(
+        key=key,
+        translation_key=key,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement="°C·d",
+        suggested_display_precision=2,
+        icon=icon,
+    )
+    for key, icon in (
+        (HEATING_TODAY, "mdi:radiator"),
+        (COOLING_TODAY, "mdi:snowflake-thermometer"),
+        (HEATING_MONTH, "mdi:radiator"),
+        (COOLING_MONTH, "mdi:snowflake-thermometer"),
+    )
+)
+
 
 async def async_setup_entry(  # noqa: RUF029
     hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
     entry: OffdelayConfigEntry,
-    async_add_entities: AddEntitiesCallback,
+    async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    descriptions = list(ENTITY_DESCRIPTIONS)
-    if entry.data.get(CONF_CLIMATES):
-        descriptions.extend(CLIMATE_ENTITY_DESCRIPTIONS)
     async_add_entities(
-        OffdelaySensor(
+        WeatherSensor(
             coordinator=entry.runtime_data.coordinator,
             entity_description=entity_description,
         )
-        for entity_description in descriptions
+        for entity_description in ENTITY_DESCRIPTIONS
     )
+    if entry.data.get(CONF_CLIMATES):
+        async_add_entities(
+            OffdelaySensor(
+                coordinator=entry.runtime_data.coordinator,
+                entity_description=entity_description,
+            )
+            for entity_description in CLIMATE_ENTITY_DESCRIPTIONS
+        )
+    if entry.options.get(CONF_HOURLY_FORECAST):
+        async_add_entities(
+            OffdelaySensor(
+                coordinator=entry.runtime_data.coordinator,
+                entity_description=entity_description,
+            )
+            for entity_description in WINDOW_ENTITY_DESCRIPTIONS
+        )
+    if entry.options.get(CONF_OUTDOOR_SENSOR):
+        async_add_entities(
+            OffdelaySensor(
+                coordinator=entry.runtime_data.coordinator,
+                entity_description=entity_description,
+            )
+            for entity_description in OUTDOOR_ENTITY_DESCRIPTIONS
+        )
+
+    accuracy = entry.runtime_data.accuracy
+    if accuracy is not None:
+        async_add_entities(
+            ForecastAccuracySensor(
+                coordinator=entry.runtime_data.coordinator,
+                entity_description=entity_description,
+                tracker=accuracy,
+            )
+            for entity_description in ACCURACY_ENTITY_DESCRIPTIONS
+        )
+
+    degree_days = entry.runtime_data.degree_days
+    if degree_days is not None:
+        async_add_entities(
+            DegreeDaySensor(
+                coordinator=entry.runtime_data.coordinator,
+                entity_description=entity_description,
+                tracker=degree_days,
+            )
+            for entity_description in DEGREE_DAY_ENTITY_DESCRIPTIONS
+        )
+
+    thermal = entry.runtime_data.thermal
+    if thermal is not None:
+        async_add_entities(
+            TimeToTargetSensor(
+                coordinator=entry.runtime_data.coordinator,
+                entity_description=SensorEntityDescription(
+                    key=f"time_to_target_{entity_id}",
+                    translation_key="time_to_target",
+                    device_class=SensorDeviceClass.DURATION,
+                    state_class=SensorStateClass.MEASUREMENT,
+                    native_unit_of_measurement=UnitOfTime.MINUTES,
+                    suggested_display_precision=0,
+                    icon="mdi:timer-sand",
+                ),
+                models=thermal,
+                climate=entity_id,
+            )
+            for entity_id in thermal.models
+        )
+
+    auto_turn_off = entry.runtime_data.auto_turn_off
+    if auto_turn_off is not None:
+        async_add_entities(
+            [
+                AutoTurnOffPendingSensor(
+                    coordinator=entry.runtime_data.coordinator,
+                    entity_description=AUTO_TURN_OFF_PENDING_DESCRIPTION,
+                    scheduler=auto_turn_off.scheduler,
+                )
+            ]
+        )
+
+    heating = entry.runtime_data.heating
+    if heating is not None:
+        for room in heating.rooms.values():
+            async_add_entities(
+                [HeatingTargetSensor(entry, heating, room)],
+                config_subentry_id=room.room_id,
+            )
+
+    sites = entry.runtime_data.sites
+    if sites is not None:
+        for site in sites.sites.values():
+            async_add_entities(
+                [SiteClimateModeSensor(entry, sites, site)],
+                config_subentry_id=site.site_id,
+            )
 
 
 class OffdelaySensor(OffdelayEntity, SensorEntity):
@@ -90,3 +330,277 @@ class OffdelaySensor(OffdelayEntity, SensorEntity):
     def native_value(self) -> float | int | str | None:
         """Return the native value of the sensor."""
         return self.coordinator.data.get(self.entity_description.key)
+
+
+class WeatherSensor(OffdelaySensor):
+    """Forecast temperature, kept while the weather source is failing."""
+
+    @property
+    def extra_state_attributes(self) -> dict[str, bool]:
+        """Return whether the value comes from an older forecast."""
+        return {"stale": bool(self.coordinator.data.get(DATA_WEATHER_STALE))}
+
+
+class AutoTurnOffPendingSensor(OffdelayEntity, SensorEntity):
+    """Number of entities waiting for offdelay.auto_turn_off."""
+
+    def __init__(
+        self,
+        coordinator: OffdelayDataUpdateCoordinator,
+        entity_description: SensorEntityDescription,
+        scheduler: DeadlineScheduler,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entity_description)
+        self._scheduler = scheduler
+        self._write_scheduled = False
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the pending deadlines."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._scheduler.async_add_listener(self._async_deadlines_changed)
+        )
+
+    @callback
+    def _async_deadlines_changed(self) -> None:
+        # A single service call can schedule hundreds of entities, write once
+        if not self._write_scheduled:
+            self._write_scheduled = True
+            self.hass.loop.call_soon(self._async_write_pending)
+
+    @callback
+    def _async_write_pending(self) -> None:
+        self._write_scheduled = False
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of pending deadlines."""
+        return len(self._scheduler)
+
+
+class ForecastAccuracySensor(OffdelayEntity, SensorEntity):
+    """Bias or mean absolute error of the max temperature forecast."""
+
+    entity_description: AccuracySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: OffdelayDataUpdateCoordinator,
+        entity_description: AccuracySensorEntityDescription,
+        tracker: ForecastAccuracyTracker,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entity_description)
+        self._tracker = tracker
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the days the errors are updated."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self._tracker.signal, self.async_write_ha_state
+            )
+        )
+
+    def _value(self, errors: ErrorStats) -> float | None:
+        if self.entity_description.statistic == "bias":
+            return errors.bias
+        return errors.mae
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the statistic of the max temperature forecast."""
+        return self._value(
+            self._tracker.errors[self.entity_description.lead][QUANTITY_MAX]
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | int | None]:
+        """Return the statistic of the min temperature forecast."""
+        errors = self._tracker.errors[self.entity_description.lead]
+        return {
+            "days": errors[QUANTITY_MAX].count,
+            f"min_temp_{self.entity_description.statistic}": self._value(
+                errors[QUANTITY_MIN]
+            ),
+        }
+
+
+class DegreeDaySensor(OffdelayEntity, SensorEntity):
+    """Heating or cooling degree-days of today or this month."""
+
+    def __init__(
+        self,
+        coordinator: OffdelayDataUpdateCoordinator,
+        entity_description: SensorEntityDescription,
+        tracker: DegreeDayTracker,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entity_description)
+        self._tracker = tracker
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the resets of the totals."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self._tracker.signal, self.async_write_ha_state
+            )
+        )
+
+    @property
+    def native_value(self) -> float:
+        """Return the total of the period."""
+        return self._tracker.totals[self.entity_description.key]
+
+
+class TimeToTargetSensor(OffdelayEntity, SensorEntity):
+    """Minutes a climate is predicted to need to reach its target."""
+
+    def __init__(
+        self,
+        coordinator: OffdelayDataUpdateCoordinator,
+        entity_description: SensorEntityDescription,
+        models: ThermalModels,
+        climate: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entity_description)
+        self._models = models
+        self._climate = climate
+        state = coordinator.hass.states.get(climate)
+        self._attr_translation_placeholders = {
+            "climate": (
+                state.attributes.get(ATTR_FRIENDLY_NAME)
+                if state is not None and ATTR_FRIENDLY_NAME in state.attributes
+                else split_entity_id(climate)[1].replace("_", " ").title()
+            )
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the state changes of the climate."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self._models.signal(self._climate), self.async_write_ha_state
+            )
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the predicted minutes to the target temperature."""
+        return self._models.minutes_to_target(self._climate)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, str | int]:
+        """Return the climate and how many samples the model has."""
+        return {
+            "climate": self._climate,
+            "samples": self._models.models[self._climate].samples,
+        }
+
+
+class HeatingTargetSensor(SensorEntity):
+    """Target temperature the heating controller computed for a room."""
+
+    _attr_attribution = ATTRIBUTION
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_translation_key = "heating_target"
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+
+    def __init__(
+        self,
+        config_entry: OffdelayConfigEntry,
+        heating: HeatingController,
+        room: HeatingRoom,
+    ) -> None:
+        """Initialize the sensor."""
+        self._heating = heating
+        self._room_id = room.room_id
+        self._attr_unique_id = f"{config_entry.entry_id}_{room.room_id}_heating_target"
+        self._attr_device_info = DeviceInfo(
+            name=room.name,
+            identifiers={(DOMAIN, room.room_id)},
+            manufacturer="Offdelay",
+            model="Heating Room",
+            via_device=(DOMAIN, config_entry.entry_id),
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to target updates."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._heating.signal(self._room_id),
+                self._async_target_updated,
+            )
+        )
+
+    @callback
+    def _async_target_updated(self) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the target temperature of the room."""
+        return self._heating.targets.get(self._room_id)
+
+
+class SiteClimateModeSensor(SensorEntity):
+    """Climate mode the site engine computed for a site."""
+
+    _attr_attribution = ATTRIBUTION
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_translation_key = "site_climate_mode"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_icon = "mdi:sun-snowflake-variant"
+
+    def __init__(
+        self,
+        config_entry: OffdelayConfigEntry,
+        engine: SiteEngine,
+        site: Site,
+    ) -> None:
+        """Initialize the sensor."""
+        self._engine = engine
+        self._site_id = site.site_id
+        self._attr_unique_id = (
+            f"{config_entry.entry_id}_{site.site_id}_site_climate_mode"
+        )
+        self._attr_device_info = site.device_info(config_entry.entry_id)
+        self._attr_options = ["winter", "summer", "none"]
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to site updates."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._engine.signal(self._site_id),
+                self._async_site_updated,
+            )
+        )
+
+    @callback
+    def _async_site_updated(self) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the climate mode of the site."""
+        state = self._engine.states[self._site_id]
+        return state.climate_mode if state.last_refresh is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float]:
+        """Return the forecast the mode was computed from."""
+        weather = self._engine.weather(self._site_id)
+        return {
+            key: weather[key]
+            for key in ("weather_max_temp_today", "weather_min_temp_today")
+            if key in weather
+        }
@@ -0,0 +1,117 @@
+"""Services for offdelay."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.const import ATTR_DEVICE_ID, ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+
+from .auto_turn_off import MODE_EXTEND, MODE_RESTART
+from .const import DOMAIN
+from .notifications import Notification
+
+if TYPE_CHECKING:
+    import datetime as dt
+
+    from .data import OffdelayConfigEntry
+
+SERVICE_AUTO_TURN_OFF = "auto_turn_off"
+SERVICE_NOTIFY = "notify"
+
+ATTR_DURATION = "duration"
+ATTR_ENTITIES = "entities"
+ATTR_MODE = "mode"
+ATTR_TURN_ON = "turn_on"
+ATTR_MESSAGE = "message"
+ATTR_TITLE = "title"
+ATTR_TAG = "tag"
+ATTR_DATA = "data"
+
+AUTO_TURN_OFF_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Inclusive(ATTR_ENTITY_ID, "entity_duration"): cv.entity_ids,
+            vol.Inclusive(ATTR_DURATION, "entity_duration"): cv.positive_time_period,
+            vol.Optional(ATTR_ENTITIES): [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+                        vol.Required(ATTR_DURATION): cv.positive_time_period,
+                    }
+                )
+            ],
+            vol.Optional(ATTR_MODE, default=MODE_RESTART): vol.In(
+                [MODE_RESTART, MODE_EXTEND]
+            ),
+            vol.Optional(ATTR_TURN_ON, default=True): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_ENTITIES),
+)
+
+NOTIFY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_MESSAGE): cv.string,
+        vol.Optional(ATTR_TITLE): cv.string,
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_TAG): cv.string,
+        vol.Optional(ATTR_DATA, default=dict): dict,
+    }
+)
+
+
+def _loaded_entry(hass: HomeAssistant) -> OffdelayConfigEntry:
+    entries: list[OffdelayConfigEntry] = hass.config_entries.async_loaded_entries(
+        DOMAIN
+    )
+    if not entries:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="not_loaded"
+        )
+    return entries[0]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the offdelay services."""
+
+    @callback
+    def async_auto_turn_off(call: ServiceCall) -> None:
+        """Turn entities on and schedule them to turn off."""
+        durations: dict[str, dt.timedelta] = dict.fromkeys(
+            call.data.get(ATTR_ENTITY_ID, []), call.data.get(ATTR_DURATION)
+        )
+        for item in call.data.get(ATTR_ENTITIES, []):
+            durations[item[ATTR_ENTITY_ID]] = item[ATTR_DURATION]
+        manager = _loaded_entry(hass).runtime_data.auto_turn_off
+        manager.async_turn_off_later(
+            durations, mode=call.data[ATTR_MODE], turn_on=call.data[ATTR_TURN_ON]
+        )
+
+    @callback
+    def async_notify(call: ServiceCall) -> None:
+        """Queue a notification."""
+        dispatcher = _loaded_entry(hass).runtime_data.notifications
+        dispatcher.async_queue(
+            Notification(
+                message=call.data[ATTR_MESSAGE],
+                title=call.data.get(ATTR_TITLE),
+                tag=call.data.get(ATTR_TAG),
+                data=call.data[ATTR_DATA],
+            ),
+            call.data.get(ATTR_DEVICE_ID),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_AUTO_TURN_OFF,
+        async_auto_turn_off,
+        schema=AUTO_TURN_OFF_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_NOTIFY, async_notify, schema=NOTIFY_SCHEMA
+    )
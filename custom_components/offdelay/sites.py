@@ -0,0 +1,251 @@
+"""Fleet mode: many sites served by one Offdelay engine.
+
+The entry itself models the property around ``zone.home``. Every site
+(config subentry) models another one with its own zone, near zone, weather
+entity, climates and occupancy sensors, and shares the thresholds and day
+window of the entry. Per-site state is kept in its own shard, so a refresh
+only touches that site.
+
+Refreshes are spread evenly over :data:`REFRESH_INTERVAL` and run on the
+shared deadline scheduler, so fifty sites do not all fetch in the same
+second, and at most :data:`MAX_CONCURRENT_FETCHES` weather fetches run at
+the same time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import datetime as dt
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_CLIMATES,
+    CONF_NEAR_ZONE,
+    CONF_OCCUPANCY_SENSORS,
+    CONF_WEATHER_ENTITY,
+    CONF_ZONE,
+    DOMAIN,
+    LOGGER,
+    SIGNAL_SITE_UPDATED,
+    SUBENTRY_SITE,
+)
+from .scheduler import DeadlineScheduler
+from .weather import async_fetch_daily_forecast
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigSubentry
+
+    from .coordinator import OffdelayDataUpdateCoordinator
+    from .data import OffdelayConfigEntry
+
+REFRESH_INTERVAL = dt.timedelta(hours=1)
+MAX_CONCURRENT_FETCHES = 4
+FETCH_TIMEOUT = 30
+
+
+@dataclass(frozen=True, slots=True)
+class Site:
+    """Configuration of one site."""
+
+    site_id: str
+    name: str
+    zone: str
+    near_zone: str | None = None
+    weather_entity: str | None = None
+    climates: tuple[str, ...] = ()
+    occupancy_sensors: tuple[str, ...] = ()
+
+    @classmethod
+    def from_subentry(cls, subentry: ConfigSubentry) -> Site:
+        """Build a site from its config subentry."""
+        data = subentry.data
+        return cls(
+            site_id=subentry.subentry_id,
+            name=subentry.title,
+            zone=data[CONF_ZONE],
+            near_zone=data.get(CONF_NEAR_ZONE) or None,
+            weather_entity=data.get(CONF_WEATHER_ENTITY) or None,
+            climates=tuple(data.get(CONF_CLIMATES, [])),
+            occupancy_sensors=tuple(data.get(CONF_OCCUPANCY_SENSORS, [])),
+        )
+
+    def device_info(self, entry_id: str) -> DeviceInfo:
+        """Return the device the entities of the site belong to."""
+        return DeviceInfo(
+            name=self.name,
+            identifiers={(DOMAIN, self.site_id)},
+            manufacturer="Offdelay",
+            model="Site",
+            via_device=(DOMAIN, entry_id),
+        )
+
+
+@dataclass(slots=True)
+class SiteState:
+    """What the engine knows about one site."""
+
+    weather: dict[str, float] = field(default_factory=dict)
+    climate_mode: str = "none"
+    last_refresh: dt.datetime | None = None
+    last_error: str | None = None
+
+
+class SiteEngine:
+    """Refresh and evaluate every site of an entry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+        sites: list[Site],
+    ) -> None:
+        """Initialize the engine."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self._coordinator = coordinator
+        self.sites: dict[str, Site] = {site.site_id: site for site in sites}
+        self.states: dict[str, SiteState] = {
+            site.site_id: SiteState() for site in sites
+        }
+        self._scheduler = DeadlineScheduler(hass)
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        # Refresh slot of every site, relative to the start of the interval
+        self._slots: dict[str, dt.datetime] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @classmethod
+    def from_config_entry(
+        cls,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+    ) -> SiteEngine | None:
+        """Create an engine for the sites of an entry, if any."""
+        sites = [
+            Site.from_subentry(subentry)
+            for subentry in config_entry.subentries.values()
+            if subentry.subentry_type == SUBENTRY_SITE
+        ]
+        if not sites:
+            return None
+        return cls(hass, config_entry, coordinator, sites)
+
+    def signal(self, site_id: str) -> str:
+        """Return the dispatcher signal sent when a site's state changes."""
+        return f"{SIGNAL_SITE_UPDATED}_{self._config_entry.entry_id}_{site_id}"
+
+    @callback
+    def async_start(self) -> None:
+        """Refresh every site now and spread the next refreshes evenly."""
+        start = dt_util.utcnow()
+        for index, site_id in enumerate(self.sites):
+            self._slots[site_id] = start + REFRESH_INTERVAL * index / len(self.sites)
+            self._async_refresh_later(site_id)
+        # Thresholds and windows come from the entry, follow its changes
+        self._unsubs.append(
+            self._coordinator.async_add_listener(self._async_coordinator_updated)
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop refreshing the sites."""
+        self._scheduler.async_stop()
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+
+    def next_refresh(self, site_id: str, now: dt.datetime) -> dt.datetime:
+        """Return the first refresh slot of a site after ``now``."""
+        slot = self._slots[site_id]
+        if slot > now:
+            return slot
+        return slot + REFRESH_INTERVAL * ((now - slot) // REFRESH_INTERVAL + 1)
+
+    @callback
+    def _async_refresh_later(self, site_id: str) -> None:
+        self._config_entry.async_create_background_task(
+            self.hass,
+            self._async_refresh(site_id),
+            f"offdelay site refresh {site_id}",
+        )
+
+    async def _async_refresh(self, site_id: str) -> None:
+        """Fetch the forecast of a site and evaluate it again."""
+        site = self.sites[site_id]
+        state = self.states[site_id]
+        if site.weather_entity is not None:
+            async with self._semaphore:
+                try:
+                    async with asyncio.timeout(FETCH_TIMEOUT):
+                        weather = await async_fetch_daily_forecast(
+                            self.hass, site.weather_entity
+                        )
+                except (HomeAssistantError, TimeoutError) as err:
+                    # Keep the last forecast, the site is retried next slot
+                    state.last_error = str(err) or type(err).__name__
+                    LOGGER.warning(
+                        "Fetching the forecast of site %s failed: %s",
+                        site.name,
+                        state.last_error,
+                    )
+                else:
+                    state.weather = weather
+                    state.last_error = None
+        state.last_refresh = dt_util.utcnow()
+        self._async_evaluate(site_id)
+        self._scheduler.async_schedule(
+            site_id,
+            self.next_refresh(site_id, state.last_refresh),
+            lambda: self._async_refresh_later(site_id),
+        )
+
+    def weather(self, site_id: str) -> dict[str, Any]:
+        """Return the forecast a site is evaluated with."""
+        if self.sites[site_id].weather_entity is None:
+            # Sites without their own weather entity share the entry's forecast
+            return self._coordinator.data
+        return self.states[site_id].weather
+
+    @callback
+    def _async_evaluate(self, site_id: str) -> None:
+        site = self.sites[site_id]
+        state = self.states[site_id]
+        state.climate_mode = self._coordinator.evaluate_climate_mode(
+            self.weather(site_id), list(site.climates), state.climate_mode
+        )
+        async_dispatcher_send(self.hass, self.signal(site_id))
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        """Evaluate the cached forecasts again, without fetching them."""
+        for site_id, state in self.states.items():
+            if state.last_refresh is not None:
+                self._async_evaluate(site_id)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the state of every site for diagnostics."""
+        return {
+            site.name: {
+                "climate_mode": self.states[site_id].climate_mode,
+                "last_refresh": (
+                    last.isoformat()
+                    if (last := self.states[site_id].last_refresh) is not None
+                    else None
+                ),
+                "next_refresh": (
+                    when.isoformat()
+                    if (when := self._scheduler.deadline(site_id)) is not None
+                    else None
+                ),
+                "last_error": self.states[site_id].last_error,
+            }
+            for site_id, site in self.sites.items()
+        }
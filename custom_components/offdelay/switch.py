@@ -10,6 +10,7 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.const import STATE_ON
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.event import async_call_later, async_track_state_change_event
 from homeassistant.util import dt as dt_util
 
@@ -19,21 +20,25 @@ from .const import (
     CONF_GUEST_TURN_ON_DELAY,
     CONF_OCCUPANCY_SENSORS,
     DOMAIN,
+    ZONE_HOME_ENTITY,
 )
+from .reconfigure import config_signal
 
 if TYPE_CHECKING:
-    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from collections.abc import Mapping
+
+    from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
     from .data import OffdelayConfigEntry
+    from .sites import Site
 
-ZONE_HOME_ENTITY = "zone.home"
 VACATION_MIN_HOURS = 4
 
 
 async def async_setup_entry(  # noqa: RUF029
     hass: HomeAssistant,  # noqa: ARG001
     entry: OffdelayConfigEntry,
-    async_add_entities: AddEntitiesCallback,
+    async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up Offdelay switches from a config entry."""
     config = dict(entry.data)
@@ -44,6 +49,13 @@ async def async_setup_entry(  # noqa: RUF029
         ]
     )
 
+    sites = entry.runtime_data.sites
+    if sites is not None:
+        for site in sites.sites.values():
+            async_add_entities(
+                [SiteGuestModeSwitch(entry, site)], config_subentry_id=site.site_id
+            )
+
 
 def _device_info(entry_id: str) -> DeviceInfo:
     return DeviceInfo(
@@ -55,8 +67,8 @@ def _device_info(entry_id: str) -> DeviceInfo:
     )
 
 
-def _zone_home_person_count(hass: HomeAssistant) -> int:
-    state = hass.states.get(ZONE_HOME_ENTITY)
+def _zone_home_person_count(hass: HomeAssistant, zone: str = ZONE_HOME_ENTITY) -> int:
+    state = hass.states.get(zone)
     if state is None:
         return 0
     try:
@@ -80,6 +92,8 @@ class GuestModeSwitch(SwitchEntity):
     _attr_translation_key = "guest_mode"
     _attr_icon = "mdi:account-question"
 
+    _zone = ZONE_HOME_ENTITY
+
     def __init__(
         self,
         config_entry: OffdelayConfigEntry,
@@ -90,17 +104,22 @@ class GuestModeSwitch(SwitchEntity):
         self._attr_unique_id = f"{config_entry.entry_id}_guest_mode"
         self._attr_device_info = _device_info(config_entry.entry_id)
 
-        self._occupancy_sensors: list[str] = list(
-            config.get(CONF_OCCUPANCY_SENSORS, [])
-        )
-        self._on_delay_minutes: int = int(config.get(CONF_GUEST_TURN_ON_DELAY, 5))
-        self._off_delay_minutes: int = int(config.get(CONF_GUEST_TURN_OFF_DELAY, 15))
+        self._occupancy_sensors: list[str] = []
+        self._on_delay_minutes = 5
+        self._off_delay_minutes = 15
+        self._apply_config(config)
 
         self._is_on = False
         self._manual_override = False
         self._on_timer: CALLBACK_TYPE | None = None
         self._off_timer: CALLBACK_TYPE | None = None
         self._listeners: list[CALLBACK_TYPE] = []
+        self._occupancy_listeners: dict[str, CALLBACK_TYPE] = {}
+
+    def _apply_config(self, config: Mapping[str, Any]) -> None:
+        self._occupancy_sensors = list(config.get(CONF_OCCUPANCY_SENSORS, []))
+        self._on_delay_minutes = int(config.get(CONF_GUEST_TURN_ON_DELAY, 5))
+        self._off_delay_minutes = int(config.get(CONF_GUEST_TURN_OFF_DELAY, 15))
 
     @property
     def is_on(self) -> bool:
@@ -121,27 +140,50 @@ class GuestModeSwitch(SwitchEntity):
     async def async_added_to_hass(self) -> None:
         self._listeners.append(
             async_track_state_change_event(
-                self.hass, ZONE_HOME_ENTITY, self._async_zone_home_changed
+                self.hass, self._zone, self._async_zone_home_changed
             )
         )
-        for eid in self._occupancy_sensors:
-            self._listeners.append(
-                async_track_state_change_event(
-                    self.hass, eid, self._async_occupancy_changed
-                )
+        self._listeners.append(
+            async_dispatcher_connect(
+                self.hass,
+                config_signal(self._config_entry.entry_id),
+                self._async_config_updated,
             )
+        )
+        self._subscribe_occupancy()
 
     async def async_will_remove_from_hass(self) -> None:
         self._cancel_all_timers()
         for unsub in self._listeners:
             unsub()
         self._listeners.clear()
+        for unsub in self._occupancy_listeners.values():
+            unsub()
+        self._occupancy_listeners.clear()
+
+    def _subscribe_occupancy(self) -> None:
+        """Follow the configured occupancy sensors, keeping existing listeners."""
+        for eid in self._occupancy_listeners.keys() - set(self._occupancy_sensors):
+            self._occupancy_listeners.pop(eid)()
+        for eid in self._occupancy_sensors:
+            if eid not in self._occupancy_listeners:
+                self._occupancy_listeners[eid] = async_track_state_change_event(
+                    self.hass, eid, self._async_occupancy_changed
+                )
+
+    @callback
+    def _async_config_updated(self) -> None:
+        """Apply new sensors and delays; running timers keep their delay."""
+        self._apply_config(self._config_entry.data)
+        self._subscribe_occupancy()
+        if not self._manual_override:
+            self._evaluate_guest_mode()
 
     @callback
     def _async_zone_home_changed(self, _event: Event) -> None:
         """Zone.home changed = major state change, clears manual override."""
         self._manual_override = False
-        someone_home = _zone_home_person_count(self.hass) > 0
+        someone_home = _zone_home_person_count(self.hass, self._zone) > 0
 
         if someone_home:
             self._cancel_all_timers()
@@ -159,7 +201,7 @@ class GuestModeSwitch(SwitchEntity):
 
     @callback
     def _evaluate_guest_mode(self) -> None:
-        someone_home = _zone_home_person_count(self.hass) > 0
+        someone_home = _zone_home_person_count(self.hass, self._zone) > 0
         if someone_home:
             return
 
@@ -187,7 +229,10 @@ class GuestModeSwitch(SwitchEntity):
     @callback
     def _async_activate_guest_mode(self, _now: dt.datetime) -> None:
         self._on_timer = None
-        if not self._manual_override and _zone_home_person_count(self.hass) == 0:
+        if (
+            not self._manual_override
+            and _zone_home_person_count(self.hass, self._zone) == 0
+        ):
             self._is_on = True
             self.async_write_ha_state()
 
@@ -312,3 +357,21 @@ class VacationModeSwitch(SwitchEntity):
         if self._deactivation_timer is not None:
             self._deactivation_timer()
             self._deactivation_timer = None
+
+
+class SiteGuestModeSwitch(GuestModeSwitch):
+    """Guest mode of a site, following its own zone and occupancy sensors."""
+
+    def __init__(self, config_entry: OffdelayConfigEntry, site: Site) -> None:
+        """Initialize the guest mode switch of a site."""
+        self._site = site
+        super().__init__(config_entry, dict(config_entry.data))
+        self._zone = site.zone
+        self._attr_unique_id = f"{config_entry.entry_id}_{site.site_id}_guest_mode"
+        self._attr_device_info = site.device_info(config_entry.entry_id)
+
+    def _apply_config(self, config: Mapping[str, Any]) -> None:
+        # The delays are shared with the entry, the sensors belong to the site
+        super()._apply_config(
+            {**config, CONF_OCCUPANCY_SENSORS: list(self._site.occupancy_sensors)}
+        )
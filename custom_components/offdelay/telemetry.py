@@ -0,0 +1,301 @@
+"""Upload engine events to offdelay.be for fleet analysis.
+
+Climate mode changes, presence transitions and climate deltas are recorded
+in a bounded in-memory buffer and uploaded in batches, when a batch is full
+or :data:`FLUSH_INTERVAL` after the first buffered event, as gzip-compressed
+JSON lines. Only one upload runs at a time.
+
+While the API is unreachable the buffered events are spilled to a bounded
+on-disk queue next to the other ``.storage`` files, and uploaded first, in
+order, once the API is back. Both queues drop their oldest data when full,
+so an outage costs old events rather than memory or disk. A batch the API
+rejects is dropped, as sending it again would only hold up the batches
+behind it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import datetime as dt
+import functools
+import gzip
+import itertools
+import json
+from pathlib import Path
+import shutil
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    OffdelayApiClient,
+    OffdelayApiClientCommunicationError,
+    OffdelayApiClientError,
+)
+from .const import (
+    CONF_TELEMETRY_URL,
+    DATA_CLIMATE_MAX_NEG_DELTA,
+    DATA_CLIMATE_MAX_POS_DELTA,
+    DATA_CLIMATE_MODE,
+    DOMAIN,
+    LOGGER,
+    ZONE_HOME_ENTITY,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import OffdelayDataUpdateCoordinator
+    from .data import OffdelayConfigEntry
+
+BATCH_SIZE = 100
+FLUSH_INTERVAL = dt.timedelta(minutes=1)
+MAX_BUFFERED_EVENTS = 1000
+MAX_SPOOLED_BATCHES = 100
+
+UPLOAD_HEADERS = {
+    "Content-Type": "application/x-ndjson",
+    "Content-Encoding": "gzip",
+}
+
+
+def _spool_dir(hass: HomeAssistant, entry_id: str) -> Path:
+    return Path(hass.config.path(".storage", f"{DOMAIN}.telemetry.{entry_id}"))
+
+
+async def async_remove_spool(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the spooled telemetry of a config entry."""
+    await hass.async_add_executor_job(
+        functools.partial(shutil.rmtree, _spool_dir(hass, entry_id), ignore_errors=True)
+    )
+
+
+def encode_batch(events: list[dict[str, Any]]) -> bytes:
+    """Encode events as gzip-compressed JSON lines."""
+    lines = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+    return gzip.compress(lines.encode(), mtime=0)
+
+
+class TelemetryUploader:
+    """Record engine events and upload them in batches."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+        client: OffdelayApiClient,
+        url: str,
+    ) -> None:
+        """Initialize the uploader."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self._coordinator = coordinator
+        self._client = client
+        self._url = url
+        self._buffer: deque[dict[str, Any]] = deque(maxlen=MAX_BUFFERED_EVENTS)
+        self._spool_dir = _spool_dir(hass, config_entry.entry_id)
+        self._spooled: deque[Path] = deque()
+        self._sequence = itertools.count()
+        self._lock = asyncio.Lock()
+        self._flush_timer: CALLBACK_TYPE | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._last: dict[str, Any] = {}
+        # Events dropped from the buffer, and batches dropped from the disk
+        # or rejected by the API
+        self.dropped = 0
+        self.dropped_batches = 0
+
+    @classmethod
+    def from_config_entry(
+        cls,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+    ) -> TelemetryUploader | None:
+        """Create an uploader if a telemetry URL is configured."""
+        if not (url := config_entry.options.get(CONF_TELEMETRY_URL)):
+            return None
+        client = coordinator.client or OffdelayApiClient(
+            async_get_clientsession(hass), url
+        )
+        return cls(hass, config_entry, coordinator, client, url)
+
+    async def async_start(self) -> None:
+        """Pick up the spooled batches and start recording."""
+        self._spooled.extend(await self.hass.async_add_executor_job(self._list_spooled))
+        if self._spooled:
+            last = int(self._spooled[-1].name.split(".", 1)[0])
+            self._sequence = itertools.count(last + 1)
+            self._schedule_flush()
+        self._unsubs = [
+            self._coordinator.async_add_listener(self._async_coordinator_updated),
+            async_track_state_change_event(
+                self.hass, ZONE_HOME_ENTITY, self._async_zone_home_changed
+            ),
+        ]
+        self._async_coordinator_updated()
+
+    async def async_stop(self) -> None:
+        """Stop recording and keep what was not uploaded on disk."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._flush_timer is not None:
+            self._flush_timer()
+            self._flush_timer = None
+        async with self._lock:
+            await self._async_spill()
+
+    def stats(self) -> dict[str, int]:
+        """Return the queue state for diagnostics."""
+        return {
+            "buffered": len(self._buffer),
+            "spooled_batches": len(self._spooled),
+            "dropped": self.dropped,
+            "dropped_batches": self.dropped_batches,
+        }
+
+    @callback
+    def async_record(self, event_type: str, **data: str | float | None) -> None:
+        """Buffer an event, dropping the oldest one if the buffer is full."""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(
+            {"time": dt_util.utcnow().isoformat(), "type": event_type, **data}
+        )
+        if len(self._buffer) >= BATCH_SIZE:
+            self._async_start_flush(full_only=True)
+        else:
+            self._schedule_flush()
+
+    @callback
+    def _schedule_flush(self) -> None:
+        if self._flush_timer is None:
+            self._flush_timer = async_call_later(
+                self.hass, FLUSH_INTERVAL, self._async_flush_timer
+            )
+
+    @callback
+    def _async_flush_timer(self, _now: dt.datetime) -> None:
+        self._flush_timer = None
+        self._async_start_flush(full_only=False)
+
+    @callback
+    def _async_start_flush(self, *, full_only: bool) -> None:
+        # Backpressure: a running upload picks up the new events itself
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = self._config_entry.async_create_task(
+                self.hass,
+                self._async_flush(full_only=full_only),
+                "offdelay telemetry upload",
+            )
+
+    async def _async_flush(self, *, full_only: bool) -> None:
+        # The spooled batches are older than the buffer, so they go first
+        async with self._lock:
+            try:
+                while self._spooled:
+                    path = self._spooled[0]
+                    body = await self.hass.async_add_executor_job(path.read_bytes)
+                    await self._async_upload(body)
+                    self._spooled.popleft()
+                    await self.hass.async_add_executor_job(path.unlink)
+                while self._buffer and (
+                    not full_only or len(self._buffer) >= BATCH_SIZE
+                ):
+                    batch = self._take_batch()
+                    try:
+                        await self._async_upload(encode_batch(batch))
+                    except OffdelayApiClientCommunicationError:
+                        self._buffer.extendleft(reversed(batch))
+                        raise
+            except OffdelayApiClientCommunicationError as err:
+                LOGGER.info("Telemetry upload failed, keeping it on disk: %s", err)
+                await self._async_spill()
+        if self._buffer or self._spooled:
+            self._schedule_flush()
+
+    async def _async_upload(self, body: bytes) -> None:
+        """Upload a batch, dropping it if the API rejects it.
+
+        Raises:
+            OffdelayApiClientCommunicationError: If the API cannot be reached.
+
+        """
+        try:
+            await self._client.async_upload(self._url, body, UPLOAD_HEADERS)
+        except OffdelayApiClientCommunicationError:
+            raise
+        except OffdelayApiClientError as err:
+            self.dropped_batches += 1
+            LOGGER.warning("Telemetry batch rejected, dropping it: %s", err)
+
+    def _take_batch(self) -> list[dict[str, Any]]:
+        return [
+            self._buffer.popleft() for _ in range(min(BATCH_SIZE, len(self._buffer)))
+        ]
+
+    async def _async_spill(self) -> None:
+        """Move the buffered events to the on-disk queue."""
+        batches: list[tuple[Path, bytes]] = []
+        while self._buffer:
+            batch = self._take_batch()
+            path = self._spool_dir / f"{next(self._sequence)}.jsonl.gz"
+            batches.append((path, encode_batch(batch)))
+        if not batches:
+            return
+        self._spooled.extend(path for path, _ in batches)
+        dropped: list[Path] = []
+        while len(self._spooled) > MAX_SPOOLED_BATCHES:
+            dropped.append(self._spooled.popleft())
+            self.dropped_batches += 1
+        await self.hass.async_add_executor_job(self._write_spool, batches, dropped)
+
+    def _list_spooled(self) -> list[Path]:
+        if not self._spool_dir.is_dir():
+            return []
+        return sorted(
+            self._spool_dir.glob("*.jsonl.gz"),
+            key=lambda path: int(path.name.split(".", 1)[0]),
+        )
+
+    def _write_spool(
+        self, batches: list[tuple[Path, bytes]], dropped: list[Path]
+    ) -> None:
+        self._spool_dir.mkdir(parents=True, exist_ok=True)
+        for path, body in batches:
+            path.write_bytes(body)
+        for path in dropped:
+            path.unlink(missing_ok=True)
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        data = self._coordinator.data
+        mode = data.get(DATA_CLIMATE_MODE)
+        if mode is not None and mode != self._last.get(DATA_CLIMATE_MODE):
+            self.async_record("climate_mode", mode=mode)
+        self._last[DATA_CLIMATE_MODE] = mode
+        deltas = {
+            "max_pos_delta": data.get(DATA_CLIMATE_MAX_POS_DELTA),
+            "max_neg_delta": data.get(DATA_CLIMATE_MAX_NEG_DELTA),
+        }
+        if any(value is not None for value in deltas.values()) and deltas != (
+            self._last.get("deltas")
+        ):
+            self.async_record("climate_delta", **deltas)
+        self._last["deltas"] = deltas
+
+    @callback
+    def _async_zone_home_changed(self, event: Event) -> None:
+        new_state = event.data["new_state"]
+        try:
+            home = new_state is not None and int(new_state.state) > 0
+        except ValueError:
+            return
+        if home != self._last.get("home"):
+            self.async_record("presence", home=home)
+        self._last["home"] = home
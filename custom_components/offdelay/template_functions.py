@@ -0,0 +1,228 @@
+"""Jinja template functions backed by Offdelay's cached data.
+
+Templates in the shipped blueprints recompute presence and climate facts by
+iterating ``states.climate`` or expanding persons. That costs time on every
+render and makes Home Assistant re-render the template for every change in
+the domain. The functions registered here answer from data the integration
+already keeps and only declare the few entities their answer depends on:
+
+- ``offdelay_climate_mode()`` returns the coordinator's climate mode and
+  depends on the climate mode binary sensors.
+- ``offdelay_is_home()`` returns whether someone is home and depends on
+  ``zone.home`` only.
+- ``offdelay_max_delta(area=None)`` returns the largest current minus target
+  temperature of the configured climates in an area (id or name), or of all
+  of them. It depends on those climates only; the area of every climate is
+  cached until the entity or device registry changes.
+
+Home Assistant has no API to extend the template environment. The
+functions are added to the environments that exist when the integration is
+set up, and to every one created after, including the short-lived ones of
+templates rendered with their own log function (as template entities are).
+Limited environments are left alone, as they do not read states. The
+functions answer ``None`` while no Offdelay entry is loaded.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+import functools
+from typing import TYPE_CHECKING
+
+from homeassistant.components.climate import ATTR_CURRENT_TEMPERATURE, ATTR_TEMPERATURE
+from homeassistant.const import Platform
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.template import TemplateEnvironment
+from homeassistant.helpers.template.render_info import render_info_cv
+from homeassistant.util.hass_dict import HassKey
+
+from .const import CONF_CLIMATES, DATA_CLIMATE_MODE, DOMAIN, ZONE_HOME_ENTITY
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .data import OffdelayConfigEntry
+
+CLIMATE_MODE_KEYS = ("climate_mode_winter", "climate_mode_summer")
+
+DATA_TEMPLATE_FUNCTIONS: HassKey[TemplateFunctions] = HassKey(
+    f"{DOMAIN}_template_functions"
+)
+
+
+def _collect(entity_ids: Iterable[str]) -> None:
+    """Make the template being rendered depend on ``entity_ids`` only."""
+    if (render_info := render_info_cv.get()) is not None:
+        render_info.entities.update(entity_ids)
+
+
+class TemplateFunctions:
+    """The Offdelay template functions of a Home Assistant instance."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the functions."""
+        self.hass = hass
+        # area id -> configured climates, rebuilt after registry updates
+        self._climates_by_area: dict[str | None, tuple[str, ...]] | None = None
+        self._climates: tuple[str, ...] = ()
+        # Loaded entries that use the cached areas
+        self._users = 0
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Drop the cached areas whenever an entity or device moves."""
+        self._users += 1
+        if self._users > 1:
+            return
+        self._unsubs = [
+            self.hass.bus.async_listen(event_type, self._async_registry_updated)
+            for event_type in (
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+                dr.EVENT_DEVICE_REGISTRY_UPDATED,
+            )
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the registries once no loaded entry is left."""
+        self._users -= 1
+        if self._users > 0:
+            return
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        self._climates_by_area = None
+
+    def globals(self) -> dict[str, Callable[..., object]]:
+        """Return the functions by their template name."""
+        return {
+            "offdelay_climate_mode": self.climate_mode,
+            "offdelay_is_home": self.is_home,
+            "offdelay_max_delta": self.max_delta,
+        }
+
+    def climate_mode(self) -> str | None:
+        """Return the climate mode (winter, summer or none)."""
+        if (entry := self._entry()) is None:
+            return None
+        registry = er.async_get(self.hass)
+        _collect(
+            entity_id
+            for key in CLIMATE_MODE_KEYS
+            if (
+                entity_id := registry.async_get_entity_id(
+                    Platform.BINARY_SENSOR, DOMAIN, f"{entry.entry_id}_{key}"
+                )
+            )
+            is not None
+        )
+        return entry.runtime_data.coordinator.data.get(DATA_CLIMATE_MODE)
+
+    def is_home(self) -> bool:
+        """Return True if at least one person is in zone.home."""
+        _collect((ZONE_HOME_ENTITY,))
+        state = self.hass.states.get(ZONE_HOME_ENTITY)
+        try:
+            return state is not None and int(state.state) > 0
+        except ValueError:
+            return False
+
+    def max_delta(self, area: str | None = None) -> float | None:
+        """Return the largest current minus target temperature in ``area``."""
+        if (entry := self._entry()) is None:
+            return None
+        climates = self._area_climates(entry, area)
+        _collect(climates)
+        deltas = []
+        for entity_id in climates:
+            if (state := self.hass.states.get(entity_id)) is None:
+                continue
+            current = state.attributes.get(ATTR_CURRENT_TEMPERATURE)
+            target = state.attributes.get(ATTR_TEMPERATURE)
+            if current is None or target is None:
+                continue
+            deltas.append(float(current) - float(target))
+        return max(deltas, default=None)
+
+    def _entry(self) -> OffdelayConfigEntry | None:
+        entries = self.hass.config_entries.async_loaded_entries(DOMAIN)
+        return entries[0] if entries else None
+
+    def _area_climates(
+        self, entry: OffdelayConfigEntry, area: str | None
+    ) -> tuple[str, ...]:
+        climates = tuple(entry.data.get(CONF_CLIMATES, ()))
+        if area is None:
+            return climates
+        if self._climates_by_area is None or climates != self._climates:
+            self._climates = climates
+            self._climates_by_area = self._index_areas(climates)
+        areas = ar.async_get(self.hass)
+        if (area_entry := areas.async_get_area(area)) is None and (
+            area_entry := areas.async_get_area_by_name(area)
+        ) is None:
+            return ()
+        return self._climates_by_area.get(area_entry.id, ())
+
+    def _index_areas(
+        self, climates: tuple[str, ...]
+    ) -> dict[str | None, tuple[str, ...]]:
+        entities = er.async_get(self.hass)
+        devices = dr.async_get(self.hass)
+        by_area: dict[str | None, list[str]] = defaultdict(list)
+        for entity_id in climates:
+            area_id = None
+            if (entity := entities.async_get(entity_id)) is not None:
+                area_id = entity.area_id
+                if area_id is None and entity.device_id is not None:
+                    device = devices.async_get(entity.device_id)
+                    area_id = device.area_id if device is not None else None
+            by_area[area_id].append(entity_id)
+        return {area_id: tuple(ids) for area_id, ids in by_area.items()}
+
+    @callback
+    def _async_registry_updated(self, _event: Event) -> None:
+        self._climates_by_area = None
+
+
+def _add_to_new_environments() -> None:
+    """Add the functions of its instance to every new template environment."""
+    init = TemplateEnvironment.__init__
+    if getattr(init, "offdelay", False):
+        return
+
+    @functools.wraps(init)
+    def __init__(  # noqa: N807
+        self: TemplateEnvironment,
+        hass: HomeAssistant | None,
+        limited: bool | None = False,  # noqa: FBT001, FBT002
+        strict: bool | None = False,  # noqa: FBT001, FBT002
+        log_fn: Callable[[int, str], None] | None = None,
+    ) -> None:
+        init(self, hass, limited, strict, log_fn)
+        if (
+            hass is not None
+            and not limited
+            and (functions := hass.data.get(DATA_TEMPLATE_FUNCTIONS)) is not None
+        ):
+            self.globals.update(functions.globals())
+
+    __init__.offdelay = True  # type: ignore[attr-defined]
+    TemplateEnvironment.__init__ = __init__  # type: ignore[method-assign]
+
+
+@callback
+def async_setup_template_functions(hass: HomeAssistant) -> None:
+    """Add the Offdelay functions to the template environments."""
+    functions = hass.data[DATA_TEMPLATE_FUNCTIONS] = TemplateFunctions(hass)
+    _add_to_new_environments()
+    # The shared environments that were created before
+    for environment in list(hass.data.values()):
+        if isinstance(environment, TemplateEnvironment) and not environment.limited:
+            environment.globals.update(functions.globals())
@@ -0,0 +1,328 @@
+"""Learned thermal model per climate, predicting the time to reach its target.
+
+The temperature of a room is modelled as changing at a rate (°C per hour)
+of::
+
+    rate = heat * heating + cool * cooling + loss * (outdoor - indoor)
+
+where ``heating`` and ``cooling`` are 1 while the climate reports that
+action. Every state change of a climate adds the rate since its previous
+state to a recursive least squares fit of ``heat``, ``cool`` and ``loss``,
+with a forgetting factor so the fit follows the seasons. Only the
+parameters that were excited forget, so a climate that never cools still
+keeps following its heating. Each climate keeps only its three parameters
+and their covariance, saved in a small store, so no recorder queries are
+needed.
+
+With the parameters the first-order model is solved for the time the
+indoor temperature needs to reach the target temperature of the climate.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+import math
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.climate import (
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_HVAC_ACTION,
+    ATTR_TEMPERATURE,
+    HVACAction,
+)
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.storage import Store
+
+from .const import CONF_CLIMATES, DOMAIN, SIGNAL_THERMAL_UPDATED
+from .outdoor import outdoor_temperature
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .coordinator import OffdelayDataUpdateCoordinator
+    from .data import OffdelayConfigEntry
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 300
+
+# Weight of the previous samples per new one, about a week of hourly samples
+FORGETTING = 0.995
+INITIAL_COVARIANCE = 100.0
+# Rates are taken over at least this long, shorter ones are mostly rounding
+MIN_INTERVAL = timedelta(minutes=5)
+MAX_INTERVAL = timedelta(hours=2)
+MIN_SAMPLES = 12
+# Closer to the target than this (°C) is at the target
+AT_TARGET = 0.2
+MAX_MINUTES = 24 * 60
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.thermal.{entry_id}")
+
+
+async def async_remove_thermal_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored thermal models of a config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+class ThermalModel:
+    """Recursive least squares fit of the heat, cool and loss parameters."""
+
+    __slots__ = ("covariance", "samples", "theta")
+
+    def __init__(self) -> None:
+        """Initialize a model that knows nothing yet."""
+        self.theta = [0.0, 0.0, 0.0]
+        self.covariance = [
+            [INITIAL_COVARIANCE if row == column else 0.0 for column in range(3)]
+            for row in range(3)
+        ]
+        self.samples = 0
+
+    @property
+    def heat(self) -> float:
+        """Return the rate heating adds, in °C per hour."""
+        return self.theta[0]
+
+    @property
+    def cool(self) -> float:
+        """Return the rate cooling adds, in °C per hour (negative)."""
+        return self.theta[1]
+
+    @property
+    def loss(self) -> float:
+        """Return the rate per °C of outdoor minus indoor temperature, per hour."""
+        return self.theta[2]
+
+    def predict(self, regressors: Sequence[float]) -> float:
+        """Return the rate of change for the regressors."""
+        return sum(t * x for t, x in zip(self.theta, regressors, strict=True))
+
+    def update(self, regressors: Sequence[float], rate: float) -> None:
+        """Add an observed rate of change."""
+        # Forget only the parameters that were excited, so the ones that never
+        # are (cooling in a home that only heats, say) do not wind up the
+        # covariance, while the others keep following the seasons
+        scale = [
+            FORGETTING**-0.5 if self.covariance[i][i] < INITIAL_COVARIANCE else 1.0
+            for i in range(3)
+        ]
+        p = [
+            [self.covariance[i][j] * scale[i] * scale[j] for j in range(3)]
+            for i in range(3)
+        ]
+        px = [sum(p[i][j] * regressors[j] for j in range(3)) for i in range(3)]
+        gain_denominator = 1.0 + sum(x * y for x, y in zip(regressors, px, strict=True))
+        gain = [value / gain_denominator for value in px]
+        error = rate - self.predict(regressors)
+        self.theta = [t + g * error for t, g in zip(self.theta, gain, strict=True)]
+        self.covariance = [
+            [p[i][j] - gain[i] * px[j] for j in range(3)] for i in range(3)
+        ]
+        self.samples += 1
+
+    def minutes_to_target(
+        self, indoor: float, target: float, outdoor: float
+    ) -> float | None:
+        """Return the minutes heating or cooling needs to reach ``target``.
+
+        Returns None if the model is not fitted yet or predicts the target
+        is not reached within :data:`MAX_MINUTES`.
+        """
+        if abs(target - indoor) <= AT_TARGET:
+            return 0.0
+        if self.samples < MIN_SAMPLES:
+            return None
+        power = self.heat if target > indoor else self.cool
+        if self.loss > 1e-6:
+            # The temperature approaches its equilibrium exponentially
+            equilibrium = outdoor + power / self.loss
+            remaining = (equilibrium - target) / (equilibrium - indoor)
+            if not 0 < remaining < 1:
+                return None
+            hours = -math.log(remaining) / self.loss
+        else:
+            hours = (target - indoor) / power if power else -1.0
+            if hours <= 0:
+                return None
+        minutes = hours * 60
+        return minutes if minutes <= MAX_MINUTES else None
+
+    def to_list(self) -> list[float]:
+        """Return the model as samples, parameters and upper covariance."""
+        p = self.covariance
+        return [
+            self.samples,
+            *self.theta,
+            *(p[i][j] for i in range(3) for j in range(i, 3)),
+        ]
+
+    @classmethod
+    def from_list(cls, values: Sequence[float]) -> ThermalModel:
+        """Restore a model saved with :meth:`to_list`."""
+        model = cls()
+        model.samples = int(values[0])
+        model.theta = [float(value) for value in values[1:4]]
+        upper = iter(values[4:10])
+        for i in range(3):
+            for j in range(i, 3):
+                model.covariance[i][j] = model.covariance[j][i] = float(next(upper))
+        return model
+
+
+@dataclass(slots=True)
+class ClimateSample:
+    """State of a climate the next rate is measured from."""
+
+    # POSIX time
+    when: float
+    indoor: float
+    outdoor: float
+    heating: float
+    cooling: float
+
+    def regressors(self) -> tuple[float, float, float]:
+        """Return the regressors of the rate that follows this sample."""
+        return self.heating, self.cooling, self.outdoor - self.indoor
+
+
+class ThermalModels:
+    """Learn a thermal model per climate from its state changes."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+        climates: list[str],
+    ) -> None:
+        """Initialize unfitted models of the climates."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self._coordinator = coordinator
+        self._store = _store(hass, config_entry.entry_id)
+        self.models = {entity_id: ThermalModel() for entity_id in climates}
+        self._samples: dict[str, ClimateSample] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @classmethod
+    def from_config_entry(
+        cls,
+        hass: HomeAssistant,
+        config_entry: OffdelayConfigEntry,
+        coordinator: OffdelayDataUpdateCoordinator,
+    ) -> ThermalModels | None:
+        """Create the models of the climates of an entry, if any."""
+        if not (climates := config_entry.data.get(CONF_CLIMATES)):
+            return None
+        return cls(hass, config_entry, coordinator, list(climates))
+
+    def signal(self, entity_id: str) -> str:
+        """Return the dispatcher signal sent when a climate was sampled."""
+        return f"{SIGNAL_THERMAL_UPDATED}_{self._config_entry.entry_id}_{entity_id}"
+
+    async def async_start(self) -> None:
+        """Restore the models and follow the climates."""
+        stored = await self._store.async_load() or {}
+        for entity_id, values in stored.get("models", {}).items():
+            if entity_id in self.models:
+                self.models[entity_id] = ThermalModel.from_list(values)
+        self._unsub = async_track_state_change_event(
+            self.hass, list(self.models), self._async_climate_changed
+        )
+
+    async def async_stop(self) -> None:
+        """Stop following the climates and save the models."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        await self._store.async_save(self._data_to_store())
+
+    @callback
+    def _async_climate_changed(self, event: Event[EventStateChangedData]) -> None:
+        entity_id = event.data["entity_id"]
+        if (state := event.data["new_state"]) is None:
+            return
+        if self._add_sample(entity_id, state):
+            self._store.async_delay_save(self._data_to_store, SAVE_DELAY)
+        async_dispatcher_send(self.hass, self.signal(entity_id))
+
+    def _add_sample(self, entity_id: str, state: State) -> bool:
+        """Sample the climate, returning whether its model was updated."""
+        indoor = state.attributes.get(ATTR_CURRENT_TEMPERATURE)
+        outdoor = outdoor_temperature(self._coordinator.data)
+        if not isinstance(indoor, (int, float)) or outdoor is None:
+            self._samples.pop(entity_id, None)
+            return False
+        action = state.attributes.get(ATTR_HVAC_ACTION)
+        sample = ClimateSample(
+            when=state.last_updated_timestamp,
+            indoor=float(indoor),
+            outdoor=outdoor,
+            heating=float(action == HVACAction.HEATING),
+            cooling=float(action == HVACAction.COOLING),
+        )
+        previous = self._samples.get(entity_id)
+        if previous is None:
+            self._samples[entity_id] = sample
+            return False
+        elapsed = sample.when - previous.when
+        if elapsed < MIN_INTERVAL.total_seconds():
+            # Keep measuring from the previous sample, unless the action
+            # changed and the rate so far belongs to neither
+            if (sample.heating, sample.cooling) != (previous.heating, previous.cooling):
+                self._samples[entity_id] = sample
+            return False
+        self._samples[entity_id] = sample
+        if elapsed > MAX_INTERVAL.total_seconds():
+            return False
+        rate = (sample.indoor - previous.indoor) / (elapsed / 3600)
+        self.models[entity_id].update(previous.regressors(), rate)
+        return True
+
+    def minutes_to_target(self, entity_id: str) -> float | None:
+        """Return the predicted minutes the climate needs to reach its target."""
+        if (state := self.hass.states.get(entity_id)) is None:
+            return None
+        indoor = state.attributes.get(ATTR_CURRENT_TEMPERATURE)
+        target = state.attributes.get(ATTR_TEMPERATURE)
+        outdoor = outdoor_temperature(self._coordinator.data)
+        if (
+            not isinstance(indoor, (int, float))
+            or not isinstance(target, (int, float))
+            or outdoor is None
+        ):
+            return None
+        return self.models[entity_id].minutes_to_target(
+            float(indoor), float(target), outdoor
+        )
+
+    def _data_to_store(self) -> dict[str, Any]:
+        return {
+            "models": {
+                entity_id: model.to_list() for entity_id, model in self.models.items()
+            }
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Return the parameters of the models for diagnostics."""
+        return {
+            entity_id: {
+                "samples": model.samples,
+                "heat": round(model.heat, 3),
+                "cool": round(model.cool, 3),
+                "loss": round(model.loss, 4),
+            }
+            for entity_id, model in self.models.items()
+        }
@@ -0,0 +1,381 @@
+"""Weather forecast access for Offdelay.
+
+:class:`WeatherCircuitBreaker` guards the weather source of the entry: a
+fetch that fails or takes longer than :data:`FORECAST_TIMEOUT` opens the
+circuit, and the source is left alone for an exponentially growing backoff.
+A source that keeps failing raises a single repair issue, which the first
+successful fetch removes again.
+
+:class:`WeatherSources` fetches an ordered list of weather entities at the
+same time. A refresh waits at most :data:`SOURCE_TIMEOUT` for them; a source
+that is slower keeps fetching in the background and its last forecast is
+used meanwhile, so one slow provider never delays the refresh. The result is
+either the first healthy source in order or the median of all of them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import statistics
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+# Used in this order when no weather entity is configured
+DEFAULT_WEATHER_ENTITIES = ("weather.forecast_home", "weather.home")
+
+DEFAULT_MAX_TEMP = 17.0
+DEFAULT_MIN_TEMP = 7.0
+
+FORECAST_TIMEOUT = 10
+BACKOFF_BASE = timedelta(minutes=5)
+BACKOFF_MAX = timedelta(hours=4)
+ISSUE_AFTER_FAILURES = 3
+
+STRATEGY_FIRST = "first"
+STRATEGY_MEDIAN = "median"
+# How long a refresh waits for the sources
+SOURCE_TIMEOUT = 5
+# How long a single fetch may run in the background
+FETCH_TIMEOUT = 30
+# Older forecasts of a slow source are not used any more
+MAX_FORECAST_AGE = timedelta(hours=6)
+
+
+class WeatherUnavailableError(HomeAssistantError):
+    """No weather entity to fetch a forecast from."""
+
+
+def find_weather_entity(hass: HomeAssistant) -> str | None:
+    """Return the first default weather entity that exists."""
+    for entity_id in DEFAULT_WEATHER_ENTITIES:
+        if hass.states.get(entity_id):
+            return entity_id
+    return None
+
+
+def _temperature(day: dict[str, Any], key: str, default: float) -> float:
+    value = day.get(key)
+    return float(value) if isinstance(value, (int, float)) else default
+
+
+def parse_daily_forecast(forecast: list[dict[str, Any]]) -> dict[str, float]:
+    """Return today's and tomorrow's max/min temperature of a daily forecast."""
+    today = forecast[0] if len(forecast) > 0 else {}
+    tomorrow = forecast[1] if len(forecast) > 1 else {}
+    return {
+        "weather_max_temp_today": _temperature(today, "temperature", DEFAULT_MAX_TEMP),
+        "weather_min_temp_today": _temperature(today, "templow", DEFAULT_MIN_TEMP),
+        "weather_max_temp_tomorrow": _temperature(
+            tomorrow, "temperature", DEFAULT_MAX_TEMP
+        ),
+        "weather_min_temp_tomorrow": _temperature(
+            tomorrow, "templow", DEFAULT_MIN_TEMP
+        ),
+    }
+
+
+async def async_get_forecast(
+    hass: HomeAssistant, entity_id: str, forecast_type: str
+) -> list[dict[str, Any]]:
+    """Fetch the ``daily`` or ``hourly`` forecast of a weather entity."""
+    response: dict[str, Any] | None = await hass.services.async_call(
+        "weather",
+        "get_forecasts",
+        {"entity_id": entity_id, "type": forecast_type},
+        blocking=True,
+        return_response=True,
+    )
+    data: dict[str, Any] = response.get(entity_id, {}) if response else {}
+    return data.get("forecast", [])
+
+
+async def async_fetch_daily_forecast(
+    hass: HomeAssistant, entity_id: str
+) -> dict[str, float]:
+    """Fetch the daily forecast of a weather entity."""
+    return parse_daily_forecast(await async_get_forecast(hass, entity_id, "daily"))
+
+
+def _issue_id(entry_id: str) -> str:
+    return f"weather_unavailable_{entry_id}"
+
+
+def async_remove_weather_issue(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the repair issue of a removed entry."""
+    ir.async_delete_issue(hass, DOMAIN, _issue_id(entry_id))
+
+
+def backoff(failures: int) -> timedelta:
+    """Return how long to leave a source alone after ``failures`` failures."""
+    return min(BACKOFF_BASE * 2 ** (failures - 1), BACKOFF_MAX)
+
+
+class WeatherCircuitBreaker:
+    """Stop fetching from a weather source that keeps failing."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the breaker, closed."""
+        self.hass = hass
+        self._issue_id = _issue_id(entry_id)
+        self.failures = 0
+        self.retry_at: datetime | None = None
+        self.last_error: str | None = None
+        self.last_success: datetime | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return whether fetches are skipped until :attr:`retry_at`."""
+        return self.retry_at is not None and dt_util.utcnow() < self.retry_at
+
+    async def async_call(
+        self, fetch: Callable[[], Awaitable[dict[str, float]]]
+    ) -> dict[str, float] | None:
+        """Return a fresh forecast, or None if the source failed or is skipped."""
+        if self.is_open:
+            return None
+        try:
+            async with asyncio.timeout(FORECAST_TIMEOUT):
+                forecast = await fetch()
+        except (HomeAssistantError, TimeoutError) as err:
+            self._record_failure(str(err) or "Timed out")
+            return None
+        self._record_success()
+        return forecast
+
+    def _record_failure(self, error: str) -> None:
+        self.failures += 1
+        self.last_error = error
+        self.retry_at = dt_util.utcnow() + backoff(self.failures)
+        if self.failures == 1:
+            LOGGER.warning(
+                "Fetching the weather forecast failed, using the last forecast: %s",
+                error,
+            )
+        else:
+            LOGGER.debug(
+                "Fetching the weather forecast failed %s times, retrying at %s: %s",
+                self.failures,
+                self.retry_at,
+                error,
+            )
+        if self.failures == ISSUE_AFTER_FAILURES:
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                self._issue_id,
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key="weather_unavailable",
+                translation_placeholders={"error": error},
+            )
+
+    def _record_success(self) -> None:
+        if self.failures:
+            LOGGER.info(
+                "Fetching the weather forecast works again after %s failures",
+                self.failures,
+            )
+            ir.async_delete_issue(self.hass, DOMAIN, self._issue_id)
+        self.failures = 0
+        self.retry_at = None
+        self.last_error = None
+        self.last_success = dt_util.utcnow()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the state of the breaker for diagnostics."""
+        return {
+            "open": self.is_open,
+            "failures": self.failures,
+            "retry_at": (
+                self.retry_at.isoformat() if self.retry_at is not None else None
+            ),
+            "last_error": self.last_error,
+            "last_success": (
+                self.last_success.isoformat() if self.last_success is not None else None
+            ),
+        }
+
+
+@dataclass(slots=True)
+class SourceState:
+    """The last forecast of one weather entity."""
+
+    forecast: dict[str, float] | None = None
+    fetched_at: datetime | None = None
+    last_error: str | None = None
+    task: asyncio.Task[None] | None = None
+
+    @property
+    def fetching(self) -> bool:
+        """Return whether a fetch is running in the background."""
+        return self.task is not None and not self.task.done()
+
+    def usable(self, now: datetime) -> bool:
+        """Return whether the source answered last time, recently enough."""
+        return (
+            self.forecast is not None
+            and self.last_error is None
+            and self.fetched_at is not None
+            and now - self.fetched_at <= MAX_FORECAST_AGE
+        )
+
+
+class WeatherSources:
+    """Fetch the forecast from an ordered list of weather entities."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        entity_ids: list[str] | None = None,
+        strategy: str = STRATEGY_FIRST,
+    ) -> None:
+        """Initialize the sources."""
+        self.hass = hass
+        self._config_entry = config_entry
+        self.entity_ids: list[str] = []
+        self.strategy = strategy
+        self._sources: dict[str, SourceState] = {}
+        # The sources the last forecast was made of
+        self.used: list[str] = []
+        self.async_set_sources(entity_ids or [], strategy)
+
+    def async_set_sources(self, entity_ids: list[str], strategy: str) -> None:
+        """Use other weather entities, or the default ones when empty."""
+        self.entity_ids = list(entity_ids)
+        self.strategy = strategy
+        for entity_id in set(self._sources) - set(entity_ids):
+            if (state := self._sources.pop(entity_id)).fetching:
+                state.task.cancel()
+
+    @property
+    def preferred(self) -> str | None:
+        """Return the entity the last forecast came from, or the first one."""
+        if self.used:
+            return self.used[0]
+        entity_ids = self._active_entity_ids()
+        return entity_ids[0] if entity_ids else None
+
+    def _active_entity_ids(self) -> list[str]:
+        if self.entity_ids:
+            return self.entity_ids
+        default = find_weather_entity(self.hass)
+        return [default] if default is not None else []
+
+    async def async_fetch(self) -> dict[str, float]:
+        """Fetch every source and combine their forecasts.
+
+        Raises:
+            WeatherUnavailableError: If no source has a recent forecast.
+
+        """
+        entity_ids = self._active_entity_ids()
+        if not entity_ids:
+            raise WeatherUnavailableError("No weather entity found")
+
+        pending = {self._async_start_fetch(entity_id) for entity_id in entity_ids}
+        deadline = self.hass.loop.time() + SOURCE_TIMEOUT
+        while pending and not self._decided(entity_ids):
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(deadline - self.hass.loop.time(), 0),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                # The sources still running fill their cache for next time
+                break
+        return self._combine(entity_ids)
+
+    def _async_start_fetch(self, entity_id: str) -> asyncio.Task[None]:
+        state = self._sources.setdefault(entity_id, SourceState())
+        if not state.fetching:
+            state.task = self._config_entry.async_create_background_task(
+                self.hass,
+                self._async_fetch_source(entity_id, state),
+                f"offdelay weather fetch {entity_id}",
+            )
+        return state.task
+
+    async def _async_fetch_source(self, entity_id: str, state: SourceState) -> None:
+        try:
+            async with asyncio.timeout(FETCH_TIMEOUT):
+                forecast = await async_fetch_daily_forecast(self.hass, entity_id)
+        except (HomeAssistantError, TimeoutError) as err:
+            state.last_error = str(err) or "Timed out"
+            LOGGER.debug(
+                "Fetching the forecast of %s failed: %s", entity_id, state.last_error
+            )
+        else:
+            state.forecast = forecast
+            state.fetched_at = dt_util.utcnow()
+            state.last_error = None
+
+    def _decided(self, entity_ids: list[str]) -> bool:
+        """Return whether the first healthy source in order is known."""
+        if self.strategy != STRATEGY_FIRST:
+            return False
+        for entity_id in entity_ids:
+            state = self._sources[entity_id]
+            if state.fetching:
+                return False
+            if state.last_error is None:
+                return True
+        return True
+
+    def _combine(self, entity_ids: list[str]) -> dict[str, float]:
+        now = dt_util.utcnow()
+        usable = [
+            entity_id
+            for entity_id in entity_ids
+            if self._sources[entity_id].usable(now)
+        ]
+        if not usable:
+            raise WeatherUnavailableError(
+                ", ".join(
+                    f"{entity_id}: {self._sources[entity_id].last_error or 'no answer'}"
+                    for entity_id in entity_ids
+                )
+            )
+
+        if self.strategy == STRATEGY_FIRST:
+            self.used = usable[:1]
+            return dict(self._sources[usable[0]].forecast)
+
+        self.used = usable
+        forecasts = [self._sources[entity_id].forecast for entity_id in usable]
+        return {
+            key: statistics.median(forecast[key] for forecast in forecasts)
+            for key in forecasts[0]
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Return the state of every source for diagnostics."""
+        return {
+            "strategy": self.strategy,
+            "used": self.used,
+            "sources": {
+                entity_id: {
+                    "fetched_at": (
+                        state.fetched_at.isoformat()
+                        if state.fetched_at is not None
+                        else None
+                    ),
+                    "last_error": state.last_error,
+                    "fetching": state.fetching,
+                }
+                for entity_id, state in self._sources.items()
+            },
+        }
@@ -0,0 +1 @@
+"""Development scripts of the Offdelay integration."""
@@ -0,0 +1,151 @@
+"""Build compact variants of the shipped Offdelay blueprints.
+
+The blueprints in ``blueprints/`` are the source of truth. Their long markdown
+descriptions, changelogs and comments make up most of each file, and Home
+Assistant parses all of it whenever blueprints load. This module writes a
+variant of every blueprint to ``blueprints_compact/`` that keeps the same
+inputs, triggers, conditions and actions, shortens descriptions to a summary
+and stores every top-level value in YAML flow style.
+
+This is a development tool, the integration only installs the files it
+writes. Run ``scripts/compact_blueprints`` after editing a blueprint.
+"""
+
+from __future__ import annotations
+
+import copy
+import sys
+from typing import Any, NamedTuple
+
+import yaml
+
+from custom_components.offdelay.blueprint import (
+    COMPACT_BLUEPRINT_DIR,
+    INTEGRATION_BLUEPRINT_DIR,
+    source_blueprints,
+    summarize,
+)
+from custom_components.offdelay.const import DOMAIN
+
+GENERATED_HEADER = (
+    "# Generated by scripts/compact_blueprints from blueprints/{path}.\n"
+    "# Do not edit, change the original blueprint instead.\n"
+)
+
+
+class BlueprintInput(NamedTuple):
+    """An ``!input`` reference inside a blueprint."""
+
+    name: str
+
+
+class _BlueprintLoader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+    """Safe YAML loader that keeps ``!input`` references."""
+
+
+class _BlueprintDumper(yaml.SafeDumper):
+    """Safe YAML dumper that writes ``!input`` references back."""
+
+
+_BlueprintLoader.add_constructor(
+    "!input",
+    lambda loader, node: BlueprintInput(loader.construct_scalar(node)),
+)
+_BlueprintDumper.add_representer(
+    BlueprintInput,
+    lambda dumper, data: dumper.represent_scalar("!input", data.name),
+)
+
+
+def load_blueprint_yaml(content: str) -> dict[str, Any]:
+    """Parse a blueprint, keeping ``!input`` references as BlueprintInput."""
+    return yaml.load(content, Loader=_BlueprintLoader)  # noqa: S506
+
+
+def _compact_inputs(inputs: dict[str, Any]) -> None:
+    """Shorten input and input section descriptions in place."""
+    for definition in inputs.values():
+        if not isinstance(definition, dict):
+            continue
+        if isinstance(definition.get("description"), str):
+            definition["description"] = summarize(definition["description"])
+        if isinstance(definition.get("input"), dict):
+            _compact_inputs(definition["input"])
+
+
+def compact_blueprint(data: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of a blueprint with its descriptions shortened."""
+    compact = copy.deepcopy(data)
+    metadata = compact["blueprint"]
+    if isinstance(metadata.get("description"), str):
+        metadata["description"] = summarize(metadata["description"])
+    if isinstance(metadata.get("input"), dict):
+        _compact_inputs(metadata["input"])
+    return compact
+
+
+def dump_compact_blueprint(data: dict[str, Any], rel_path: str) -> str:
+    """Serialize a blueprint with one flow-style line per top-level key."""
+    lines = [GENERATED_HEADER.format(path=rel_path)]
+    for key, value in data.items():
+        dumped = yaml.dump(
+            {key: value},
+            Dumper=_BlueprintDumper,
+            default_flow_style=True,
+            allow_unicode=True,
+            sort_keys=False,
+            width=sys.maxsize,
+        )
+        # Drop the braces of the single-key wrapper mapping.
+        lines.append(dumped.strip()[1:-1] + "\n")
+    return "".join(lines)
+
+
+def build_compact_blueprints(domain: str = DOMAIN) -> dict[str, str]:
+    """Return the compact content of every shipped blueprint by relative path."""
+    return {
+        rel_path: dump_compact_blueprint(
+            compact_blueprint(load_blueprint_yaml(source.read_text(encoding="utf-8"))),
+            rel_path,
+        )
+        for rel_path, source in source_blueprints(domain).items()
+    }
+
+
+def write_compact_blueprints(domain: str = DOMAIN) -> list[str]:
+    """Write the compact blueprints that changed and return their paths."""
+    written: list[str] = []
+    compact = build_compact_blueprints(domain)
+    for rel_path, content in compact.items():
+        destination = COMPACT_BLUEPRINT_DIR / rel_path
+        if destination.is_file() and destination.read_text(encoding="utf-8") == content:
+            continue
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_text(content, encoding="utf-8")
+        written.append(rel_path)
+
+    # Drop variants whose original was removed.
+    for stale in COMPACT_BLUEPRINT_DIR.glob("*/*/*.yaml"):
+        rel_path = stale.relative_to(COMPACT_BLUEPRINT_DIR).as_posix()
+        if rel_path not in compact:
+            stale.unlink()
+            written.append(rel_path)
+    return written
+
+
+def main() -> None:
+    """Regenerate the compact blueprints."""
+    for rel_path in write_compact_blueprints():
+        original = INTEGRATION_BLUEPRINT_DIR / rel_path
+        compact = COMPACT_BLUEPRINT_DIR / rel_path
+        if not compact.exists():
+            sys.stdout.write(f"removed {rel_path}\n")
+            continue
+        sys.stdout.write(
+            f"wrote {rel_path}: {original.stat().st_size} -> "
+            f"{compact.stat().st_size} bytes\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
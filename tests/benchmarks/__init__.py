@@ -0,0 +1 @@
+"""Benchmarks for the Offdelay integration."""
@@ -0,0 +1,57 @@
+"""Install the shipped blueprints for the benchmarks."""
+
+from pathlib import Path
+from typing import Any
+
+from homeassistant.helpers import selector
+from homeassistant.util.yaml import dump, load_yaml
+import voluptuous as vol
+
+from custom_components.offdelay.blueprint import INTEGRATION_BLUEPRINT_DIR
+
+
+def _drop_unsupported_options(selector_config: dict[str, Any]) -> None:
+    """Drop the selector options the installed Home Assistant rejects."""
+    for kind, options in selector_config.items():
+        while isinstance(options, dict):
+            try:
+                selector.validate_selector({kind: options})
+            except vol.Invalid as err:
+                errors = err.errors if isinstance(err, vol.MultipleInvalid) else [err]
+                extra = [
+                    error.path[0]
+                    for error in errors
+                    if len(error.path) == 1
+                    and error.error_message == "extra keys not allowed"
+                ]
+                if not extra:
+                    break
+                for key in extra:
+                    del options[key]
+            else:
+                break
+
+
+def _drop_unsupported_selector_options(node: Any) -> None:
+    if isinstance(node, dict):
+        if isinstance(selector_config := node.get("selector"), dict):
+            _drop_unsupported_options(selector_config)
+        for value in node.values():
+            _drop_unsupported_selector_options(value)
+    elif isinstance(node, list):
+        for value in node:
+            _drop_unsupported_selector_options(value)
+
+
+def install_blueprint(config_dir: Path, rel_path: str) -> None:
+    """Install a shipped blueprint into ``config_dir``.
+
+    The shipped blueprints may use selector options of a newer Home Assistant
+    than the one the tests run on, such as ``enable_second`` of the duration
+    selector. They only change the UI, so they are dropped from the copy.
+    """
+    data = load_yaml(INTEGRATION_BLUEPRINT_DIR / rel_path)
+    _drop_unsupported_selector_options(data)
+    destination = config_dir / "blueprints" / rel_path
+    destination.parent.mkdir(parents=True)
+    destination.write_text(dump(data), encoding="utf-8")
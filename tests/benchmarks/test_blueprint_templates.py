@@ -0,0 +1,389 @@
+"""Profile the templates of the shipped blueprints.
+
+Every scenario loads one blueprint with synthetic inputs for a handful of
+rooms, drives a sequence of representative triggers and reports, ranked by
+cost:
+
+- every template the blueprint rendered, with its location in the
+  blueprint, render count, CPU time, the time of the first render of each
+  instance (which includes compiling it) and the peak memory allocated
+  while rendering;
+- every step of the sequence, with the CPU time and memory the automation
+  runs it triggered needed.
+
+Everything runs offline against the test Home Assistant instance. CPU time
+is measured with ``process_time`` because freezegun freezes the wall clocks.
+Use the report as the baseline to judge a blueprint change or a native
+replacement.
+
+Run with ``pytest tests/benchmarks/test_blueprint_templates.py --benchmark -s``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import datetime as dt
+import functools
+import json
+from pathlib import Path
+import time
+import tracemalloc
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.template import Template
+from homeassistant.setup import async_setup_component
+from homeassistant.util.yaml import load_yaml
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.offdelay.blueprint import INTEGRATION_BLUEPRINT_DIR
+from tests.benchmarks.blueprints import install_blueprint
+
+ROOMS = 10
+TOP_TEMPLATES = 15
+
+pytestmark = pytest.mark.benchmark
+
+type Step = tuple[str, Callable[[HomeAssistant, FrozenDateTimeFactory], Awaitable]]
+
+
+@dataclass
+class TemplateStats:
+    """Cost of one template source."""
+
+    location: str
+    renders: int = 0
+    seconds: float = 0.0
+    first_seconds: float = 0.0
+    peak_bytes: int = 0
+
+
+@dataclass
+class StepStats:
+    """Cost of one step of a scenario."""
+
+    name: str
+    seconds: float
+    allocated_bytes: int
+
+
+@dataclass
+class Report:
+    """Ranked costs of a scenario."""
+
+    blueprint: str
+    templates: dict[str, TemplateStats] = field(default_factory=dict)
+    steps: list[StepStats] = field(default_factory=list)
+
+    def ranked_templates(self) -> list[tuple[str, TemplateStats]]:
+        """Return the templates, most expensive first."""
+        return sorted(
+            self.templates.items(), key=lambda item: item[1].seconds, reverse=True
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as JSON serializable data."""
+        return {
+            "blueprint": self.blueprint,
+            "steps": [vars(step) for step in self.steps],
+            "templates": [
+                {"source": source, **vars(stats)}
+                for source, stats in self.ranked_templates()
+            ],
+        }
+
+    def format(self) -> str:
+        """Return the report as a table."""
+        lines = [
+            f"== {self.blueprint}, {ROOMS} instances",
+            f"{'step':<28}{'cpu ms':>10}{'alloc KiB':>12}",
+        ]
+        lines.extend(
+            f"{step.name:<28}{step.seconds * 1000:>10.1f}"
+            f"{step.allocated_bytes / 1024:>12.1f}"
+            for step in sorted(self.steps, key=lambda step: step.seconds, reverse=True)
+        )
+        lines.append(
+            f"{'template':<44}{'renders':>8}{'cpu ms':>9}{'first ms':>10}"
+            f"{'us/render':>11}{'peak KiB':>10}  source"
+        )
+        for source, stats in self.ranked_templates()[:TOP_TEMPLATES]:
+            snippet = " ".join(source.split())[:60]
+            lines.append(
+                f"{stats.location[:43]:<44}{stats.renders:>8}"
+                f"{stats.seconds * 1000:>9.2f}{stats.first_seconds * 1000:>10.2f}"
+                f"{stats.seconds / stats.renders * 1e6:>11.1f}"
+                f"{stats.peak_bytes / 1024:>10.1f}  {snippet}"
+            )
+        return "\n".join(lines)
+
+
+def _template_locations(node: Any, path: str = "") -> Iterator[tuple[str, str]]:
+    """Yield (template source, location) for every template in a blueprint."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if not path and key == "blueprint":
+                continue
+            yield from _template_locations(value, f"{path}.{key}" if path else key)
+    elif isinstance(node, list):
+        for index, value in enumerate(node):
+            yield from _template_locations(value, f"{path}[{index}]")
+    elif isinstance(node, str) and ("{{" in node or "{%" in node):
+        yield node, path
+
+
+class TemplateProfiler:
+    """Record the cost of every template render while active."""
+
+    def __init__(self, report: Report, blueprint: Path) -> None:
+        """Initialize the profiler with the template locations of a blueprint."""
+        self._report = report
+        self._locations = dict(_template_locations(load_yaml(blueprint)))
+        self._depth = 0
+        self._rendered: set[int] = set()
+
+    @contextmanager
+    def active(self) -> Iterator[None]:
+        """Profile template renders inside the block."""
+        original = Template.async_render
+
+        @functools.wraps(original)
+        def async_render(template: Template, *args: Any, **kwargs: Any) -> Any:
+            if template.is_static or self._depth:
+                return original(template, *args, **kwargs)
+            self._depth += 1
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            start = time.process_time()
+            try:
+                return original(template, *args, **kwargs)
+            finally:
+                elapsed = time.process_time() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                self._depth -= 1
+                first = id(template) not in self._rendered
+                self._rendered.add(id(template))
+                self._record(template.template, elapsed, peak - base, first=first)
+
+        with patch.object(Template, "async_render", async_render):
+            yield
+
+    def _record(
+        self, source: str, seconds: float, peak_bytes: int, *, first: bool
+    ) -> None:
+        stats = self._report.templates.get(source)
+        if stats is None:
+            location = self._locations.get(source, "(input or generated)")
+            stats = self._report.templates[source] = TemplateStats(location)
+        stats.renders += 1
+        stats.seconds += seconds
+        if first:
+            stats.first_seconds += seconds
+        stats.peak_bytes = max(stats.peak_bytes, peak_bytes)
+
+
+async def _run_scenario(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    tmp_path: Path,
+    blueprint: str,
+    inputs: Callable[[int], dict[str, Any]],
+    steps: list[Step],
+) -> Report:
+    """Load ``blueprint`` once per room and profile ``steps``."""
+    hass.config.config_dir = str(tmp_path)
+    install_blueprint(tmp_path, blueprint)
+
+    assert await async_setup_component(
+        hass,
+        "automation",
+        {
+            "automation": [
+                {
+                    "id": f"bench_{room}",
+                    "alias": f"Bench {room}",
+                    "use_blueprint": {
+                        "path": blueprint.removeprefix("automation/"),
+                        "input": inputs(room),
+                    },
+                }
+                for room in range(ROOMS)
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+    automations = hass.states.async_all("automation")
+    assert len(automations) == ROOMS
+    assert all(state.state == "on" for state in automations)
+
+    report = Report(blueprint)
+    profiler = TemplateProfiler(report, INTEGRATION_BLUEPRINT_DIR / blueprint)
+    tracemalloc.start()
+    try:
+        with profiler.active():
+            for name, step in steps:
+                before = tracemalloc.get_traced_memory()[0]
+                start = time.process_time()
+                await step(hass, freezer)
+                await hass.async_block_till_done()
+                report.steps.append(
+                    StepStats(
+                        name,
+                        time.process_time() - start,
+                        tracemalloc.get_traced_memory()[0] - before,
+                    )
+                )
+    finally:
+        tracemalloc.stop()
+    return report
+
+
+def _set_all(entity: str, state: str, attributes: dict | None = None) -> Callable:
+    async def step(hass: HomeAssistant, _freezer: FrozenDateTimeFactory) -> None:
+        for room in range(ROOMS):
+            hass.states.async_set(entity.format(room), state, attributes)
+            await hass.async_block_till_done()
+
+    return step
+
+
+def _wait(seconds: float) -> Callable:
+    async def step(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+        freezer.tick(dt.timedelta(seconds=seconds))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    return step
+
+
+def _print(report: Report, record_property: Callable[[str, Any], None]) -> None:
+    record_property("report", json.dumps(report.as_dict()))
+    print("\n" + report.format())  # noqa: T201
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Bypass weather calls."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={},
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+async def utc(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Run every scenario at the same evening hour."""
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to("2024-01-15 19:00:00+00:00")
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_light_sensor(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    tmp_path: Path,
+    record_property,
+):
+    """Profile light_sensor_V1 through motion, clearing and the off delay."""
+    async_mock_service(hass, "light", "turn_on")
+    async_mock_service(hass, "light", "turn_off")
+    for room in range(ROOMS):
+        hass.states.async_set(f"binary_sensor.motion_{room}", "off")
+        hass.states.async_set(f"sensor.lux_{room}", "20")
+        hass.states.async_set(f"light.room_{room}", "off")
+
+    report = await _run_scenario(
+        hass,
+        freezer,
+        tmp_path,
+        "automation/offdelay/light_sensor_V1.yaml",
+        lambda room: {
+            "motion_trigger": [f"binary_sensor.motion_{room}"],
+            "light_switch": {"entity_id": [f"light.room_{room}"]},
+            "time_delay": 1,
+            "include_ambient": "ambient_enabled",
+            "ambient_light_sensor": f"sensor.lux_{room}",
+            "ambient_light_value": 50,
+        },
+        [
+            ("motion detected", _set_all("binary_sensor.motion_{}", "on")),
+            ("lights report on", _set_all("light.room_{}", "on")),
+            ("motion cleared", _set_all("binary_sensor.motion_{}", "off")),
+            ("off delay expires", _wait(61)),
+            ("lux changes", _set_all("sensor.lux_{}", "80")),
+        ],
+    )
+    _print(report, record_property)
+    assert report.templates
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_climate_heatpump(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    tmp_path: Path,
+    record_property,
+):
+    """Profile climate_heatpump_V1 through windows, presence and temperatures."""
+    async_mock_service(hass, "climate", "set_temperature")
+    async_mock_service(hass, "climate", "set_hvac_mode")
+    hass.states.async_set("person.resident", "home")
+    hass.states.async_set("zone.home", "1")
+    for room in range(ROOMS):
+        hass.states.async_set(
+            f"climate.room_{room}",
+            "heat",
+            {"temperature": 20.0, "current_temperature": 19.0},
+        )
+        hass.states.async_set(f"binary_sensor.window_{room}", "off")
+
+    async def leave(hass: HomeAssistant, _freezer: FrozenDateTimeFactory) -> None:
+        hass.states.async_set("person.resident", "not_home")
+        hass.states.async_set("zone.home", "0")
+        await hass.async_block_till_done()
+
+    async def arrive(hass: HomeAssistant, _freezer: FrozenDateTimeFactory) -> None:
+        hass.states.async_set("person.resident", "home")
+        hass.states.async_set("zone.home", "1")
+        await hass.async_block_till_done()
+
+    report = await _run_scenario(
+        hass,
+        freezer,
+        tmp_path,
+        "automation/offdelay/climate_heatpump_V1.yaml",
+        lambda room: {
+            "input_trvs": [f"climate.room_{room}"],
+            "input_windows": [f"binary_sensor.window_{room}"],
+            "input_persons": ["person.resident"],
+        },
+        [
+            ("window opened", _set_all("binary_sensor.window_{}", "on")),
+            ("window reaction time", _wait(120)),
+            ("window closed", _set_all("binary_sensor.window_{}", "off")),
+            ("window close time", _wait(120)),
+            ("resident leaves", leave),
+            ("away time", _wait(600)),
+            ("resident arrives", arrive),
+            (
+                "temperature update",
+                _set_all(
+                    "climate.room_{}",
+                    "heat",
+                    {"temperature": 20.0, "current_temperature": 19.5},
+                ),
+            ),
+        ],
+    )
+    _print(report, record_property)
+    assert report.templates
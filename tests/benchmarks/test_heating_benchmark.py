@@ -0,0 +1,176 @@
+"""Compare the native heating controller with the climate_heatpump blueprint.
+
+Both are driven through the same event sequence on a simulated 50-room
+house: every window opens and closes, the resident leaves and comes back and
+every thermostat reports a new room temperature. The time reported is the
+event-loop time needed to process the sequence; the baseline run measures
+the cost of the state writes alone. Blueprint triggers with a ``for`` delay
+are rendered but not waited for, so the blueprint number is a lower bound.
+
+Run with ``pytest tests/benchmarks --benchmark -s``.
+"""
+
+from pathlib import Path
+import time
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.config_entries import ConfigSubentryDataWithId
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+)
+
+from custom_components.offdelay.const import (
+    CONF_CLIMATE,
+    CONF_COMFORT_END,
+    CONF_COMFORT_START,
+    CONF_COMFORT_TEMP,
+    CONF_ECO_TEMP,
+    CONF_FROST_TEMP,
+    CONF_WINDOW_SENSORS,
+    DOMAIN,
+    SUBENTRY_HEATING_ROOM,
+)
+from tests.benchmarks.blueprints import install_blueprint
+from tests.const import MOCK_CONFIG
+
+ROOMS = 50
+ROUNDS = 3
+HEATPUMP_BLUEPRINT = "automation/offdelay/climate_heatpump_V1.yaml"
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Bypass weather calls."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={},
+    ):
+        yield
+
+
+@pytest.fixture(name="house")
+def house_fixture(hass: HomeAssistant) -> None:
+    """Create the thermostats, windows and resident of the house."""
+    hass.states.async_set("person.resident", "home")
+    hass.states.async_set("zone.home", "1")
+    for room in range(ROOMS):
+        hass.states.async_set(
+            f"climate.room_{room}",
+            "heat",
+            {"temperature": 20.0, "current_temperature": 19.0},
+        )
+        hass.states.async_set(f"binary_sensor.window_{room}", "off")
+
+
+async def _run_events(hass: HomeAssistant) -> float:
+    """Drive the event sequence and return the elapsed seconds."""
+    start = time.perf_counter()
+    for round_ in range(ROUNDS):
+        for room in range(ROOMS):
+            for state in ("on", "off"):
+                hass.states.async_set(f"binary_sensor.window_{room}", state)
+                await hass.async_block_till_done()
+        for person, zone in (("not_home", "0"), ("home", "1")):
+            hass.states.async_set("person.resident", person)
+            hass.states.async_set("zone.home", zone)
+            await hass.async_block_till_done()
+        for room in range(ROOMS):
+            hass.states.async_set(
+                f"climate.room_{room}",
+                "heat",
+                {"temperature": 20.0, "current_temperature": 19.1 + round_ / 10},
+            )
+            await hass.async_block_till_done()
+    return time.perf_counter() - start
+
+
+@pytest.mark.usefixtures("house")
+async def test_baseline(hass: HomeAssistant, record_property):
+    """Measure the event sequence without any heating logic."""
+    elapsed = await _run_events(hass)
+    record_property("baseline_seconds", elapsed)
+    print(f"baseline, {ROOMS} rooms: {elapsed * 1000:.1f} ms")  # noqa: T201
+
+
+@pytest.mark.usefixtures("house")
+async def test_native_controller(hass: HomeAssistant, record_property):
+    """Benchmark the native heating controller."""
+    calls = async_mock_service(hass, "climate", "set_temperature")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG,
+        subentries_data=[
+            ConfigSubentryDataWithId(
+                subentry_id=f"room_{room}",
+                subentry_type=SUBENTRY_HEATING_ROOM,
+                title=f"Room {room}",
+                unique_id=f"climate.room_{room}",
+                data={
+                    CONF_CLIMATE: f"climate.room_{room}",
+                    CONF_COMFORT_TEMP: 21.0,
+                    CONF_ECO_TEMP: 18.0,
+                    CONF_FROST_TEMP: 7.0,
+                    CONF_COMFORT_START: "00:00:00",
+                    CONF_COMFORT_END: "23:59:59",
+                    CONF_WINDOW_SENSORS: [f"binary_sensor.window_{room}"],
+                },
+            )
+            for room in range(ROOMS)
+        ],
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    elapsed = await _run_events(hass)
+    record_property("native_seconds", elapsed)
+    record_property("native_set_temperature_calls", len(calls))
+    print(f"native controller, {ROOMS} rooms: {elapsed * 1000:.1f} ms")  # noqa: T201
+    assert calls
+
+
+@pytest.mark.usefixtures("house")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_blueprint(hass: HomeAssistant, tmp_path: Path, record_property):
+    """Benchmark the climate_heatpump blueprint."""
+    hass.config.config_dir = str(tmp_path)
+    install_blueprint(tmp_path, HEATPUMP_BLUEPRINT)
+    calls = async_mock_service(hass, "climate", "set_temperature")
+
+    assert await async_setup_component(
+        hass,
+        "automation",
+        {
+            "automation": [
+                {
+                    "id": f"heating_room_{room}",
+                    "alias": f"Heating room {room}",
+                    "use_blueprint": {
+                        "path": "offdelay/climate_heatpump_V1.yaml",
+                        "input": {
+                            "input_trvs": [f"climate.room_{room}"],
+                            "input_windows": [f"binary_sensor.window_{room}"],
+                            "input_persons": ["person.resident"],
+                        },
+                    },
+                }
+                for room in range(ROOMS)
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+    automations = hass.states.async_all("automation")
+    assert len(automations) == ROOMS
+    assert all(state.state == "on" for state in automations)
+
+    elapsed = await _run_events(hass)
+    record_property("blueprint_seconds", elapsed)
+    record_property("blueprint_set_temperature_calls", len(calls))
+    print(f"climate_heatpump blueprint, {ROOMS} rooms: {elapsed * 1000:.1f} ms")  # noqa: T201
@@ -0,0 +1,191 @@
+"""Compare the native motion light controller with the light_sensor blueprint.
+
+Every room of a simulated 200-room building sees motion, the motion clears
+and the off-delay expires. The time reported is the CPU time needed to
+process the sequence; the baseline run measures the state writes alone.
+
+Run with ``pytest tests/benchmarks --benchmark -s``.
+"""
+
+import datetime as dt
+from pathlib import Path
+import shutil
+import time
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigSubentryDataWithId
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.offdelay.blueprint import INTEGRATION_BLUEPRINT_DIR
+from custom_components.offdelay.const import (
+    CONF_LIGHTS,
+    CONF_LUX_SENSOR,
+    CONF_LUX_THRESHOLD,
+    CONF_MOTION_SENSORS,
+    CONF_OFF_DELAY,
+    DOMAIN,
+    SUBENTRY_LIGHT_ROOM,
+)
+from tests.const import MOCK_CONFIG
+
+ROOMS = 200
+OFF_DELAY = dt.timedelta(minutes=1)
+LIGHT_BLUEPRINT = "automation/offdelay/light_sensor_V1.yaml"
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Bypass weather calls."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={},
+    ):
+        yield
+
+
+def _mock_light_services(hass: HomeAssistant) -> dict[str, list[ServiceCall]]:
+    """Register light services that record their calls and update the state."""
+    calls: dict[str, list[ServiceCall]] = {"turn_on": [], "turn_off": []}
+
+    for service, state in (("turn_on", "on"), ("turn_off", "off")):
+
+        @callback
+        def handle(call: ServiceCall, service: str = service, state: str = state):
+            calls[service].append(call)
+            for entity_id in call.data["entity_id"]:
+                hass.states.async_set(entity_id, state)
+
+        hass.services.async_register("light", service, handle)
+    return calls
+
+
+@pytest.fixture(name="building")
+def building_fixture(hass: HomeAssistant) -> None:
+    """Create the motion sensors, lux sensors and lights of the building."""
+    for room in range(ROOMS):
+        hass.states.async_set(f"binary_sensor.motion_{room}", "off")
+        hass.states.async_set(f"sensor.lux_{room}", "20")
+        hass.states.async_set(f"light.room_{room}", "off")
+
+
+async def _run_events(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> float:
+    """Drive the event sequence and return the CPU seconds it took.
+
+    freezegun also freezes ``perf_counter``, ``process_time`` keeps running.
+    """
+    start = time.process_time()
+    for state in ("on", "off"):
+        for room in range(ROOMS):
+            hass.states.async_set(f"binary_sensor.motion_{room}", state)
+            await hass.async_block_till_done()
+    freezer.tick(OFF_DELAY + dt.timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    return time.process_time() - start
+
+
+@pytest.mark.usefixtures("building")
+async def test_baseline(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, record_property
+):
+    """Measure the event sequence without any light logic."""
+    elapsed = await _run_events(hass, freezer)
+    record_property("baseline_seconds", elapsed)
+    print(f"baseline, {ROOMS} rooms: {elapsed * 1000:.1f} ms")  # noqa: T201
+
+
+@pytest.mark.usefixtures("building")
+async def test_native_controller(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, record_property
+):
+    """Benchmark the native motion light controller."""
+    calls = _mock_light_services(hass)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG,
+        subentries_data=[
+            ConfigSubentryDataWithId(
+                subentry_id=f"room_{room}",
+                subentry_type=SUBENTRY_LIGHT_ROOM,
+                title=f"Room {room}",
+                unique_id=None,
+                data={
+                    CONF_MOTION_SENSORS: [f"binary_sensor.motion_{room}"],
+                    CONF_LIGHTS: [f"light.room_{room}"],
+                    CONF_OFF_DELAY: OFF_DELAY.total_seconds(),
+                    CONF_LUX_SENSOR: f"sensor.lux_{room}",
+                    CONF_LUX_THRESHOLD: 50,
+                },
+            )
+            for room in range(ROOMS)
+        ],
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    elapsed = await _run_events(hass, freezer)
+    record_property("native_seconds", elapsed)
+    print(f"native controller, {ROOMS} rooms: {elapsed * 1000:.1f} ms")  # noqa: T201
+    assert len(calls["turn_on"]) == ROOMS
+    # Every off-delay expires in the same tick and is sent as one call
+    assert len(calls["turn_off"]) == 1
+
+
+@pytest.mark.usefixtures("building")
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_blueprint(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    tmp_path: Path,
+    record_property,
+):
+    """Benchmark the light_sensor blueprint."""
+    hass.config.config_dir = str(tmp_path)
+    destination = tmp_path / "blueprints" / LIGHT_BLUEPRINT
+    destination.parent.mkdir(parents=True)
+    shutil.copyfile(INTEGRATION_BLUEPRINT_DIR / LIGHT_BLUEPRINT, destination)
+    _mock_light_services(hass)
+
+    assert await async_setup_component(
+        hass,
+        "automation",
+        {
+            "automation": [
+                {
+                    "id": f"light_room_{room}",
+                    "alias": f"Light room {room}",
+                    "use_blueprint": {
+                        "path": "offdelay/light_sensor_V1.yaml",
+                        "input": {
+                            "motion_trigger": [f"binary_sensor.motion_{room}"],
+                            "light_switch": {"entity_id": [f"light.room_{room}"]},
+                            "time_delay": OFF_DELAY.total_seconds() / 60,
+                            "include_ambient": "ambient_enabled",
+                            "ambient_light_sensor": f"sensor.lux_{room}",
+                            "ambient_light_value": 50,
+                        },
+                    },
+                }
+                for room in range(ROOMS)
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+    automations = hass.states.async_all("automation")
+    assert len(automations) == ROOMS
+    assert all(state.state == "on" for state in automations)
+
+    elapsed = await _run_events(hass, freezer)
+    record_property("blueprint_seconds", elapsed)
+    print(f"light_sensor blueprint, {ROOMS} rooms: {elapsed * 1000:.1f} ms")  # noqa: T201
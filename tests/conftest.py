@@ -18,3 +18,25 @@ def config_fixture():
         "platform": "offdelay",
         "delay": 10,
     }
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the option to run the benchmarks."""
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="run the benchmarks in tests/benchmarks",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip benchmarks unless --benchmark is given."""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
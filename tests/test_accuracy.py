@@ -0,0 +1,172 @@
+"""Test the Off-delay forecast accuracy tracker."""
+
+from dataclasses import asdict
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.offdelay.accuracy import (
+    LEAD_TODAY,
+    LEAD_TOMORROW,
+    OBSERVED_SAVE_INTERVAL,
+    QUANTITY_MAX,
+    ErrorStats,
+    observed_temperature,
+)
+from custom_components.offdelay.const import CONF_OUTDOOR_SENSOR, DOMAIN
+
+from .const import MOCK_CONFIG
+
+OUTDOOR = "sensor.outdoor_temperature"
+FORECAST = {
+    "weather_max_temp_today": 10.0,
+    "weather_min_temp_today": 2.0,
+    "weather_max_temp_tomorrow": 11.0,
+    "weather_min_temp_tomorrow": 3.0,
+}
+
+
+@pytest.fixture(autouse=True)
+async def just_after_midnight(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Start at the beginning of a day, with a weather entity."""
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to("2024-01-15 00:00:10+00:00")
+    hass.states.async_set("weather.home", "sunny", {"temperature": 4})
+
+
+@pytest.fixture(autouse=True)
+def fetch():
+    """Return the same forecast every day."""
+    with patch(
+        "custom_components.offdelay.weather.async_fetch_daily_forecast",
+        new_callable=AsyncMock,
+        return_value=FORECAST,
+    ) as fetch:
+        yield fetch
+
+
+async def _setup(hass: HomeAssistant, **options: object) -> MockConfigEntry:
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, options=options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _observe(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entity_id: str,
+    temperatures: list[float],
+) -> None:
+    for temperature in temperatures:
+        freezer.tick(timedelta(hours=2))
+        hass.states.async_set(
+            entity_id, str(temperature), {"unit_of_measurement": "°C"}
+        )
+        await hass.async_block_till_done()
+
+
+async def _midnight(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    freezer.move_to(
+        (freezer.time_to_freeze + timedelta(days=1)).replace(hour=0, minute=0, second=0)
+    )
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+def test_error_statistics():
+    """Test the running bias, mean absolute error and standard deviation."""
+    errors = ErrorStats()
+    assert errors.bias is None
+    for error in (1.0, -1.0, 3.0):
+        errors.add(error)
+
+    assert errors.bias == pytest.approx(1.0)
+    assert errors.mae == pytest.approx(5 / 3)
+    assert errors.std == pytest.approx(2.0)
+    assert ErrorStats.from_dict(asdict(errors)) == errors
+
+
+async def test_errors_per_lead(hass: HomeAssistant, freezer: FrozenDateTimeFactory):
+    """Test the errors of today's and tomorrow's forecast survive a restart."""
+    hass.states.async_set(OUTDOOR, "5", {"unit_of_measurement": "°C"})
+    entry = await _setup(hass, **{CONF_OUTDOOR_SENSOR: OUTDOOR})
+    await _observe(hass, freezer, OUTDOOR, [8, 12, 1])
+    await _midnight(hass, freezer)
+
+    # Forecast 10 °C max and 2 °C min, observed 12 °C and 1 °C
+    bias = hass.states.get("sensor.offdelay_forecast_bias_today")
+    assert float(bias.state) == pytest.approx(-2.0)
+    assert bias.attributes["min_temp_bias"] == pytest.approx(1.0)
+    assert bias.attributes["days"] == 1
+    # Yesterday nothing was forecast for the first day
+    assert hass.states.get("sensor.offdelay_forecast_error_tomorrow").state == "unknown"
+
+    await _observe(hass, freezer, OUTDOOR, [6, 9, 7])
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    await _midnight(hass, freezer)
+
+    errors = entry.runtime_data.accuracy.errors
+    assert errors[LEAD_TODAY][QUANTITY_MAX].count == 2
+    assert errors[LEAD_TODAY][QUANTITY_MAX].bias == pytest.approx((-2.0 + 1.0) / 2)
+    # Forecast the day before: 11 °C max, observed 9 °C
+    assert errors[LEAD_TOMORROW][QUANTITY_MAX].bias == pytest.approx(2.0)
+    assert float(
+        hass.states.get("sensor.offdelay_forecast_error_tomorrow").state
+    ) == pytest.approx(2.0)
+
+
+async def test_partial_day_is_not_counted(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test a day observed from the afternoon only is left out."""
+    freezer.move_to("2024-01-15 14:00:00+00:00")
+    entry = await _setup(hass)
+    assert entry.runtime_data.accuracy.source == "weather.home"
+    for temperature in (5, 6, 7, 8):
+        freezer.tick(timedelta(minutes=30))
+        hass.states.async_set("weather.home", "sunny", {"temperature": temperature})
+        await hass.async_block_till_done()
+    await _midnight(hass, freezer)
+
+    assert entry.runtime_data.accuracy.errors[LEAD_TODAY][QUANTITY_MAX].count == 0
+    assert hass.states.get("sensor.offdelay_forecast_bias_today").state == "unknown"
+
+
+async def test_readings_do_not_hold_off_saving(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, hass_storage: dict
+):
+    """Test the observation is saved while readings keep coming in."""
+    entry = await _setup(hass)
+    key = f"{DOMAIN}.forecast_accuracy.{entry.entry_id}"
+    for step in range(int(OBSERVED_SAVE_INTERVAL / timedelta(seconds=30)) + 4):
+        freezer.tick(timedelta(seconds=30))
+        hass.states.async_set("weather.home", "sunny", {"temperature": step % 5})
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    observed = hass_storage[key]["data"]["observed"]
+    # Saved at the interval, not only with the first forecast
+    assert observed["samples"] > 20
+    assert observed["max_temp"] == 4
+
+
+def test_observed_temperature_of_weather_entity(hass: HomeAssistant):
+    """Test the current temperature of a weather entity is read in °C."""
+    hass.states.async_set(
+        "weather.home", "sunny", {"temperature": 50, "temperature_unit": "°F"}
+    )
+    assert observed_temperature(hass.states.get("weather.home")) == pytest.approx(10)
+    hass.states.async_set("weather.home", "sunny")
+    assert observed_temperature(hass.states.get("weather.home")) is None
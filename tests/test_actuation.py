@@ -0,0 +1,154 @@
+"""Test the Off-delay climate actuation on a climate mode change."""
+
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+)
+
+from custom_components.offdelay.const import (
+    CONF_CLIMATE_ACTUATION,
+    CONF_CLIMATES,
+    DATA_CLIMATE_MODE,
+    DOMAIN,
+)
+
+from .const import MOCK_CONFIG_WITH_CLIMATE
+
+MODES = {
+    "hvac_modes": ["off", "heat", "cool", "auto"],
+    "preset_modes": ["comfort", "eco"],
+}
+# Entity, integration, state and attributes
+CLIMATES = (
+    ("climate.living_room", "tado", "off", {**MODES, "preset_mode": "eco"}),
+    ("climate.office", "tado", "cool", {**MODES, "preset_mode": "comfort"}),
+    ("climate.garage", "nest", "off", {**MODES, "preset_mode": "eco"}),
+    ("climate.bedroom", "tado", "heat", {**MODES, "preset_mode": "eco"}),
+    ("climate.hall", "nest", "off", {"hvac_modes": ["off", "cool"]}),
+    ("climate.attic", "nest", "unavailable", {}),
+)
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Bypass weather calls."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={"weather_max_temp_today": 17, "weather_min_temp_today": 10},
+    ):
+        yield
+
+
+async def _setup(hass: HomeAssistant) -> MockConfigEntry:
+    registry = er.async_get(hass)
+    for entity_id, platform, state, attributes in CLIMATES:
+        object_id = entity_id.removeprefix("climate.")
+        registry.async_get_or_create(
+            "climate", platform, object_id, suggested_object_id=object_id
+        )
+        hass.states.async_set(entity_id, state, attributes)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            **MOCK_CONFIG_WITH_CLIMATE,
+            CONF_CLIMATES: [entity_id for entity_id, *_ in CLIMATES],
+        },
+        options={CONF_CLIMATE_ACTUATION: True},
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _set_mode(hass: HomeAssistant, entry: MockConfigEntry, mode: str) -> None:
+    coordinator = entry.runtime_data.coordinator
+    coordinator.async_set_updated_data({**coordinator.data, DATA_CLIMATE_MODE: mode})
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_batches_per_integration(hass: HomeAssistant):
+    """Test only the climates that need it are set, one call per integration."""
+    calls = async_mock_service(hass, "climate", "set_hvac_mode")
+    presets = async_mock_service(hass, "climate", "set_preset_mode")
+    entry = await _setup(hass)
+    # The mode at startup is taken as applied
+    assert not calls
+
+    await _set_mode(hass, entry, "winter")
+    assert sorted(
+        (call.data["entity_id"], call.data["hvac_mode"]) for call in calls
+    ) == [
+        (["climate.garage"], "heat"),
+        (["climate.living_room", "climate.office"], "heat"),
+    ]
+    # The bedroom already heats, but in the eco preset
+    assert sorted(
+        (call.data["entity_id"], call.data["preset_mode"]) for call in presets
+    ) == [
+        (["climate.garage"], "comfort"),
+        (["climate.living_room", "climate.bedroom"], "comfort"),
+    ]
+    last_run = entry.runtime_data.actuator.last_run
+    assert last_run["skipped"] == {
+        "hvac_mode": {
+            "climate.bedroom": "unchanged",
+            "climate.hall": "unsupported",
+            "climate.attic": "unavailable",
+        },
+        "preset_mode": {
+            "climate.office": "unchanged",
+            "climate.hall": "unsupported",
+            "climate.attic": "unavailable",
+        },
+    }
+    assert all(batch["attempts"] == 1 for batch in last_run["batches"])
+
+    # Between winter and summer auto with the eco preset
+    calls.clear()
+    presets.clear()
+    await _set_mode(hass, entry, "none")
+    assert [call.data["entity_id"] for call in calls] == [
+        ["climate.living_room", "climate.office", "climate.bedroom"],
+        ["climate.garage"],
+    ]
+    assert calls[0].data["hvac_mode"] == "auto"
+    assert [call.data for call in presets] == [
+        {"entity_id": ["climate.office"], "preset_mode": "eco"}
+    ]
+
+
+async def test_failed_call_is_retried(hass: HomeAssistant):
+    """Test a failing call is retried and reported."""
+    attempts: list[ServiceCall] = []
+
+    @callback
+    def flaky(call: ServiceCall) -> None:
+        attempts.append(call)
+        if len(attempts) == 1 or "climate.garage" in call.data["entity_id"]:
+            msg = "Thermostat did not answer"
+            raise HomeAssistantError(msg)
+
+    hass.services.async_register("climate", "set_hvac_mode", flaky)
+    async_mock_service(hass, "climate", "set_preset_mode")
+    entry = await _setup(hass)
+    with patch("custom_components.offdelay.actuation.backoff_delay", return_value=0):
+        await _set_mode(hass, entry, "summer")
+
+    batches = {
+        batch["integration"]: batch
+        for batch in entry.runtime_data.actuator.last_run["batches"]
+        if batch["service"] == "set_hvac_mode"
+    }
+    assert batches["nest"]["attempts"] == 3
+    assert batches["nest"]["error"] == "Thermostat did not answer"
+    assert "error" not in batches["tado"]
+    skipped = entry.runtime_data.actuator.last_run["skipped"]
+    assert skipped["hvac_mode"]["climate.office"] == "unchanged"
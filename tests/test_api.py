@@ -0,0 +1,148 @@
+"""Test the offdelay.be API client against a local stand-in server."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestServer
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.offdelay.api import (
+    OffdelayApiClient,
+    OffdelayApiClientAuthenticationError,
+    OffdelayApiClientCommunicationError,
+    backoff_delay,
+)
+from custom_components.offdelay.const import CONF_API_URL, DATA_API, DOMAIN
+
+from .const import MOCK_CONFIG
+
+
+class StandInApi:
+    """Stand-in for the offdelay.be API."""
+
+    def __init__(self) -> None:
+        """Initialize the stand-in."""
+        self.data = {"version": 1}
+        self.etag = '"v1"'
+        self.failures: list[int] = []
+        self.hits = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Answer with the next failure, 304 or the data."""
+        self.hits += 1
+        await self.release.wait()
+        if self.failures:
+            return web.Response(status=self.failures.pop(0))
+        if request.headers.get(hdrs.IF_NONE_MATCH) == self.etag:
+            return web.Response(status=304)
+        return web.json_response(self.data, headers={hdrs.ETAG: self.etag})
+
+
+@pytest.fixture(name="api")
+async def api_fixture(socket_enabled: None) -> AsyncGenerator[tuple[StandInApi, str]]:
+    """Start the stand-in server on localhost."""
+    api = StandInApi()
+    app = web.Application()
+    app.router.add_get("/data", api.handle)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    yield api, str(server.make_url("/data"))
+    await server.close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff():
+    """Retry without waiting."""
+    with patch("custom_components.offdelay.api.RETRY_BASE_DELAY", 0):
+        yield
+
+
+def test_backoff_delay():
+    """Test the delay grows exponentially and stays under the cap."""
+    with (
+        patch("custom_components.offdelay.api.RETRY_BASE_DELAY", 1),
+        patch("custom_components.offdelay.api.random.uniform", lambda _, b: b),
+    ):
+        assert [backoff_delay(attempt) for attempt in (1, 2, 3, 10)] == [
+            1,
+            2,
+            4,
+            30,
+        ]
+
+
+async def test_conditional_requests(hass: HomeAssistant, api: tuple[StandInApi, str]):
+    """Test unchanged data is answered from the cache after a 304."""
+    server, url = api
+    client = OffdelayApiClient(async_get_clientsession(hass), url)
+
+    assert await client.async_get_data() == {"version": 1}
+    assert await client.async_get_data() == {"version": 1}
+    assert client.not_modified == 1
+
+    server.data, server.etag = {"version": 2}, '"v2"'
+    assert await client.async_get_data() == {"version": 2}
+    assert client.cache_info()["etags"] == {url: '"v2"'}
+
+
+async def test_retries(hass: HomeAssistant, api: tuple[StandInApi, str]):
+    """Test server errors are retried and refused credentials are not."""
+    server, url = api
+    client = OffdelayApiClient(async_get_clientsession(hass), url)
+
+    server.failures = [503, 502]
+    assert await client.async_get_data() == {"version": 1}
+    assert server.hits == 3
+
+    server.failures = [500] * 4
+    with pytest.raises(OffdelayApiClientCommunicationError):
+        await client.async_get_data()
+
+    server.hits = 0
+    server.failures = [401]
+    with pytest.raises(OffdelayApiClientAuthenticationError):
+        await client.async_get_data()
+    assert server.hits == 1
+
+
+async def test_coalescing(hass: HomeAssistant, api: tuple[StandInApi, str]):
+    """Test concurrent calls share one request."""
+    server, url = api
+    server.release.clear()
+    client = OffdelayApiClient(async_get_clientsession(hass), url)
+
+    calls = [asyncio.create_task(client.async_get_data()) for _ in range(5)]
+    await asyncio.sleep(0.05)
+    server.release.set()
+    assert await asyncio.gather(*calls) == [{"version": 1}] * 5
+    assert server.hits == 1
+
+
+async def test_coordinator(hass: HomeAssistant, api: tuple[StandInApi, str]):
+    """Test the coordinator polls the API and keeps its data through errors."""
+    server, url = api
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_API_URL: url}
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={},
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = entry.runtime_data.coordinator
+        assert coordinator.data[DATA_API] == {"version": 1}
+
+        server.failures = [404]
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert coordinator.data[DATA_API] == {"version": 1}
@@ -0,0 +1,148 @@
+"""Test the Off-delay auto_turn_off service."""
+
+import datetime as dt
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.offdelay.const import DOMAIN
+
+from .const import MOCK_CONFIG
+
+PENDING_SENSOR = "sensor.offdelay_auto_turn_off_pending"
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Bypass weather calls."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={},
+    ):
+        yield
+
+
+@pytest.fixture(name="entry")
+async def entry_fixture(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up the integration."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, entry_id="test")
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.fixture(name="calls")
+def calls_fixture(hass: HomeAssistant, entry: MockConfigEntry) -> dict[str, list]:
+    """Mock the switch and light services once the switch platform is loaded."""
+    return {
+        (domain, service): async_mock_service(hass, domain, service)
+        for domain in ("switch", "light")
+        for service in ("turn_on", "turn_off")
+    }
+
+
+async def _auto_turn_off(hass: HomeAssistant, **data: Any) -> None:
+    await hass.services.async_call(DOMAIN, "auto_turn_off", data, blocking=True)
+    await hass.async_block_till_done()
+
+
+async def _tick(hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float):
+    freezer.tick(dt.timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_batched_calls_and_pending_sensor(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calls: dict
+):
+    """Test one call per domain and a pending count that follows deadlines."""
+    await _auto_turn_off(
+        hass,
+        entity_id=["switch.pump", "switch.fan", "light.hall"],
+        duration=30,
+        entities=[{"entity_id": "switch.heater", "duration": {"minutes": 2}}],
+    )
+    assert len(calls["switch", "turn_on"]) == 1
+    assert calls["switch", "turn_on"][0].data == {
+        "entity_id": ["switch.fan", "switch.heater", "switch.pump"]
+    }
+    assert calls["light", "turn_on"][0].data == {"entity_id": ["light.hall"]}
+    assert hass.states.get(PENDING_SENSOR).state == "4"
+
+    await _tick(hass, freezer, 31)
+    assert calls["switch", "turn_off"][0].data == {
+        "entity_id": ["switch.fan", "switch.pump"]
+    }
+    assert len(calls["light", "turn_off"]) == 1
+    assert hass.states.get(PENDING_SENSOR).state == "1"
+
+    await _tick(hass, freezer, 90)
+    assert calls["switch", "turn_off"][1].data == {"entity_id": ["switch.heater"]}
+    assert hass.states.get(PENDING_SENSOR).state == "0"
+
+
+async def test_restart_and_extend(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entry: MockConfigEntry,
+    calls: dict,
+):
+    """Test restart replaces a deadline and extend only moves it later."""
+    scheduler = entry.runtime_data.auto_turn_off.scheduler
+    now = dt_util.utcnow()
+
+    await _auto_turn_off(hass, entity_id="switch.pump", duration=60)
+    await _auto_turn_off(hass, entity_id="switch.pump", duration=10)
+    assert scheduler.deadline("switch.pump") == now + dt.timedelta(seconds=10)
+
+    await _auto_turn_off(
+        hass, entity_id="switch.pump", duration=120, mode="extend", turn_on=False
+    )
+    await _auto_turn_off(hass, entity_id="switch.pump", duration=5, mode="extend")
+    assert scheduler.deadline("switch.pump") == now + dt.timedelta(seconds=120)
+    assert len(calls["switch", "turn_on"]) == 3
+
+    await _tick(hass, freezer, 60)
+    assert calls["switch", "turn_off"] == []
+    await _tick(hass, freezer, 61)
+    assert len(calls["switch", "turn_off"]) == 1
+
+
+async def test_deadlines_survive_reload(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entry: MockConfigEntry,
+    calls: dict,
+):
+    """Test pending deadlines are stored and restored, overdue ones run."""
+    await _auto_turn_off(hass, entity_id="switch.pump", duration=30)
+    await _auto_turn_off(hass, entity_id="switch.fan", duration=300)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    freezer.tick(dt.timedelta(seconds=60))
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert calls["switch", "turn_off"][0].data == {"entity_id": ["switch.pump"]}
+    assert "switch.fan" in entry.runtime_data.auto_turn_off.scheduler
+    await _tick(hass, freezer, 241)
+    assert calls["switch", "turn_off"][1].data == {"entity_id": ["switch.fan"]}
+
+
+async def test_not_loaded(hass: HomeAssistant, entry: MockConfigEntry):
+    """Test the service refuses calls without a loaded entry."""
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    with pytest.raises(ServiceValidationError):
+        await _auto_turn_off(hass, entity_id="switch.pump", duration=30)
@@ -0,0 +1,213 @@
+"""Tests for the Offdelay blueprint sync."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.offdelay.blueprint import (
+    COMPACT_BLUEPRINT_DIR,
+    STORAGE_KEY,
+    SUMMARY_MAX_LENGTH,
+    async_remove_blueprints,
+    async_setup_blueprints,
+    load_blueprint_catalog,
+    release_blueprints,
+    source_blueprints,
+    sync_blueprints,
+)
+from custom_components.offdelay.const import CONF_BLUEPRINTS, DOMAIN
+
+from .const import MOCK_CONFIG
+
+LIGHT_SENSOR = "automation/offdelay/light_sensor_V1.yaml"
+AUTO_TURN_OFF = "script/offdelay/entity_auto_turn_off_v1.yaml"
+
+
+@pytest.fixture(name="config_dir")
+def config_dir_fixture(hass: HomeAssistant, tmp_path: Path) -> Path:
+    """Point the Home Assistant config dir at a temporary directory."""
+    hass.config.config_dir = str(tmp_path)
+    return tmp_path
+
+
+def test_first_sync_installs_and_second_is_noop(tmp_path: Path):
+    """Test only changed blueprints are written."""
+    manifest: dict = {}
+    shipped = source_blueprints(DOMAIN)
+
+    result = sync_blueprints(tmp_path, manifest, DOMAIN, "entry_1")
+    assert sorted(result.written) == sorted(shipped)
+    for rel_path in shipped:
+        assert (tmp_path / "blueprints" / rel_path).is_file()
+
+    result = sync_blueprints(tmp_path, manifest, DOMAIN, "entry_1")
+    assert result.written == []
+    assert sorted(result.unchanged) == sorted(shipped)
+
+
+def test_outdated_copy_is_updated(tmp_path: Path):
+    """Test a copy installed from an older release is replaced."""
+    manifest: dict = {}
+    sync_blueprints(tmp_path, manifest, DOMAIN, "entry_1")
+    manifest[LIGHT_SENSOR]["hash"] = "outdated"
+    destination = tmp_path / "blueprints" / LIGHT_SENSOR
+    destination.write_text("old release", encoding="utf-8")
+    manifest[LIGHT_SENSOR]["size"] = destination.stat().st_size
+    manifest[LIGHT_SENSOR]["mtime_ns"] = destination.stat().st_mtime_ns
+
+    result = sync_blueprints(tmp_path, manifest, DOMAIN, "entry_1")
+    assert result.written == [LIGHT_SENSOR]
+    assert (
+        destination.read_bytes() == (COMPACT_BLUEPRINT_DIR / LIGHT_SENSOR).read_bytes()
+    )
+
+
+def test_user_modified_copy_is_kept(tmp_path: Path):
+    """Test locally edited blueprints are neither overwritten nor deleted."""
+    manifest: dict = {}
+    sync_blueprints(tmp_path, manifest, DOMAIN, "entry_1")
+    destination = tmp_path / "blueprints" / LIGHT_SENSOR
+    destination.write_text("my changes", encoding="utf-8")
+
+    result = sync_blueprints(tmp_path, manifest, DOMAIN, "entry_1")
+    assert result.modified == [LIGHT_SENSOR]
+    assert destination.read_text(encoding="utf-8") == "my changes"
+
+    result = release_blueprints(tmp_path, manifest, "entry_1")
+    assert result.modified == [LIGHT_SENSOR]
+    assert LIGHT_SENSOR not in result.removed
+    assert destination.read_text(encoding="utf-8") == "my changes"
+
+    # A new entry still does not take the file over.
+    result = sync_blueprints(tmp_path, manifest, DOMAIN, "entry_2")
+    assert result.modified == [LIGHT_SENSOR]
+    assert destination.read_text(encoding="utf-8") == "my changes"
+
+
+def test_legacy_copy_is_adopted(tmp_path: Path):
+    """Test files left by releases without a manifest are taken over."""
+    destination = tmp_path / "blueprints" / LIGHT_SENSOR
+    destination.parent.mkdir(parents=True)
+    destination.write_bytes((COMPACT_BLUEPRINT_DIR / LIGHT_SENSOR).read_bytes())
+
+    manifest: dict = {}
+    result = sync_blueprints(tmp_path, manifest, DOMAIN, "entry_1")
+    assert LIGHT_SENSOR in result.unchanged
+    assert LIGHT_SENSOR not in result.written
+    assert manifest[LIGHT_SENSOR]["entries"] == ["entry_1"]
+
+
+def test_refcount_across_entries(tmp_path: Path):
+    """Test a blueprint is only removed when the last entry releases it."""
+    manifest: dict = {}
+    sync_blueprints(tmp_path, manifest, DOMAIN, "entry_1")
+    sync_blueprints(tmp_path, manifest, DOMAIN, "entry_2")
+    destination = tmp_path / "blueprints" / LIGHT_SENSOR
+
+    result = release_blueprints(tmp_path, manifest, "entry_1")
+    assert result.removed == []
+    assert destination.is_file()
+
+    result = release_blueprints(tmp_path, manifest, "entry_2")
+    assert sorted(result.removed) == sorted(source_blueprints(DOMAIN))
+    assert not destination.exists()
+    assert manifest == {}
+
+
+async def test_setup_and_remove_entry(
+    hass: HomeAssistant, config_dir: Path, hass_storage: dict
+):
+    """Test the async helpers persist the manifest between calls."""
+    result = await async_setup_blueprints(hass, "entry_1")
+    assert LIGHT_SENSOR in result.written
+    assert hass_storage[STORAGE_KEY]["data"]["files"][LIGHT_SENSOR]["entries"] == [
+        "entry_1"
+    ]
+
+    result = await async_setup_blueprints(hass, "entry_1")
+    assert result.written == []
+
+    await async_remove_blueprints(hass, "entry_1")
+    assert not (config_dir / "blueprints" / LIGHT_SENSOR).exists()
+    assert hass_storage[STORAGE_KEY]["data"]["files"] == {}
+
+
+def test_catalog_metadata():
+    """Test the catalog lists every shipped blueprint with a short summary."""
+    catalog = load_blueprint_catalog(DOMAIN)
+    assert set(catalog) == set(source_blueprints(DOMAIN))
+
+    info = catalog["script/offdelay/entity_auto_turn_off_v1.yaml"]
+    assert info.name == "Entity auto turn off v1"
+    assert info.blueprint_type == "script"
+    assert info.summary == "A script that turns a switch ON, waits, and turns it OFF."
+    for info in catalog.values():
+        assert info.name
+        assert len(info.summary) <= SUMMARY_MAX_LENGTH
+        assert "<" not in info.summary
+
+    assert load_blueprint_catalog(DOMAIN) is catalog
+
+
+async def test_only_selected_blueprints_are_installed(
+    hass: HomeAssistant, config_dir: Path
+):
+    """Test deselected blueprints are removed and unselected ones never copied."""
+    await async_setup_blueprints(hass, "entry_1")
+    assert (config_dir / "blueprints" / LIGHT_SENSOR).is_file()
+
+    result = await async_setup_blueprints(hass, "entry_1", {AUTO_TURN_OFF})
+    assert result.written == []
+    assert LIGHT_SENSOR in result.removed
+    assert not (config_dir / "blueprints" / LIGHT_SENSOR).exists()
+    assert (config_dir / "blueprints" / AUTO_TURN_OFF).is_file()
+
+
+async def test_deselected_blueprint_in_use_is_kept(
+    hass: HomeAssistant, config_dir: Path
+):
+    """Test a blueprint used by an automation is not deleted when deselected."""
+    await async_setup_blueprints(hass, "entry_1")
+
+    with patch(
+        "custom_components.offdelay.blueprint.automations_with_blueprint",
+        side_effect=lambda _hass, path: (
+            ["automation.hallway"] if path == "offdelay/light_sensor_V1.yaml" else []
+        ),
+    ):
+        result = await async_setup_blueprints(hass, "entry_1", set())
+
+    assert LIGHT_SENSOR not in result.removed
+    assert (config_dir / "blueprints" / LIGHT_SENSOR).is_file()
+
+
+async def test_options_flow_selects_blueprints(hass: HomeAssistant, config_dir: Path):
+    """Test picking blueprints in the options flow installs only those."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_BLUEPRINTS: []}
+    )
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={},
+    ):
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert not (config_dir / "blueprints" / AUTO_TURN_OFF).exists()
+
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        assert result["type"] == FlowResultType.FORM
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], user_input={CONF_BLUEPRINTS: [AUTO_TURN_OFF]}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_BLUEPRINTS] == [AUTO_TURN_OFF]
+    assert (config_dir / "blueprints" / AUTO_TURN_OFF).is_file()
+    assert not (config_dir / "blueprints" / LIGHT_SENSOR).exists()
@@ -0,0 +1,77 @@
+"""Tests for the compact blueprint variants."""
+
+import time
+from typing import Any
+
+from homeassistant.util.yaml import parse_yaml
+import pytest
+
+from custom_components.offdelay.blueprint import (
+    COMPACT_BLUEPRINT_DIR,
+    SUMMARY_MAX_LENGTH,
+    source_blueprints,
+)
+from custom_components.offdelay.const import DOMAIN
+from scripts.blueprint_compact import build_compact_blueprints
+
+SHIPPED = source_blueprints(DOMAIN)
+PARSE_ROUNDS = 3
+
+
+def _without_descriptions(inputs: dict[str, Any]) -> dict[str, Any]:
+    """Return input definitions without their (shortened) descriptions."""
+    stripped: dict[str, Any] = {}
+    for key, definition in inputs.items():
+        if not isinstance(definition, dict):
+            stripped[key] = definition
+            continue
+        definition = {k: v for k, v in definition.items() if k != "description"}
+        if isinstance(definition.get("input"), dict):
+            definition["input"] = _without_descriptions(definition["input"])
+        stripped[key] = definition
+    return stripped
+
+
+def _parse_time(content: str) -> float:
+    start = time.perf_counter()
+    for _ in range(PARSE_ROUNDS):
+        parse_yaml(content)
+    return (time.perf_counter() - start) / PARSE_ROUNDS
+
+
+def test_compact_blueprints_are_up_to_date():
+    """Test the committed compact blueprints match their originals."""
+    for rel_path, content in build_compact_blueprints().items():
+        compact = COMPACT_BLUEPRINT_DIR / rel_path
+        assert compact.is_file(), f"run scripts/compact_blueprints ({rel_path})"
+        assert compact.read_text(encoding="utf-8") == content, (
+            f"run scripts/compact_blueprints ({rel_path})"
+        )
+
+
+@pytest.mark.parametrize("rel_path", sorted(SHIPPED))
+def test_compact_blueprint_is_equivalent(rel_path: str, record_property):
+    """Test the compact variant keeps inputs, triggers and actions."""
+    original_content = SHIPPED[rel_path].read_text(encoding="utf-8")
+    compact_content = (COMPACT_BLUEPRINT_DIR / rel_path).read_text(encoding="utf-8")
+    original = parse_yaml(original_content)
+    compact = parse_yaml(compact_content)
+
+    # Everything outside the blueprint metadata is identical.
+    assert {k: v for k, v in original.items() if k != "blueprint"} == {
+        k: v for k, v in compact.items() if k != "blueprint"
+    }
+    original_meta = original["blueprint"]
+    compact_meta = compact["blueprint"]
+    assert _without_descriptions(original_meta["input"]) == _without_descriptions(
+        compact_meta["input"]
+    )
+    for key in ("name", "domain", "source_url", "author", "homeassistant"):
+        assert original_meta.get(key) == compact_meta.get(key)
+    assert len(compact_meta.get("description", "")) <= SUMMARY_MAX_LENGTH
+
+    assert len(compact_content) <= len(original_content)
+    record_property("original_bytes", len(original_content))
+    record_property("compact_bytes", len(compact_content))
+    record_property("original_parse_ms", round(_parse_time(original_content) * 1000, 2))
+    record_property("compact_parse_ms", round(_parse_time(compact_content) * 1000, 2))
@@ -86,7 +86,7 @@ async def test_config_flow_valid_climate_config(hass: HomeAssistant):
 
 
 async def test_config_flow_day_night_hour_conflict(hass: HomeAssistant):
-    """Test that day_start >= night_start shows error."""
+    """Test that day_start == night_start shows error."""
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": "user"}
     )
@@ -95,7 +95,7 @@ async def test_config_flow_day_night_hour_conflict(hass: HomeAssistant):
         user_input={
             "winter_max_temp": 15.0,
             "summer_min_temp": 20.0,
-            "climate_day_start_hour": 17,
+            "climate_day_start_hour": 8,
             "climate_night_start_hour": 8,
             "climate_delta_tolerance": 0.5,
         },
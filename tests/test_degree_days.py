@@ -0,0 +1,136 @@
+"""Test the Off-delay heating and cooling degree-days."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.offdelay.const import CONF_OUTDOOR_SENSOR, DOMAIN
+from custom_components.offdelay.degree_days import (
+    COOLING_TODAY,
+    HEATING_MONTH,
+    HEATING_TODAY,
+    degree_days_below,
+)
+
+from .const import MOCK_CONFIG
+
+OUTDOOR = "sensor.outdoor_temperature"
+
+
+@pytest.fixture(autouse=True)
+async def local_time(hass: HomeAssistant) -> None:
+    """Run in UTC."""
+    await hass.config.async_set_time_zone("UTC")
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Forecast a day with a mean of 12 °C."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={"weather_max_temp_today": 16.0, "weather_min_temp_today": 8.0},
+    ):
+        yield
+
+
+async def _setup(hass: HomeAssistant, **options: object) -> MockConfigEntry:
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, options=options)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _hours(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, entry: MockConfigEntry, hours
+) -> None:
+    for _ in range(hours):
+        freezer.tick(timedelta(hours=1))
+        entry.runtime_data.coordinator.async_reevaluate()
+        await hass.async_block_till_done()
+
+
+def test_trapezoidal_integration():
+    """Test only the part of a crossing below the base is counted."""
+    assert degree_days_below(18, 10, 14, 0.5) == pytest.approx(3.0)
+    assert degree_days_below(18, 20, 22, 1) == 0
+    # Half of the day below the base, at most 2 °C below it
+    assert degree_days_below(18, 16, 20, 1) == pytest.approx(0.5)
+    assert degree_days_below(18, 20, 16, 1) == pytest.approx(0.5)
+    # Cooling degree-days are the same with the signs flipped
+    assert degree_days_below(-21, -23, -19, 1) == pytest.approx(0.5)
+
+
+async def test_outdoor_sensor_is_integrated(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test the totals grow with the outdoor sensor and survive a reload."""
+    freezer.move_to("2024-01-15 00:00:00+00:00")
+    hass.states.async_set(OUTDOOR, "10", {"unit_of_measurement": "°C"})
+    entry = await _setup(hass, **{CONF_OUTDOOR_SENSOR: OUTDOOR})
+    await _hours(hass, freezer, entry, 6)
+
+    # 8 °C below the base for a quarter of a day
+    state = hass.states.get("sensor.offdelay_heating_degree_days_today")
+    assert state.attributes["state_class"] == "total_increasing"
+    assert float(state.state) == pytest.approx(2.0)
+    assert hass.states.get("sensor.offdelay_cooling_degree_days_today").state == "0.0"
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    await _hours(hass, freezer, entry, 6)
+    assert entry.runtime_data.degree_days.totals[HEATING_TODAY] == pytest.approx(4.0)
+
+
+async def test_periods_reset(hass: HomeAssistant, freezer: FrozenDateTimeFactory):
+    """Test the forecast mean is used and the totals restart on time."""
+    freezer.move_to("2024-01-31 18:00:00+00:00")
+    entry = await _setup(hass)
+    tracker = entry.runtime_data.degree_days
+    await _hours(hass, freezer, entry, 3)
+    assert tracker.totals[HEATING_TODAY] == pytest.approx(6 * 3 / 24)
+
+    # The last temperature is counted up to midnight, then the day restarts
+    freezer.move_to("2024-01-31 23:30:00+00:00")
+    entry.runtime_data.coordinator.async_reevaluate()
+    freezer.move_to("2024-02-01 00:00:00+00:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert tracker.totals[HEATING_TODAY] == 0
+    assert tracker.totals[COOLING_TODAY] == 0
+    assert tracker.totals[HEATING_MONTH] == 0
+    assert hass.states.get("sensor.offdelay_heating_degree_days_this_month").state == (
+        "0.0"
+    )
+
+    await _hours(hass, freezer, entry, 4)
+    assert tracker.totals[HEATING_MONTH] == pytest.approx(1.0)
+
+
+async def test_restart_over_midnight(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test the hours Home Assistant was stopped over midnight are not counted."""
+    freezer.move_to("2024-01-15 20:00:00+00:00")
+    hass.states.async_set(OUTDOOR, "10", {"unit_of_measurement": "°C"})
+    entry = await _setup(hass, **{CONF_OUTDOOR_SENSOR: OUTDOOR})
+    await _hours(hass, freezer, entry, 3)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+    freezer.move_to("2024-01-16 01:00:00+00:00")
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    tracker = entry.runtime_data.degree_days
+    assert tracker.totals[HEATING_TODAY] == 0
+    assert tracker.totals[HEATING_MONTH] == pytest.approx(8 * 3 / 24)
+
+    await _hours(hass, freezer, entry, 3)
+    assert tracker.totals[HEATING_TODAY] == pytest.approx(8 * 3 / 24)
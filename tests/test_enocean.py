@@ -0,0 +1,224 @@
+"""Test the Off-delay EnOcean rocker switch handler."""
+
+import datetime as dt
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigSubentryDataWithId
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.offdelay.const import (
+    CONF_DIM_STEP,
+    CONF_LIGHTS_LEFT,
+    CONF_LIGHTS_RIGHT,
+    CONF_SWITCH_EVENT,
+    DOMAIN,
+    SUBENTRY_ENOCEAN_SWITCH,
+)
+from custom_components.offdelay.enocean import parse_event_type
+
+from .const import MOCK_CONFIG
+
+
+def _switch_subentry(name: str) -> ConfigSubentryDataWithId:
+    return ConfigSubentryDataWithId(
+        subentry_id=name,
+        subentry_type=SUBENTRY_ENOCEAN_SWITCH,
+        title=name.title(),
+        data={
+            CONF_SWITCH_EVENT: f"event.{name}_action",
+            CONF_LIGHTS_LEFT: [f"light.{name}_left"],
+            CONF_LIGHTS_RIGHT: [f"light.{name}_right"],
+            CONF_DIM_STEP: 10,
+        },
+        unique_id=f"event.{name}_action",
+    )
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Bypass weather calls."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={},
+    ):
+        yield
+
+
+@pytest.fixture(name="calls")
+def calls_fixture(hass: HomeAssistant) -> dict[str, list]:
+    """Mock the light services."""
+    return {
+        "on": async_mock_service(hass, "light", "turn_on"),
+        "off": async_mock_service(hass, "light", "turn_off"),
+    }
+
+
+async def _setup(
+    hass: HomeAssistant, *subentries: ConfigSubentryDataWithId
+) -> MockConfigEntry:
+    # The event entities exist with an earlier event
+    for subentry in subentries:
+        hass.states.async_set(
+            subentry["data"][CONF_SWITCH_EVENT],
+            "2024-01-01T00:00:00+00:00",
+            {"event_type": "release_1"},
+        )
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, subentries_data=list(subentries)
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _event(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, name: str, event_type: str
+) -> None:
+    """Fire an event on the event entity of a switch, like Zigbee2MQTT does."""
+    freezer.tick(dt.timedelta(milliseconds=10))
+    hass.states.async_set(
+        f"event.{name}_action",
+        dt.datetime.now(dt.UTC).isoformat(),
+        {"event_type": event_type},
+    )
+    await hass.async_block_till_done()
+
+
+async def _tick(hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float):
+    freezer.tick(dt.timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+def test_parse_event_type():
+    """Test event types are split into button and press/release."""
+    assert parse_event_type("press_1") == ("1", "press")
+    assert parse_event_type("release_2_and_4") == ("2_and_4", "release")
+    assert parse_event_type("release_5") is None
+    assert parse_event_type("hold_1") is None
+
+
+async def test_short_presses(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calls: dict
+):
+    """Test short presses switch the lights of their own switch and rocker."""
+    await _setup(hass, _switch_subentry("hall"), _switch_subentry("kitchen"))
+
+    await _event(hass, freezer, "hall", "press_1")
+    await _event(hass, freezer, "hall", "release_1")
+    assert calls["on"][-1].data == {"entity_id": ["light.hall_left"]}
+
+    await _event(hass, freezer, "kitchen", "press_4")
+    await _event(hass, freezer, "kitchen", "release_4")
+    assert calls["off"][-1].data == {"entity_id": ["light.kitchen_right"]}
+
+    await _event(hass, freezer, "hall", "press_1_and_3")
+    await _event(hass, freezer, "hall", "release_1_and_3")
+    assert calls["on"][-1].data == {
+        "entity_id": ["light.hall_left", "light.hall_right"]
+    }
+    assert len(calls["on"]) == 2
+    assert len(calls["off"]) == 1
+
+
+async def test_long_press_dims_until_release(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calls: dict
+):
+    """Test holding a button dims in steps and releasing it stops."""
+    entry = await _setup(hass, _switch_subentry("hall"))
+    scheduler = entry.runtime_data.rockers.scheduler
+
+    await _event(hass, freezer, "hall", "press_2")
+    await _tick(hass, freezer, 1.1)
+    await _tick(hass, freezer, 0.5)
+    assert [call.data for call in calls["on"]] == [
+        {"entity_id": ["light.hall_left"], "brightness_step_pct": -10},
+        {"entity_id": ["light.hall_left"], "brightness_step_pct": -10},
+    ]
+
+    await _event(hass, freezer, "hall", "release_2")
+    assert len(scheduler) == 0
+    await _tick(hass, freezer, 2)
+    # A release after dimming does not also turn the lights off
+    assert len(calls["on"]) == 2
+    assert calls["off"] == []
+
+
+async def test_lost_release_stops_dimming(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calls: dict
+):
+    """Test dimming stops after the full range when the release never comes."""
+    entry = await _setup(hass, _switch_subentry("hall"))
+
+    await _event(hass, freezer, "hall", "press_1")
+    for _ in range(30):
+        await _tick(hass, freezer, 0.5)
+    # Ten steps of 10% go from off to full brightness
+    assert len(calls["on"]) == 10
+    assert len(entry.runtime_data.rockers.scheduler) == 0
+
+    # The late release does not also turn the lights on
+    await _event(hass, freezer, "hall", "release_1")
+    assert len(calls["on"]) == 10
+
+
+async def test_restored_event_is_not_replayed(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calls: dict
+):
+    """Test an event entity coming back does not repeat its last event."""
+    await _setup(hass, _switch_subentry("hall"))
+    last_event = hass.states.get("event.hall_action")
+
+    hass.states.async_set("event.hall_action", "unavailable")
+    await hass.async_block_till_done()
+    hass.states.async_set(
+        "event.hall_action", last_event.state, dict(last_event.attributes)
+    )
+    await hass.async_block_till_done()
+    # Only attributes changed, the event is the same
+    hass.states.async_set(
+        "event.hall_action", last_event.state, {"event_type": "release_1", "x": 1}
+    )
+    await hass.async_block_till_done()
+    assert calls["on"] == []
+
+    await _event(hass, freezer, "hall", "press_1")
+    await _event(hass, freezer, "hall", "release_1")
+    assert len(calls["on"]) == 1
+
+
+async def test_subentry_flow(hass: HomeAssistant):
+    """Test adding a switch requires lights and a free event entity."""
+    entry = await _setup(hass, _switch_subentry("hall"))
+
+    result = await hass.config_entries.subentries.async_init(
+        (entry.entry_id, SUBENTRY_ENOCEAN_SWITCH), context={"source": "user"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    user_input = {
+        "name": "Hall",
+        CONF_SWITCH_EVENT: "event.hall_action",
+        CONF_LIGHTS_LEFT: ["light.hall"],
+    }
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"], user_input=user_input
+    )
+    assert result["errors"] == {"base": "enocean_switch_in_use"}
+
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"],
+        user_input={**user_input, CONF_SWITCH_EVENT: "event.attic_action"},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    assert len(entry.runtime_data.rockers.switches) == 2
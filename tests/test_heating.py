@@ -0,0 +1,258 @@
+"""Test the Off-delay native heating controller."""
+
+import datetime as dt
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigSubentryDataWithId
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.offdelay.const import (
+    CONF_CLIMATE,
+    CONF_COMFORT_END,
+    CONF_COMFORT_START,
+    CONF_COMFORT_TEMP,
+    CONF_ECO_TEMP,
+    CONF_FROST_TEMP,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_WINDOW_SENSORS,
+    DATA_CLIMATE_MODE,
+    DOMAIN,
+    SUBENTRY_HEATING_ROOM,
+)
+from custom_components.offdelay.heating import HeatingRoom, calibrate, compute_target
+
+from .const import MOCK_CONFIG
+
+ROOM_DATA = {
+    CONF_CLIMATE: "climate.living",
+    CONF_COMFORT_TEMP: 21.0,
+    CONF_ECO_TEMP: 18.0,
+    CONF_FROST_TEMP: 7.0,
+    CONF_COMFORT_START: "07:00:00",
+    CONF_COMFORT_END: "22:00:00",
+    CONF_WINDOW_SENSORS: ["binary_sensor.living_window"],
+}
+
+
+def _room_subentry(
+    subentry_id: str, title: str, **data: object
+) -> ConfigSubentryDataWithId:
+    room = {**ROOM_DATA, **data}
+    return ConfigSubentryDataWithId(
+        subentry_id=subentry_id,
+        subentry_type=SUBENTRY_HEATING_ROOM,
+        title=title,
+        data=room,
+        unique_id=room[CONF_CLIMATE],
+    )
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Bypass weather calls."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={},
+    ):
+        yield
+
+
+@pytest.fixture(name="house")
+async def house_fixture(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Someone is home at noon, windows are closed."""
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to("2024-01-15 12:00:00+00:00")
+    hass.states.async_set("zone.home", "1")
+    hass.states.async_set(
+        "climate.living", "heat", {"temperature": 20.0, "current_temperature": 19.0}
+    )
+    hass.states.async_set(
+        "climate.kitchen", "heat", {"temperature": 20.0, "current_temperature": 19.0}
+    )
+    hass.states.async_set("binary_sensor.living_window", "off")
+
+
+async def _setup(
+    hass: HomeAssistant, *subentries: ConfigSubentryDataWithId
+) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, subentries_data=list(subentries)
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def test_compute_target_priorities():
+    """Test window, season, presence and schedule are applied in order."""
+    room = HeatingRoom(
+        room_id="room",
+        name="Living",
+        climate="climate.living",
+        comfort=21.0,
+        eco=18.0,
+        frost=7.0,
+        comfort_start=dt.time(7),
+        comfort_end=dt.time(22),
+    )
+    noon = dt.time(12)
+    kwargs = {"climate_mode": "winter", "home": True, "window_open": False}
+
+    assert compute_target(room, now=noon, **kwargs) == 21.0
+    assert compute_target(room, now=dt.time(23), **kwargs) == 18.0
+    assert compute_target(room, now=noon, **{**kwargs, "home": False}) == 18.0
+    assert compute_target(room, now=noon, **{**kwargs, "window_open": True}) == 7.0
+    assert compute_target(room, now=noon, **{**kwargs, "climate_mode": "summer"}) == 7.0
+
+
+def test_comfort_window_wraps_midnight():
+    """Test a schedule ending before it starts spans midnight."""
+    room = HeatingRoom(
+        room_id="room",
+        name="Bedroom",
+        climate="climate.bedroom",
+        comfort=19.0,
+        eco=16.0,
+        frost=7.0,
+        comfort_start=dt.time(21),
+        comfort_end=dt.time(6),
+    )
+    assert room.in_comfort_window(dt.time(23))
+    assert room.in_comfort_window(dt.time(2))
+    assert not room.in_comfort_window(dt.time(12))
+
+
+def test_calibrate():
+    """Test the thermostat error is compensated in setpoint steps."""
+    assert calibrate(21.0, None, 20.0) == 21.0
+    assert calibrate(21.0, 22.0, 20.1) == 23.0
+    assert calibrate(21.0, 19.0, 19.0) == 21.0
+    assert calibrate(21.0, 35.0, 15.0) == 26.0
+
+
+@pytest.mark.usefixtures("house")
+async def test_setpoint_only_sent_on_change(hass: HomeAssistant):
+    """Test set_temperature is only called when a target changes."""
+    calls = async_mock_service(hass, "climate", "set_temperature")
+    await _setup(hass, _room_subentry("living", "Living"))
+
+    assert len(calls) == 1
+    assert calls[0].data == {"entity_id": ["climate.living"], "temperature": 21.0}
+    assert hass.states.get("sensor.living_heating_target").state == "21.0"
+
+    # Unrelated attribute change: nothing to send
+    hass.states.async_set(
+        "climate.living", "heat", {"temperature": 21.0, "current_temperature": 19.5}
+    )
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    hass.states.async_set("binary_sensor.living_window", "on")
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert calls[1].data["temperature"] == 7.0
+    assert hass.states.get("sensor.living_heating_target").state == "7.0"
+
+
+@pytest.mark.usefixtures("house")
+async def test_rooms_with_same_target_share_a_call(hass: HomeAssistant):
+    """Test rooms that change to the same target are set together."""
+    calls = async_mock_service(hass, "climate", "set_temperature")
+    await _setup(
+        hass,
+        _room_subentry("living", "Living"),
+        _room_subentry(
+            "kitchen", "Kitchen", climate="climate.kitchen", window_sensors=[]
+        ),
+    )
+    assert len(calls) == 1
+    assert sorted(calls[0].data["entity_id"]) == ["climate.kitchen", "climate.living"]
+
+    hass.states.async_set("zone.home", "0")
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert calls[1].data["temperature"] == 18.0
+
+
+@pytest.mark.usefixtures("house")
+async def test_schedule_and_climate_mode(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test schedule boundaries and the summer mode update the target."""
+    calls = async_mock_service(hass, "climate", "set_temperature")
+    entry = await _setup(hass, _room_subentry("living", "Living"))
+    assert calls[-1].data["temperature"] == 21.0
+
+    freezer.move_to("2024-01-15 22:00:00+00:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert calls[-1].data["temperature"] == 18.0
+
+    coordinator = entry.runtime_data.coordinator
+    coordinator.async_set_updated_data(
+        {**coordinator.data, DATA_CLIMATE_MODE: "summer"}
+    )
+    await hass.async_block_till_done()
+    assert calls[-1].data["temperature"] == 7.0
+    assert len(calls) == 3
+
+
+@pytest.mark.usefixtures("house")
+async def test_calibration_sensor(hass: HomeAssistant):
+    """Test an external room sensor offsets the setpoint."""
+    hass.states.async_set("sensor.living_temperature", "18.0")
+    calls = async_mock_service(hass, "climate", "set_temperature")
+    await _setup(
+        hass,
+        _room_subentry(
+            "living", "Living", temperature_sensor="sensor.living_temperature"
+        ),
+    )
+    assert calls[-1].data["temperature"] == 22.0
+
+    hass.states.async_set("sensor.living_temperature", "19.0")
+    await hass.async_block_till_done()
+    assert calls[-1].data["temperature"] == 21.0
+
+
+async def test_subentry_flow(hass: HomeAssistant):
+    """Test adding a heating room and rejecting a second room on its climate."""
+    entry = await _setup(hass)
+
+    result = await hass.config_entries.subentries.async_init(
+        (entry.entry_id, SUBENTRY_HEATING_ROOM), context={"source": "user"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    user_input = {"name": "Living", **ROOM_DATA, CONF_ECO_TEMP: 22.0}
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"], user_input=user_input
+    )
+    assert result["errors"] == {"base": "heating_temperature_order"}
+
+    user_input[CONF_ECO_TEMP] = 18.0
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"], user_input=user_input
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    (subentry,) = entry.subentries.values()
+    assert subentry.title == "Living"
+    assert CONF_TEMPERATURE_SENSOR not in subentry.data
+
+    result = await hass.config_entries.subentries.async_init(
+        (entry.entry_id, SUBENTRY_HEATING_ROOM), context={"source": "user"}
+    )
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"], user_input={**user_input, "name": "Other"}
+    )
+    assert result["errors"] == {"base": "heating_climate_in_use"}
@@ -0,0 +1,140 @@
+"""Test the Off-delay hourly forecast of the day window."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.offdelay.const import (
+    CONF_HOURLY_FORECAST,
+    DATA_CLIMATE_MODE,
+    DATA_WINDOW_HOURS_BELOW,
+    DATA_WINDOW_MAX_TEMP,
+    DOMAIN,
+)
+from custom_components.offdelay.hourly import HourlyForecast
+
+from .const import MOCK_CONFIG
+
+NOON = datetime(2024, 1, 15, 12, tzinfo=UTC)
+
+
+def _hours(start: datetime, temperatures: list[float]) -> list[dict[str, object]]:
+    return [
+        {
+            "datetime": (start + timedelta(hours=index)).isoformat(),
+            "temperature": temperature,
+            "cloud_coverage": 50,
+        }
+        for index, temperature in enumerate(temperatures)
+    ]
+
+
+@pytest.fixture(autouse=True)
+async def noon(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Run inside the day window."""
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to(NOON)
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Make the daily forecast warm."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={"weather_max_temp_today": 25.0, "weather_min_temp_today": 9.0},
+    ):
+        yield
+
+
+@pytest.fixture(name="hourly")
+def hourly_fixture():
+    """Return a cold afternoon and a warm evening from the hourly forecast."""
+    with patch(
+        "custom_components.offdelay.hourly.async_get_forecast",
+        new_callable=AsyncMock,
+        return_value=_hours(NOON, [10, 12, 14, 13, 11, 25, 26, 24]),
+    ) as hourly:
+        yield hourly
+
+
+def test_window_features():
+    """Test parsing, sorting and the features of the hours in a window."""
+    forecast = HourlyForecast.from_forecast(
+        [
+            *reversed(_hours(NOON, [10, 12, 14])),
+            {"datetime": "not a date", "temperature": 40},
+            {"datetime": (NOON + timedelta(hours=3)).isoformat()},
+        ]
+    )
+    assert forecast.temperature.typecode == "d"
+    assert list(forecast.temperature) == [10, 12, 14]
+
+    features = forecast.window_features(
+        NOON, NOON + timedelta(hours=2), winter_max=11, summer_min=11.5
+    )
+    assert features == {
+        "window_max_temp": 12,
+        "window_mean_temp": 11.0,
+        "window_hours_above": 1,
+        "window_hours_below": 1,
+        "window_cloud_coverage": 50,
+    }
+    assert set(
+        forecast.window_features(
+            NOON + timedelta(days=1),
+            NOON + timedelta(days=1, hours=5),
+            winter_max=11,
+            summer_min=20,
+        ).values()
+    ) == {None}
+
+
+def test_passed_hours_are_kept():
+    """Test a new forecast keeps the hours before it from the previous one."""
+    previous = HourlyForecast.from_forecast(_hours(NOON, [10, 12, 14]))
+    forecast = HourlyForecast.from_forecast(
+        _hours(NOON + timedelta(hours=2), [15, 16])
+    ).merged_with(previous)
+
+    assert list(forecast.temperature) == [10, 12, 15, 16]
+
+
+async def test_hourly_forecast_decides_the_mode(hass: HomeAssistant, hourly: AsyncMock):
+    """Test the window temperatures decide the mode and are only computed once."""
+    hass.states.async_set("weather.home", "sunny")
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_HOURLY_FORECAST: True}
+    )
+    entry.add_to_hass(hass)
+    with patch.object(
+        HourlyForecast,
+        "window_features",
+        autospec=True,
+        side_effect=HourlyForecast.window_features,
+    ) as features:
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = entry.runtime_data.coordinator
+
+        # Only the hours before 17:00 count, the warm evening does not
+        assert coordinator.data[DATA_WINDOW_MAX_TEMP] == 14
+        assert coordinator.data[DATA_WINDOW_HOURS_BELOW] == 5
+        assert coordinator.data[DATA_CLIMATE_MODE] == "winter"
+        assert hass.states.get("sensor.offdelay_day_window_max_temp").state == "14.0"
+        assert (
+            hass.states.get("sensor.offdelay_day_window_hours_below_winter").state
+            == "5"
+        )
+
+        await coordinator.async_refresh()
+        assert features.call_count == 1
+
+        hourly.return_value = _hours(NOON, [16, 17])
+        await coordinator.async_refresh()
+        assert features.call_count == 2
+        assert coordinator.data[DATA_CLIMATE_MODE] == "none"
@@ -0,0 +1,224 @@
+"""Test the Off-delay native motion light controller."""
+
+import datetime as dt
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigSubentryDataWithId
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.offdelay.const import (
+    CONF_ACTIVE_END,
+    CONF_ACTIVE_START,
+    CONF_BYPASS_ENTITY,
+    CONF_LIGHTS,
+    CONF_LUX_SENSOR,
+    CONF_LUX_THRESHOLD,
+    CONF_MAX_SUN_ELEVATION,
+    CONF_MOTION_SENSORS,
+    CONF_OFF_DELAY,
+    DOMAIN,
+    SUBENTRY_LIGHT_ROOM,
+)
+
+from .const import MOCK_CONFIG
+
+
+def _room_subentry(room: str, **data: object) -> ConfigSubentryDataWithId:
+    return ConfigSubentryDataWithId(
+        subentry_id=room,
+        subentry_type=SUBENTRY_LIGHT_ROOM,
+        title=room.title(),
+        data={
+            CONF_MOTION_SENSORS: [f"binary_sensor.{room}_motion"],
+            CONF_LIGHTS: [f"light.{room}"],
+            CONF_OFF_DELAY: 60,
+            **data,
+        },
+        unique_id=None,
+    )
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Bypass weather calls."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={},
+    ):
+        yield
+
+
+@pytest.fixture(name="calls")
+async def calls_fixture(hass: HomeAssistant, freezer: FrozenDateTimeFactory):
+    """Mock the light services and start at noon with everything off."""
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to("2024-01-15 12:00:00+00:00")
+    for room in ("hall", "kitchen"):
+        hass.states.async_set(f"binary_sensor.{room}_motion", "off")
+        hass.states.async_set(f"light.{room}", "off")
+    return {
+        "on": async_mock_service(hass, "light", "turn_on"),
+        "off": async_mock_service(hass, "light", "turn_off"),
+    }
+
+
+async def _setup(
+    hass: HomeAssistant, *subentries: ConfigSubentryDataWithId
+) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, subentries_data=list(subentries)
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _motion(hass: HomeAssistant, room: str, state: str) -> None:
+    hass.states.async_set(f"binary_sensor.{room}_motion", state)
+    await hass.async_block_till_done()
+
+
+async def _tick(hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float):
+    freezer.tick(dt.timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_off_delay_restarts_on_motion(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calls: dict
+):
+    """Test lights turn on with motion and off after the motion clears."""
+    entry = await _setup(hass, _room_subentry("hall"))
+    scheduler = entry.runtime_data.lighting.scheduler
+
+    await _motion(hass, "hall", "on")
+    assert calls["on"][-1].data == {"entity_id": ["light.hall"]}
+    hass.states.async_set("light.hall", "on")
+
+    await _motion(hass, "hall", "off")
+    assert "hall" in scheduler
+    await _tick(hass, freezer, 30)
+
+    # New motion cancels the pending off-delay without another turn_on
+    await _motion(hass, "hall", "on")
+    assert "hall" not in scheduler
+    assert len(calls["on"]) == 1
+    await _motion(hass, "hall", "off")
+    await _tick(hass, freezer, 45)
+    assert calls["off"] == []
+
+    await _tick(hass, freezer, 20)
+    assert calls["off"][-1].data == {"entity_id": ["light.hall"]}
+    assert len(scheduler) == 0
+
+
+async def test_rooms_share_one_call(hass: HomeAssistant, calls: dict):
+    """Test rooms triggered by the same sensor are switched in one call."""
+    await _setup(
+        hass,
+        _room_subentry("hall"),
+        _room_subentry(
+            "kitchen", **{CONF_MOTION_SENSORS: ["binary_sensor.hall_motion"]}
+        ),
+    )
+    await _motion(hass, "hall", "on")
+    assert len(calls["on"]) == 1
+    assert calls["on"][0].data == {"entity_id": ["light.hall", "light.kitchen"]}
+
+
+async def test_conditions(hass: HomeAssistant, calls: dict):
+    """Test lux, sun and time conditions gate turning lights on."""
+    hass.states.async_set("sensor.hall_lux", "250")
+    hass.states.async_set("sun.sun", "above_horizon", {"elevation": 30.0})
+    await _setup(
+        hass,
+        _room_subentry(
+            "hall",
+            **{CONF_LUX_SENSOR: "sensor.hall_lux", CONF_LUX_THRESHOLD: 100},
+        ),
+        _room_subentry("kitchen", **{CONF_MAX_SUN_ELEVATION: 5}),
+    )
+    await _motion(hass, "hall", "on")
+    await _motion(hass, "kitchen", "on")
+    assert calls["on"] == []
+
+    await _motion(hass, "hall", "off")
+    await _motion(hass, "kitchen", "off")
+    hass.states.async_set("sensor.hall_lux", "40")
+    hass.states.async_set("sun.sun", "below_horizon", {"elevation": -2.0})
+    await _motion(hass, "hall", "on")
+    await _motion(hass, "kitchen", "on")
+    assert [call.data["entity_id"] for call in calls["on"]] == [
+        ["light.hall"],
+        ["light.kitchen"],
+    ]
+
+
+async def test_time_window_and_bypass(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calls: dict
+):
+    """Test the active window and the bypass entity."""
+    hass.states.async_set("input_boolean.party", "off")
+    await _setup(
+        hass,
+        _room_subentry(
+            "hall",
+            **{CONF_ACTIVE_START: "18:00:00", CONF_ACTIVE_END: "06:00:00"},
+        ),
+        _room_subentry("kitchen", **{CONF_BYPASS_ENTITY: "input_boolean.party"}),
+    )
+    await _motion(hass, "hall", "on")
+    assert calls["on"] == []
+
+    await _motion(hass, "kitchen", "on")
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("input_boolean.party", "on")
+    await _motion(hass, "kitchen", "off")
+    await _tick(hass, freezer, 120)
+    assert calls["off"] == []
+
+    # Leaving bypass restarts the off-delay
+    hass.states.async_set("input_boolean.party", "off")
+    await hass.async_block_till_done()
+    await _tick(hass, freezer, 61)
+    assert calls["off"][-1].data == {"entity_id": ["light.kitchen"]}
+
+
+async def test_subentry_flow(hass: HomeAssistant):
+    """Test adding a light room validates paired options."""
+    entry = await _setup(hass)
+
+    result = await hass.config_entries.subentries.async_init(
+        (entry.entry_id, SUBENTRY_LIGHT_ROOM), context={"source": "user"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    user_input = {
+        "name": "Hall",
+        CONF_MOTION_SENSORS: ["binary_sensor.hall_motion"],
+        CONF_LIGHTS: ["light.hall"],
+        CONF_OFF_DELAY: 60,
+        CONF_LUX_SENSOR: "sensor.hall_lux",
+    }
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"], user_input=user_input
+    )
+    assert result["errors"] == {"base": "light_lux_incomplete"}
+
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"], user_input={**user_input, CONF_LUX_THRESHOLD: 50}
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    (subentry,) = entry.subentries.values()
+    assert subentry.title == "Hall"
+    assert subentry.data[CONF_LUX_THRESHOLD] == 50
@@ -0,0 +1,200 @@
+"""Test the Off-delay notification dispatcher."""
+
+import asyncio
+import datetime as dt
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import device_registry as dr
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.offdelay.const import DOMAIN
+from custom_components.offdelay.notifications import (
+    COALESCE_WINDOW,
+    MAX_CONCURRENT_SENDS,
+)
+
+from .const import MOCK_CONFIG
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Bypass weather calls."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={},
+    ):
+        yield
+
+
+class StandInNotify:
+    """Stand-in for the mobile_app notify services."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the stand-in."""
+        self.hass = hass
+        self.calls: dict[str, list[dict[str, Any]]] = {}
+        self.release = asyncio.Event()
+        self.release.set()
+        self.running = 0
+        self.max_running = 0
+
+    def register(self, service: str) -> None:
+        """Register a notify service that records its calls."""
+        self.calls[service] = []
+
+        async def handle(call: ServiceCall) -> None:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            await self.release.wait()
+            self.running -= 1
+            self.calls[service].append(dict(call.data))
+
+        self.hass.services.async_register("notify", service, handle)
+
+
+@pytest.fixture(name="mobile_app")
+def mobile_app_fixture(hass: HomeAssistant) -> MockConfigEntry:
+    """Add a mobile_app config entry the phones belong to."""
+    entry = MockConfigEntry(domain="mobile_app")
+    entry.add_to_hass(hass)
+    return entry
+
+
+def _phone(hass: HomeAssistant, mobile_app: MockConfigEntry, name: str) -> str:
+    return (
+        dr.async_get(hass)
+        .async_get_or_create(
+            config_entry_id=mobile_app.entry_id,
+            identifiers={("mobile_app", name)},
+            name=name,
+        )
+        .id
+    )
+
+
+async def _setup(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def _notify(hass: HomeAssistant, **data: Any) -> None:
+    await hass.services.async_call(DOMAIN, "notify", data, blocking=True)
+
+
+async def _close_window(hass: HomeAssistant, freezer: FrozenDateTimeFactory):
+    freezer.tick(COALESCE_WINDOW + dt.timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_coalesce_by_tag_and_batch_per_device(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, mobile_app: MockConfigEntry
+):
+    """Test tagged duplicates are merged and every phone gets its messages."""
+    notify = StandInNotify(hass)
+    notify.register("mobile_app_alice_phone")
+    notify.register("mobile_app_bob_phone")
+    alice = _phone(hass, mobile_app, "Alice Phone")
+    _phone(hass, mobile_app, "Bob Phone")
+    await _setup(hass)
+
+    for count in range(3):
+        await _notify(hass, message=f"Door opened {count + 1}x", tag="door")
+    await _notify(hass, message="Welcome home", title="Home", device_id=alice)
+    assert notify.calls["mobile_app_alice_phone"] == []
+
+    await _close_window(hass, freezer)
+    assert notify.calls["mobile_app_alice_phone"] == [
+        {"message": "Door opened 3x", "data": {"tag": "door"}},
+        {"message": "Welcome home", "title": "Home"},
+    ]
+    assert notify.calls["mobile_app_bob_phone"] == [
+        {"message": "Door opened 3x", "data": {"tag": "door"}}
+    ]
+
+
+async def test_coalesce_by_tag_per_device(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, mobile_app: MockConfigEntry
+):
+    """Test the same tag for different devices reaches both."""
+    notify = StandInNotify(hass)
+    notify.register("mobile_app_alice_phone")
+    notify.register("mobile_app_bob_phone")
+    alice = _phone(hass, mobile_app, "Alice Phone")
+    bob = _phone(hass, mobile_app, "Bob Phone")
+    await _setup(hass)
+
+    await _notify(hass, message="Door opened", tag="door", device_id=alice)
+    await _notify(hass, message="Door opened", tag="door", device_id=bob)
+    await _notify(hass, message="Door opened 2x", tag="door", device_id=bob)
+
+    await _close_window(hass, freezer)
+    assert notify.calls["mobile_app_alice_phone"] == [
+        {"message": "Door opened", "data": {"tag": "door"}}
+    ]
+    assert notify.calls["mobile_app_bob_phone"] == [
+        {"message": "Door opened 2x", "data": {"tag": "door"}}
+    ]
+
+
+async def test_bounded_concurrency(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, mobile_app: MockConfigEntry
+):
+    """Test devices are notified concurrently up to the limit."""
+    notify = StandInNotify(hass)
+    notify.release.clear()
+    phones = MAX_CONCURRENT_SENDS + 3
+    for phone in range(phones):
+        notify.register(f"mobile_app_phone_{phone}")
+        _phone(hass, mobile_app, f"Phone {phone}")
+    await _setup(hass)
+
+    await _notify(hass, message="Alarm")
+    freezer.tick(COALESCE_WINDOW + dt.timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert notify.running == MAX_CONCURRENT_SENDS
+
+    notify.release.set()
+    await hass.async_block_till_done()
+    assert notify.max_running == MAX_CONCURRENT_SENDS
+    assert all(len(calls) == 1 for calls in notify.calls.values())
+
+
+async def test_registry_updates_refresh_targets(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mobile_app: MockConfigEntry,
+    caplog: pytest.LogCaptureFixture,
+):
+    """Test cached targets follow renamed and added devices."""
+    notify = StandInNotify(hass)
+    for service in ("alice_phone", "alice_new_phone", "bob_phone"):
+        notify.register(f"mobile_app_{service}")
+    alice = _phone(hass, mobile_app, "Alice Phone")
+    await _setup(hass)
+
+    await _notify(hass, message="One")
+    await _close_window(hass, freezer)
+    assert len(notify.calls["mobile_app_alice_phone"]) == 1
+
+    dr.async_get(hass).async_update_device(alice, name="Alice New Phone")
+    _phone(hass, mobile_app, "Bob Phone")
+    await _notify(hass, message="Two")
+    await _notify(hass, message="Three", device_id="unknown")
+    await _close_window(hass, freezer)
+    assert len(notify.calls["mobile_app_alice_phone"]) == 1
+    assert notify.calls["mobile_app_alice_new_phone"] == [{"message": "Two"}]
+    assert notify.calls["mobile_app_bob_phone"] == [{"message": "Two"}]
+    assert "Cannot notify unknown device unknown" in caplog.text
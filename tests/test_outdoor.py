@@ -0,0 +1,145 @@
+"""Test the Off-delay local outdoor temperature sensor."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.offdelay.const import (
+    CONF_OUTDOOR_SENSOR,
+    CONF_OUTDOOR_WEIGHT,
+    DATA_CLIMATE_MODE,
+    DATA_OUTDOOR_MAX,
+    DOMAIN,
+)
+from custom_components.offdelay.coordinator import OUTDOOR_PUBLISH_INTERVAL
+from custom_components.offdelay.outdoor import BUCKET, OutdoorStats
+
+from .const import MOCK_CONFIG
+
+NOON = datetime(2024, 1, 15, 12, tzinfo=UTC)
+OUTDOOR = "sensor.outdoor_temperature"
+
+
+@pytest.fixture(autouse=True)
+async def noon(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Run at noon UTC."""
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to(NOON)
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Make the forecast cold."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={"weather_max_temp_today": 10.0, "weather_min_temp_today": 2.0},
+    ) as weather:
+        yield weather
+
+
+async def _setup(hass: HomeAssistant, **options: object) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG,
+        options={CONF_OUTDOOR_SENSOR: OUTDOOR, **options},
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def test_streaming_statistics():
+    """Test the average, trend and daily max/min of a stream of readings."""
+    stats = OutdoorStats()
+    start = NOON.timestamp()
+    for minute in range(120):
+        stats.add(10 + minute / 60, start + minute * 60)
+
+    # Rising 1 °C an hour, the average lags half an hour behind
+    assert stats.ewma == pytest.approx(10 + 119 / 60 - 0.5, abs=0.1)
+    assert 0.5 < stats.trend < 1.0
+    now = start + 119 * 60
+    assert stats.daily_max(now) == pytest.approx(10 + 119 / 60)
+    assert stats.daily_min(now) == 10
+
+    # A day later the ring buffer slots of the first readings are reused
+    later = start + timedelta(days=1, minutes=30).total_seconds()
+    stats.add(5, later)
+    assert stats.daily_min(later) == 5
+    assert stats.daily_max(later) == pytest.approx(
+        10 + (120 - BUCKET.total_seconds() / 60) / 60, abs=0.3
+    )
+    assert stats.readings == 121
+
+
+async def test_readings_are_throttled_and_blended(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test a chatty sensor publishes once a minute and moves the mode."""
+    hass.states.async_set(OUTDOOR, "20", {"unit_of_measurement": "°C"})
+    entry = await _setup(hass)
+    coordinator = entry.runtime_data.coordinator
+    # Forecast 10 °C and measured 20 °C blend to 15 °C, between the thresholds
+    assert coordinator.data[DATA_OUTDOOR_MAX] == 20.0
+    assert coordinator.data[DATA_CLIMATE_MODE] == "none"
+
+    updates = []
+    coordinator.async_add_listener(lambda: updates.append(coordinator.data))
+    for second in range(30):
+        freezer.tick(timedelta(seconds=1))
+        hass.states.async_set(OUTDOOR, str(80 + second), {"unit_of_measurement": "°F"})
+        await hass.async_block_till_done()
+    assert updates == []
+
+    freezer.tick(timedelta(seconds=OUTDOOR_PUBLISH_INTERVAL))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(updates) == 1
+    assert coordinator.data[DATA_OUTDOOR_MAX] == 42.8
+    assert coordinator.data[DATA_CLIMATE_MODE] == "summer"
+    assert hass.states.get("sensor.offdelay_outdoor_max_temp").state == "42.8"
+    assert float(hass.states.get("sensor.offdelay_outdoor_trend").state) > 0
+
+
+async def test_unusable_readings_are_ignored(hass: HomeAssistant):
+    """Test unavailable sensors leave the forecast in charge."""
+    hass.states.async_set(OUTDOOR, "unavailable")
+    entry = await _setup(hass, **{CONF_OUTDOOR_WEIGHT: 100})
+
+    coordinator = entry.runtime_data.coordinator
+    assert DATA_OUTDOOR_MAX not in coordinator.data
+    assert coordinator.data[DATA_CLIMATE_MODE] == "winter"
+    assert hass.states.get("sensor.offdelay_outdoor_temp").state == "unknown"
+
+
+async def test_readings_do_not_hold_off_refresh(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, bypass_weather: AsyncMock
+):
+    """Test the weather is still fetched while the sensor reports every minute."""
+    entry = await _setup(hass)
+    coordinator = entry.runtime_data.coordinator
+    assert bypass_weather.call_count == 1
+
+    next_refresh = dt_util.utcnow() + coordinator.update_interval
+    refreshes = 1
+    for minute in range(6 * 60):
+        freezer.tick(timedelta(minutes=1))
+        hass.states.async_set(OUTDOOR, str(5 + minute % 3))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        if dt_util.utcnow() >= next_refresh:
+            refreshes += 1
+            next_refresh = dt_util.utcnow() + coordinator.update_interval
+
+    assert bypass_weather.call_count == refreshes
+    assert refreshes > 1
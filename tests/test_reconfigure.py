@@ -0,0 +1,126 @@
+"""Test config changes are applied in place instead of reloading the entry."""
+
+from collections.abc import Generator
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.offdelay.const import (
+    CONF_CLIMATES,
+    CONF_OCCUPANCY_SENSORS,
+    CONF_WINTER_MAX_TEMP,
+    DATA_CLIMATE_MODE,
+    DOMAIN,
+)
+
+from .const import MOCK_CONFIG, MOCK_CONFIG_WITH_CLIMATE, MOCK_CONFIG_WITH_OCCUPANCY
+
+GUEST_MODE = "switch.offdelay_guest_mode"
+
+
+@pytest.fixture(name="weather")
+def weather_fixture() -> Generator[AsyncMock]:
+    """Count the weather fetches, which happen on every setup."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={
+            "weather_max_temp_today": 12,
+            "weather_min_temp_today": 5,
+            "weather_max_temp_tomorrow": 13,
+            "weather_min_temp_tomorrow": 6,
+        },
+    ) as weather:
+        yield weather
+
+
+async def _setup_entry(hass: HomeAssistant, config: dict) -> MockConfigEntry:
+    entry = MockConfigEntry(domain=DOMAIN, data=config)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _update(
+    hass: HomeAssistant, entry: MockConfigEntry, **changes: object
+) -> None:
+    hass.config_entries.async_update_entry(entry, data={**entry.data, **changes})
+    await hass.async_block_till_done()
+
+
+async def test_threshold_change_reevaluates_cached_weather(
+    hass: HomeAssistant, weather: AsyncMock
+):
+    """Test a new threshold changes the mode without a refetch or a reload."""
+    with patch(
+        "homeassistant.util.dt.now",
+        return_value=datetime(2026, 4, 24, 10, 0, 0, tzinfo=dt_util.UTC),
+    ):
+        entry = await _setup_entry(hass, MOCK_CONFIG_WITH_CLIMATE)
+        coordinator = entry.runtime_data.coordinator
+        assert coordinator.data[DATA_CLIMATE_MODE] == "winter"
+
+        await _update(hass, entry, **{CONF_WINTER_MAX_TEMP: 10.0})
+
+    assert entry.runtime_data.coordinator is coordinator
+    assert coordinator.data[DATA_CLIMATE_MODE] == "none"
+    assert weather.call_count == 1
+
+
+async def test_occupancy_change_resubscribes_guest_mode(
+    hass: HomeAssistant, weather: AsyncMock
+):
+    """Test guest mode follows a newly configured occupancy sensor."""
+    hass.states.async_set("zone.home", "0")
+    entry = await _setup_entry(hass, MOCK_CONFIG_WITH_OCCUPANCY)
+
+    await _update(hass, entry, **{CONF_OCCUPANCY_SENSORS: ["binary_sensor.hall"]})
+    hass.states.async_set("binary_sensor.motion_living_room", STATE_ON)
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=5, seconds=1))
+    await hass.async_block_till_done()
+    assert hass.states.get(GUEST_MODE).state == STATE_OFF
+
+    hass.states.async_set("binary_sensor.hall", STATE_ON)
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=11))
+    await hass.async_block_till_done()
+    assert hass.states.get(GUEST_MODE).state == STATE_ON
+    assert weather.call_count == 1
+
+
+async def test_adding_climates_reloads(hass: HomeAssistant, weather: AsyncMock):
+    """Test the entry is reloaded when its climate entities appear."""
+    entry = await _setup_entry(hass, MOCK_CONFIG)
+    sensors = len(hass.states.async_entity_ids("sensor"))
+
+    await _update(hass, entry, **{CONF_CLIMATES: ["climate.living_room"]})
+    assert weather.call_count == 2
+    # Two delta sensors and the climate's time to target
+    assert len(hass.states.async_entity_ids("sensor")) == sensors + 3
+
+
+async def test_reconfigure_flow_applies_in_place(
+    hass: HomeAssistant, weather: AsyncMock
+):
+    """Test the reconfigure flow updates the entry without reloading it."""
+    entry = await _setup_entry(hass, MOCK_CONFIG)
+
+    result = await entry.start_reconfigure_flow(hass)
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={**MOCK_CONFIG, CONF_WINTER_MAX_TEMP: 12.0}
+    )
+    await hass.async_block_till_done()
+
+    assert result["reason"] == "reconfigure_successful"
+    assert entry.data[CONF_WINTER_MAX_TEMP] == 12.0
+    assert weather.call_count == 1
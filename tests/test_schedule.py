@@ -0,0 +1,198 @@
+"""Test the Off-delay weekly day window schedule."""
+
+from datetime import UTC, date, datetime
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.offdelay.const import (
+    CONF_CLIMATE_DAY_START_HOUR,
+    CONF_CLIMATE_NIGHT_START_HOUR,
+    CONF_CLIMATE_SCHEDULE,
+    DOMAIN,
+)
+from custom_components.offdelay.schedule import (
+    SunTime,
+    WeeklySchedule,
+    parse_schedule,
+    sun_times,
+    windows_from_config,
+)
+
+from .const import MOCK_CONFIG
+
+# A Monday
+MONDAY = datetime(2024, 1, 15, tzinfo=UTC)
+
+
+def _at(day: int, hour: int, minute: int = 0) -> datetime:
+    return MONDAY.replace(day=15 + day, hour=hour, minute=minute)
+
+
+def test_hours_of_the_entry():
+    """Test the day and night hours form the same window every day."""
+    schedule = WeeklySchedule(windows_from_config(MOCK_CONFIG))
+    assert len(schedule) == 14
+    assert schedule.is_day(_at(0, 12))
+    assert not schedule.is_day(_at(0, 17))
+    assert schedule.next_transition(_at(0, 12, 30)) == _at(0, 17)
+    assert schedule.window(_at(0, 12)) == (_at(0, 8), _at(0, 17))
+    # After the window has ended, the window of tomorrow
+    assert schedule.window(_at(0, 18)) == (_at(1, 8), _at(1, 17))
+
+
+def test_night_shift_wraps_around_midnight():
+    """Test a night start before the day start runs the window past midnight."""
+    schedule = WeeklySchedule(
+        windows_from_config(
+            {CONF_CLIMATE_DAY_START_HOUR: 22, CONF_CLIMATE_NIGHT_START_HOUR: 6}
+        )
+    )
+    assert schedule.is_day(_at(0, 23))
+    assert schedule.is_day(_at(1, 5, 59))
+    assert not schedule.is_day(_at(1, 6))
+    assert schedule.window(_at(0, 2)) == (_at(-1, 22), _at(0, 6))
+    # Sunday night runs into Monday morning of the next week
+    assert schedule.is_day(_at(6, 23))
+    assert schedule.is_day(_at(0, 1))
+    assert schedule.next_transition(_at(6, 23)) == _at(7, 6)
+
+
+def test_weekdays_and_minutes():
+    """Test windows per weekday to the minute, merged where they overlap."""
+    schedule = WeeklySchedule(
+        parse_schedule(
+            "mon-fri 07:30-18:00\nmon 17:00-19:15\n\nsat,sun 10:00-24:00\nsun 20:00-02:00"
+        )
+    )
+    assert not schedule.is_day(_at(0, 7, 29))
+    assert schedule.is_day(_at(0, 7, 30))
+    # Monday's windows are merged into one
+    assert schedule.window(_at(0, 8)) == (_at(0, 7, 30), _at(0, 19, 15))
+    assert schedule.window(_at(1, 8)) == (_at(1, 7, 30), _at(1, 18))
+    # Friday evening the next window is on Saturday
+    assert schedule.window(_at(4, 20)) == (_at(5, 10), _at(6, 0))
+    # Sunday runs into the night and past the end of the week
+    assert schedule.window(_at(6, 21)) == (_at(6, 10), _at(7, 2))
+    assert schedule.is_day(_at(0, 1))
+    assert schedule.stats()[:2] == ["mon 02:00 night", "mon 07:30 day"]
+
+
+def test_always_and_never():
+    """Test schedules without transitions."""
+    always = WeeklySchedule(parse_schedule("daily 00:00-24:00"))
+    assert always.always_day
+    assert always.is_day(_at(3, 4))
+    assert always.next_transition(_at(3, 4)) is None
+    never = WeeklySchedule([])
+    assert not never.is_day(_at(3, 4))
+    assert never.window(_at(3, 4)) is None
+
+
+def test_sun_relative_windows():
+    """Test windows relative to sunrise and sunset are placed at the sun times."""
+    windows = parse_schedule(
+        "daily sunrise+1h-sunset-1:30\nsat, sun sunset - 23:00\nmon 8-sunrise+30m"
+    )
+    assert windows[0].start == SunTime("sunrise", 60)
+    assert windows[0].end == SunTime("sunset", -90)
+    assert windows[1].start == SunTime("sunset")
+    assert windows[1].end == 23 * 60
+    assert windows[2].uses_sun
+
+    schedule = WeeklySchedule(windows, {"sunrise": 7 * 60 + 45, "sunset": 16 * 60})
+    assert not schedule.is_day(_at(1, 8, 44))
+    assert schedule.window(_at(1, 12)) == (_at(1, 8, 45), _at(1, 14, 30))
+    assert schedule.window(_at(6, 17)) == (_at(6, 16), _at(6, 23))
+    # The sun does not set: only the windows that do not need the sunset
+    polar = WeeklySchedule(windows, {"sunrise": 0, "sunset": None})
+    assert not polar.is_day(_at(1, 12))
+    assert polar.window(_at(1, 12)) == (_at(7, 8), _at(8, 0, 30))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "mon-fri",
+        "mon 8-17-",
+        "someday 08:00-17:00",
+        "mon 08:60-17:00",
+        "25-26",
+        "daily sunrise+1-sunset",
+        "daily sundown-22:00",
+    ],
+)
+def test_invalid_schedule(text: str):
+    """Test schedules that do not parse."""
+    with pytest.raises(ValueError):  # noqa: PT011
+        parse_schedule(text)
+
+
+async def test_config_flow_accepts_wrapping_windows(hass: HomeAssistant):
+    """Test a night shift and a weekly schedule are accepted."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={
+            **MOCK_CONFIG,
+            CONF_CLIMATE_DAY_START_HOUR: 22,
+            CONF_CLIMATE_NIGHT_START_HOUR: 6,
+            CONF_CLIMATE_SCHEDULE: "mon 08:00-12:00\nfri 8:00",
+        },
+    )
+    assert result["errors"]["base"] == "invalid_schedule"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={
+            **MOCK_CONFIG,
+            CONF_CLIMATE_DAY_START_HOUR: 22,
+            CONF_CLIMATE_NIGHT_START_HOUR: 6,
+            CONF_CLIMATE_SCHEDULE: "mon-fri 22:00-06:00",
+        },
+    )
+    assert result["type"] == "create_entry"
+    assert result["data"][CONF_CLIMATE_SCHEDULE] == "mon-fri 22:00-06:00"
+
+
+async def test_sun_times_move_every_day(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test the coordinator compiles the sun windows again at midnight."""
+    freezer.move_to(
+        dt_util.as_utc(
+            datetime(2024, 1, 15, 12, tzinfo=dt_util.get_default_time_zone())
+        )
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={**MOCK_CONFIG, CONF_CLIMATE_SCHEDULE: "daily sunrise+1h-sunset-1h"},
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = entry.runtime_data.coordinator
+    winter = sun_times(hass, date(2024, 1, 15))
+    assert coordinator.sun_times == winter
+    assert coordinator.schedule.is_day(dt_util.now())
+    start, end = coordinator.schedule.window(dt_util.now())
+    assert start.hour * 60 + start.minute == winter["sunrise"] + 60
+    assert end.hour * 60 + end.minute == winter["sunset"] - 60
+
+    freezer.move_to(
+        dt_util.as_utc(datetime(2024, 6, 15, tzinfo=dt_util.get_default_time_zone()))
+    )
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    summer = sun_times(hass, date(2024, 6, 15))
+    assert summer["sunset"] > winter["sunset"]
+    assert coordinator.sun_times == summer
@@ -0,0 +1,95 @@
+"""Test the Off-delay deadline scheduler."""
+
+import datetime as dt
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.offdelay.scheduler import DeadlineScheduler
+
+
+async def _tick(hass: HomeAssistant, freezer: FrozenDateTimeFactory, seconds: float):
+    freezer.tick(dt.timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_deadlines_fire_in_order(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test deadlines run in order from a single timer."""
+    scheduler = DeadlineScheduler(hass)
+    fired: list[str] = []
+    now = dt_util.utcnow()
+    for key, seconds in (("b", 20), ("a", 10), ("c", 30)):
+        scheduler.async_schedule(
+            key, now + dt.timedelta(seconds=seconds), lambda key=key: fired.append(key)
+        )
+    assert len(scheduler) == 3
+
+    await _tick(hass, freezer, 15)
+    assert fired == ["a"]
+    await _tick(hass, freezer, 20)
+    assert fired == ["a", "b", "c"]
+    assert len(scheduler) == 0
+
+
+async def test_restart_extend_and_cancel(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test rescheduling replaces, extending only moves later, cancel drops."""
+    scheduler = DeadlineScheduler(hass)
+    fired: list[str] = []
+    now = dt_util.utcnow()
+
+    scheduler.async_schedule(
+        "a", now + dt.timedelta(seconds=10), lambda: fired.append("a1")
+    )
+    scheduler.async_schedule(
+        "a", now + dt.timedelta(seconds=5), lambda: fired.append("a2")
+    )
+    scheduler.async_extend(
+        "a", now + dt.timedelta(seconds=2), lambda: fired.append("a3")
+    )
+    assert scheduler.deadline("a") == now + dt.timedelta(seconds=5)
+
+    scheduler.async_schedule(
+        "b", now + dt.timedelta(seconds=1), lambda: fired.append("b")
+    )
+    assert scheduler.async_cancel("b")
+    assert not scheduler.async_cancel("b")
+
+    await _tick(hass, freezer, 6)
+    assert fired == ["a3"]
+
+    scheduler.async_schedule(
+        "c", now + dt.timedelta(seconds=20), lambda: fired.append("c")
+    )
+    scheduler.async_extend(
+        "c", now + dt.timedelta(seconds=30), lambda: fired.append("c2")
+    )
+    await _tick(hass, freezer, 15)
+    assert "c" in scheduler
+    await _tick(hass, freezer, 10)
+    assert fired == ["a3", "c2"]
+
+
+async def test_listeners_and_stop(hass: HomeAssistant, freezer: FrozenDateTimeFactory):
+    """Test listeners see changes and stop drops everything."""
+    scheduler = DeadlineScheduler(hass)
+    counts: list[int] = []
+    remove = scheduler.async_add_listener(lambda: counts.append(len(scheduler)))
+    fired: list[str] = []
+
+    scheduler.async_schedule(
+        "a", dt_util.utcnow() + dt.timedelta(seconds=5), lambda: fired.append("a")
+    )
+    assert counts == [1]
+    remove()
+
+    scheduler.async_stop()
+    await _tick(hass, freezer, 10)
+    assert fired == []
+    assert counts == [1]
@@ -0,0 +1,260 @@
+"""Test the Off-delay fleet mode sites."""
+
+import asyncio
+import datetime as dt
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigSubentryDataWithId
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.offdelay.const import (
+    CONF_NEAR_ZONE,
+    CONF_OCCUPANCY_SENSORS,
+    CONF_WEATHER_ENTITY,
+    CONF_ZONE,
+    DOMAIN,
+    SUBENTRY_SITE,
+)
+from custom_components.offdelay.sites import MAX_CONCURRENT_FETCHES
+
+from .const import MOCK_CONFIG
+
+COLD = {"weather_max_temp_today": 5.0, "weather_min_temp_today": 0.0}
+WARM = {"weather_max_temp_today": 25.0, "weather_min_temp_today": 15.0}
+
+
+def _site_subentry(index: int, **data: object) -> ConfigSubentryDataWithId:
+    site = {
+        CONF_ZONE: f"zone.unit_{index}",
+        CONF_WEATHER_ENTITY: f"weather.unit_{index}",
+        **data,
+    }
+    return ConfigSubentryDataWithId(
+        subentry_id=f"site_{index}",
+        subentry_type=SUBENTRY_SITE,
+        title=f"Unit {index}",
+        data=site,
+        unique_id=site[CONF_ZONE],
+    )
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Make the forecast of the entry warm."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value=WARM,
+    ):
+        yield
+
+
+@pytest.fixture(name="fetch")
+def fetch_fixture():
+    """Make the forecast of every site cold."""
+    with patch(
+        "custom_components.offdelay.sites.async_fetch_daily_forecast",
+        new_callable=AsyncMock,
+        return_value=COLD,
+    ) as fetch:
+        yield fetch
+
+
+@pytest.fixture(autouse=True)
+async def noon(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Run inside the day window."""
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to("2024-01-15 12:00:00+00:00")
+
+
+async def _setup(
+    hass: HomeAssistant, *subentries: ConfigSubentryDataWithId
+) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, subentries_data=list(subentries)
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_sites_use_their_own_forecast(hass: HomeAssistant, fetch: AsyncMock):
+    """Test a site with a weather entity is evaluated with its own forecast."""
+    entry = await _setup(hass, _site_subentry(1), _site_subentry(2))
+
+    assert {call.args[1] for call in fetch.call_args_list} == {
+        "weather.unit_1",
+        "weather.unit_2",
+    }
+    assert hass.states.get("sensor.unit_1_climate_mode").state == "winter"
+    assert hass.states.get("sensor.unit_2_climate_mode").state == "winter"
+    assert entry.runtime_data.coordinator.data["climate_mode"] == "summer"
+
+
+async def test_site_without_weather_shares_the_entry_forecast(
+    hass: HomeAssistant, fetch: AsyncMock
+):
+    """Test a site without a weather entity does not fetch anything."""
+    await _setup(hass, _site_subentry(1, **{CONF_WEATHER_ENTITY: None}))
+
+    fetch.assert_not_called()
+    state = hass.states.get("sensor.unit_1_climate_mode")
+    assert state.state == "summer"
+    assert state.attributes["weather_max_temp_today"] == 25.0
+
+
+async def test_refreshes_are_staggered(
+    hass: HomeAssistant, fetch: AsyncMock, freezer: FrozenDateTimeFactory
+):
+    """Test the sites refresh at evenly spread slots, once an hour each."""
+    entry = await _setup(hass, *(_site_subentry(index) for index in range(4)))
+    start = dt.datetime(2024, 1, 15, 12, tzinfo=dt.UTC)
+    fetch.reset_mock()
+
+    stats = entry.runtime_data.sites.stats()
+    assert sorted(site["next_refresh"] for site in stats.values()) == [
+        (start + dt.timedelta(minutes=minutes)).isoformat()
+        for minutes in (15, 30, 45, 60)
+    ]
+
+    freezer.tick(dt.timedelta(minutes=16))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [call.args[1] for call in fetch.call_args_list] == ["weather.unit_1"]
+    assert entry.runtime_data.sites.stats()["Unit 1"]["next_refresh"] == (
+        (start + dt.timedelta(minutes=75)).isoformat()
+    )
+
+
+async def test_concurrent_fetches_are_capped(hass: HomeAssistant):
+    """Test no more than MAX_CONCURRENT_FETCHES forecasts are fetched at once."""
+    running = 0
+    peak = 0
+    release = asyncio.Event()
+
+    async def fetch(_hass: HomeAssistant, _entity_id: str) -> dict[str, float]:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+        return COLD
+
+    with patch("custom_components.offdelay.sites.async_fetch_daily_forecast", fetch):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data=MOCK_CONFIG,
+            subentries_data=[_site_subentry(index) for index in range(10)],
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert running == MAX_CONCURRENT_FETCHES
+
+        release.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert peak == MAX_CONCURRENT_FETCHES
+    assert all(
+        site["climate_mode"] == "winter"
+        for site in entry.runtime_data.sites.stats().values()
+    )
+
+
+async def test_failed_fetch_keeps_the_last_forecast(
+    hass: HomeAssistant, fetch: AsyncMock, freezer: FrozenDateTimeFactory
+):
+    """Test a failing weather entity keeps the site's last forecast."""
+    entry = await _setup(hass, _site_subentry(1))
+
+    fetch.side_effect = HomeAssistantError("unavailable")
+    freezer.tick(dt.timedelta(hours=1, seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert fetch.call_count == 2
+    assert hass.states.get("sensor.unit_1_climate_mode").state == "winter"
+    assert entry.runtime_data.sites.stats()["Unit 1"]["last_error"] == "unavailable"
+
+
+@pytest.mark.usefixtures("fetch")
+async def test_site_presence_and_guest_mode(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test the site entities follow the zones and sensors of the site."""
+    hass.states.async_set("zone.unit_1", "0")
+    hass.states.async_set("zone.unit_1_near", "1")
+    hass.states.async_set("binary_sensor.unit_1_motion", "off")
+    await _setup(
+        hass,
+        _site_subentry(
+            1,
+            **{
+                CONF_NEAR_ZONE: "zone.unit_1_near",
+                CONF_OCCUPANCY_SENSORS: ["binary_sensor.unit_1_motion"],
+            },
+        ),
+    )
+    assert hass.states.get("binary_sensor.unit_1_is_home").state == "off"
+    assert hass.states.get("binary_sensor.unit_1_is_near").state == "on"
+
+    hass.states.async_set("zone.unit_1", "2")
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.unit_1_is_home").state == "on"
+
+    hass.states.async_set("zone.unit_1", "0")
+    hass.states.async_set("binary_sensor.unit_1_motion", "on")
+    await hass.async_block_till_done()
+    freezer.tick(dt.timedelta(minutes=6))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("switch.unit_1_guest_mode").state == "on"
+    # The entry's own guest mode follows zone.home and its own sensors
+    assert hass.states.get("switch.offdelay_guest_mode").state == "off"
+
+
+@pytest.mark.usefixtures("fetch")
+async def test_subentry_flow(hass: HomeAssistant):
+    """Test adding a site and rejecting a second site on its zone."""
+    entry = await _setup(hass)
+
+    result = await hass.config_entries.subentries.async_init(
+        (entry.entry_id, SUBENTRY_SITE), context={"source": "user"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    user_input = {
+        "name": "Unit 1",
+        CONF_ZONE: "zone.unit_1",
+        CONF_NEAR_ZONE: "zone.unit_1",
+    }
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"], user_input=user_input
+    )
+    assert result["errors"] == {"base": "site_near_zone_same"}
+
+    user_input[CONF_NEAR_ZONE] = "zone.unit_1_near"
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"], user_input=user_input
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+    (subentry,) = entry.subentries.values()
+    assert subentry.title == "Unit 1"
+
+    result = await hass.config_entries.subentries.async_init(
+        (entry.entry_id, SUBENTRY_SITE), context={"source": "user"}
+    )
+    result = await hass.config_entries.subentries.async_configure(
+        result["flow_id"], user_input={**user_input, "name": "Other"}
+    )
+    assert result["errors"] == {"base": "site_zone_in_use"}
@@ -0,0 +1,209 @@
+"""Test the telemetry upload pipeline against a local stand-in server."""
+
+from collections.abc import AsyncGenerator
+import datetime as dt
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestServer
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.offdelay.const import CONF_TELEMETRY_URL, DOMAIN
+from custom_components.offdelay.telemetry import FLUSH_INTERVAL, TelemetryUploader
+
+from .const import MOCK_CONFIG
+
+
+class StandInCollector:
+    """Stand-in for the telemetry endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the stand-in."""
+        self.batches: list[list[dict]] = []
+        self.online = True
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Store a batch, or fail while offline."""
+        if not self.online:
+            return web.Response(status=503)
+        # aiohttp decompresses the body because of the Content-Encoding
+        assert request.headers[hdrs.CONTENT_ENCODING] == "gzip"
+        lines = (await request.text()).splitlines()
+        batch = [json.loads(line) for line in lines]
+        if any(event.get("invalid") for event in batch):
+            return web.Response(status=400)
+        self.batches.append(batch)
+        return web.Response(status=204)
+
+    def events(self) -> list[dict]:
+        """Return the received events in order."""
+        return [event for batch in self.batches for event in batch]
+
+
+@pytest.fixture(name="collector")
+async def collector_fixture(
+    socket_enabled: None,
+) -> AsyncGenerator[tuple[StandInCollector, str]]:
+    """Start the stand-in server on localhost."""
+    collector = StandInCollector()
+    app = web.Application()
+    app.router.add_post("/telemetry", collector.handle)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    yield collector, str(server.make_url("/telemetry"))
+    await server.close()
+
+
+@pytest.fixture(autouse=True)
+def setup_fixture(hass: HomeAssistant, tmp_path: Path):
+    """Bypass weather calls, retry without waiting and spool to a temp dir."""
+    hass.config.config_dir = str(tmp_path)
+    with (
+        patch(
+            "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+            new_callable=AsyncMock,
+            return_value={},
+        ),
+        patch("custom_components.offdelay.api.RETRY_BASE_DELAY", 0),
+        patch("custom_components.offdelay.telemetry.BATCH_SIZE", 3),
+        patch("custom_components.offdelay.telemetry.MAX_SPOOLED_BATCHES", 2),
+    ):
+        yield
+
+
+async def _setup(hass: HomeAssistant, url: str) -> TelemetryUploader:
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={CONF_TELEMETRY_URL: url}
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry.runtime_data.telemetry
+
+
+async def _flush(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    freezer.tick(FLUSH_INTERVAL + dt.timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_batches_by_size_and_time(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    collector: tuple[StandInCollector, str],
+):
+    """Test full batches are sent at once and the rest after the interval."""
+    server, url = collector
+    telemetry = await _setup(hass, url)
+
+    for count in range(7):
+        telemetry.async_record("test", count=count)
+    await hass.async_block_till_done()
+    assert [len(batch) for batch in server.batches] == [3, 3]
+
+    await _flush(hass, freezer)
+    # The climate mode recorded at startup is the first event
+    assert [len(batch) for batch in server.batches] == [3, 3, 2]
+    assert [event.get("count") for event in server.events()] == [None, *range(7)]
+
+
+async def test_presence_transitions(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    collector: tuple[StandInCollector, str],
+):
+    """Test presence is recorded on transitions only."""
+    server, url = collector
+    await _setup(hass, url)
+
+    for count in ("1", "2", "0"):
+        hass.states.async_set("zone.home", count)
+    await _flush(hass, freezer)
+    assert [
+        event["home"] for event in server.events() if event["type"] == "presence"
+    ] == [True, False]
+
+
+async def test_outage_spills_to_disk_and_recovers(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    tmp_path: Path,
+    collector: tuple[StandInCollector, str],
+):
+    """Test an outage keeps the newest batches on disk and sends them in order."""
+    server, url = collector
+    server.online = False
+    telemetry = await _setup(hass, url)
+
+    for count in range(9):
+        telemetry.async_record("test", count=count)
+    await hass.async_block_till_done()
+    spool = next((tmp_path / ".storage").glob(f"{DOMAIN}.telemetry.*"))
+    assert len(list(spool.iterdir())) == 2
+    assert server.batches == []
+
+    server.online = True
+    telemetry.async_record("test", count=9)
+    await _flush(hass, freezer)
+    # The oldest spooled batch was dropped when the disk queue was full
+    assert [event["count"] for event in server.events()] == list(range(5, 10))
+    assert list(spool.iterdir()) == []
+    assert telemetry.dropped_batches == 2
+
+
+@patch("custom_components.offdelay.telemetry.MAX_SPOOLED_BATCHES", 10)
+async def test_rejected_batch_does_not_hold_up_the_rest(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    tmp_path: Path,
+    collector: tuple[StandInCollector, str],
+):
+    """Test a spooled batch the API rejects is dropped, not sent again."""
+    server, url = collector
+    server.online = False
+    telemetry = await _setup(hass, url)
+
+    telemetry.async_record("test", count=0, invalid=True)
+    for count in range(1, 6):
+        telemetry.async_record("test", count=count)
+    await hass.async_block_till_done()
+
+    server.online = True
+    await _flush(hass, freezer)
+    await _flush(hass, freezer)
+    # The climate mode recorded at startup shared the batch of the first event
+    assert [event["count"] for event in server.events()] == [2, 3, 4, 5]
+    spool = next((tmp_path / ".storage").glob(f"{DOMAIN}.telemetry.*"))
+    assert list(spool.iterdir()) == []
+    assert telemetry.dropped_batches == 1
+
+
+async def test_unload_keeps_events_on_disk(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    collector: tuple[StandInCollector, str],
+):
+    """Test buffered events survive a reload."""
+    server, url = collector
+    telemetry = await _setup(hass, url)
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+
+    telemetry.async_record("test", count=1)
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert server.batches == []
+
+    await _flush(hass, freezer)
+    assert [event["type"] for event in server.events()] == [
+        "climate_mode",
+        "test",
+        "climate_mode",
+    ]
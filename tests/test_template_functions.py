@@ -0,0 +1,134 @@
+"""Test the Off-delay template functions."""
+
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.template import Template
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.offdelay.const import DATA_CLIMATE_MODE, DOMAIN
+
+from .const import MOCK_CONFIG_WITH_CLIMATE
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Bypass weather calls."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={"weather_max_temp_today": 10},
+    ):
+        yield
+
+
+def _climate(hass: HomeAssistant, name: str, current: float, target: float) -> None:
+    er.async_get(hass).async_get_or_create(
+        "climate", "test", name, suggested_object_id=name
+    )
+    hass.states.async_set(
+        f"climate.{name}",
+        "heat",
+        {"current_temperature": current, "temperature": target},
+    )
+
+
+async def _setup(hass: HomeAssistant) -> MockConfigEntry:
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG_WITH_CLIMATE)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def _render(hass: HomeAssistant, source: str) -> tuple[object, set[str]]:
+    info = Template(source, hass).async_render_to_info()
+    return info.result(), info.entities
+
+
+async def test_functions_without_entry(hass: HomeAssistant):
+    """Test the functions answer None until an entry is loaded."""
+    await _setup(hass)
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    await hass.config_entries.async_unload(entry.entry_id)
+
+    assert _render(hass, "{{ offdelay_climate_mode() }}")[0] is None
+    assert _render(hass, "{{ offdelay_max_delta() }}")[0] is None
+
+
+async def test_functions_in_every_environment(hass: HomeAssistant):
+    """Test templates rendered with their own log function see the functions."""
+    hass.states.async_set("zone.home", "1")
+    await _setup(hass)
+    logged: list[str] = []
+
+    info = Template("{{ offdelay_is_home() }}", hass).async_render_to_info(
+        log_fn=lambda _level, message: logged.append(message)
+    )
+    assert info.result() is True
+    assert logged == []
+
+
+async def test_registry_listeners_removed_on_unload(hass: HomeAssistant):
+    """Test the template functions stop following the registries."""
+    events = (er.EVENT_ENTITY_REGISTRY_UPDATED, dr.EVENT_DEVICE_REGISTRY_UPDATED)
+    before = hass.bus.async_listeners()
+    await _setup(hass)
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    after = hass.bus.async_listeners()
+    assert [after.get(event, 0) for event in events] == [
+        before.get(event, 0) for event in events
+    ]
+
+
+async def test_climate_mode_and_presence(hass: HomeAssistant):
+    """Test climate mode and presence only depend on a few entities."""
+    entry = await _setup(hass)
+    hass.states.async_set("zone.home", "2")
+
+    result, entities = _render(hass, "{{ offdelay_climate_mode() }}")
+    assert result == entry.runtime_data.coordinator.data[DATA_CLIMATE_MODE]
+    assert entities == {
+        "binary_sensor.offdelay_climate_mode_winter",
+        "binary_sensor.offdelay_climate_mode_summer",
+    }
+
+    assert _render(hass, "{{ offdelay_is_home() }}") == (True, {"zone.home"})
+    hass.states.async_set("zone.home", "0")
+    assert _render(hass, "{{ offdelay_is_home() }}")[0] is False
+
+
+async def test_max_delta_per_area(hass: HomeAssistant):
+    """Test deltas per area and that moved climates are picked up."""
+    _climate(hass, "living_room", 21.5, 20.0)
+    _climate(hass, "bedroom", 17.0, 18.0)
+    await _setup(hass)
+    areas = ar.async_get(hass)
+    living = areas.async_create("Living Room")
+    bedroom = areas.async_create("Bedroom")
+    entities = er.async_get(hass)
+    entities.async_update_entity("climate.living_room", area_id=living.id)
+    entities.async_update_entity("climate.bedroom", area_id=bedroom.id)
+
+    assert _render(hass, "{{ offdelay_max_delta() }}")[0] == 1.5
+    assert _render(hass, "{{ offdelay_max_delta('Bedroom') }}") == (
+        -1.0,
+        {"climate.bedroom"},
+    )
+    assert _render(hass, f"{{{{ offdelay_max_delta('{living.id}') }}}}") == (
+        1.5,
+        {"climate.living_room"},
+    )
+    assert _render(hass, "{{ offdelay_max_delta('Attic') }}") == (None, set())
+
+    entities.async_update_entity("climate.living_room", area_id=bedroom.id)
+    await hass.async_block_till_done()
+    assert _render(hass, "{{ offdelay_max_delta('Bedroom') }}")[0] == 1.5
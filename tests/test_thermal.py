@@ -0,0 +1,131 @@
+"""Test the Off-delay thermal models of the climates."""
+
+from datetime import timedelta
+import math
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.offdelay.const import DOMAIN
+from custom_components.offdelay.thermal import MIN_SAMPLES, ThermalModel
+
+from .const import MOCK_CONFIG_WITH_CLIMATE
+
+LIVING_ROOM = "climate.living_room"
+# The room heats at 2 °C/h and loses a tenth of the difference with outside
+HEAT = 2.0
+LOSS = 0.1
+OUTDOOR = 12.0
+
+
+@pytest.fixture(autouse=True)
+def bypass_weather():
+    """Forecast a day with a mean of 12 °C."""
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value={"weather_max_temp_today": 16.0, "weather_min_temp_today": 8.0},
+    ):
+        yield
+
+
+def _expected_minutes(indoor: float, target: float) -> float:
+    equilibrium = OUTDOOR + HEAT / LOSS
+    return -math.log((equilibrium - target) / (equilibrium - indoor)) / LOSS * 60
+
+
+def test_recursive_least_squares():
+    """Test the model finds the rates and survives being saved."""
+    model = ThermalModel()
+    indoor = 15.0
+    for step in range(60):
+        heating = float(step % 20 < 12)
+        regressors = (heating, 0.0, OUTDOOR - indoor)
+        rate = HEAT * heating + LOSS * (OUTDOOR - indoor)
+        model.update(regressors, rate)
+        indoor += rate / 6
+
+    assert model.heat == pytest.approx(HEAT, abs=0.01)
+    assert model.loss == pytest.approx(LOSS, abs=0.01)
+    assert model.minutes_to_target(18, 21, OUTDOOR) == pytest.approx(
+        _expected_minutes(18, 21), rel=1e-2
+    )
+    # At the target already, and a target the heating cannot reach
+    assert model.minutes_to_target(20.9, 21, OUTDOOR) == 0
+    assert model.minutes_to_target(18, 35, OUTDOOR) is None
+
+    restored = ThermalModel.from_list(model.to_list())
+    assert restored.theta == model.theta
+    for restored_row, row in zip(restored.covariance, model.covariance, strict=True):
+        assert restored_row == pytest.approx(row)
+    assert restored.samples == 60
+
+
+def test_forgetting_follows_changes():
+    """Test the model follows a changed room while it never cools."""
+    model = ThermalModel()
+    indoor = 15.0
+    for step in range(3000):
+        # Better insulated and with a stronger heater halfway
+        heat, loss = (HEAT, LOSS) if step < 1000 else (3.0, 0.05)
+        heating = float(step % 20 < 12)
+        regressors = (heating, 0.0, OUTDOOR - indoor)
+        rate = heat * heating + loss * (OUTDOOR - indoor)
+        model.update(regressors, rate)
+        indoor += rate / 6
+
+    assert model.heat == pytest.approx(3.0, abs=0.01)
+    assert model.loss == pytest.approx(0.05, abs=0.01)
+    assert model.covariance[1][1] == pytest.approx(100.0)
+
+
+async def test_time_to_target_sensor(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test the model learns from the climate's state changes."""
+    hass.states.async_set(
+        LIVING_ROOM,
+        "heat",
+        {"friendly_name": "Living Room", "current_temperature": 15.0},
+    )
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG_WITH_CLIMATE)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    sensor = "sensor.offdelay_living_room_time_to_target"
+    assert hass.states.get(sensor).state == "unknown"
+    assert hass.states.get("sensor.offdelay_bedroom_time_to_target")
+
+    indoor = 15.0
+    for step in range(2 * MIN_SAMPLES):
+        heating = step % 8 < 5
+        freezer.tick(timedelta(minutes=10))
+        hass.states.async_set(
+            LIVING_ROOM,
+            "heat",
+            {
+                "friendly_name": "Living Room",
+                "current_temperature": indoor,
+                "temperature": 21.0,
+                "hvac_action": "heating" if heating else "idle",
+            },
+        )
+        await hass.async_block_till_done()
+        indoor += (HEAT * heating + LOSS * (OUTDOOR - indoor)) / 6
+
+    state = hass.states.get(sensor)
+    assert state.attributes["samples"] == 2 * MIN_SAMPLES - 1
+    model = entry.runtime_data.thermal.models[LIVING_ROOM]
+    last_indoor = hass.states.get(LIVING_ROOM).attributes["current_temperature"]
+    assert float(state.state) == pytest.approx(
+        _expected_minutes(last_indoor, 21.0), rel=1e-2
+    )
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    restored = entry.runtime_data.thermal.models[LIVING_ROOM]
+    assert restored.theta == pytest.approx(model.theta)
@@ -0,0 +1,137 @@
+"""Test the adaptive refresh interval of the Off-delay coordinator."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.offdelay.const import DOMAIN
+from custom_components.offdelay.coordinator import (
+    DEFAULT_UPDATE_INTERVAL,
+    MAX_UPDATE_INTERVAL,
+    SHORT_UPDATE_INTERVAL,
+    choose_update_interval,
+)
+from custom_components.offdelay.diagnostics import async_get_config_entry_diagnostics
+
+from .const import MOCK_CONFIG, MOCK_CONFIG_WITH_CLIMATE
+
+
+def _forecast(max_temp: float) -> dict[str, float]:
+    return {
+        "weather_max_temp_today": max_temp,
+        "weather_min_temp_today": max_temp - 8,
+        "weather_max_temp_tomorrow": max_temp,
+        "weather_min_temp_tomorrow": max_temp - 8,
+    }
+
+
+@pytest.fixture(autouse=True)
+async def local_time(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Run at noon UTC."""
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to("2024-01-15 12:00:00+00:00")
+
+
+async def _setup(hass: HomeAssistant, config: dict, max_temp: float) -> MockConfigEntry:
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value=_forecast(max_temp),
+    ):
+        entry = MockConfigEntry(domain=DOMAIN, data=config)
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry
+
+
+def test_choose_update_interval():
+    """Test margins and forecast changes set the interval."""
+    kwargs = {
+        "forecast_changed": False,
+        "previous": DEFAULT_UPDATE_INTERVAL,
+    }
+    assert choose_update_interval(margin=None, **kwargs) == (
+        DEFAULT_UPDATE_INTERVAL,
+        "default",
+    )
+    assert choose_update_interval(margin=0.4, **kwargs) == (
+        SHORT_UPDATE_INTERVAL,
+        "small_margin",
+    )
+    assert choose_update_interval(margin=2.0, **kwargs) == (
+        DEFAULT_UPDATE_INTERVAL,
+        "default",
+    )
+    assert choose_update_interval(margin=5.0, **kwargs) == (
+        timedelta(hours=2),
+        "stable",
+    )
+    assert choose_update_interval(
+        margin=5.0, **{**kwargs, "previous": timedelta(hours=2)}
+    ) == (MAX_UPDATE_INTERVAL, "stable")
+    assert choose_update_interval(
+        margin=5.0, **{**kwargs, "forecast_changed": True}
+    ) == (DEFAULT_UPDATE_INTERVAL, "default")
+
+
+async def test_stable_forecast_backs_off(hass: HomeAssistant):
+    """Test an unchanged forecast far from the thresholds refreshes less often."""
+    entry = await _setup(hass, MOCK_CONFIG, 5.0)
+    coordinator = entry.runtime_data.coordinator
+    # The first forecast is new
+    assert coordinator.update_interval == DEFAULT_UPDATE_INTERVAL
+
+    with patch(
+        "custom_components.offdelay.coordinator.OffdelayDataUpdateCoordinator._update_weather_data",
+        new_callable=AsyncMock,
+        return_value=_forecast(5.0),
+    ):
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(hours=2)
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == MAX_UPDATE_INTERVAL
+
+    diagnostics = async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["coordinator"]["update_interval_reason"] == "stable"
+
+
+async def test_small_margin_refreshes_often(hass: HomeAssistant):
+    """Test a forecast close to the winter threshold refreshes every 15 minutes."""
+    entry = await _setup(hass, MOCK_CONFIG, 15.5)
+
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.update_interval == SHORT_UPDATE_INTERVAL
+    assert coordinator.update_interval_reason == "small_margin"
+
+
+async def test_reevaluate_at_window_boundary(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test the night window starts on time without a refresh."""
+    freezer.move_to("2024-01-15 16:50:00+00:00")
+    hass.states.async_set(
+        "climate.living_room", "heat", {"current_temperature": 25, "temperature": 20}
+    )
+    hass.states.async_set(
+        "climate.bedroom", "heat", {"current_temperature": 24, "temperature": 20}
+    )
+    entry = await _setup(hass, MOCK_CONFIG_WITH_CLIMATE, 5.0)
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.data["climate_mode"] == "winter"
+    assert coordinator.update_interval == DEFAULT_UPDATE_INTERVAL
+
+    # Every room is far above its target, the night logic switches to summer
+    with patch.object(coordinator, "_async_update_data") as update:
+        freezer.move_to("2024-01-15 17:00:00+00:00")
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    update.assert_not_called()
+    assert coordinator.data["climate_mode"] == "summer"
@@ -0,0 +1,128 @@
+"""Test the circuit breaker around the Off-delay weather source."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import issue_registry as ir
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.offdelay.const import (
+    DATA_CLIMATE_MAX_POS_DELTA,
+    DATA_WEATHER_STALE,
+    DOMAIN,
+)
+from custom_components.offdelay.weather import BACKOFF_BASE, backoff
+
+from .const import MOCK_CONFIG, MOCK_CONFIG_WITH_CLIMATE
+
+FORECAST = {
+    "weather_max_temp_today": 10.0,
+    "weather_min_temp_today": 2.0,
+    "weather_max_temp_tomorrow": 11.0,
+    "weather_min_temp_tomorrow": 3.0,
+}
+
+
+@pytest.fixture(name="fetch")
+def fetch_fixture():
+    """Return a working forecast from the weather entity."""
+    with patch(
+        "custom_components.offdelay.weather.async_fetch_daily_forecast",
+        new_callable=AsyncMock,
+        return_value=FORECAST,
+    ) as fetch:
+        yield fetch
+
+
+@pytest.fixture(autouse=True)
+async def local_time(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Run at noon UTC."""
+    await hass.config.async_set_time_zone("UTC")
+    freezer.move_to("2024-01-15 12:00:00+00:00")
+
+
+async def _setup(hass: HomeAssistant, config: dict) -> MockConfigEntry:
+    entry = MockConfigEntry(domain=DOMAIN, data=config)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def _issue(hass: HomeAssistant, entry: MockConfigEntry) -> ir.IssueEntry | None:
+    return ir.async_get(hass).async_get_issue(
+        DOMAIN, f"weather_unavailable_{entry.entry_id}"
+    )
+
+
+def test_backoff():
+    """Test the backoff doubles with every failure up to its maximum."""
+    assert backoff(1) == BACKOFF_BASE
+    assert backoff(2) == BACKOFF_BASE * 2
+    assert backoff(3) == BACKOFF_BASE * 4
+    assert backoff(20) == timedelta(hours=4)
+
+
+async def test_missing_weather_entity(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+):
+    """Test a missing weather entity keeps the climate deltas available."""
+    hass.states.async_set(
+        "climate.living_room",
+        "heat",
+        {"current_temperature": 21, "temperature": 20},
+    )
+    entry = await _setup(hass, MOCK_CONFIG_WITH_CLIMATE)
+    coordinator = entry.runtime_data.coordinator
+
+    assert coordinator.last_update_success
+    assert coordinator.data[DATA_CLIMATE_MAX_POS_DELTA] == 1.0
+    assert coordinator.data[DATA_WEATHER_STALE] is True
+    assert hass.states.get("sensor.offdelay_max_temp_today").state == ("unknown")
+    assert _issue(hass, entry) is None
+
+    # Refreshes while the circuit is open do not count as failures
+    await coordinator.async_refresh()
+    assert coordinator.weather_breaker.failures == 1
+
+    for failures in (2, 3):
+        freezer.tick(backoff(failures - 1))
+        await coordinator.async_refresh()
+        assert coordinator.weather_breaker.failures == failures
+    issue = _issue(hass, entry)
+    assert issue is not None
+    assert issue.translation_placeholders == {"error": "No weather entity found"}
+
+
+async def test_stale_forecast_and_recovery(
+    hass: HomeAssistant, fetch: AsyncMock, freezer: FrozenDateTimeFactory
+):
+    """Test the last forecast is served stale and the issue is removed again."""
+    hass.states.async_set("weather.home", "sunny")
+    entry = await _setup(hass, MOCK_CONFIG)
+    coordinator = entry.runtime_data.coordinator
+    state = hass.states.get("sensor.offdelay_max_temp_today")
+    assert state.state == "10.0"
+    assert state.attributes["stale"] is False
+
+    fetch.side_effect = HomeAssistantError("unavailable")
+    for failures in range(1, 4):
+        await coordinator.async_refresh()
+        freezer.tick(backoff(failures))
+    assert fetch.call_count == 4
+    assert _issue(hass, entry) is not None
+    state = hass.states.get("sensor.offdelay_max_temp_today")
+    assert state.state == "10.0"
+    assert state.attributes["stale"] is True
+    assert coordinator.data["climate_mode"] == "winter"
+
+    fetch.side_effect = None
+    await coordinator.async_refresh()
+    assert _issue(hass, entry) is None
+    assert coordinator.weather_breaker.failures == 0
+    state = hass.states.get("sensor.offdelay_max_temp_today")
+    assert state.attributes["stale"] is False
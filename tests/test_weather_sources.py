@@ -0,0 +1,156 @@
+"""Test the Off-delay weather source fallback chain and consensus."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.offdelay.const import (
+    CONF_WEATHER_ENTITIES,
+    CONF_WEATHER_STRATEGY,
+    DATA_WEATHER_STALE,
+    DOMAIN,
+)
+from custom_components.offdelay.weather import STRATEGY_FIRST, STRATEGY_MEDIAN
+
+from .const import MOCK_CONFIG
+
+SOURCES = ["weather.met", "weather.owm", "weather.buienradar"]
+
+
+def _forecast(max_temp: float) -> dict[str, float]:
+    return {
+        "weather_max_temp_today": max_temp,
+        "weather_min_temp_today": max_temp - 8,
+        "weather_max_temp_tomorrow": max_temp + 1,
+        "weather_min_temp_tomorrow": max_temp - 7,
+    }
+
+
+@pytest.fixture(name="forecasts")
+def forecasts_fixture() -> dict[str, object]:
+    """Return the forecast or error of every weather entity."""
+    return {
+        "weather.met": _forecast(10.0),
+        "weather.owm": _forecast(12.0),
+        "weather.buienradar": _forecast(30.0),
+    }
+
+
+@pytest.fixture(autouse=True)
+def fetch_fixture(forecasts: dict[str, object]):
+    """Answer every weather entity from ``forecasts``."""
+
+    async def fetch(_hass: HomeAssistant, entity_id: str) -> dict[str, float]:
+        result = forecasts[entity_id]
+        if isinstance(result, asyncio.Event):
+            await result.wait()
+            return _forecast(11.0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with patch(
+        "custom_components.offdelay.weather.async_fetch_daily_forecast",
+        new_callable=AsyncMock,
+        side_effect=fetch,
+    ) as mock:
+        yield mock
+
+
+async def _setup(hass: HomeAssistant, strategy: str) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG,
+        options={CONF_WEATHER_ENTITIES: SOURCES, CONF_WEATHER_STRATEGY: strategy},
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_first_healthy_source(hass: HomeAssistant, forecasts: dict[str, object]):
+    """Test a failing source is skipped for the next one in order."""
+    forecasts["weather.met"] = HomeAssistantError("unavailable")
+    entry = await _setup(hass, STRATEGY_FIRST)
+
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.data["weather_max_temp_today"] == 12.0
+    assert coordinator.weather_sources.used == ["weather.owm"]
+    stats = coordinator.weather_sources.stats()
+    assert stats["sources"]["weather.met"]["last_error"] == "unavailable"
+
+
+async def test_median_of_sources(hass: HomeAssistant):
+    """Test the consensus is not pulled away by one outlier."""
+    entry = await _setup(hass, STRATEGY_MEDIAN)
+
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.data["weather_max_temp_today"] == 12.0
+    assert coordinator.data["weather_min_temp_tomorrow"] == 5.0
+    assert coordinator.weather_sources.used == SOURCES
+
+
+async def test_slow_source_answers_from_its_cache(
+    hass: HomeAssistant, forecasts: dict[str, object]
+):
+    """Test a slow source does not delay the refresh and catches up later."""
+    entry = await _setup(hass, STRATEGY_FIRST)
+    coordinator = entry.runtime_data.coordinator
+
+    release = asyncio.Event()
+    forecasts["weather.met"] = release
+    with patch("custom_components.offdelay.weather.SOURCE_TIMEOUT", 0):
+        await coordinator.async_refresh()
+    assert coordinator.data["weather_max_temp_today"] == 10.0
+    assert coordinator.data[DATA_WEATHER_STALE] is False
+    assert coordinator.weather_sources.stats()["sources"]["weather.met"]["fetching"]
+
+    release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    await coordinator.async_refresh()
+    assert coordinator.data["weather_max_temp_today"] == 11.0
+
+
+async def test_options_change_sources_in_place(
+    hass: HomeAssistant, fetch_fixture: AsyncMock
+):
+    """Test changing the weather entities applies without a reload."""
+    entry = await _setup(hass, STRATEGY_FIRST)
+    coordinator = entry.runtime_data.coordinator
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_WEATHER_ENTITIES: ["weather.buienradar"],
+            CONF_WEATHER_STRATEGY: STRATEGY_FIRST,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert entry.runtime_data.coordinator is coordinator
+    assert coordinator.weather_sources.entity_ids == ["weather.buienradar"]
+    assert fetch_fixture.call_args.args[1] == "weather.buienradar"
+    assert coordinator.data["weather_max_temp_today"] == 30.0
+
+
+async def test_unanswered_source(hass: HomeAssistant, forecasts: dict[str, object]):
+    """Test sources that never answered fail the fetch without blocking it."""
+    release = asyncio.Event()
+    forecasts.update(dict.fromkeys(SOURCES, release))
+    with patch("custom_components.offdelay.weather.SOURCE_TIMEOUT", 0):
+        entry = await _setup(hass, STRATEGY_FIRST)
+
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.last_update_success
+    assert coordinator.data[DATA_WEATHER_STALE] is True
+    assert coordinator.weather_breaker.last_error == ", ".join(
+        f"{entity_id}: no answer" for entity_id in SOURCES
+    )
+    release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)